@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark a news refresh: per-row saves vs. one batched upsert.
+
+Writes N articles (1,000 by default) into a temporary database with
+save_news_article() once per article (one commit each) and with
+save_news_articles() (executemany in a single transaction), then repeats
+the batched refresh over existing rows to measure the upsert path.
+
+Usage:
+    python scripts/benchmark_bulk_writes.py [--articles N] [--repeat R]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+
+
+def make_articles(count: int, offset: int = 0):
+    """Build article dicts shaped like NewsCollector output."""
+    return [
+        {
+            'id': f"article-{offset + i}",
+            'title': f"Headline number {offset + i}",
+            'url': f"https://news.example.com/{offset + i}",
+            'snippet': "Summary text " * 15,
+            'source': 'Example News',
+            'image_url': f"https://img.example.com/{offset + i}.jpg",
+            'published_date': '2026-10-16T08:00:00',
+            'topics': ['technology', 'ai'],
+            'relevance_score': 0.5,
+            'user_feedback': None
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label: str, count: int, func, repeat: int):
+    """Print best-of-`repeat` wall time and rows/sec."""
+    best = float('inf')
+    for attempt in range(repeat):
+        started = time.perf_counter()
+        func(attempt)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<40} {count} rows  best={best * 1000:8.1f}ms  {count / best:10.0f} rows/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    count = args.articles
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'benchmark.db'))
+
+        def per_row(attempt):
+            for article in make_articles(count, offset=attempt * count):
+                db.save_news_article(article)
+
+        def batched_insert(attempt):
+            db.save_news_articles(make_articles(count, offset=(args.repeat + attempt) * count))
+
+        def batched_refresh(attempt):
+            db.save_news_articles(make_articles(count))
+
+        timed("save_news_article() per row", count, per_row, args.repeat)
+        timed("save_news_articles() new rows", count, batched_insert, args.repeat)
+        timed("save_news_articles() refresh (upsert)", count, batched_refresh, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
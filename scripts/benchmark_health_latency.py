@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark /health latency while DB-heavy endpoints are under load.
+
+Hammers /api/tasks and /api/news with concurrent workers and samples /health
+in parallel, then reports p50/p95/p99 for both. Run against a live dashboard
+before and after a change to see how much blocking work reaches the event loop.
+Compare runs on the same data: with a near-empty database every endpoint is
+cheap and the difference disappears (a few thousand todos make it visible).
+
+Usage:
+    python scripts/benchmark_health_latency.py [--base-url URL] [--workers N] [--duration SECONDS]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+HAMMER_PATHS = ["/api/tasks", "/api/news"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, samples: List[float], errors: int):
+    """Print a one-line latency summary in milliseconds."""
+    if not samples:
+        print(f"{name:<12} no successful requests ({errors} errors)")
+        return
+    print(
+        f"{name:<12} n={len(samples):<6} errors={errors:<4} "
+        f"mean={statistics.mean(samples):7.1f}ms "
+        f"p50={percentile(samples, 50):7.1f}ms "
+        f"p95={percentile(samples, 95):7.1f}ms "
+        f"p99={percentile(samples, 99):7.1f}ms "
+        f"max={max(samples):7.1f}ms"
+    )
+
+
+async def hammer(client: httpx.AsyncClient, path: str, deadline: float, results: Dict):
+    """Request a DB-heavy endpoint back to back until the deadline."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            response.raise_for_status()
+            results['samples'].append((time.perf_counter() - started) * 1000)
+        except Exception:
+            results['errors'] += 1
+
+
+async def probe_health(client: httpx.AsyncClient, deadline: float, interval: float, results: Dict):
+    """Sample /health at a fixed interval until the deadline."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get("/health")
+            response.raise_for_status()
+            results['samples'].append((time.perf_counter() - started) * 1000)
+        except Exception:
+            results['errors'] += 1
+        await asyncio.sleep(interval)
+
+
+async def run(base_url: str, workers: int, duration: float, interval: float):
+    limits = httpx.Limits(max_connections=workers + 4)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        # Warm up caches and connections
+        for path in HAMMER_PATHS + ["/health"]:
+            try:
+                await client.get(path)
+            except Exception as e:
+                print(f"Warm-up request to {path} failed: {e}")
+
+        deadline = time.perf_counter() + duration
+        load = {'samples': [], 'errors': 0}
+        health = {'samples': [], 'errors': 0}
+
+        tasks = [
+            asyncio.create_task(hammer(client, HAMMER_PATHS[i % len(HAMMER_PATHS)], deadline, load))
+            for i in range(workers)
+        ]
+        tasks.append(asyncio.create_task(probe_health(client, deadline, interval, health)))
+        await asyncio.gather(*tasks)
+
+    print(f"\n{workers} workers on {', '.join(HAMMER_PATHS)} for {duration:.0f}s against {base_url}\n")
+    summarize("load", load['samples'], load['errors'])
+    summarize("/health", health['samples'], health['errors'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', default='http://localhost:8008')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between /health probes')
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.workers, args.duration, args.interval))
+
+
+if __name__ == '__main__':
+    main()
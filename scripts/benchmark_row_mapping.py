@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for todo row mapping.
+
+Seeds a temporary database with N todos (50k by default) and compares the
+legacy get_todos() row mapping (SELECT * plus a key set and closure per row,
+then a second dict copy for /api/tasks) against the typed row models, with
+wall time and peak traced allocations for each.
+
+Usage:
+    python scripts/benchmark_row_mapping.py [--rows N] [--repeat R]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+
+
+def seed(db: DatabaseManager, rows: int):
+    """Insert `rows` todos with realistic description/preview sizes."""
+    priorities = ('high', 'medium', 'low')
+    statuses = ('pending', 'pending', 'in_progress', 'completed')
+    with db.get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO universal_todos (
+                id, title, description, due_date, priority, category, source,
+                source_id, source_title, source_url, source_preview, creation_reason,
+                status, requires_response, email_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    f"todo-{i}", f"Task {i}: follow up on thread", "Details " * 120,
+                    f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}", priorities[i % 3], 'work',
+                    'email', f"msg-{i}", f"Subject {i}", f"https://example.com/{i}",
+                    "Preview text " * 20, 'Detected as actionable from email content',
+                    statuses[i % 4], i % 2, f"msg-{i}",
+                )
+                for i in range(rows)
+            ],
+        )
+        conn.commit()
+
+
+def legacy_get_todos(db: DatabaseManager):
+    """The previous get_todos() mapping, kept here as the baseline."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM universal_todos WHERE status != 'completed' AND status != 'deleted' "
+            "ORDER BY due_date ASC, priority DESC, created_at DESC"
+        )
+        todos = []
+        for row in cursor.fetchall():
+            row_keys = set(row.keys())
+            def get_row_value(key, default=None):
+                return row[key] if key in row_keys else default
+
+            todos.append({
+                'id': get_row_value('id', ''),
+                'title': get_row_value('title', ''),
+                'description': get_row_value('description', ''),
+                'due_date': get_row_value('due_date'),
+                'priority': get_row_value('priority', 'medium'),
+                'category': get_row_value('category', 'general'),
+                'source': get_row_value('source', 'manual'),
+                'source_id': get_row_value('source_id'),
+                'source_title': get_row_value('source_title', ''),
+                'source_url': get_row_value('source_url', ''),
+                'source_preview': get_row_value('source_preview', ''),
+                'creation_reason': get_row_value('creation_reason', ''),
+                'status': get_row_value('status', 'pending'),
+                'assigned_to_service': get_row_value('assigned_to_service'),
+                'requires_response': bool(get_row_value('requires_response', 0)),
+                'email_id': get_row_value('email_id'),
+                'created_at': get_row_value('created_at'),
+                'completed_at': get_row_value('completed_at')
+            })
+        return todos
+
+
+def legacy_api_tasks(db: DatabaseManager):
+    """Legacy /api/tasks: get_todos() dicts copied into response dicts."""
+    tasks = []
+    for task in legacy_get_todos(db):
+        tasks.append({
+            'id': task.get('id', ''),
+            'title': task.get('title', ''),
+            'description': task.get('description', ''),
+            'priority': task.get('priority', 'medium'),
+            'category': task.get('category', 'general'),
+            'status': task.get('status', 'pending'),
+            'source': task.get('source', 'manual'),
+            'source_id': task.get('source_id', ''),
+            'source_title': task.get('source_title', ''),
+            'source_url': task.get('source_url', ''),
+            'source_preview': task.get('source_preview', ''),
+            'creation_reason': task.get('creation_reason', ''),
+            'due_date': task.get('due_date', ''),
+            'created_at': task.get('created_at', ''),
+            'completed_at': task.get('completed_at', ''),
+            'requires_response': bool(task.get('requires_response', 0)),
+            'email_id': task.get('email_id', ''),
+            'gmail_link': f"https://mail.google.com/mail/u/0/#inbox/{task.get('email_id')}" if task.get('email_id') else None
+        })
+    return tasks
+
+
+def measure(label: str, func, repeat: int):
+    """Report best wall time and peak traced allocation for func()."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+        del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(result)
+    del result
+
+    print(f"{label:<44} rows={count:<7} best={best * 1000:8.1f}ms  peak_alloc={peak / 1024 / 1024:7.1f}MB")
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'benchmark.db'))
+        seed(db, args.rows)
+        print(f"Seeded {args.rows} todos\n")
+
+        cases = [
+            ("legacy get_todos()", lambda: legacy_get_todos(db)),
+            ("get_todos() (shared key tuple)", lambda: db.get_todos()),
+            ("get_todo_rows() models", lambda: db.get_todo_rows()),
+            ("get_todo_rows(summary=True) models", lambda: db.get_todo_rows(summary=True)),
+            ("legacy /api/tasks serialization", lambda: legacy_api_tasks(db)),
+            ("/api/tasks via TodoRow.to_api_dict()", lambda: [t.to_api_dict() for t in db.get_todo_rows()]),
+        ]
+        for label, func in cases:
+            measure(label, func, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
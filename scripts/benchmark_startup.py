@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark DatabaseManager startup: cold, first-in-process and warm.
+
+- cold: first construction against a new database file (all migrations run)
+- first-in-process: existing, up-to-date file in a fresh process
+  (schema_version is read, no DDL runs)
+- warm: every later construction in the same process
+- legacy: re-running the full baseline DDL, which is what every
+  construction did before migrations were versioned
+
+Usage:
+    python scripts/benchmark_startup.py [--warm N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_migrations import reset_schema_state
+
+
+def timed_ms(func) -> float:
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--warm', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / 'benchmark.db')
+
+        cold = timed_ms(lambda: DatabaseManager(path))
+
+        reset_schema_state(path)
+        first = timed_ms(lambda: DatabaseManager(path))
+
+        def warm_loop():
+            for _ in range(args.warm):
+                DatabaseManager(path)
+        warm = timed_ms(warm_loop) / args.warm
+
+        db = DatabaseManager(path)
+
+        def legacy_init():
+            with db.get_connection() as conn:
+                db._create_schema(conn.cursor())
+                conn.commit()
+        legacy = min(timed_ms(legacy_init) for _ in range(5))
+
+    print(f"{'cold (new file, all migrations)':<40} {cold:10.2f} ms")
+    print(f"{'first in process (version check)':<40} {first:10.2f} ms")
+    print(f"{'warm (per construction)':<40} {warm * 1000:10.2f} µs")
+    print(f"{'legacy per construction (full DDL)':<40} {legacy:10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Nightly cleanup script for dashboard content.
 Removes unliked content and preserves liked content for personality training.
 """
 
+import argparse
 import asyncio
 import logging
 import sys
@@ -11,9 +12,10 @@ import os
 from datetime import datetime
 from pathlib import Path
 
-# Add project root to path
+# Add project root and src to path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
+sys.path.insert(0, str(project_root / 'src'))
 
 from database import DatabaseManager
 
@@ -33,9 +35,10 @@ logger = logging.getLogger(__name__)
 class NightlyCleanupManager:
     """Manages nightly cleanup of dashboard content."""
     
-    def __init__(self):
+    def __init__(self, convert_vacuum: bool = False):
         """Initialize cleanup manager."""
         self.db = DatabaseManager()
+        self.convert_vacuum = convert_vacuum
         
     def run_cleanup(self):
         """Run the nightly cleanup process."""
@@ -45,6 +48,11 @@ class NightlyCleanupManager:
             # Run content cleanup
             cleanup_stats = self.db.cleanup_unliked_content()
             
+            # Apply table retention policies, then vacuum and analyze
+            retention = self.db.run_retention(convert_legacy_vacuum=self.convert_vacuum)
+            logger.info(f"Retention removed {retention['rows_deleted']} rows "
+                        f"and reclaimed {retention['bytes_reclaimed']} bytes")
+            
             # Generate personality profile update
             personality_profile = self.db.get_personality_profile()
             liked_content = self.db.get_liked_content_summary()
@@ -99,7 +107,11 @@ class NightlyCleanupManager:
 
 def main():
     """Main entry point for nightly cleanup."""
-    cleanup_manager = NightlyCleanupManager()
+    parser = argparse.ArgumentParser(description="Nightly cleanup for dashboard content")
+    parser.add_argument('--convert-vacuum', action='store_true',
+                        help="One-time full VACUUM to switch an older database to incremental vacuum")
+    args = parser.parse_args()
+    cleanup_manager = NightlyCleanupManager(convert_vacuum=args.convert_vacuum)
     
     try:
         stats = cleanup_manager.run_cleanup()
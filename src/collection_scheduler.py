@@ -0,0 +1,379 @@
+"""
+Asyncio scheduler for background data collection.
+
+One scheduler runs inside the application's event loop and owns every
+periodic collector. Each job has its own interval, a random jitter so jobs
+do not line up, a retry interval after failures and an optional timeout.
+A shared semaphore caps how many collectors run at once, and stop()
+cancels everything on shutdown. Coroutine collectors run on the loop and
+hand their own blocking calls to threads; a plain sync callable can be
+registered with `offload=True` to run on a worker thread instead.
+
+Intervals adapt to the data and to the user. Each result is hashed; while
+successive runs return identical content a job's interval grows toward
+`max_interval`, and it snaps back to the base interval as soon as the
+content changes. While a dashboard tab is visible and in use, jobs run at
+half their interval (never below `min_interval`). Repeated failures back
+off exponentially with jitter, and when no client has reported activity
+for `idle_timeout` seconds, pausable jobs stop until the next report.
+
+Given a CollectorTelemetry, every run is recorded with its duration, item
+count, payload size, error class and upstream call count.
+
+Usage:
+    scheduler = CollectionScheduler(max_concurrency=4, on_result=cache.store)
+    scheduler.add_job('news', collect_news, interval=900)
+    await scheduler.start()      # in startup_event
+    scheduler.run_now('news')    # e.g. after a cache clear
+    scheduler.record_activity()  # on each client visibility/interaction report
+    data = await scheduler.run_once('news')  # joins a run already in flight
+    await scheduler.stop()       # in shutdown_event
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from collector_telemetry import CollectorTelemetry, RunRecord, measure_payload, track_upstream_calls
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_JITTER = 0.1          # +/- fraction of the interval
+DEFAULT_RETRY_INTERVAL = 300  # seconds to wait after a first failed run
+DEFAULT_MAX_BACKOFF = 3600    # cap for exponential failure backoff
+UNCHANGED_GROWTH = 1.5        # interval multiplier per unchanged result
+MAX_INTERVAL_FACTOR = 4       # default max_interval = interval * this
+ACTIVE_FACTOR = 0.5           # interval multiplier while the dashboard is in use
+ACTIVE_WINDOW = 120           # seconds since the last request that count as "in use"
+IDLE_TIMEOUT = 1800           # pause pausable jobs after this long without requests
+
+# Keys whose values change on every run without the content changing
+VOLATILE_KEYS = frozenset({'timestamp', 'collected_at', 'last_updated', 'generated_at',
+                           'fetched_at', 'cached_at', 'freshness'})
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of a collector result, ignoring volatile timestamp fields."""
+    def strip(item):
+        if isinstance(item, dict):
+            return {k: strip(v) for k, v in item.items() if k not in VOLATILE_KEYS}
+        if isinstance(item, (list, tuple)):
+            return [strip(v) for v in item]
+        return item
+    encoded = json.dumps(strip(value), sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+@dataclass
+class CollectionJob:
+    """A periodic collector and its run bookkeeping."""
+
+    name: str
+    func: Callable[[], Awaitable[Any]]
+    interval: float
+    jitter: float = DEFAULT_JITTER
+    initial_delay: float = 0.0
+    retry_interval: float = DEFAULT_RETRY_INTERVAL
+    timeout: Optional[float] = None
+    offload: bool = False
+    min_interval: Optional[float] = None
+    max_interval: Optional[float] = None
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+    adaptive: bool = True
+    pausable: bool = True
+
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    running: bool = False
+    last_started: Optional[datetime] = None
+    last_finished: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    next_run: Optional[datetime] = None
+    coalesced: int = 0
+    current_interval: float = 0.0
+    unchanged_runs: int = 0
+    last_hash: Optional[str] = None
+    paused: bool = False
+    _wake: Optional[asyncio.Event] = field(default=None, repr=False)
+    _inflight: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.min_interval is None:
+            self.min_interval = self.interval * ACTIVE_FACTOR
+        if self.max_interval is None:
+            self.max_interval = self.interval * MAX_INTERVAL_FACTOR
+        self.current_interval = self.interval
+
+    def record_content(self, value: Any):
+        """Grow the interval while results repeat; reset it when they change."""
+        if not self.adaptive:
+            return
+        digest = content_hash(value)
+        if digest == self.last_hash:
+            self.unchanged_runs += 1
+            self.current_interval = min(self.max_interval, self.current_interval * UNCHANGED_GROWTH)
+        else:
+            self.unchanged_runs = 0
+            self.current_interval = self.interval
+        self.last_hash = digest
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'interval': self.interval,
+            'current_interval': round(self.current_interval, 1),
+            'unchanged_runs': self.unchanged_runs,
+            'paused': self.paused,
+            'runs': self.runs,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'coalesced': self.coalesced,
+            'running': self.running,
+            'last_started': self.last_started.isoformat() if self.last_started else None,
+            'last_finished': self.last_finished.isoformat() if self.last_finished else None,
+            'last_duration_ms': self.last_duration_ms,
+            'last_error': self.last_error,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+        }
+
+
+class CollectorResultError(RuntimeError):
+    """A collector returned a result that reports an error."""
+
+
+def _call_blocking(func: Callable[[], Any]) -> Any:
+    """Run a sync callable on a worker thread. Coroutines belong on the loop."""
+    if inspect.iscoroutinefunction(func):
+        raise TypeError(f"Cannot offload coroutine function {func!r}")
+    result = func()
+    if inspect.iscoroutine(result):
+        result.close()
+        raise TypeError(f"Offloaded callable {func!r} returned a coroutine")
+    return result
+
+
+class CollectionScheduler:
+    """Runs collection jobs as tasks on one event loop with bounded concurrency."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 on_result: Optional[Callable[[str, Any], None]] = None,
+                 result_error: Optional[Callable[[Any], Optional[str]]] = None,
+                 idle_timeout: Optional[float] = IDLE_TIMEOUT,
+                 active_window: float = ACTIVE_WINDOW,
+                 telemetry: Optional[CollectorTelemetry] = None):
+        self.max_concurrency = max_concurrency
+        self.telemetry = telemetry
+        self.on_result = on_result
+        self.result_error = result_error
+        self.idle_timeout = idle_timeout
+        self.active_window = active_window
+        self.jobs: Dict[str, CollectionJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._activity: Optional[asyncio.Event] = None
+        self._running = False
+        self.last_activity = time.monotonic()
+        self.client_visible = True
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[Any]], interval: float, **options) -> CollectionJob:
+        """Register a job; if the scheduler is already running it starts right away."""
+        if name in self.jobs:
+            raise ValueError(f"Collection job already registered: {name}")
+        if options.get('offload') and inspect.iscoroutinefunction(func):
+            raise ValueError(f"Job {name} is a coroutine function; only sync callables can be offloaded")
+        job = CollectionJob(name=name, func=func, interval=interval, **options)
+        self.jobs[name] = job
+        if self._running:
+            self._spawn(job)
+        return job
+
+    async def start(self):
+        """Start every registered job on the running loop."""
+        if self._running:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._activity = asyncio.Event()
+        self.last_activity = time.monotonic()
+        self._running = True
+        for job in self.jobs.values():
+            self._spawn(job)
+        logger.info(f"Collection scheduler started {len(self.jobs)} jobs "
+                    f"(max {self.max_concurrency} concurrent)")
+
+    async def stop(self, timeout: float = 5.0):
+        """Cancel all jobs and wait for them to unwind."""
+        self._running = False
+        tasks = list(self._tasks.values())
+        tasks += [job._inflight for job in self.jobs.values()
+                  if job._inflight is not None and not job._inflight.done()]
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        logger.info("Collection scheduler stopped")
+
+    def run_now(self, name: str) -> bool:
+        """Wake a job so it runs immediately instead of at its next slot."""
+        job = self.jobs.get(name)
+        if job is None or job._wake is None:
+            return False
+        if not job.running:
+            job._wake.set()
+        return True
+
+    def record_activity(self, visible: Optional[bool] = None):
+        """Note a client activity report (and tab visibility, when known); resumes paused jobs."""
+        self.last_activity = time.monotonic()
+        if visible is not None:
+            self.client_visible = visible
+        if self._activity is not None:
+            self._activity.set()
+
+    def is_idle(self) -> bool:
+        """True when no client has reported activity for idle_timeout seconds."""
+        return self.idle_timeout is not None and time.monotonic() - self.last_activity > self.idle_timeout
+
+    def client_active(self) -> bool:
+        """True while a visible dashboard tab has recently reported activity."""
+        return self.client_visible and time.monotonic() - self.last_activity <= self.active_window
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'running': self._running,
+            'max_concurrency': self.max_concurrency,
+            'idle': self.is_idle(),
+            'client_active': self.client_active(),
+            'seconds_since_activity': round(time.monotonic() - self.last_activity, 1),
+            'active': sum(1 for job in self.jobs.values() if job.running),
+            'jobs': {name: job.status() for name, job in self.jobs.items()},
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def _spawn(self, job: CollectionJob):
+        job._wake = asyncio.Event()
+        self._tasks[job.name] = asyncio.create_task(self._job_loop(job), name=f"collector-{job.name}")
+
+    def _jittered(self, seconds: float, jitter: float) -> float:
+        if seconds <= 0 or jitter <= 0:
+            return max(0.0, seconds)
+        return max(0.0, seconds * (1 + random.uniform(-jitter, jitter)))
+
+    def next_delay(self, job: CollectionJob, ok: bool) -> float:
+        """Seconds until the job's next run after a success or failure."""
+        if not ok:
+            # Exponential backoff with jitter in [backoff/2, backoff]
+            first = min(job.retry_interval, job.interval)
+            backoff = min(job.max_backoff, first * 2 ** (job.consecutive_failures - 1))
+            return random.uniform(backoff / 2, backoff)
+        interval = job.current_interval
+        if job.adaptive and self.client_active():
+            interval = max(job.min_interval, min(interval, job.interval) * ACTIVE_FACTOR)
+        return self._jittered(interval, job.jitter)
+
+    async def _sleep(self, job: CollectionJob, seconds: float):
+        job.next_run = datetime.fromtimestamp(time.time() + seconds)
+        try:
+            await asyncio.wait_for(job._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        job._wake.clear()
+
+    async def _wait_for_activity(self, job: CollectionJob):
+        job.paused = True
+        job.next_run = None
+        logger.info(f"Pausing {job.name} collection: no client activity")
+        while self._running and self.is_idle():
+            self._activity.clear()
+            await self._activity.wait()
+        job.paused = False
+
+    async def _job_loop(self, job: CollectionJob):
+        await self._sleep(job, job.initial_delay)
+        while self._running:
+            if job.pausable and self.is_idle():
+                await self._wait_for_activity(job)
+                continue
+            ok = await self.run_job(job)
+            await self._sleep(job, self.next_delay(job, ok))
+
+    async def run_job(self, job: CollectionJob) -> bool:
+        """Run the job once, joining a run that is already in flight."""
+        ok, _ = await self._run_coalesced(job)
+        return ok
+
+    async def run_once(self, name: str) -> Any:
+        """Collect `name` now (or join the current run) and return its result."""
+        job = self.jobs[name]
+        ok, result = await self._run_coalesced(job)
+        if not ok:
+            raise RuntimeError(job.last_error or f"Collection of {name} failed")
+        return result
+
+    async def _run_coalesced(self, job: CollectionJob) -> Tuple[bool, Any]:
+        if job._inflight is None or job._inflight.done():
+            job._inflight = asyncio.ensure_future(self._execute(job))
+        else:
+            job.coalesced += 1
+        return await asyncio.shield(job._inflight)
+
+    async def _execute(self, job: CollectionJob) -> Tuple[bool, Any]:
+        """Run one collection, store its result and update the job's stats."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            job.running = True
+            job.last_started = datetime.now()
+            started = time.perf_counter()
+            result, failure, cancelled = None, None, False
+            try:
+                with track_upstream_calls() as upstream:
+                    if job.offload:
+                        call = asyncio.to_thread(_call_blocking, job.func)
+                    else:
+                        call = job.func()
+                    result = await (asyncio.wait_for(call, job.timeout) if job.timeout else call)
+                error = self.result_error(result) if self.result_error else None
+                if error:
+                    raise CollectorResultError(error)
+                job.record_content(result)
+                if self.on_result is not None:
+                    self.on_result(job.name, result)
+                job.consecutive_failures = 0
+                job.last_error = None
+                return True, result
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            except Exception as e:
+                failure = e
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.last_error = str(e) or type(e).__name__
+                logger.error(f"Error in background collection for {job.name}: {job.last_error}")
+                return False, None
+            finally:
+                job.runs += 1
+                job.running = False
+                job.last_finished = datetime.now()
+                job.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+                if self.telemetry is not None and not cancelled:
+                    self.telemetry.record(RunRecord(
+                        job.name, job.last_duration_ms, ok=failure is None,
+                        error_class=type(failure).__name__ if failure is not None else None,
+                        error=job.last_error if failure is not None else None,
+                        upstream_calls=upstream.count,
+                        **measure_payload(result)
+                    ))
@@ -0,0 +1,260 @@
+"""
+Per-run timing and health telemetry for background collectors.
+
+The collection scheduler records one RunRecord per collector run: duration,
+item count, payload size, error class, number of upstream calls and when
+it finished. The last HISTORY_SIZE runs of each collector are kept in an
+in-memory ring buffer, from which /api/system/status reports duration
+percentiles, failure rates and the last successful run. Runs are also
+folded into hourly rollups that are flushed to the collector_run_rollups
+table every FLUSH_INTERVAL seconds, so history survives restarts without
+a write per run.
+
+Upstream calls are counted per run through a context variable: the
+scheduler opens `track_upstream_calls()` around each run and the shared
+HTTP clients (and the Google API request builder) call
+`count_upstream_call()` for every request they send. Context variables
+follow the run into tasks and worker threads started from it.
+
+Usage:
+    telemetry = CollectorTelemetry(flush=lambda rows: db.save_collector_rollups(rows))
+    with track_upstream_calls() as calls:
+        result = await collect()
+    telemetry.record(RunRecord('news', duration_ms, ok=True, upstream_calls=calls.count,
+                               **measure_payload(result)))
+    telemetry.summary()['news']['duration_ms']['p90']
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = 200    # runs kept per collector
+FLUSH_INTERVAL = 60   # seconds between rollup flushes
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass(slots=True)
+class RunRecord:
+    """One collector run."""
+
+    collector: str
+    duration_ms: float
+    ok: bool
+    items: int = 0
+    payload_bytes: int = 0
+    error_class: Optional[str] = None
+    error: Optional[str] = None
+    upstream_calls: int = 0
+    finished_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'finished_at': datetime.fromtimestamp(self.finished_at).isoformat(),
+            'duration_ms': self.duration_ms,
+            'ok': self.ok,
+            'items': self.items,
+            'payload_bytes': self.payload_bytes,
+            'error_class': self.error_class,
+            'error': self.error,
+            'upstream_calls': self.upstream_calls,
+        }
+
+
+class UpstreamCallCounter:
+    """Mutable counter shared by everything a run starts."""
+
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+
+_current_counter: contextvars.ContextVar[Optional[UpstreamCallCounter]] = \
+    contextvars.ContextVar('collector_upstream_calls', default=None)
+
+
+@contextmanager
+def track_upstream_calls() -> Iterator[UpstreamCallCounter]:
+    """Count upstream requests made by the enclosed code (and tasks/threads it starts)."""
+    counter = UpstreamCallCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def count_upstream_call(n: int = 1):
+    """Record an outbound request against the collector run in progress, if any."""
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += n
+
+
+@functools.lru_cache(maxsize=None)
+def google_request_builder():
+    """HttpRequest subclass for googleapiclient.build() that counts each execute()."""
+    from googleapiclient.http import HttpRequest
+
+    class CountingHttpRequest(HttpRequest):
+        def execute(self, *args, **kwargs):
+            count_upstream_call()
+            return super().execute(*args, **kwargs)
+
+    return CountingHttpRequest
+
+
+def measure_payload(result: Any) -> Dict[str, int]:
+    """Item count and serialized size of a collector result.
+
+    Items are the length of a list result, or of the longest list among a
+    dict result's top-level values (e.g. 'events', 'articles', 'emails').
+    """
+    if result is None:
+        return {'items': 0, 'payload_bytes': 0}
+    if isinstance(result, (list, tuple)):
+        items = len(result)
+    elif isinstance(result, dict):
+        items = max((len(v) for v in result.values() if isinstance(v, (list, tuple))), default=1)
+    else:
+        items = 1
+    try:
+        size = len(json.dumps(result, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        size = 0
+    return {'items': items, 'payload_bytes': size}
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def _hour_bucket(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d %H:00:00')
+
+
+class CollectorTelemetry:
+    """Ring buffer of recent runs per collector plus pending hourly rollups."""
+
+    def __init__(self, history: int = HISTORY_SIZE,
+                 flush: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.history = history
+        self.flush = flush
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._runs: Dict[str, Deque[RunRecord]] = {}
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, run: RunRecord):
+        """Add a run to the ring buffer and rollups; flushes rollups when due."""
+        with self._lock:
+            self._runs.setdefault(run.collector, deque(maxlen=self.history)).append(run)
+            totals = self._totals.setdefault(run.collector, {
+                'runs': 0, 'failures': 0, 'last_success_at': None,
+                'last_failure_at': None, 'last_error_class': None,
+            })
+            totals['runs'] += 1
+            if run.ok:
+                totals['last_success_at'] = run.finished_at
+            else:
+                totals['failures'] += 1
+                totals['last_failure_at'] = run.finished_at
+                totals['last_error_class'] = run.error_class
+
+            bucket = self._pending.setdefault((run.collector, _hour_bucket(run.finished_at)), {
+                'collector': run.collector, 'hour': _hour_bucket(run.finished_at),
+                'runs': 0, 'failures': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'items': 0,
+                'payload_bytes': 0, 'upstream_calls': 0, 'last_success_at': None,
+                'last_error_class': None,
+            })
+            bucket['runs'] += 1
+            bucket['total_ms'] += run.duration_ms
+            bucket['max_ms'] = max(bucket['max_ms'], run.duration_ms)
+            bucket['items'] += run.items
+            bucket['payload_bytes'] += run.payload_bytes
+            bucket['upstream_calls'] += run.upstream_calls
+            if run.ok:
+                bucket['last_success_at'] = datetime.fromtimestamp(run.finished_at).isoformat(sep=' ')
+            else:
+                bucket['failures'] += 1
+                bucket['last_error_class'] = run.error_class
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush_rollups()
+
+    def drain_rollups(self) -> List[Dict[str, Any]]:
+        """Take the rollups accumulated since the last flush."""
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+        return rows
+
+    def flush_rollups(self) -> int:
+        """Hand pending rollups to the flush callback. Returns the number of rows."""
+        rows = self.drain_rollups()
+        if rows and self.flush is not None:
+            try:
+                self.flush(rows)
+            except Exception as e:
+                logger.error(f"Error flushing collector telemetry rollups: {e}")
+        return len(rows)
+
+    def recent(self, collector: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """The collector's latest runs, newest first."""
+        with self._lock:
+            runs = list(self._runs.get(collector, ()))[-limit:]
+        return [run.to_dict() for run in reversed(runs)]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-collector health and percentiles over the ring buffer."""
+        with self._lock:
+            snapshot = {name: (list(runs), dict(self._totals[name])) for name, runs in self._runs.items()}
+        result = {}
+        for name, (runs, totals) in snapshot.items():
+            durations = sorted(run.duration_ms for run in runs)
+            failed = sum(1 for run in runs if not run.ok)
+            last = runs[-1]
+            ok_runs = [run for run in runs if run.ok] or runs
+            result[name] = {
+                'runs': totals['runs'],
+                'failures': totals['failures'],
+                'window': len(runs),
+                'failure_rate': round(failed / len(runs), 3),
+                'duration_ms': {
+                    **{f'p{pct}': percentile(durations, pct) for pct in PERCENTILES},
+                    'max': durations[-1],
+                    'avg': round(sum(durations) / len(durations), 1),
+                },
+                'items': {'last': last.items,
+                          'avg': round(sum(run.items for run in ok_runs) / len(ok_runs), 1)},
+                'payload_bytes': {'last': last.payload_bytes,
+                                  'avg': round(sum(run.payload_bytes for run in ok_runs) / len(ok_runs))},
+                'upstream_calls': {'last': last.upstream_calls,
+                                   'avg': round(sum(run.upstream_calls for run in runs) / len(runs), 2)},
+                'last_success_at': (datetime.fromtimestamp(totals['last_success_at']).isoformat()
+                                    if totals['last_success_at'] else None),
+                'last_failure_at': (datetime.fromtimestamp(totals['last_failure_at']).isoformat()
+                                    if totals['last_failure_at'] else None),
+                'last_error_class': totals['last_error_class'],
+                'last_run': last.to_dict(),
+            }
+        return result
@@ -2,6 +2,7 @@
 Google Calendar data collector using Google Calendar API.
 """
 
+import asyncio
 import os
 import logging
 import re
@@ -14,6 +15,7 @@ try:
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
+    from collector_telemetry import google_request_builder
     GOOGLE_AVAILABLE = True
 except ImportError:
     GOOGLE_AVAILABLE = False
@@ -58,15 +60,15 @@ class CalendarCollector:
             
             logger.info(f"Fetching calendar events from {start_time} to {end_time}")
             
-            # Get events from primary calendar
-            events_result = self.service.events().list(
+            # Get events from primary calendar (the Google client blocks)
+            events_result = await asyncio.to_thread(self.service.events().list(
                 calendarId='primary',
                 timeMin=start_time,
                 timeMax=end_time,
                 maxResults=500,
                 singleEvents=True,
                 orderBy='startTime'
-            ).execute()
+            ).execute)
             
             events = events_result.get('items', [])
             
@@ -84,7 +86,11 @@ class CalendarCollector:
             return []
     
     async def _authenticate(self):
-        """Authenticate with Google Calendar API."""
+        """Authenticate with Google Calendar API on a worker thread."""
+        await asyncio.to_thread(self._authenticate_blocking)
+    
+    def _authenticate_blocking(self):
+        """Load, refresh and save credentials, then build the service."""
         logger.info("Starting Google Calendar authentication")
         creds = None
         
@@ -138,7 +144,7 @@ class CalendarCollector:
             logger.error("No valid Google credentials available. Please authenticate via the web interface.")
             return
         
-        self.service = build('calendar', 'v3', credentials=creds)
+        self.service = build('calendar', 'v3', credentials=creds, requestBuilder=google_request_builder())
         logger.info("Successfully authenticated with Google Calendar API")
     
     def _process_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
@@ -2,6 +2,7 @@
 Gmail data collector using Google Gmail API.
 """
 
+import asyncio
 import os
 import logging
 import hashlib
@@ -16,11 +17,13 @@ import sys
 # Add parent directory to path for processor imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from processors.email_risk_checker import EmailRiskChecker
+from db_async import run_in_db_executor
 
 try:
     from google.oauth2.credentials import Credentials
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
+    from collector_telemetry import google_request_builder
     GOOGLE_AVAILABLE = True
 except ImportError:
     GOOGLE_AVAILABLE = False
@@ -72,11 +75,11 @@ class GmailCollector:
             query = f'after:{start_query} before:{end_query}'
             
             # Get message list
-            result = self.service.users().messages().list(
+            result = await asyncio.to_thread(self.service.users().messages().list(
                 userId='me',
                 q=query,
                 maxResults=500
-            ).execute()
+            ).execute)
             
             messages = result.get('messages', [])
             
@@ -112,14 +115,14 @@ class GmailCollector:
             
             # Initialize risk checker with shared database
             from database import db
-            risk_checker = EmailRiskChecker(db)
+            risk_checker = await run_in_db_executor(EmailRiskChecker, db)
             
             # Get 100 most recent emails - no date filtering, no priority analysis
             # Just get them fresh every time
-            result = self.service.users().messages().list(
+            result = await asyncio.to_thread(self.service.users().messages().list(
                 userId='me',
                 maxResults=100
-            ).execute()
+            ).execute)
             
             messages = result.get('messages', [])
             logger.info(f"Found {len(messages)} recent emails")
@@ -137,7 +140,7 @@ class GmailCollector:
                     is_unread = 'UNREAD' in labels
                     
                     # Analyze email for security/spam risk
-                    risk_analysis = risk_checker.analyze_email(email_data)
+                    risk_analysis = await run_in_db_executor(risk_checker.analyze_email, email_data)
                     
                     formatted_email = {
                         'id': email_data.get('id', ''),
@@ -194,7 +197,11 @@ class GmailCollector:
             }
     
     async def _authenticate(self):
-        """Authenticate with Google Gmail API for this account."""
+        """Authenticate with Google Gmail API for this account on a worker thread."""
+        await asyncio.to_thread(self._authenticate_blocking)
+    
+    def _authenticate_blocking(self):
+        """Load, refresh and save credentials, then build the service."""
         logger.info(f"Authenticating Gmail account: {self.account['name']}")
         creds = None
         token_file = Path(self.account['credentials_file'])
@@ -234,17 +241,17 @@ class GmailCollector:
             logger.error("No valid Google credentials available. Please authenticate via the web interface.")
             return
         
-        self.service = build('gmail', 'v1', credentials=creds)
+        self.service = build('gmail', 'v1', credentials=creds, requestBuilder=google_request_builder())
         logger.info("Successfully authenticated with Google Gmail API")
     
     async def _get_email_details(self, message_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific email."""
         try:
-            message = self.service.users().messages().get(
+            message = await asyncio.to_thread(self.service.users().messages().get(
                 userId='me',
                 id=message_id,
                 format='full'
-            ).execute()
+            ).execute)
             
             headers = message['payload'].get('headers', [])
             
@@ -636,6 +643,11 @@ class GmailCollector:
                 }
             }
             
+            # Existing email todos, loaded once; rows to write are batched below
+            existing_todos_by_id = {t['id']: t for t in db_manager.get_todos_by_source('email', None)}
+            emails_to_save = []
+            todos_to_save = []
+            
             # Process each email
             for email_data in emails[:100]:  # Limit to 100 most recent (increased from 50)
                 try:
@@ -707,7 +719,7 @@ class GmailCollector:
                         'has_todos': len(todos) > 0
                     }
                     
-                    db_manager.save_email(email_db_data)
+                    emails_to_save.append(email_db_data)
                     
                     # Save todos to database (only if they don't already exist)
                     for todo in todos:
@@ -716,8 +728,7 @@ class GmailCollector:
                         ).hexdigest()
                         
                         # Check if this todo already exists
-                        existing_todos = db_manager.get_todos_by_source('email', None)
-                        existing_todo = next((t for t in existing_todos if t['id'] == todo_id), None)
+                        existing_todo = existing_todos_by_id.get(todo_id)
                         
                         if existing_todo:
                             # Todo already exists - don't recreate it
@@ -757,7 +768,8 @@ class GmailCollector:
                             'email_id': email_id
                         }
                         
-                        db_manager.save_todo(todo_db_data)
+                        todos_to_save.append(todo_db_data)
+                        existing_todos_by_id[todo_id] = todo_db_data
                         analyzed_emails['total_todos'].append(todo_db_data)
                     
                     # Categorize by final priority (use Ollama priority if available)
@@ -776,6 +788,10 @@ class GmailCollector:
                     logger.error(f"Error processing email: {e}")
                     continue
             
+            # Persist emails and new todos, one transaction each
+            db_manager.save_emails(emails_to_save)
+            db_manager.upsert_todos(todos_to_save)
+            
             # Update stats
             analyzed_emails['analysis_stats']['todos_extracted'] = len(analyzed_emails['total_todos'])
             
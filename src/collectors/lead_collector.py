@@ -19,6 +19,7 @@ from collections import defaultdict
 import asyncio
 
 from database import DatabaseManager
+from db_migrations import Migration
 from modules.foundershield.service import FounderShieldService
 from processors.email_risk_learning import EmailRiskLearningSystem
 
@@ -108,68 +109,71 @@ class LeadCollector:
         self._ensure_tables()
     
     def _ensure_tables(self):
-        """Ensure leads database tables exist."""
+        """Ensure leads database tables exist (once per database per process)."""
         try:
-            with self.db.get_connection() as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS leads (
-                        lead_id TEXT PRIMARY KEY,
-                        source TEXT NOT NULL,
-                        lead_type TEXT NOT NULL,
-                        contact_name TEXT,
-                        contact_email TEXT NOT NULL,
-                        company TEXT,
-                        status TEXT DEFAULT 'new',
-                        score INTEGER DEFAULT 0,
-                        confidence REAL DEFAULT 0,
-                        signals TEXT,
-                        context TEXT,
-                        first_seen TIMESTAMP,
-                        last_contact TIMESTAMP,
-                        conversation_count INTEGER DEFAULT 0,
-                        foundershield_score INTEGER,
-                        risk_level TEXT,
-                        next_action TEXT,
-                        metadata TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS lead_interactions (
-                        interaction_id TEXT PRIMARY KEY,
-                        lead_id TEXT NOT NULL,
-                        interaction_type TEXT,
-                        direction TEXT,
-                        content_summary TEXT,
-                        timestamp TIMESTAMP,
-                        source_id TEXT,
-                        metadata TEXT,
-                        FOREIGN KEY (lead_id) REFERENCES leads(lead_id)
-                    )
-                """)
-                
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS lead_tasks (
-                        task_id TEXT PRIMARY KEY,
-                        lead_id TEXT NOT NULL,
-                        task_type TEXT,
-                        description TEXT,
-                        status TEXT DEFAULT 'pending',
-                        priority TEXT,
-                        due_date TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        FOREIGN KEY (lead_id) REFERENCES leads(lead_id)
-                    )
-                """)
-                
-                conn.commit()
-                logger.info("✅ Lead tables created/verified")
+            self.db.ensure_schema('leads', [
+                Migration(1, 'lead tables', self._create_tables),
+            ])
         except Exception as e:
             logger.error(f"Error creating lead tables: {e}")
     
+    def _create_tables(self, cursor):
+        """Leads, lead interactions and lead follow-up tasks."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS leads (
+                lead_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                lead_type TEXT NOT NULL,
+                contact_name TEXT,
+                contact_email TEXT NOT NULL,
+                company TEXT,
+                status TEXT DEFAULT 'new',
+                score INTEGER DEFAULT 0,
+                confidence REAL DEFAULT 0,
+                signals TEXT,
+                context TEXT,
+                first_seen TIMESTAMP,
+                last_contact TIMESTAMP,
+                conversation_count INTEGER DEFAULT 0,
+                foundershield_score INTEGER,
+                risk_level TEXT,
+                next_action TEXT,
+                metadata TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS lead_interactions (
+                interaction_id TEXT PRIMARY KEY,
+                lead_id TEXT NOT NULL,
+                interaction_type TEXT,
+                direction TEXT,
+                content_summary TEXT,
+                timestamp TIMESTAMP,
+                source_id TEXT,
+                metadata TEXT,
+                FOREIGN KEY (lead_id) REFERENCES leads(lead_id)
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS lead_tasks (
+                task_id TEXT PRIMARY KEY,
+                lead_id TEXT NOT NULL,
+                task_type TEXT,
+                description TEXT,
+                status TEXT DEFAULT 'pending',
+                priority TEXT,
+                due_date TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                FOREIGN KEY (lead_id) REFERENCES leads(lead_id)
+            )
+        """)
+        logger.info("✅ Lead tables created/verified")
+    
     async def collect_from_gmail(
         self,
         emails: List[Dict[str, Any]],
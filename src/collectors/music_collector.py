@@ -7,6 +7,8 @@ music news sources, and learns from user preferences.
 
 import asyncio
 import aiohttp
+from http_pool import aiohttp_session
+from db_async import run_in_db_executor
 import feedparser
 import logging
 from typing import List, Dict, Any, Optional
@@ -224,7 +226,7 @@ class MusicCollector:
     async def _get_bandcamp_rss_stats(self) -> Optional[StreamingStats]:
         """Get real music data from Bandcamp RSS feeds."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 # Bandcamp new and notable RSS feed
                 url = "https://bandcamp.com/api/discover/2/get_web"
                 headers = {'User-Agent': 'Personal Dashboard Music Collector 1.0'}
@@ -255,7 +257,7 @@ class MusicCollector:
     async def _get_lastfm_stats(self) -> Optional[StreamingStats]:
         """Get real music trends from Last.fm public API."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 # Last.fm chart.getTopTracks (public API, no auth needed)
                 url = "http://ws.audioscrobbler.com/2.0/"
                 params = {
@@ -298,7 +300,7 @@ class MusicCollector:
         try:
             # Get data from Pitchfork RSS feed
             feed_url = "https://pitchfork.com/rss/reviews/albums/"
-            feed = feedparser.parse(feed_url)
+            feed = await asyncio.to_thread(feedparser.parse, feed_url)
             
             if feed.entries:
                 trending_tracks = []
@@ -324,7 +326,7 @@ class MusicCollector:
         indie_stats = []
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 headers = {'User-Agent': 'Personal Dashboard Music Collector 1.0'}
                 
                 # 1. SoundCloud trending electronic music
@@ -469,7 +471,7 @@ class MusicCollector:
         
         try:
             # Get from multiple sources in parallel
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 
                 # 1. iTunes/Apple Music Charts
                 try:
@@ -623,7 +625,7 @@ class MusicCollector:
         
         try:
             # Get recent releases from Bandcamp discover feed
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 url = "https://bandcamp.com/api/discover/2/get_web"
                 headers = {'User-Agent': 'Personal Dashboard Music Collector 1.0'}
                 
@@ -680,7 +682,7 @@ class MusicCollector:
         """Collect music industry news."""
         all_news = []
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp_session() as session:
             tasks = []
             for feed_url in self.music_news_feeds:
                 tasks.append(self._fetch_music_news_feed(session, feed_url))
@@ -707,7 +709,7 @@ class MusicCollector:
             async with session.get(feed_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     content = await response.text()
-                    feed = feedparser.parse(content)
+                    feed = await asyncio.to_thread(feedparser.parse, content)
                     
                     for entry in feed.entries:
                         title = entry.get('title', '').strip()
@@ -816,7 +818,7 @@ class MusicCollector:
         
         # Get search terms from user profile
         try:
-            profile = self.db.get_user_profile()
+            profile = await run_in_db_executor(self.db.get_user_profile)
             label_name = profile.get('music_label_name', 'Your Label')
             artist_name = profile.get('music_artist_name', 'Your Artist')
             
@@ -892,7 +894,7 @@ class MusicCollector:
         ]
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 headers = {'User-Agent': 'MusicCollector/1.0 (by /u/musicbot)'}
                 
                 # Search specific subreddits first (more targeted)
@@ -944,13 +946,13 @@ class MusicCollector:
         mentions = []
         try:
             # Use Google News RSS feed
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 url = f"https://news.google.com/rss/search?q={quote(term)}&hl=en&gl=US&ceid=US:en"
                 
                 async with session.get(url) as response:
                     if response.status == 200:
                         content = await response.text()
-                        feed = feedparser.parse(content)
+                        feed = await asyncio.to_thread(feedparser.parse, content)
                         
                         for entry in feed.entries[:3]:
                             mentions.append({
@@ -999,11 +1001,11 @@ class MusicCollector:
             
             for feed_url in blog_feeds:
                 try:
-                    async with aiohttp.ClientSession() as session:
+                    async with aiohttp_session() as session:
                         async with session.get(feed_url) as response:
                             if response.status == 200:
                                 content = await response.text()
-                                feed = feedparser.parse(content)
+                                feed = await asyncio.to_thread(feedparser.parse, content)
                                 
                                 for entry in feed.entries:
                                     title = entry.get('title', '').lower()
@@ -1034,7 +1036,7 @@ class MusicCollector:
         
         # Get profile data for realistic mentions
         try:
-            profile = self.db.get_user_profile()
+            profile = await run_in_db_executor(self.db.get_user_profile)
             label_name = profile.get('music_label_name', 'Your Label')
             artist_name = profile.get('music_artist_name', 'Your Artist')
             bandcamp_url = profile.get('bandcamp_url', 'https://yourname.bandcamp.com')
@@ -1092,7 +1094,7 @@ class MusicCollector:
         """Get fallback mentions if search fails."""
         # Get profile data
         try:
-            profile = self.db.get_user_profile()
+            profile = await run_in_db_executor(self.db.get_user_profile)
             label_name = profile.get('music_label_name', 'Your Label')
             artist_name = profile.get('music_artist_name', 'Your Artist')
             bandcamp_url = profile.get('bandcamp_url', 'https://yourname.bandcamp.com')
@@ -1167,6 +1169,98 @@ class MusicCollector:
         except:
             return 'Unknown'
 
+    def _save_to_database(self, music_data: Dict[str, Any]):
+        """Store collected news, stats, releases and mentions for personality training."""
+        # Initialize database manager
+        db_manager = DatabaseManager()
+        
+        # Save music news to database
+        if music_data.get('music_news'):
+            for news_item in music_data['music_news']:
+                try:
+                    # Convert MusicNews dataclass to dict for database
+                    music_content_data = {
+                        'id': f"news_{news_item.url.split('/')[-1]}_{int(news_item.published_date.timestamp())}",
+                        'title': news_item.title,
+                        'artist': news_item.source,
+                        'album': 'Music News',
+                        'url': news_item.url,
+                        'source': news_item.source,
+                        'release_date': news_item.published_date.isoformat(),
+                        'genres': news_item.tags or [],
+                        'user_feedback': news_item.user_feedback
+                    }
+                    
+                    # Save to database as music content
+                    db_manager.save_music_content(music_content_data)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to save music news item to database: {e}")
+        
+        # Save streaming stats to database
+        if music_data.get('streaming_stats'):
+            for stat in music_data['streaming_stats']:
+                try:
+                    music_content_data = {
+                        'id': f"stats_{stat.platform}_{int(datetime.now().timestamp())}",
+                        'title': f"{stat.platform} Statistics",
+                        'artist': self.label_name,
+                        'album': 'Streaming Stats',
+                        'url': None,
+                        'source': stat.platform,
+                        'release_date': datetime.now().isoformat(),
+                        'genres': ['stats'],
+                        'user_feedback': None
+                    }
+                    
+                    db_manager.save_music_content(music_content_data)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to save streaming stats to database: {e}")
+        
+        # Save recent releases to database
+        if music_data.get('recent_releases'):
+            for release in music_data['recent_releases']:
+                try:
+                    music_content_data = {
+                        'id': f"release_{release.title.replace(' ', '_')}_{int(release.release_date.timestamp())}",
+                        'title': release.title,
+                        'artist': release.artist,
+                        'album': release.title,
+                        'url': release.stream_url,
+                        'source': release.platform,
+                        'release_date': release.release_date.isoformat(),
+                        'genres': ['release'],
+                        'user_feedback': None
+                    }
+                    
+                    db_manager.save_music_content(music_content_data)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to save music release to database: {e}")
+        
+        # Save mentions to database
+        for mention_type in ['label_mentions', 'band_mentions']:
+            mentions = music_data.get(mention_type, [])
+            for mention in mentions:
+                try:
+                    if isinstance(mention, dict):
+                        music_content_data = {
+                            'id': f"mention_{mention_type}_{mention.get('url', '').split('/')[-1]}_{int(datetime.now().timestamp())}",
+                            'title': mention.get('title', f"{mention_type} mention"),
+                            'artist': mention.get('artist', self.band_name if 'band' in mention_type else self.label_name),
+                            'album': 'Mentions',
+                            'url': mention.get('url'),
+                            'source': mention.get('platform', 'web'),
+                            'release_date': datetime.now().isoformat(),
+                            'genres': ['mention'],
+                            'user_feedback': None
+                        }
+                        
+                        db_manager.save_music_content(music_content_data)
+                except Exception as e:
+                    logger.error(f"Failed to save music mention to database: {e}")
+
     async def collect_data(self) -> Dict[str, Any]:
         """
         Collect music data and save to database for personality training.
@@ -1185,95 +1279,7 @@ class MusicCollector:
             # Collect all music data
             music_data = await self.collect_all_music_data()
             
-            # Initialize database manager
-            db_manager = DatabaseManager()
-            
-            # Save music news to database
-            if music_data.get('music_news'):
-                for news_item in music_data['music_news']:
-                    try:
-                        # Convert MusicNews dataclass to dict for database
-                        music_content_data = {
-                            'id': f"news_{news_item.url.split('/')[-1]}_{int(news_item.published_date.timestamp())}",
-                            'title': news_item.title,
-                            'artist': news_item.source,
-                            'album': 'Music News',
-                            'url': news_item.url,
-                            'source': news_item.source,
-                            'release_date': news_item.published_date.isoformat(),
-                            'genres': news_item.tags or [],
-                            'user_feedback': news_item.user_feedback
-                        }
-                        
-                        # Save to database as music content
-                        db_manager.save_music_content(music_content_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to save music news item to database: {e}")
-            
-            # Save streaming stats to database
-            if music_data.get('streaming_stats'):
-                for stat in music_data['streaming_stats']:
-                    try:
-                        music_content_data = {
-                            'id': f"stats_{stat.platform}_{int(datetime.now().timestamp())}",
-                            'title': f"{stat.platform} Statistics",
-                            'artist': self.label_name,
-                            'album': 'Streaming Stats',
-                            'url': None,
-                            'source': stat.platform,
-                            'release_date': datetime.now().isoformat(),
-                            'genres': ['stats'],
-                            'user_feedback': None
-                        }
-                        
-                        db_manager.save_music_content(music_content_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to save streaming stats to database: {e}")
-            
-            # Save recent releases to database
-            if music_data.get('recent_releases'):
-                for release in music_data['recent_releases']:
-                    try:
-                        music_content_data = {
-                            'id': f"release_{release.title.replace(' ', '_')}_{int(release.release_date.timestamp())}",
-                            'title': release.title,
-                            'artist': release.artist,
-                            'album': release.title,
-                            'url': release.stream_url,
-                            'source': release.platform,
-                            'release_date': release.release_date.isoformat(),
-                            'genres': ['release'],
-                            'user_feedback': None
-                        }
-                        
-                        db_manager.save_music_content(music_content_data)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to save music release to database: {e}")
-            
-            # Save mentions to database
-            for mention_type in ['label_mentions', 'band_mentions']:
-                mentions = music_data.get(mention_type, [])
-                for mention in mentions:
-                    try:
-                        if isinstance(mention, dict):
-                            music_content_data = {
-                                'id': f"mention_{mention_type}_{mention.get('url', '').split('/')[-1]}_{int(datetime.now().timestamp())}",
-                                'title': mention.get('title', f"{mention_type} mention"),
-                                'artist': mention.get('artist', self.band_name if 'band' in mention_type else self.label_name),
-                                'album': 'Mentions',
-                                'url': mention.get('url'),
-                                'source': mention.get('platform', 'web'),
-                                'release_date': datetime.now().isoformat(),
-                                'genres': ['mention'],
-                                'user_feedback': None
-                            }
-                            
-                            db_manager.save_music_content(music_content_data)
-                    except Exception as e:
-                        logger.error(f"Failed to save music mention to database: {e}")
+            await run_in_db_executor(self._save_to_database, music_data)
             
             logger.info(f"Successfully collected and saved music data: "
                        f"{len(music_data.get('music_news', []))} news items, "
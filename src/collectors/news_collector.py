@@ -7,6 +7,8 @@ Star Wars, and Star Trek from multiple sources.
 
 import asyncio
 import aiohttp
+from http_pool import aiohttp_session
+from db_async import run_in_db_executor
 import feedparser
 import logging
 from typing import List, Dict, Any, Optional
@@ -202,7 +204,7 @@ class NewsCollector:
         all_articles = []
         
         # Get dynamic sources from database
-        news_sources = self.get_dynamic_news_sources()
+        news_sources = await run_in_db_executor(self.get_dynamic_news_sources)
         
         # Collect from RSS feeds
         for topic, feeds in news_sources.items():
@@ -235,7 +237,7 @@ class NewsCollector:
         """Collect articles from RSS feeds for a specific topic."""
         articles = []
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp_session() as session:
             tasks = []
             for feed_url in feeds:
                 tasks.append(self._fetch_rss_feed(session, feed_url, topic))
@@ -260,7 +262,7 @@ class NewsCollector:
                     content = await response.text()
                     
                     # Parse RSS feed
-                    feed = feedparser.parse(content)
+                    feed = await asyncio.to_thread(feedparser.parse, content)
                     
                     for entry in feed.entries:
                         # Extract article info
@@ -310,7 +312,7 @@ class NewsCollector:
         if not self.news_api_key:
             return articles
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp_session() as session:
             # Search for each topic
             for topic, keywords in self.topics.items():
                 for keyword in keywords[:2]:  # Limit to avoid API quota
@@ -374,7 +376,7 @@ class NewsCollector:
         """Collect articles from general news sources and filter by relevance."""
         articles = []
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp_session() as session:
             tasks = []
             for feed_url in self.general_rss_feeds:
                 task = self._fetch_general_rss_feed(session, feed_url)
@@ -401,7 +403,7 @@ class NewsCollector:
                     content = await response.text()
                     
                     # Parse RSS feed
-                    feed = feedparser.parse(content)
+                    feed = await asyncio.to_thread(feedparser.parse, content)
                     
                     for entry in feed.entries:
                         title = entry.get('title', '').strip()
@@ -446,7 +448,7 @@ class NewsCollector:
         """Collect articles from Reddit using RSS feeds."""
         articles = []
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp_session() as session:
             for topic, subreddits in self.reddit_subreddits.items():
                 for subreddit in subreddits:
                     try:
@@ -458,7 +460,7 @@ class NewsCollector:
                                 content = await response.text()
                                 
                                 # Parse RSS feed
-                                feed = feedparser.parse(content)
+                                feed = await asyncio.to_thread(feedparser.parse, content)
                                 
                                 for entry in feed.entries:
                                     title = entry.get('title', '').strip()
@@ -710,13 +712,13 @@ class NewsCollector:
             from database import DatabaseManager
             db = DatabaseManager()
             
-            saved_count = 0
+            import hashlib
+            articles_data = []
             for article in articles:
                 # Generate unique ID for article
-                import hashlib
                 article_id = hashlib.sha256(f"{article.url}{article.title}".encode()).hexdigest()[:16]
                 
-                article_data = {
+                articles_data.append({
                     'id': article_id,
                     'title': article.title,
                     'url': article.url,
@@ -727,28 +729,14 @@ class NewsCollector:
                     'topics': article.topics,
                     'relevance_score': article.relevance_score,
                     'user_feedback': article.user_feedback
-                }
-                
-                if db.save_news_article(article_data):
-                    saved_count += 1
+                })
+            
+            # One transaction for the whole refresh
+            saved_count = await run_in_db_executor(db.save_news_articles, articles_data)
             
             # Return summary for API
             result = {
-                'articles': [
-                    {
-                        'id': hashlib.sha256(f"{article.url}{article.title}".encode()).hexdigest()[:16],
-                        'title': article.title,
-                        'url': article.url,
-                        'snippet': article.snippet,
-                        'source': article.source,
-                        'image_url': article.image_url,
-                        'published_date': article.published_date.isoformat(),
-                        'topics': article.topics,
-                        'relevance_score': article.relevance_score,
-                        'user_feedback': article.user_feedback
-                    }
-                    for article in articles
-                ],
+                'articles': articles_data,
                 'total': len(articles),
                 'saved_to_database': saved_count,
                 'timestamp': datetime.now().isoformat()
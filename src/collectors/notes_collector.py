@@ -1001,6 +1001,13 @@ def collect_all_notes(obsidian_path: Optional[str] = None,
     if gdrive_auth_error:
         result['gdrive_auth_error'] = gdrive_auth_error
     
+    # Keep a searchable copy of the collected notes
+    try:
+        from database import get_db
+        get_db().save_notes(all_notes)
+    except Exception as e:
+        logger.error(f"Error saving notes for search: {e}")
+    
     return result
 
 
@@ -7,6 +7,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import aiohttp
+from http_pool import aiohttp_session
+from db_async import run_in_db_executor
 import json
 import hashlib
 from dataclasses import dataclass
@@ -262,11 +264,11 @@ class VanityAlertsCollector:
             query = quote_plus(search_term)
             url = f"{self.sources['google_news']}?q={query}&hl=en-US&gl=US&ceid=US:en"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         content = await response.text()
-                        feed = feedparser.parse(content)
+                        feed = await asyncio.to_thread(feedparser.parse, content)
                         
                         for entry in feed.entries[:15]:  # Limit to 15 results
                             alert = VanityAlert(
@@ -297,8 +299,8 @@ class VanityAlertsCollector:
             query = quote_plus(search_term)
             url = f"{self.sources['reddit']}?q={query}&sort=new&limit=10"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -341,8 +343,8 @@ class VanityAlertsCollector:
             query = quote_plus(search_term)
             url = f"{self.sources['hackernews']}?query={query}&tags=story&hitsPerPage=10"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -377,8 +379,8 @@ class VanityAlertsCollector:
             query = quote_plus(search_term)
             url = f"{self.sources['github']}?q={query}&sort=updated&per_page=10"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -414,8 +416,8 @@ class VanityAlertsCollector:
             query = search_term.replace('"', '')
             url = f"{self.sources['devto']}?per_page=10&tag={quote_plus(query)}"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -450,8 +452,8 @@ class VanityAlertsCollector:
             query = quote_plus(search_term.replace('"', ''))
             url = f"{self.sources['producthunt']}?q={query}"
             
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url) as response:
+            async with aiohttp_session() as session:
+                async with session.get(url, headers=self.headers) as response:
                     if response.status == 200:
                         content = await response.text()
                         soup = BeautifulSoup(content, 'html.parser')
@@ -554,7 +556,7 @@ class VanityAlertsCollector:
             
             # Save high-confidence alerts to database
             if filtered_alerts:
-                self.save_alerts_to_database(filtered_alerts)
+                await run_in_db_executor(self.save_alerts_to_database, filtered_alerts)
             
             # Return summary data
             result = {
@@ -599,46 +601,22 @@ class VanityAlertsCollector:
         
         try:
             db = get_db()
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Create table if it doesn't exist
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS vanity_alerts (
-                        id TEXT PRIMARY KEY,
-                        title TEXT NOT NULL,
-                        url TEXT NOT NULL,
-                        source TEXT NOT NULL,
-                        search_term TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        confidence_score REAL NOT NULL,
-                        is_liked INTEGER DEFAULT NULL,
-                        is_dismissed INTEGER DEFAULT 0,
-                        is_validated INTEGER DEFAULT NULL,
-                        content TEXT,
-                        snippet TEXT,
-                        sentiment TEXT DEFAULT NULL
-                    )
-                ''')
-                
-                # Insert or update alerts
-                for alert in alerts:
-                    cursor.execute('''
-                    INSERT OR REPLACE INTO vanity_alerts 
-                    (id, title, url, source, search_term, timestamp, confidence_score, snippet)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    alert.id,
-                    alert.title,
-                    alert.url,
-                    alert.source,
-                    alert.search_term,
-                    alert.timestamp.isoformat(),
-                    alert.confidence_score,
-                    alert.snippet or ''
-                ))
+            # Upsert in one transaction; likes/dismissals on existing alerts are kept
+            saved = db.save_vanity_alerts([
+                {
+                    'id': alert.id,
+                    'title': alert.title,
+                    'url': alert.url,
+                    'source': alert.source,
+                    'search_term': alert.search_term,
+                    'timestamp': alert.timestamp.isoformat(),
+                    'confidence_score': alert.confidence_score,
+                    'snippet': alert.snippet or ''
+                }
+                for alert in alerts
+            ])
             
-            logger.info(f"Saved {len(alerts)} alerts to database")
+            logger.info(f"Saved {saved} alerts to database")
             
         except Exception as e:
             logger.error(f"Error saving alerts to database: {e}")
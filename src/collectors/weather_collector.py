@@ -7,6 +7,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import aiohttp
+from http_pool import aiohttp_session
 import os
 from dataclasses import dataclass
 
@@ -66,7 +67,7 @@ class WeatherCollector:
             return self._get_mock_weather()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 url = f"{self.base_url}/weather"
                 params = {
                     'lat': self.lat,
@@ -94,7 +95,7 @@ class WeatherCollector:
             return self._get_mock_forecast()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp_session() as session:
                 url = f"{self.base_url}/forecast"
                 params = {
                     'lat': self.lat,
@@ -3,14 +3,30 @@ Database models and initialization for the Personal Dashboard.
 """
 
 import sqlite3
+import base64
+import hashlib
 import json
 import logging
 import os
 import sys
+import time
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Iterator, List, Optional, Set, Type
 from contextlib import contextmanager
+from functools import partial
+
+from db_migrations import Migration, ensure_schema
+from db_pool import get_connection_pool
+from db_retention import RetentionEngine, RetentionPolicy
+from db_search import create_search_index, fts_query, resolve_kinds, search_source
+from db_settings_cache import SETTINGS_VERSION_NAME, bump_version, get_settings_cache
+from metrics import DB_SECONDS
+from db_models import (
+    EmailRow, EmailSummaryRow, TodoRow, TodoSummaryRow,
+    clear_projection_cache, projection, rows_to_dicts, rows_to_models
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,847 +52,1011 @@ class DatabaseManager:
     def __init__(self, db_path: str = DATABASE_PATH):
         """Initialize database manager."""
         self.db_path = db_path
+        self._pool = get_connection_pool(db_path)
+        self._settings_cache = get_settings_cache(db_path)
         self.init_database()
     
     def init_database(self):
-        """Initialize database tables."""
+        """Bring the schema up to date.
+        
+        Migrations run once per database file per process; later calls (and
+        later DatabaseManager constructions) return without touching the DB.
+        """
         try:
-            # Ensure the directory exists for the database file
-            db_dir = Path(self.db_path).parent
-            db_dir.mkdir(parents=True, exist_ok=True)
-            
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Credentials table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS credentials (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    service_name TEXT UNIQUE NOT NULL,
-                    credentials_data TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Authentication tokens table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS auth_tokens (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    service_name TEXT UNIQUE NOT NULL,
-                    token_data TEXT NOT NULL,
-                    expires_at TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Collected data table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS collected_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    service_name TEXT NOT NULL,
-                    data_type TEXT NOT NULL,
-                    data_content TEXT NOT NULL,
-                    collection_date TIMESTAMP NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Settings table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    setting_key TEXT UNIQUE NOT NULL,
-                    setting_value TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Dashboard sessions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS dashboard_sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_data TEXT NOT NULL,
-                    kpis_data TEXT,
-                    insights_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Email analysis table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS emails (
-                    id TEXT PRIMARY KEY,
-                    subject TEXT NOT NULL,
-                    sender TEXT NOT NULL,
-                    recipient TEXT,
-                    body TEXT,
-                    received_date TIMESTAMP,
-                    priority TEXT DEFAULT 'medium',
-                    is_analyzed INTEGER DEFAULT 0,
-                    ollama_priority TEXT,
-                    has_todos INTEGER DEFAULT 0,
-                    is_archived INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Universal todos table (from all sources)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS universal_todos (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    due_date TIMESTAMP,
-                    priority TEXT DEFAULT 'medium',
-                    category TEXT,
-                    source TEXT NOT NULL,
-                    source_id TEXT,
-                    source_title TEXT,
-                    source_url TEXT,
-                    source_preview TEXT,
-                    creation_reason TEXT,
-                    status TEXT DEFAULT 'pending',
-                    assigned_to_service TEXT,
-                    requires_response INTEGER DEFAULT 0,
-                    email_id TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP,
-                    FOREIGN KEY (email_id) REFERENCES emails (id)
-                )
-            """)
-            
-            # Suggested todos table (awaiting user approval)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS suggested_todos (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    context TEXT,
-                    source TEXT NOT NULL,
-                    source_id TEXT,
-                    source_title TEXT,
-                    source_url TEXT,
-                    source_content TEXT,
-                    priority TEXT DEFAULT 'medium',
-                    due_date TIMESTAMP,
-                    status TEXT DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    reviewed_at TIMESTAMP,
-                    auto_extracted INTEGER DEFAULT 1
-                )
-            """)
-            
-            # News articles table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS news_articles (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    url TEXT NOT NULL,
-                    snippet TEXT,
-                    image_url TEXT,
-                    source TEXT,
-                    published_date TIMESTAMP,
-                    topics TEXT,
-                    relevance_score REAL,
-                    is_liked INTEGER DEFAULT 0,
-                    is_read INTEGER DEFAULT 0,
-                    user_feedback TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Music content table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS music_content (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    artist TEXT,
-                    album TEXT,
-                    url TEXT,
-                    source TEXT,
-                    release_date TIMESTAMP,
-                    genres TEXT,
-                    is_liked INTEGER DEFAULT 0,
-                    user_feedback TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # User preferences and personality profile table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_personality_profile (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content_type TEXT NOT NULL,
-                    content_id TEXT NOT NULL,
-                    preference_score REAL DEFAULT 0.0,
-                    keywords TEXT,
-                    topics TEXT,
-                    sentiment TEXT,
-                    interaction_type TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Vanity Alerts table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vanity_alerts (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    url TEXT,
-                    snippet TEXT,
-                    source TEXT,
-                    search_term TEXT,
-                    confidence_score REAL DEFAULT 0.0,
-                    is_liked INTEGER DEFAULT 0,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Data cleanup log table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS data_cleanup_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    cleanup_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    content_type TEXT NOT NULL,
-                    items_removed INTEGER DEFAULT 0,
-                    items_preserved INTEGER DEFAULT 0,
-                    notes TEXT
-                )
-            """)
-            
-            # User feedback table for AI training
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_feedback (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    item_id TEXT NOT NULL,
-                    item_type TEXT NOT NULL,
-                    item_title TEXT,
-                    item_content TEXT,
-                    item_metadata TEXT,
-                    feedback_type TEXT NOT NULL CHECK(feedback_type IN ('like', 'dislike')),
-                    feedback_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    source_api TEXT,
-                    category TEXT,
-                    confidence_score REAL DEFAULT 0.5,
-                    notes TEXT
-                )
-            """)
-            
-            # Dashboard projects table for persisting discovered dashboards
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS dashboard_projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    path TEXT NOT NULL,
-                    type TEXT NOT NULL,
-                    port INTEGER,
-                    start_command TEXT,
-                    url TEXT,
-                    github_pages_url TEXT,
-                    custom_domain TEXT,
-                    brand TEXT,
-                    description TEXT,
-                    health_endpoint TEXT,
-                    production_url TEXT,
-                    api_url TEXT,
-                    is_active INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            applied = ensure_schema(partial(self.get_connection, op='ensure_schema'), self.db_path, 'core', self.schema_migrations())
+            if applied:
+                clear_projection_cache(self.db_path)
+                logger.info(f"Database initialized successfully (migrations {applied})")
             
-            # Music playlists table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS music_playlists (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    mood TEXT,
-                    artists TEXT,
-                    genres TEXT,
-                    tracks TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Liked songs table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS liked_songs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    artist TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    youtube_id TEXT,
-                    liked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(artist, title)
-                )
-            """)
-            
-            # Deleted tasks table - tracks tasks deleted by user to prevent re-import
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS deleted_tasks (
-                    id TEXT PRIMARY KEY,
-                    source TEXT NOT NULL,
-                    source_id TEXT,
-                    original_title TEXT,
-                    original_url TEXT,
-                    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    reason TEXT DEFAULT 'user-deleted'
-                )
-            """)
+        except Exception as e:
+            logger.error(f"Database initialization failed: {e}")
+            raise RuntimeError(f"Database initialization failed: {e}")
+    
+    def ensure_schema(self, component: str, migrations: List[Migration]) -> List[int]:
+        """Apply a module's own migrations (once per database file per process)."""
+        return ensure_schema(partial(self.get_connection, op='ensure_schema'), self.db_path, component, migrations)
+    
+    def schema_migrations(self) -> List[Migration]:
+        """Core schema migrations, oldest first. Append new steps; never edit applied ones."""
+        return [
+            Migration(1, 'baseline schema', self._create_schema),
+            Migration(2, 'retention indexes and maintenance log', self._schema_retention),
+            Migration(3, 'collector cache snapshots', self._schema_cache_snapshots),
+            Migration(4, 'collector run rollups', self._schema_collector_rollups),
+            Migration(5, 'data version triggers', self._schema_data_version_triggers),
+            Migration(6, 'ai response cache', self._schema_ai_response_cache),
+        ]
+    
+    # Tables whose writes bump a cache_versions counter, by counter name
+    DATA_VERSION_TABLES = {
+        'todos': 'universal_todos',
+        'user_profile': 'user_profile',
+        'user_feedback': 'user_feedback',
+    }
+    
+    def _schema_data_version_triggers(self, cursor: sqlite3.Cursor):
+        """Bump a cache_versions counter on every write to tables the AI context renders."""
+        for name, table in self.DATA_VERSION_TABLES.items():
+            for suffix, event in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE')):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                        INSERT OR IGNORE INTO cache_versions (name, version) VALUES ('{name}', 0);
+                        UPDATE cache_versions SET version = version + 1 WHERE name = '{name}';
+                    END
+                """)
+    
+    def _schema_collector_rollups(self, cursor: sqlite3.Cursor):
+        """Hourly per-collector run telemetry (durations, failures, sizes, upstream calls)."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS collector_run_rollups (
+                collector TEXT NOT NULL,
+                hour TIMESTAMP NOT NULL,
+                runs INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                total_ms REAL NOT NULL DEFAULT 0,
+                max_ms REAL NOT NULL DEFAULT 0,
+                items INTEGER NOT NULL DEFAULT 0,
+                payload_bytes INTEGER NOT NULL DEFAULT 0,
+                upstream_calls INTEGER NOT NULL DEFAULT 0,
+                last_success_at TIMESTAMP,
+                last_error_class TEXT,
+                PRIMARY KEY (collector, hour)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collector_run_rollups_hour ON collector_run_rollups(hour)")
+    
+    def _schema_ai_response_cache(self, cursor: sqlite3.Cursor):
+        """AI responses keyed by provider, model, normalized prompt and context hash."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                context_hash TEXT NOT NULL DEFAULT '',
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_hit_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""CREATE INDEX IF NOT EXISTS idx_ai_response_cache_context
+                          ON ai_response_cache(provider, model, context_hash, created_at)""")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_response_cache_last_hit ON ai_response_cache(last_hit_at)")
+    
+    def _schema_cache_snapshots(self, cursor: sqlite3.Cursor):
+        """Last collector result per cache key, reloaded on startup."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS cache_snapshots (
+                cache_key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    
+    def _schema_retention(self, cursor: sqlite3.Cursor):
+        """Timestamp indexes used by retention deletes, and the maintenance run log."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TIMESTAMP NOT NULL,
+                duration_ms REAL,
+                rows_deleted INTEGER DEFAULT 0,
+                bytes_reclaimed INTEGER DEFAULT 0,
+                database_bytes INTEGER,
+                details TEXT
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_created ON news_articles(created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vanity_alerts_timestamp ON vanity_alerts(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_scanned_at ON scanned_sources(scanned_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_items_date ON collected_items(collection_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_dashboard_sessions_created ON dashboard_sessions(created_at)")
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Baseline schema: every table, index and column that predates migrations."""
+        
+        # Credentials table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS credentials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT UNIQUE NOT NULL,
+                credentials_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Authentication tokens table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS auth_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT UNIQUE NOT NULL,
+                token_data TEXT NOT NULL,
+                expires_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Collected data table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS collected_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                data_content TEXT NOT NULL,
+                collection_date TIMESTAMP NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-            # Jokes table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS jokes (
-                    joke_id TEXT PRIMARY KEY,
-                    is_liked INTEGER DEFAULT 0,
-                    liked_at TIMESTAMP,
-                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Add new columns if they don't exist (migration)
-            try:
-                cursor.execute("ALTER TABLE dashboard_projects ADD COLUMN production_url TEXT")
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-            
+        # Collected items: one row per collector item (replaces collected_data blobs)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS collected_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                item_key TEXT NOT NULL,
+                item_timestamp TIMESTAMP NOT NULL,
+                item_index INTEGER NOT NULL DEFAULT 0,
+                collection_date TIMESTAMP NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Settings table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                setting_key TEXT UNIQUE NOT NULL,
+                setting_value TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Version counters for in-process caches (bumped on write, checked by readers)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS cache_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        
+        # Dashboard sessions table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dashboard_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_data TEXT NOT NULL,
+                kpis_data TEXT,
+                insights_data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Email analysis table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS emails (
+                id TEXT PRIMARY KEY,
+                subject TEXT NOT NULL,
+                sender TEXT NOT NULL,
+                recipient TEXT,
+                body TEXT,
+                received_date TIMESTAMP,
+                priority TEXT DEFAULT 'medium',
+                is_analyzed INTEGER DEFAULT 0,
+                ollama_priority TEXT,
+                has_todos INTEGER DEFAULT 0,
+                is_archived INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Universal todos table (from all sources)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS universal_todos (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                due_date TIMESTAMP,
+                priority TEXT DEFAULT 'medium',
+                category TEXT,
+                source TEXT NOT NULL,
+                source_id TEXT,
+                source_title TEXT,
+                source_url TEXT,
+                source_preview TEXT,
+                creation_reason TEXT,
+                status TEXT DEFAULT 'pending',
+                assigned_to_service TEXT,
+                requires_response INTEGER DEFAULT 0,
+                email_id TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                FOREIGN KEY (email_id) REFERENCES emails (id)
+            )
+        """)
+        
+        # Suggested todos table (awaiting user approval)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS suggested_todos (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                context TEXT,
+                source TEXT NOT NULL,
+                source_id TEXT,
+                source_title TEXT,
+                source_url TEXT,
+                source_content TEXT,
+                priority TEXT DEFAULT 'medium',
+                due_date TIMESTAMP,
+                status TEXT DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                reviewed_at TIMESTAMP,
+                auto_extracted INTEGER DEFAULT 1
+            )
+        """)
+        
+        # News articles table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS news_articles (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                snippet TEXT,
+                image_url TEXT,
+                source TEXT,
+                published_date TIMESTAMP,
+                topics TEXT,
+                relevance_score REAL,
+                is_liked INTEGER DEFAULT 0,
+                is_read INTEGER DEFAULT 0,
+                user_feedback TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Notes table (latest copy of notes from Obsidian/Drive/Keep/Apple Notes, for search)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS notes (
+                id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT,
+                url TEXT,
+                modified_at TIMESTAMP,
+                note_data TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Music content table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS music_content (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                artist TEXT,
+                album TEXT,
+                url TEXT,
+                source TEXT,
+                release_date TIMESTAMP,
+                genres TEXT,
+                is_liked INTEGER DEFAULT 0,
+                user_feedback TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # User preferences and personality profile table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_personality_profile (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_type TEXT NOT NULL,
+                content_id TEXT NOT NULL,
+                preference_score REAL DEFAULT 0.0,
+                keywords TEXT,
+                topics TEXT,
+                sentiment TEXT,
+                interaction_type TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Vanity Alerts table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS vanity_alerts (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT,
+                snippet TEXT,
+                source TEXT,
+                search_term TEXT,
+                confidence_score REAL DEFAULT 0.0,
+                is_liked INTEGER DEFAULT 0,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Data cleanup log table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_cleanup_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cleanup_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                content_type TEXT NOT NULL,
+                items_removed INTEGER DEFAULT 0,
+                items_preserved INTEGER DEFAULT 0,
+                notes TEXT
+            )
+        """)
+        
+        # User feedback table for AI training
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_id TEXT NOT NULL,
+                item_type TEXT NOT NULL,
+                item_title TEXT,
+                item_content TEXT,
+                item_metadata TEXT,
+                feedback_type TEXT NOT NULL CHECK(feedback_type IN ('like', 'dislike')),
+                feedback_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                source_api TEXT,
+                category TEXT,
+                confidence_score REAL DEFAULT 0.5,
+                notes TEXT
+            )
+        """)
+        
+        # Dashboard projects table for persisting discovered dashboards
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dashboard_projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                path TEXT NOT NULL,
+                type TEXT NOT NULL,
+                port INTEGER,
+                start_command TEXT,
+                url TEXT,
+                github_pages_url TEXT,
+                custom_domain TEXT,
+                brand TEXT,
+                description TEXT,
+                health_endpoint TEXT,
+                production_url TEXT,
+                api_url TEXT,
+                is_active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Music playlists table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS music_playlists (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                mood TEXT,
+                artists TEXT,
+                genres TEXT,
+                tracks TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Liked songs table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS liked_songs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                artist TEXT NOT NULL,
+                title TEXT NOT NULL,
+                youtube_id TEXT,
+                liked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(artist, title)
+            )
+        """)
+        
+        # Deleted tasks table - tracks tasks deleted by user to prevent re-import
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS deleted_tasks (
+                id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                source_id TEXT,
+                original_title TEXT,
+                original_url TEXT,
+                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                reason TEXT DEFAULT 'user-deleted'
+            )
+        """)
+
+        # Jokes table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jokes (
+                joke_id TEXT PRIMARY KEY,
+                is_liked INTEGER DEFAULT 0,
+                liked_at TIMESTAMP,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Add new columns if they don't exist (migration)
+        try:
+            cursor.execute("ALTER TABLE dashboard_projects ADD COLUMN production_url TEXT")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        
+        try:
+            cursor.execute("ALTER TABLE dashboard_projects ADD COLUMN api_url TEXT")
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+        # Migration: Ensure universal_todos has task provenance/detail fields
+        todo_migrations = [
+            ("source_title", "TEXT"),
+            ("source_url", "TEXT"),
+            ("source_preview", "TEXT"),
+            ("creation_reason", "TEXT"),
+        ]
+        for column_name, column_type in todo_migrations:
             try:
-                cursor.execute("ALTER TABLE dashboard_projects ADD COLUMN api_url TEXT")
+                cursor.execute(f"ALTER TABLE universal_todos ADD COLUMN {column_name} {column_type}")
             except sqlite3.OperationalError:
-                pass  # Column already exists
-
-            # Migration: Ensure universal_todos has task provenance/detail fields
-            todo_migrations = [
-                ("source_title", "TEXT"),
-                ("source_url", "TEXT"),
-                ("source_preview", "TEXT"),
-                ("creation_reason", "TEXT"),
-            ]
-            for column_name, column_type in todo_migrations:
+                pass
+        
+        # Create indexes for better performance
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_data_service_date ON collected_data(service_name, collection_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_items_collection ON collected_items(service_name, data_type, collection_date, item_index)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_items_timestamp ON collected_items(service_name, data_type, item_timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_items_key ON collected_items(service_name, data_type, item_key)")
+        self._migrate_collected_data(cursor)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_credentials_service ON credentials(service_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_auth_tokens_service ON auth_tokens(service_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_received_date ON emails(received_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_priority ON emails(priority)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_analyzed ON emails(is_analyzed)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_due_date ON universal_todos(due_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_priority ON universal_todos(priority)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_status ON universal_todos(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_source ON universal_todos(source)")
+        # Task list: keyset order, filter combinations and the stats GROUP BY
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_todos_list_order ON universal_todos(
+                COALESCE(due_date, ''), COALESCE(priority, '') DESC, COALESCE(created_at, '') DESC, id
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_priority_status ON universal_todos(priority COLLATE NOCASE, status COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_category_status ON universal_todos(category COLLATE NOCASE, status COLLATE NOCASE)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_source_status ON universal_todos(source, status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_stats ON universal_todos(status, priority, category, source)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_source ON deleted_tasks(source)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_source_id ON deleted_tasks(source_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_deleted_at ON deleted_tasks(deleted_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_liked ON news_articles(is_liked)")
+        
+        # Migration: Add is_read column to news_articles if it doesn't exist
+        try:
+            cursor.execute("SELECT is_read FROM news_articles LIMIT 1")
+        except sqlite3.OperationalError:
+            logger.info("Adding is_read column to news_articles table")
+            cursor.execute("ALTER TABLE news_articles ADD COLUMN is_read INTEGER DEFAULT 0")
+
+        # Migration: Add image_url column to news_articles if it doesn't exist
+        try:
+            cursor.execute("SELECT image_url FROM news_articles LIMIT 1")
+        except sqlite3.OperationalError:
+            logger.info("Adding image_url column to news_articles table")
+            cursor.execute("ALTER TABLE news_articles ADD COLUMN image_url TEXT")
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_read ON news_articles(is_read)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_music_content_liked ON music_content(is_liked)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vanity_alerts_liked ON vanity_alerts(is_liked)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personality_profile_type ON user_personality_profile(content_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_personality_profile_content ON user_personality_profile(content_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_created_at ON news_articles(created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_music_created_at ON music_content(created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vanity_created_at ON vanity_alerts(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_type ON user_feedback(feedback_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_item ON user_feedback(item_type, item_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_timestamp ON user_feedback(feedback_timestamp)")
+
+        # Migration: keep vanity_alerts schema compatible across old/new collectors
+        vanity_columns = set()
+        try:
+            cursor.execute("PRAGMA table_info(vanity_alerts)")
+            vanity_columns = {row[1] for row in cursor.fetchall()}
+        except Exception:
+            vanity_columns = set()
+
+        vanity_migrations = {
+            'content': "ALTER TABLE vanity_alerts ADD COLUMN content TEXT",
+            'sentiment': "ALTER TABLE vanity_alerts ADD COLUMN sentiment TEXT DEFAULT NULL",
+            'is_dismissed': "ALTER TABLE vanity_alerts ADD COLUMN is_dismissed INTEGER DEFAULT 0",
+        }
+        for column_name, alter_sql in vanity_migrations.items():
+            if column_name not in vanity_columns:
                 try:
-                    cursor.execute(f"ALTER TABLE universal_todos ADD COLUMN {column_name} {column_type}")
+                    cursor.execute(alter_sql)
                 except sqlite3.OperationalError:
                     pass
-            
-            # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_collected_data_service_date ON collected_data(service_name, collection_date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_credentials_service ON credentials(service_name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_auth_tokens_service ON auth_tokens(service_name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_received_date ON emails(received_date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_priority ON emails(priority)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_emails_analyzed ON emails(is_analyzed)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_due_date ON universal_todos(due_date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_priority ON universal_todos(priority)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_status ON universal_todos(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_todos_source ON universal_todos(source)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_source ON deleted_tasks(source)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_source_id ON deleted_tasks(source_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deleted_tasks_deleted_at ON deleted_tasks(deleted_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_liked ON news_articles(is_liked)")
-            
-            # Migration: Add is_read column to news_articles if it doesn't exist
-            try:
-                cursor.execute("SELECT is_read FROM news_articles LIMIT 1")
-            except sqlite3.OperationalError:
-                logger.info("Adding is_read column to news_articles table")
-                cursor.execute("ALTER TABLE news_articles ADD COLUMN is_read INTEGER DEFAULT 0")
-
-            # Migration: Add image_url column to news_articles if it doesn't exist
-            try:
-                cursor.execute("SELECT image_url FROM news_articles LIMIT 1")
-            except sqlite3.OperationalError:
-                logger.info("Adding image_url column to news_articles table")
-                cursor.execute("ALTER TABLE news_articles ADD COLUMN image_url TEXT")
-            
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_read ON news_articles(is_read)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_music_content_liked ON music_content(is_liked)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vanity_alerts_liked ON vanity_alerts(is_liked)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_personality_profile_type ON user_personality_profile(content_type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_personality_profile_content ON user_personality_profile(content_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_created_at ON news_articles(created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_music_created_at ON music_content(created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vanity_created_at ON vanity_alerts(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_type ON user_feedback(feedback_type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_item ON user_feedback(item_type, item_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_feedback_timestamp ON user_feedback(feedback_timestamp)")
-
-            # Migration: keep vanity_alerts schema compatible across old/new collectors
-            vanity_columns = set()
-            try:
-                cursor.execute("PRAGMA table_info(vanity_alerts)")
-                vanity_columns = {row[1] for row in cursor.fetchall()}
-            except Exception:
-                vanity_columns = set()
-
-            vanity_migrations = {
-                'content': "ALTER TABLE vanity_alerts ADD COLUMN content TEXT",
-                'sentiment': "ALTER TABLE vanity_alerts ADD COLUMN sentiment TEXT DEFAULT NULL",
-                'is_dismissed': "ALTER TABLE vanity_alerts ADD COLUMN is_dismissed INTEGER DEFAULT 0",
-            }
-            for column_name, alter_sql in vanity_migrations.items():
-                if column_name not in vanity_columns:
-                    try:
-                        cursor.execute(alter_sql)
-                    except sqlite3.OperationalError:
-                        pass
-            
-            # Scanned sources tracking table - prevents rescanning same items
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scanned_sources (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    source_type TEXT NOT NULL,
-                    source_id TEXT NOT NULL,
-                    item_hash TEXT,
-                    scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    tasks_found INTEGER DEFAULT 0,
-                    tasks_created INTEGER DEFAULT 0,
-                    dismissed INTEGER DEFAULT 0,
-                    UNIQUE(source_type, source_id)
-                )
-            """)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_type ON scanned_sources(source_type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_id ON scanned_sources(source_type, source_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_dismissed ON scanned_sources(dismissed)")
-            
-            # AI Assistant tables
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_providers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    provider_type TEXT NOT NULL,
-                    base_url TEXT,
-                    api_key TEXT,
-                    model_name TEXT,
-                    config_data TEXT,
-                    is_active INTEGER DEFAULT 0,
-                    is_default INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_conversations (
-                    id TEXT PRIMARY KEY,
-                    provider_id INTEGER NOT NULL,
-                    title TEXT,
-                    context_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (provider_id) REFERENCES ai_providers (id)
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_messages (
-                    id TEXT PRIMARY KEY,
-                    conversation_id TEXT NOT NULL,
-                    role TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    metadata TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (conversation_id) REFERENCES ai_conversations (id)
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_training_data (
-                    id TEXT PRIMARY KEY,
-                    data_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    context TEXT,
-                    user_feedback TEXT,
-                    source_table TEXT,
-                    source_id TEXT,
-                    relevance_score REAL DEFAULT 0.5,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_model_training (
-                    id TEXT PRIMARY KEY,
-                    provider_id INTEGER NOT NULL,
-                    training_status TEXT DEFAULT 'pending',
-                    training_data_hash TEXT,
-                    model_version TEXT,
-                    training_started_at TIMESTAMP,
-                    training_completed_at TIMESTAMP,
-                    performance_metrics TEXT,
-                    error_log TEXT,
-                    FOREIGN KEY (provider_id) REFERENCES ai_providers (id)
-                )
-            """)
-            
-            # User profile table for AI personalization
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_profile (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    full_name TEXT,
-                    preferred_name TEXT,
-                    occupation TEXT,
-                    company TEXT,
-                    role TEXT,
-                    work_focus TEXT,
-                    interests TEXT,
-                    communication_style TEXT,
-                    timezone TEXT,
-                    work_hours TEXT,
-                    priorities TEXT,
-                    bio TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # AI message feedback table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ai_message_feedback (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message_id TEXT NOT NULL,
-                    conversation_id TEXT NOT NULL,
-                    feedback_type TEXT NOT NULL,
-                    rating INTEGER,
-                    comment TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (message_id) REFERENCES ai_messages (id),
-                    FOREIGN KEY (conversation_id) REFERENCES ai_conversations (id)
-                )
-            """)
-            
-            # Safe senders whitelist for email risk assessment
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS safe_email_senders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sender_email TEXT UNIQUE NOT NULL,
-                    sender_domain TEXT NOT NULL,
-                    added_reason TEXT,
-                    marked_safe_count INTEGER DEFAULT 1,
-                    last_seen TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Trust Reports for Anti-Scam Layer
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS trust_reports (
-                    id TEXT PRIMARY KEY,
-                    thread_id TEXT NOT NULL,
-                    primary_message_id TEXT NOT NULL,
-                    score INTEGER NOT NULL CHECK(score >= 0 AND score <= 100),
-                    risk_level TEXT NOT NULL CHECK(risk_level IN ('likely_ok', 'caution', 'high_risk')),
-                    summary TEXT,
-                    findings_json TEXT,
-                    signals_json TEXT,
-                    version INTEGER DEFAULT 1,
-                    ruleset_version TEXT DEFAULT '1.0',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Trust Claims from verifiers
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS trust_claims (
-                    id TEXT PRIMARY KEY,
-                    report_id TEXT NOT NULL,
-                    provider TEXT NOT NULL,
-                    claim_type TEXT NOT NULL,
-                    subject TEXT NOT NULL,
-                    issuer TEXT NOT NULL,
-                    evidence_json TEXT,
-                    confidence REAL DEFAULT 0.5 CHECK(confidence >= 0 AND confidence <= 1),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (report_id) REFERENCES trust_reports (id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Provider Accounts (OAuth connections)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS provider_accounts (
-                    id TEXT PRIMARY KEY,
-                    user_id INTEGER DEFAULT 1,
-                    provider TEXT NOT NULL,
-                    access_token TEXT,
-                    refresh_token TEXT,
-                    expires_at TIMESTAMP,
-                    scopes TEXT,
-                    provider_metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Verification Requests (for external verification)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS verification_requests (
-                    id TEXT PRIMARY KEY,
-                    created_by_user_id INTEGER DEFAULT 1,
-                    report_id TEXT NOT NULL,
-                    provider TEXT NOT NULL,
-                    target_email TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'created' CHECK(status IN ('created', 'sent', 'completed', 'expired', 'revoked')),
-                    request_token TEXT UNIQUE NOT NULL,
-                    expires_at TIMESTAMP NOT NULL,
-                    completed_at TIMESTAMP,
-                    result_json TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (report_id) REFERENCES trust_reports (id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Audit log for trust system
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS trust_audit_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER DEFAULT 1,
-                    action TEXT NOT NULL,
-                    resource_type TEXT NOT NULL,
-                    resource_id TEXT NOT NULL,
-                    details TEXT,
-                    ip_address TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create indexes for trust tables
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_thread ON trust_reports(thread_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_created ON trust_reports(created_at DESC)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_risk ON trust_reports(risk_level)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_claims_report ON trust_claims(report_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_claims_provider ON trust_claims(provider, claim_type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_report ON verification_requests(report_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_token ON verification_requests(request_token)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_status ON verification_requests(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_provider_accounts_provider ON provider_accounts(provider)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_audit_log_created ON trust_audit_log(created_at DESC)")
-            
-            # Create index for fast domain lookups
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_safe_senders_domain 
-                ON safe_email_senders(sender_domain)
-            """)
-            
-            # News sources management table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS news_sources (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    url TEXT UNIQUE NOT NULL,
-                    category TEXT DEFAULT 'general',
-                    is_active INTEGER DEFAULT 1,
-                    is_custom INTEGER DEFAULT 0,
-                    last_fetched TIMESTAMP,
-                    fetch_count INTEGER DEFAULT 0,
-                    error_count INTEGER DEFAULT 0,
-                    user_preference INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Investment tracking table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS investments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    name TEXT,
-                    type TEXT NOT NULL, -- 'stock', 'crypto', 'currency'
-                    exchange TEXT,
-                    current_price REAL,
-                    previous_price REAL,
-                    change_percent REAL,
-                    market_cap REAL,
-                    volume REAL,
-                    last_updated TIMESTAMP,
-                    is_tracked INTEGER DEFAULT 1,
-                    external_source TEXT, -- '5003_api', 'external_api', etc.
-                    external_id TEXT,
-                    user_notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Local services monitoring table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS local_services (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    service_name TEXT,
-                    port INTEGER,
-                    ip_address TEXT,
-                    hostname TEXT,
-                    service_type TEXT, -- 'web', 'api', 'database', etc.
-                    status TEXT DEFAULT 'unknown', -- 'running', 'stopped', 'error'
-                    last_checked TIMESTAMP,
-                    response_time REAL,
-                    endpoint_url TEXT,
-                    is_monitored INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Network discovery table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS network_devices (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    ip_address TEXT UNIQUE NOT NULL,
-                    hostname TEXT,
-                    mac_address TEXT,
-                    device_type TEXT,
-                    manufacturer TEXT,
-                    open_ports TEXT, -- JSON array of open ports
-                    services TEXT, -- JSON array of detected services
-                    last_seen TIMESTAMP,
-                    is_online INTEGER DEFAULT 0,
-                    response_time REAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        
+        # Scanned sources tracking table - prevents rescanning same items
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scanned_sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_type TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                item_hash TEXT,
+                scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                tasks_found INTEGER DEFAULT 0,
+                tasks_created INTEGER DEFAULT 0,
+                dismissed INTEGER DEFAULT 0,
+                UNIQUE(source_type, source_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_type ON scanned_sources(source_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_id ON scanned_sources(source_type, source_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scanned_sources_dismissed ON scanned_sources(dismissed)")
+        
+        # AI Assistant tables
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_providers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                provider_type TEXT NOT NULL,
+                base_url TEXT,
+                api_key TEXT,
+                model_name TEXT,
+                config_data TEXT,
+                is_active INTEGER DEFAULT 0,
+                is_default INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_conversations (
+                id TEXT PRIMARY KEY,
+                provider_id INTEGER NOT NULL,
+                title TEXT,
+                context_data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (provider_id) REFERENCES ai_providers (id)
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_messages (
+                id TEXT PRIMARY KEY,
+                conversation_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                metadata TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (conversation_id) REFERENCES ai_conversations (id)
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_training_data (
+                id TEXT PRIMARY KEY,
+                data_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                context TEXT,
+                user_feedback TEXT,
+                source_table TEXT,
+                source_id TEXT,
+                relevance_score REAL DEFAULT 0.5,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_model_training (
+                id TEXT PRIMARY KEY,
+                provider_id INTEGER NOT NULL,
+                training_status TEXT DEFAULT 'pending',
+                training_data_hash TEXT,
+                model_version TEXT,
+                training_started_at TIMESTAMP,
+                training_completed_at TIMESTAMP,
+                performance_metrics TEXT,
+                error_log TEXT,
+                FOREIGN KEY (provider_id) REFERENCES ai_providers (id)
+            )
+        """)
+        
+        # User profile table for AI personalization
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_profile (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                full_name TEXT,
+                preferred_name TEXT,
+                occupation TEXT,
+                company TEXT,
+                role TEXT,
+                work_focus TEXT,
+                interests TEXT,
+                communication_style TEXT,
+                timezone TEXT,
+                work_hours TEXT,
+                priorities TEXT,
+                bio TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # AI message feedback table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ai_message_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT NOT NULL,
+                conversation_id TEXT NOT NULL,
+                feedback_type TEXT NOT NULL,
+                rating INTEGER,
+                comment TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (message_id) REFERENCES ai_messages (id),
+                FOREIGN KEY (conversation_id) REFERENCES ai_conversations (id)
+            )
+        """)
+        
+        # Safe senders whitelist for email risk assessment
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS safe_email_senders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sender_email TEXT UNIQUE NOT NULL,
+                sender_domain TEXT NOT NULL,
+                added_reason TEXT,
+                marked_safe_count INTEGER DEFAULT 1,
+                last_seen TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Trust Reports for Anti-Scam Layer
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trust_reports (
+                id TEXT PRIMARY KEY,
+                thread_id TEXT NOT NULL,
+                primary_message_id TEXT NOT NULL,
+                score INTEGER NOT NULL CHECK(score >= 0 AND score <= 100),
+                risk_level TEXT NOT NULL CHECK(risk_level IN ('likely_ok', 'caution', 'high_risk')),
+                summary TEXT,
+                findings_json TEXT,
+                signals_json TEXT,
+                version INTEGER DEFAULT 1,
+                ruleset_version TEXT DEFAULT '1.0',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Trust Claims from verifiers
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trust_claims (
+                id TEXT PRIMARY KEY,
+                report_id TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                claim_type TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                issuer TEXT NOT NULL,
+                evidence_json TEXT,
+                confidence REAL DEFAULT 0.5 CHECK(confidence >= 0 AND confidence <= 1),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (report_id) REFERENCES trust_reports (id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Provider Accounts (OAuth connections)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS provider_accounts (
+                id TEXT PRIMARY KEY,
+                user_id INTEGER DEFAULT 1,
+                provider TEXT NOT NULL,
+                access_token TEXT,
+                refresh_token TEXT,
+                expires_at TIMESTAMP,
+                scopes TEXT,
+                provider_metadata TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Verification Requests (for external verification)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS verification_requests (
+                id TEXT PRIMARY KEY,
+                created_by_user_id INTEGER DEFAULT 1,
+                report_id TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                target_email TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'created' CHECK(status IN ('created', 'sent', 'completed', 'expired', 'revoked')),
+                request_token TEXT UNIQUE NOT NULL,
+                expires_at TIMESTAMP NOT NULL,
+                completed_at TIMESTAMP,
+                result_json TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (report_id) REFERENCES trust_reports (id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Audit log for trust system
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trust_audit_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER DEFAULT 1,
+                action TEXT NOT NULL,
+                resource_type TEXT NOT NULL,
+                resource_id TEXT NOT NULL,
+                details TEXT,
+                ip_address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Create indexes for trust tables
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_thread ON trust_reports(thread_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_created ON trust_reports(created_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_reports_risk ON trust_reports(risk_level)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_claims_report ON trust_claims(report_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_claims_provider ON trust_claims(provider, claim_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_report ON verification_requests(report_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_token ON verification_requests(request_token)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_verification_requests_status ON verification_requests(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_provider_accounts_provider ON provider_accounts(provider)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trust_audit_log_created ON trust_audit_log(created_at DESC)")
+        
+        # Create index for fast domain lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_safe_senders_domain 
+            ON safe_email_senders(sender_domain)
+        """)
+        
+        # News sources management table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS news_sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                url TEXT UNIQUE NOT NULL,
+                category TEXT DEFAULT 'general',
+                is_active INTEGER DEFAULT 1,
+                is_custom INTEGER DEFAULT 0,
+                last_fetched TIMESTAMP,
+                fetch_count INTEGER DEFAULT 0,
+                error_count INTEGER DEFAULT 0,
+                user_preference INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Investment tracking table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS investments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                name TEXT,
+                type TEXT NOT NULL, -- 'stock', 'crypto', 'currency'
+                exchange TEXT,
+                current_price REAL,
+                previous_price REAL,
+                change_percent REAL,
+                market_cap REAL,
+                volume REAL,
+                last_updated TIMESTAMP,
+                is_tracked INTEGER DEFAULT 1,
+                external_source TEXT, -- '5003_api', 'external_api', etc.
+                external_id TEXT,
+                user_notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Local services monitoring table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS local_services (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                service_name TEXT,
+                port INTEGER,
+                ip_address TEXT,
+                hostname TEXT,
+                service_type TEXT, -- 'web', 'api', 'database', etc.
+                status TEXT DEFAULT 'unknown', -- 'running', 'stopped', 'error'
+                last_checked TIMESTAMP,
+                response_time REAL,
+                endpoint_url TEXT,
+                is_monitored INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Network discovery table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS network_devices (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ip_address TEXT UNIQUE NOT NULL,
+                hostname TEXT,
+                mac_address TEXT,
+                device_type TEXT,
+                manufacturer TEXT,
+                open_ports TEXT, -- JSON array of open ports
+                services TEXT, -- JSON array of detected services
+                last_seen TIMESTAMP,
+                is_online INTEGER DEFAULT 0,
+                response_time REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-            # Focus Playlists - Mood Presets
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS mood_presets (
-                    id TEXT PRIMARY KEY,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    energy_level INTEGER DEFAULT 5,
-                    genres TEXT,
-                    tempo_range TEXT,
-                    instrumental_preference TEXT,
-                    default_duration_minutes INTEGER DEFAULT 60,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Focus Playlists - Main Playlist Table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS focus_playlists (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT DEFAULT 'default',
-                    title TEXT NOT NULL,
-                    mood TEXT,
-                    description TEXT,
-                    duration_minutes INTEGER,
-                    source TEXT DEFAULT 'buildly',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Focus Playlists - Tracks
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS focus_playlist_tracks (
-                    id TEXT PRIMARY KEY,
-                    playlist_id TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    artist TEXT NOT NULL,
-                    album TEXT,
-                    duration_seconds INTEGER,
-                    position INTEGER NOT NULL,
-                    youtube_video_id TEXT,
-                    spotify_track_id TEXT,
-                    apple_music_track_id TEXT,
-                    match_confidence REAL DEFAULT 0.0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (playlist_id) REFERENCES focus_playlists(id),
-                    UNIQUE(playlist_id, position)
-                )
-            """)
-            
-            # Focus Playlists - User Music Connections (OAuth Tokens)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_music_connections (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT DEFAULT 'default',
-                    provider TEXT NOT NULL,
-                    access_token TEXT,
-                    refresh_token TEXT,
-                    token_expires_at TIMESTAMP,
-                    provider_user_id TEXT,
-                    is_default INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, provider)
-                )
-            """)
-            
-            # Focus Playlists - Sync Jobs
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sync_jobs (
-                    id TEXT PRIMARY KEY,
-                    user_id TEXT DEFAULT 'default',
-                    playlist_id TEXT NOT NULL,
-                    provider TEXT NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    external_playlist_id TEXT,
-                    matched_tracks INTEGER DEFAULT 0,
-                    failed_tracks INTEGER DEFAULT 0,
-                    error_message TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (playlist_id) REFERENCES focus_playlists(id),
-                    UNIQUE(playlist_id, provider)
-                )
-            """)
+        # Focus Playlists - Mood Presets
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS mood_presets (
+                id TEXT PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                energy_level INTEGER DEFAULT 5,
+                genres TEXT,
+                tempo_range TEXT,
+                instrumental_preference TEXT,
+                default_duration_minutes INTEGER DEFAULT 60,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Focus Playlists - Main Playlist Table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS focus_playlists (
+                id TEXT PRIMARY KEY,
+                user_id TEXT DEFAULT 'default',
+                title TEXT NOT NULL,
+                mood TEXT,
+                description TEXT,
+                duration_minutes INTEGER,
+                source TEXT DEFAULT 'buildly',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Focus Playlists - Tracks
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS focus_playlist_tracks (
+                id TEXT PRIMARY KEY,
+                playlist_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                album TEXT,
+                duration_seconds INTEGER,
+                position INTEGER NOT NULL,
+                youtube_video_id TEXT,
+                spotify_track_id TEXT,
+                apple_music_track_id TEXT,
+                match_confidence REAL DEFAULT 0.0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (playlist_id) REFERENCES focus_playlists(id),
+                UNIQUE(playlist_id, position)
+            )
+        """)
+        
+        # Focus Playlists - User Music Connections (OAuth Tokens)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_music_connections (
+                id TEXT PRIMARY KEY,
+                user_id TEXT DEFAULT 'default',
+                provider TEXT NOT NULL,
+                access_token TEXT,
+                refresh_token TEXT,
+                token_expires_at TIMESTAMP,
+                provider_user_id TEXT,
+                is_default INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_id, provider)
+            )
+        """)
+        
+        # Focus Playlists - Sync Jobs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_jobs (
+                id TEXT PRIMARY KEY,
+                user_id TEXT DEFAULT 'default',
+                playlist_id TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                external_playlist_id TEXT,
+                matched_tracks INTEGER DEFAULT 0,
+                failed_tracks INTEGER DEFAULT 0,
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (playlist_id) REFERENCES focus_playlists(id),
+                UNIQUE(playlist_id, provider)
+            )
+        """)
 
-            # AI Assistant indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_providers_active ON ai_providers(is_active)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_providers_default ON ai_providers(is_default)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_conversations_provider ON ai_conversations(provider_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_messages_conversation ON ai_messages(conversation_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_messages_timestamp ON ai_messages(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_training_data_type ON ai_training_data(data_type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_training_data_created ON ai_training_data(created_at)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_model_training_provider ON ai_model_training(provider_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_model_training_status ON ai_model_training(training_status)")
-            
-            # New table indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_sources_active ON news_sources(is_active)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_sources_category ON news_sources(category)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_symbol ON investments(symbol)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_type ON investments(type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_tracked ON investments(is_tracked)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_local_services_port ON local_services(port)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_local_services_status ON local_services(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_network_devices_ip ON network_devices(ip_address)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_network_devices_online ON network_devices(is_online)")
-            
-            conn.commit()
-            logger.info("Database initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Database initialization failed: {e}")
-            # Attempt to rollback
-            try:
-                conn.rollback()
-            except:
-                pass
-            raise RuntimeError(f"Database initialization failed: {e}")
+        # AI Assistant indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_providers_active ON ai_providers(is_active)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_providers_default ON ai_providers(is_default)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_conversations_provider ON ai_conversations(provider_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_messages_conversation ON ai_messages(conversation_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_messages_timestamp ON ai_messages(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_training_data_type ON ai_training_data(data_type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_training_data_created ON ai_training_data(created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_model_training_provider ON ai_model_training(provider_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ai_model_training_status ON ai_model_training(training_status)")
         
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
-    
+        # New table indexes
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_sources_active ON news_sources(is_active)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_sources_category ON news_sources(category)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_symbol ON investments(symbol)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_type ON investments(type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_investments_tracked ON investments(is_tracked)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_local_services_port ON local_services(port)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_local_services_status ON local_services(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_network_devices_ip ON network_devices(ip_address)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_network_devices_online ON network_devices(is_online)")
+        
+        # Full-text search tables and sync triggers (after all column migrations)
+        create_search_index(cursor)
+
     @contextmanager
-    def get_connection(self):
-        """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+    def get_connection(self, op: str = 'other'):
+        """Get a pooled database connection.
+        
+        Connections are shared per database file, use WAL mode and are
+        reentrant: nested calls from the same thread/task reuse the held
+        connection. Uncommitted work is rolled back when released.
+        
+        Outermost checkouts record their connection hold time (checkout
+        wait included, not just query time) for /metrics under `op`.
+        """
+        if self._pool.holds_connection():
+            with self._pool.connection() as conn:
+                yield conn
+            return
+        started = time.perf_counter()
         try:
-            yield conn
+            with self._pool.connection() as conn:
+                yield conn
         finally:
-            conn.close()
+            DB_SECONDS.labels(op).observe(time.perf_counter() - started)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage and lock contention counters."""
+        return self._pool.get_stats()
     
     # Credentials management
     def save_credentials(self, service_name: str, credentials: Dict[str, Any]):
         """Save service credentials."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_credentials') as conn:
             cursor = conn.cursor()
             credentials_json = json.dumps(credentials)
             
@@ -890,7 +1070,7 @@ class DatabaseManager:
     
     def get_credentials(self, service_name: str) -> Optional[Dict[str, Any]]:
         """Get service credentials."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_credentials') as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT credentials_data FROM credentials WHERE service_name = ?",
@@ -904,7 +1084,7 @@ class DatabaseManager:
     
     def list_configured_services(self) -> List[str]:
         """List all configured services."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='list_configured_services') as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT service_name FROM credentials")
             return [row['service_name'] for row in cursor.fetchall()]
@@ -914,7 +1094,7 @@ class DatabaseManager:
                        expires_in: Optional[int] = None, token_data: Optional[Dict[str, Any]] = None, 
                        expires_at: Optional[datetime] = None):
         """Save authentication token with flexible parameters."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_auth_token') as conn:
             cursor = conn.cursor()
             
             # Build token_data dict if not provided
@@ -941,7 +1121,7 @@ class DatabaseManager:
     
     def save_oauth_state(self, service_name: str, state: str):
         """Save OAuth state for CSRF protection."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_oauth_state') as conn:
             cursor = conn.cursor()
             expires_at = datetime.now() + timedelta(minutes=10)  # State expires in 10 minutes
             
@@ -954,7 +1134,7 @@ class DatabaseManager:
     
     def verify_oauth_state(self, service_name: str, state: str) -> bool:
         """Verify OAuth state for CSRF protection."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='verify_oauth_state') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT token_data, expires_at FROM auth_tokens 
@@ -976,7 +1156,7 @@ class DatabaseManager:
     
     def get_auth_token(self, service_name: str) -> Optional[Dict[str, Any]]:
         """Get authentication token."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_auth_token') as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT token_data, expires_at FROM auth_tokens WHERE service_name = ?",
@@ -1026,52 +1206,165 @@ class DatabaseManager:
         return status
     
     # Data collection storage
-    def save_collected_data(self, service_name: str, data_type: str, data: List[Dict[str, Any]], collection_date: datetime):
-        """Save collected data."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            data_json = json.dumps(data, default=str)  # default=str handles datetime objects
-            
-            # Remove old data for the same service and type from the same day
-            cursor.execute("""
-                DELETE FROM collected_data 
-                WHERE service_name = ? AND data_type = ? AND DATE(collection_date) = DATE(?)
-            """, (service_name, data_type, collection_date))
-            
-            # Insert new data
-            cursor.execute("""
-                INSERT INTO collected_data (service_name, data_type, data_content, collection_date)
-                VALUES (?, ?, ?, ?)
-            """, (service_name, data_type, data_json, collection_date))
-            
-            conn.commit()
-            logger.info(f"Saved {len(data)} {data_type} items for {service_name}")
+    # Item fields tried, in order, for the item key and the item timestamp
+    _COLLECTED_KEY_FIELDS = ('id', 'key', 'uid', 'message_id', 'url', 'link')
+    _COLLECTED_TIME_FIELDS = ('timestamp', 'published_date', 'received_date', 'date',
+                              'start_time', 'start', 'created_at', 'updated_at')
+
+    @staticmethod
+    def _collected_timestamp(value: Any) -> Optional[str]:
+        """Normalize a datetime/ISO string/epoch to the stored 'YYYY-MM-DD HH:MM:SS' form."""
+        try:
+            if isinstance(value, datetime):
+                parsed = value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                parsed = datetime.fromtimestamp(value)
+            elif isinstance(value, str) and value:
+                parsed = datetime.fromisoformat(value.strip())
+            elif hasattr(value, 'isoformat'):
+                parsed = datetime.fromisoformat(value.isoformat())
+            else:
+                return None
+        except (ValueError, OverflowError, OSError):
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed.isoformat(sep=' ')
+
+    def _collected_item_row(self, service_name: str, data_type: str, item: Any,
+                            index: int, collection_ts: str) -> tuple:
+        """Build the collected_items row for one collector item."""
+        payload = json.dumps(item, default=str)  # default=str handles datetime objects
+        key = timestamp = None
+        if isinstance(item, dict):
+            for field in self._COLLECTED_KEY_FIELDS:
+                if item.get(field):
+                    key = str(item[field])
+                    break
+            for field in self._COLLECTED_TIME_FIELDS:
+                timestamp = self._collected_timestamp(item.get(field))
+                if timestamp:
+                    break
+        if key is None:
+            key = hashlib.sha1(payload.encode()).hexdigest()
+        return (service_name, data_type, key, timestamp or collection_ts, index, collection_ts, payload)
+
+    def save_collected_data(self, service_name: str, data_type: str, data: List[Dict[str, Any]],
+                            collection_date: datetime) -> int:
+        """Save a collection run as one row per item, replacing the same day's run.
+
+        Returns the number of items written.
+        """
+        try:
+            collection_ts = self._collected_timestamp(collection_date)
+            day = datetime.fromisoformat(collection_ts).replace(hour=0, minute=0, second=0, microsecond=0)
+            rows = [
+                self._collected_item_row(service_name, data_type, item, index, collection_ts)
+                for index, item in enumerate(data)
+            ]
+            with self.get_connection(op='save_collected_data') as conn:
+                cursor = conn.cursor()
+                
+                # Remove old data for the same service and type from the same day
+                cursor.execute("""
+                    DELETE FROM collected_items
+                    WHERE service_name = ? AND data_type = ?
+                    AND collection_date >= ? AND collection_date < ?
+                """, (service_name, data_type, self._collected_timestamp(day),
+                      self._collected_timestamp(day + timedelta(days=1))))
+                
+                cursor.executemany("""
+                    INSERT INTO collected_items (
+                        service_name, data_type, item_key, item_timestamp,
+                        item_index, collection_date, payload
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                
+                conn.commit()
+                logger.info(f"Saved {len(rows)} {data_type} items for {service_name}")
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving collected data for {service_name}/{data_type}: {e}")
+            return 0
+    
+    def iter_collected_data(self, service_name: str, data_type: str,
+                            start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
+                            by: str = 'collection', keys: Optional[List[str]] = None,
+                            limit: Optional[int] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream collected items for a service and type, newest first.
+
+        `by='collection'` filters on the collection run date (items keep their
+        order within a run); `by='item'` filters on each item's own timestamp.
+        `keys` restricts results to specific item keys. Rows are fetched in
+        keyset pages of `batch_size`, each with its own short connection
+        checkout, so a slow or abandoned consumer never holds a pooled
+        connection between pages.
+        """
+        if by == 'collection':
+            sort_columns = 'collection_date, item_index, id'
+            order = 'collection_date DESC, item_index ASC, id ASC'
+            after = "(collection_date < ? OR (collection_date = ? AND (item_index > ? OR (item_index = ? AND id > ?))))"
+            column = 'collection_date'
+        elif by == 'item':
+            sort_columns = 'item_timestamp, id'
+            order = 'item_timestamp DESC, id ASC'
+            after = "(item_timestamp < ? OR (item_timestamp = ? AND id > ?))"
+            column = 'item_timestamp'
+        else:
+            raise ValueError(f"Unknown collected data ordering: {by}")
+        
+        conditions = ["service_name = ?", "data_type = ?"]
+        params: List[Any] = [service_name, data_type]
+        if start_date is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(self._collected_timestamp(start_date))
+        if end_date is not None:
+            conditions.append(f"{column} <= ?")
+            params.append(self._collected_timestamp(end_date))
+        if keys is not None:
+            keys = list(keys)
+            if not keys:
+                return
+            conditions.append(f"item_key IN ({', '.join('?' * len(keys))})")
+            params.extend(keys)
+        
+        remaining = int(limit) if limit is not None else None
+        last = None  # Sort key of the last row yielded
+        while remaining is None or remaining > 0:
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            page_conditions, page_params = list(conditions), list(params)
+            if last is not None:
+                page_conditions.append(after)
+                if by == 'collection':
+                    page_params.extend([last[0], last[0], last[1], last[1], last[2]])
+                else:
+                    page_params.extend([last[0], last[0], last[1]])
+            query = (f"SELECT {sort_columns}, payload FROM collected_items "
+                     f"WHERE {' AND '.join(page_conditions)} ORDER BY {order} LIMIT ?")
+            with self.get_connection(op='iter_collected_data') as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                page = cursor.execute(query, page_params + [page_size]).fetchall()
+            
+            for row in page:
+                yield json.loads(row[-1])
+            if len(page) < page_size:
+                break
+            last = page[-1][:-1]
+            if remaining is not None:
+                remaining -= len(page)
     
     def get_collected_data(self, service_name: str, data_type: str, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """Get collected data for a service and type within date range."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT data_content FROM collected_data 
-                WHERE service_name = ? AND data_type = ? 
-                AND collection_date BETWEEN ? AND ?
-                ORDER BY collection_date DESC
-            """, (service_name, data_type, start_date, end_date))
-            
-            all_data = []
-            for row in cursor.fetchall():
-                data = json.loads(row['data_content'])
-                all_data.extend(data)
-            
-            return all_data
+        return list(self.iter_collected_data(service_name, data_type, start_date, end_date))
     
     def get_latest_collection_date(self, service_name: str) -> Optional[datetime]:
         """Get the latest collection date for a service."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_latest_collection_date') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT MAX(collection_date) as latest_date 
-                FROM collected_data 
+                FROM collected_items 
                 WHERE service_name = ?
             """, (service_name,))
             
@@ -1079,11 +1372,41 @@ class DatabaseManager:
             if row and row['latest_date']:
                 return datetime.fromisoformat(row['latest_date'])
             return None
+
+    def _migrate_collected_data(self, cursor: sqlite3.Cursor):
+        """Explode legacy collected_data JSON blobs into collected_items rows."""
+        legacy = cursor.execute(
+            "SELECT id, service_name, data_type, data_content, collection_date FROM collected_data ORDER BY id"
+        ).fetchall()
+        if not legacy:
+            return
+        
+        rows = []
+        for row in legacy:
+            try:
+                items = json.loads(row['data_content'])
+            except (TypeError, ValueError):
+                continue
+            if not isinstance(items, list):
+                items = [items]
+            collection_ts = self._collected_timestamp(row['collection_date']) or str(row['collection_date'])
+            rows.extend(
+                self._collected_item_row(row['service_name'], row['data_type'], item, index, collection_ts)
+                for index, item in enumerate(items)
+            )
+        cursor.executemany("""
+            INSERT INTO collected_items (
+                service_name, data_type, item_key, item_timestamp,
+                item_index, collection_date, payload
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        cursor.execute("DELETE FROM collected_data")
+        logger.info(f"Migrated {len(legacy)} collected_data blobs into {len(rows)} collected_items rows")
     
     # Settings management
     def save_setting(self, key: str, value: Any):
-        """Save a setting."""
-        with self.get_connection() as conn:
+        """Save a setting (writes through to the settings cache)."""
+        with self.get_connection(op='save_setting') as conn:
             cursor = conn.cursor()
             value_json = json.dumps(value)
             
@@ -1091,32 +1414,137 @@ class DatabaseManager:
                 INSERT OR REPLACE INTO settings (setting_key, setting_value, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             """, (key, value_json))
+            version = bump_version(conn)
             
             conn.commit()
+        self._settings_cache.apply_write(key, json.loads(value_json), version)
     
     def get_setting(self, key: str, default: Any = None) -> Any:
-        """Get a setting."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT setting_value FROM settings WHERE setting_key = ?",
-                (key,)
+        """Get a setting from the in-memory settings cache."""
+        return self._settings_cache.get(partial(self.get_connection, op='get_setting'), key, default)
+    
+    def get_settings(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several settings at once; missing keys are left out."""
+        return self._settings_cache.get_many(partial(self.get_connection, op='get_settings'), keys)
+    
+    def invalidate_settings_cache(self):
+        """Force the next settings read to reload (after out-of-band edits)."""
+        self._settings_cache.invalidate()
+    
+    # Notes and full-text search
+    @staticmethod
+    def _note_id(note: Dict[str, Any]) -> str:
+        """Stable id for a collected note: source plus its native id/path/url/title."""
+        native = (note.get('doc_id') or note.get('keep_id') or note.get('id')
+                  or note.get('path') or note.get('url') or note.get('title', ''))
+        return f"{note.get('source', 'unknown')}:{native}"
+    
+    def save_notes(self, notes: List[Dict[str, Any]]) -> int:
+        """Upsert collected notes in one transaction. Returns rows written."""
+        if not notes:
+            return 0
+        try:
+            rows = [
+                (
+                    self._note_id(note),
+                    note.get('source', 'unknown'),
+                    note.get('title') or '',
+                    note.get('content') or note.get('preview') or '',
+                    note.get('url') or note.get('path'),
+                    note.get('modified_at'),
+                    json.dumps(note, default=str)
+                )
+                for note in notes
+            ]
+            with self.get_connection(op='save_notes') as conn:
+                conn.executemany("""
+                    INSERT INTO notes (id, source, title, content, url, modified_at, note_data, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        content = excluded.content,
+                        url = excluded.url,
+                        modified_at = excluded.modified_at,
+                        note_data = excluded.note_data,
+                        updated_at = CURRENT_TIMESTAMP
+                """, rows)
+                conn.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving notes: {e}")
+            return 0
+    
+    def find_note(self, title_query: str) -> Optional[Dict[str, Any]]:
+        """Best-matching stored note for a title query, as collected."""
+        try:
+            hits = self.search(title_query, kinds=['notes'], limit=1)
+            if not hits:
+                return None
+            with self.get_connection(op='find_note') as conn:
+                row = conn.execute("SELECT note_data FROM notes WHERE id = ?", (hits[0]['id'],)).fetchone()
+            return json.loads(row['note_data']) if row else None
+        except Exception as e:
+            logger.error(f"Error finding note: {e}")
+            return None
+    
+    def search(self, query: str, kinds: Optional[List[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search across emails, todos, news and notes.
+        
+        Every word in `query` must match (as a prefix). Results from all
+        requested kinds are merged by BM25 relevance; each has kind, id,
+        title, snippet (matches wrapped in **), score, timestamp and url.
+        Raises ValueError for unknown kinds.
+        """
+        sources = resolve_kinds(kinds)
+        match = fts_query(query)
+        if match is None or limit <= 0:
+            return []
+        try:
+            results = []
+            with self.get_connection(op='search') as conn:
+                for source in sources:
+                    results.extend(search_source(conn, source, match, limit))
+            results.sort(key=lambda hit: hit['score'], reverse=True)
+            return results[:limit]
+        except Exception as e:
+            logger.error(f"Error searching for {query!r}: {e}")
+            return []
+    
+    def search_todos(self, query: str, include_completed: bool = False, status: str = None,
+                     priority: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Todos matching a full-text query, best match first, as get_todos dicts."""
+        match = fts_query(query)
+        if match is None:
+            return []
+        try:
+            conditions, params = self._todo_filter_clause(
+                include_completed, False, priority=priority, status=status
             )
-            
-            row = cursor.fetchone()
-            if row:
-                try:
-                    # Try to parse as JSON first
-                    return json.loads(row['setting_value'])
-                except (json.JSONDecodeError, TypeError):
-                    # If it fails, return the raw value (plain string)
-                    return row['setting_value']
-            return default
+            with self.get_connection(op='search_todos') as conn:
+                columns = projection(conn, self.db_path, 'universal_todos', TodoRow)
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                # Rank in a CTE so the FTS column names don't clash with the projection
+                cursor.execute(f"""
+                    WITH hits AS (
+                        SELECT rowid AS hit_rowid, bm25(todos_fts, 5.0, 1.0, 2.0) AS hit_rank
+                        FROM todos_fts WHERE todos_fts MATCH ?
+                    )
+                    SELECT {columns} FROM universal_todos
+                    JOIN hits ON hits.hit_rowid = universal_todos.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY hits.hit_rank
+                    LIMIT ?
+                """, [match, *params, limit])
+                return rows_to_dicts(TodoRow, cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error searching todos: {e}")
+            return []
     
     # Dashboard sessions
     def save_dashboard_session(self, session_data: Dict[str, Any], kpis_data: Dict[str, Any], insights_data: List[str]):
         """Save dashboard session data."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_dashboard_session') as conn:
             cursor = conn.cursor()
             
             session_json = json.dumps(session_data, default=str)
@@ -1133,7 +1561,7 @@ class DatabaseManager:
     
     def get_latest_dashboard_session(self) -> Optional[Dict[str, Any]]:
         """Get the latest dashboard session."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_latest_dashboard_session') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT session_data, kpis_data, insights_data, created_at
@@ -1154,31 +1582,265 @@ class DatabaseManager:
     
     # Cleanup operations
     def cleanup_old_data(self, days_to_keep: int = 90):
-        """Clean up old collected data."""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_to_keep)
-            
-            cursor.execute("""
-                DELETE FROM collected_data 
-                WHERE collection_date < ?
-            """, (cutoff_date,))
-            
-            cursor.execute("""
-                DELETE FROM dashboard_sessions 
-                WHERE created_at < ?
-            """, (cutoff_date,))
-            
-            conn.commit()
-            logger.info(f"Cleaned up data older than {days_to_keep} days")
+        """Clean up old collected data and dashboard sessions."""
+        self.run_retention(policies=[
+            RetentionPolicy('collected_items', 'collection_date', max_age_days=days_to_keep, local_time=True),
+            RetentionPolicy('dashboard_sessions', 'created_at', max_age_days=days_to_keep),
+        ], vacuum=False)
+        logger.info(f"Cleaned up data older than {days_to_keep} days")
+    
+    def run_retention(self, policies: Optional[List[RetentionPolicy]] = None, vacuum: bool = True,
+                      analyze: bool = True, convert_legacy_vacuum: bool = False) -> Dict[str, Any]:
+        """Apply retention policies (defaults plus the retention_policies setting),
+        then incremental vacuum and ANALYZE. Returns the run summary."""
+        return RetentionEngine(self, policies).run(
+            vacuum=vacuum, analyze=analyze, convert_legacy_vacuum=convert_legacy_vacuum
+        )
+    
+    def get_maintenance_stats(self) -> Dict[str, Any]:
+        """Last retention run and totals reclaimed so far."""
+        try:
+            with self.get_connection(op='get_maintenance_stats') as conn:
+                last = conn.execute("""
+                    SELECT started_at, duration_ms, rows_deleted, bytes_reclaimed, details
+                    FROM maintenance_runs ORDER BY id DESC LIMIT 1
+                """).fetchone()
+                totals = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(rows_deleted), 0), COALESCE(SUM(bytes_reclaimed), 0) FROM maintenance_runs"
+                ).fetchone()
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            return {
+                'runs': totals[0],
+                'total_rows_deleted': totals[1],
+                'total_bytes_reclaimed': totals[2],
+                'free_bytes': free_pages * page_size,
+                'last_run': {
+                    'started_at': last['started_at'],
+                    'duration_ms': last['duration_ms'],
+                    'rows_deleted': last['rows_deleted'],
+                    'bytes_reclaimed': last['bytes_reclaimed'],
+                    'deleted_by_table': json.loads(last['details'] or '{}'),
+                } if last else None,
+            }
+        except Exception as e:
+            logger.error(f"Error getting maintenance stats: {e}")
+            return {}
 
+    # Collector cache snapshots
+    
+    def save_cache_snapshot(self, cache_key: str, value: Any, stored_at: float) -> bool:
+        """Persist one cache entry as zlib-compressed JSON, keeping its original timestamp."""
+        try:
+            payload = zlib.compress(json.dumps(value, default=str).encode('utf-8'))
+            with self.get_connection(op='save_cache_snapshot') as conn:
+                conn.execute("""
+                    INSERT INTO cache_snapshots (cache_key, payload, stored_at, saved_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        payload = excluded.payload,
+                        stored_at = excluded.stored_at,
+                        saved_at = excluded.saved_at
+                """, (cache_key, payload, stored_at))
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error saving cache snapshot for {cache_key}: {e}")
+            return False
+    
+    def load_cache_snapshots(self, max_age_seconds: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Saved cache entries as {key: {'value': ..., 'stored_at': epoch seconds}}."""
+        snapshots = {}
+        try:
+            query = "SELECT cache_key, payload, stored_at FROM cache_snapshots"
+            params: tuple = ()
+            if max_age_seconds is not None:
+                query += " WHERE stored_at >= ?"
+                params = (datetime.now().timestamp() - max_age_seconds,)
+            with self.get_connection(op='load_cache_snapshots') as conn:
+                rows = conn.execute(query, params).fetchall()
+            for row in rows:
+                try:
+                    value = json.loads(zlib.decompress(row['payload']).decode('utf-8'))
+                except (zlib.error, ValueError) as e:
+                    logger.warning(f"Skipping unreadable cache snapshot {row['cache_key']}: {e}")
+                    continue
+                snapshots[row['cache_key']] = {'value': value, 'stored_at': row['stored_at']}
+        except Exception as e:
+            logger.error(f"Error loading cache snapshots: {e}")
+        return snapshots
+    
+    # Data version counters
+    
+    def get_data_versions(self, names: Optional[List[str]] = None) -> Dict[str, int]:
+        """Current cache_versions counters (0 for counters never bumped)."""
+        names = list(names or [*self.DATA_VERSION_TABLES, SETTINGS_VERSION_NAME])
+        try:
+            with self.get_connection(op='get_data_versions') as conn:
+                rows = conn.execute(
+                    f"SELECT name, version FROM cache_versions WHERE name IN ({','.join('?' * len(names))})",
+                    names
+                ).fetchall()
+            versions = {row['name']: row['version'] for row in rows}
+            return {name: versions.get(name, 0) for name in names}
+        except Exception as e:
+            logger.error(f"Error reading data versions: {e}")
+            return {name: 0 for name in names}
+    
+    # AI response cache
+    
+    def hit_ai_response(self, cache_key: str, max_age_seconds: float) -> Optional[str]:
+        """Cached response younger than max_age_seconds, marking it used; None if absent."""
+        try:
+            now = time.time()
+            with self.get_connection(op='hit_ai_response') as conn:
+                row = conn.execute(
+                    "SELECT response FROM ai_response_cache WHERE cache_key = ? AND created_at >= ?",
+                    (cache_key, now - max_age_seconds)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE ai_response_cache SET hits = hits + 1, last_hit_at = ? WHERE cache_key = ?",
+                    (now, cache_key)
+                )
+                conn.commit()
+            return row['response']
+        except Exception as e:
+            logger.error(f"Error reading AI response cache: {e}")
+            return None
+    
+    def get_recent_ai_responses(self, provider: str, model: str, context_hash: str,
+                                max_age_seconds: float, limit: int = 50) -> List[Dict[str, Any]]:
+        """Unexpired entries for one provider/model/context, newest first (cache_key, prompt)."""
+        try:
+            with self.get_connection(op='get_recent_ai_responses') as conn:
+                rows = conn.execute("""
+                    SELECT cache_key, prompt FROM ai_response_cache
+                    WHERE provider = ? AND model = ? AND context_hash = ? AND created_at >= ?
+                    ORDER BY created_at DESC LIMIT ?
+                """, (provider, model, context_hash, time.time() - max_age_seconds, limit)).fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error reading AI response cache: {e}")
+            return []
+    
+    def save_ai_response(self, cache_key: str, provider: str, model: str, prompt: str,
+                         context_hash: str, response: str) -> bool:
+        """Store (or refresh) one cached AI response."""
+        try:
+            now = time.time()
+            with self.get_connection(op='save_ai_response') as conn:
+                conn.execute("""
+                    INSERT INTO ai_response_cache
+                    (cache_key, provider, model, prompt, context_hash, response, created_at, last_hit_at, hits)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        response = excluded.response,
+                        created_at = excluded.created_at,
+                        last_hit_at = excluded.last_hit_at
+                """, (cache_key, provider, model, prompt, context_hash, response, now, now))
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error saving AI response cache entry: {e}")
+            return False
+    
+    def prune_ai_responses(self, max_age_seconds: float, max_entries: int) -> int:
+        """Delete expired entries, then the least recently used beyond max_entries."""
+        try:
+            with self.get_connection(op='prune_ai_responses') as conn:
+                deleted = conn.execute(
+                    "DELETE FROM ai_response_cache WHERE created_at < ?", (time.time() - max_age_seconds,)
+                ).rowcount
+                deleted += conn.execute("""
+                    DELETE FROM ai_response_cache WHERE cache_key NOT IN (
+                        SELECT cache_key FROM ai_response_cache ORDER BY last_hit_at DESC LIMIT ?
+                    )
+                """, (max(0, max_entries),)).rowcount
+                conn.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"Error pruning AI response cache: {e}")
+            return 0
+    
+    def count_ai_responses(self) -> int:
+        """Number of stored AI response cache entries."""
+        try:
+            with self.get_connection(op='count_ai_responses') as conn:
+                return conn.execute("SELECT COUNT(*) FROM ai_response_cache").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting AI response cache entries: {e}")
+            return 0
+    
+    # Collector telemetry rollups
+    
+    def save_collector_rollups(self, rows: List[Dict[str, Any]]) -> bool:
+        """Add hourly rollups from CollectorTelemetry onto the stored totals."""
+        try:
+            with self.get_connection(op='save_collector_rollups') as conn:
+                conn.executemany("""
+                    INSERT INTO collector_run_rollups
+                    (collector, hour, runs, failures, total_ms, max_ms, items, payload_bytes,
+                     upstream_calls, last_success_at, last_error_class)
+                    VALUES (:collector, :hour, :runs, :failures, :total_ms, :max_ms, :items,
+                            :payload_bytes, :upstream_calls, :last_success_at, :last_error_class)
+                    ON CONFLICT(collector, hour) DO UPDATE SET
+                        runs = runs + excluded.runs,
+                        failures = failures + excluded.failures,
+                        total_ms = total_ms + excluded.total_ms,
+                        max_ms = MAX(max_ms, excluded.max_ms),
+                        items = items + excluded.items,
+                        payload_bytes = payload_bytes + excluded.payload_bytes,
+                        upstream_calls = upstream_calls + excluded.upstream_calls,
+                        last_success_at = COALESCE(excluded.last_success_at, last_success_at),
+                        last_error_class = COALESCE(excluded.last_error_class, last_error_class)
+                """, rows)
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error saving collector rollups: {e}")
+            return False
+    
+    def get_collector_rollups(self, hours: int = 24) -> Dict[str, Dict[str, Any]]:
+        """Per-collector totals over the last `hours` hourly rollups."""
+        try:
+            cutoff = (datetime.now() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:00:00')
+            with self.get_connection(op='get_collector_rollups') as conn:
+                rows = conn.execute("""
+                    SELECT collector, SUM(runs) AS runs, SUM(failures) AS failures,
+                           SUM(total_ms) AS total_ms, MAX(max_ms) AS max_ms,
+                           SUM(items) AS items, SUM(payload_bytes) AS payload_bytes,
+                           SUM(upstream_calls) AS upstream_calls,
+                           MAX(last_success_at) AS last_success_at
+                    FROM collector_run_rollups
+                    WHERE hour >= ?
+                    GROUP BY collector
+                """, (cutoff,)).fetchall()
+            return {
+                row['collector']: {
+                    'runs': row['runs'],
+                    'failures': row['failures'],
+                    'failure_rate': round(row['failures'] / row['runs'], 3) if row['runs'] else 0.0,
+                    'avg_ms': round(row['total_ms'] / row['runs'], 1) if row['runs'] else None,
+                    'max_ms': row['max_ms'],
+                    'items': row['items'],
+                    'payload_bytes': row['payload_bytes'],
+                    'upstream_calls': row['upstream_calls'],
+                    'last_success_at': row['last_success_at'],
+                }
+                for row in rows
+            }
+        except Exception as e:
+            logger.error(f"Error loading collector rollups: {e}")
+            return {}
+    
     # Email and todo management methods
     
     def save_email(self, email_data: Dict[str, Any]) -> bool:
         """Save an email to the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_email') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO emails 
@@ -1206,7 +1868,7 @@ class DatabaseManager:
     def is_task_deleted(self, task_id: str) -> bool:
         """Check if a task has been deleted by the user."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='is_task_deleted') as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id FROM deleted_tasks WHERE id = ?", (task_id,))
                 return cursor.fetchone() is not None
@@ -1218,7 +1880,7 @@ class DatabaseManager:
                            original_title: str = None, original_url: str = None) -> bool:
         """Record a task deletion to prevent re-importing from sources."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='record_task_deletion') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO deleted_tasks 
@@ -1234,7 +1896,7 @@ class DatabaseManager:
     def get_deleted_task_ids(self, source: str = None) -> List[str]:
         """Get list of deleted task IDs to prevent re-import."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_deleted_task_ids') as conn:
                 cursor = conn.cursor()
                 if source:
                     cursor.execute("SELECT id FROM deleted_tasks WHERE source = ?", (source,))
@@ -1248,7 +1910,7 @@ class DatabaseManager:
     def restore_deleted_task(self, task_id: str) -> bool:
         """Remove a task from the deleted list (restore it)."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='restore_deleted_task') as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM deleted_tasks WHERE id = ?", (task_id,))
                 conn.commit()
@@ -1267,7 +1929,7 @@ class DatabaseManager:
                 logger.info(f"Skipping import of previously deleted task: {task_id}")
                 return True  # Return True to indicate no error, just skipped
             
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_todo') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO universal_todos 
@@ -1299,13 +1961,148 @@ class DatabaseManager:
             logger.error(f"Error saving todo: {e}")
             return False
     
-    def get_emails_by_priority(self, priority: str = None, analyzed_only: bool = False) -> List[Dict[str, Any]]:
-        """Get emails filtered by priority and analysis status."""
+    def save_emails(self, emails: List[Dict[str, Any]]) -> int:
+        """Upsert many emails in one transaction. Returns the number of rows written.
+        
+        Unlike save_email, existing rows keep is_archived and created_at.
+        """
+        if not emails:
+            return 0
+        rows = [(
+            email_data.get('id'),
+            email_data.get('subject'),
+            email_data.get('sender'),
+            email_data.get('recipient'),
+            email_data.get('body'),
+            email_data.get('received_date'),
+            email_data.get('priority', 'medium'),
+            1 if email_data.get('is_analyzed') else 0,
+            email_data.get('ollama_priority'),
+            1 if email_data.get('has_todos') else 0
+        ) for email_data in emails]
+        try:
+            with self.get_connection(op='save_emails') as conn:
+                conn.executemany("""
+                    INSERT INTO emails 
+                    (id, subject, sender, recipient, body, received_date, 
+                     priority, is_analyzed, ollama_priority, has_todos)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        subject = excluded.subject,
+                        sender = excluded.sender,
+                        recipient = excluded.recipient,
+                        body = excluded.body,
+                        received_date = excluded.received_date,
+                        priority = excluded.priority,
+                        is_analyzed = excluded.is_analyzed,
+                        ollama_priority = excluded.ollama_priority,
+                        has_todos = excluded.has_todos
+                """, rows)
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving emails: {e}")
+            return 0
+    
+    def upsert_todos(self, todos: List[Dict[str, Any]]) -> int:
+        """Insert or update many todos in one transaction.
+        
+        Todos the user previously deleted (recorded in deleted_tasks) are
+        skipped, as in save_todo. Existing rows keep created_at/completed_at.
+        Returns the number of rows written.
+        """
+        if not todos:
+            return 0
+        try:
+            with self.get_connection(op='upsert_todos') as conn:
+                written = self._upsert_todo_rows(conn, todos)
+                conn.commit()
+                return written
+        except Exception as e:
+            logger.error(f"Error upserting todos: {e}")
+            return 0
+    
+    def _upsert_todo_rows(self, conn, todos: List[Dict[str, Any]]) -> int:
+        """upsert_todos without the commit, for callers batching several writes."""
+        rows = [(
+            todo_data.get('id'),
+            todo_data.get('title'),
+            todo_data.get('description'),
+            todo_data.get('due_date'),
+            todo_data.get('priority', 'medium'),
+            todo_data.get('category'),
+            todo_data.get('source'),
+            todo_data.get('source_id'),
+            todo_data.get('source_title'),
+            todo_data.get('source_url'),
+            todo_data.get('source_preview'),
+            todo_data.get('creation_reason'),
+            todo_data.get('status', 'pending'),
+            todo_data.get('assigned_to_service'),
+            1 if todo_data.get('requires_response') else 0,
+            todo_data.get('email_id'),
+            todo_data.get('id')  # For the deleted_tasks check
+        ) for todo_data in todos]
+        cursor = conn.executemany("""
+            INSERT INTO universal_todos 
+            (id, title, description, due_date, priority, category, 
+             source, source_id, source_title, source_url, source_preview, creation_reason,
+             status, assigned_to_service, requires_response, email_id)
+            SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (SELECT 1 FROM deleted_tasks WHERE id = ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                description = excluded.description,
+                due_date = excluded.due_date,
+                priority = excluded.priority,
+                category = excluded.category,
+                source = excluded.source,
+                source_id = excluded.source_id,
+                source_title = excluded.source_title,
+                source_url = excluded.source_url,
+                source_preview = excluded.source_preview,
+                creation_reason = excluded.creation_reason,
+                status = excluded.status,
+                assigned_to_service = excluded.assigned_to_service,
+                requires_response = excluded.requires_response,
+                email_id = excluded.email_id
+        """, rows)
+        written = cursor.rowcount
+        skipped = len(rows) - written
+        if skipped:
+            logger.info(f"Skipped {skipped} previously deleted task(s) during upsert")
+        return written
+    
+    def save_scan_results(self, todos: List[Dict[str, Any]], sources: List[Dict[str, Any]]) -> int:
+        """Write the tasks found by a scan and mark its sources scanned, in one transaction.
+        
+        todos are written as in upsert_todos and sources as in
+        mark_sources_scanned; either both land or neither does. Returns the
+        number of todos written, or -1 if the transaction failed.
+        """
+        if not todos and not sources:
+            return 0
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_scan_results') as conn:
+                written = self._upsert_todo_rows(conn, todos) if todos else 0
+                if sources:
+                    self._mark_scanned_rows(conn, sources)
+                conn.commit()
+                return written
+        except Exception as e:
+            logger.error(f"Error saving scan results: {e}")
+            return -1
+    
+    def get_email_rows(self, priority: str = None, analyzed_only: bool = False,
+                       include_body: bool = False) -> List[EmailSummaryRow]:
+        """Get emails as typed rows; bodies are only loaded when include_body is set."""
+        model = EmailRow if include_body else EmailSummaryRow
+        try:
+            with self.get_connection(op='get_email_rows') as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None
                 
-                query = "SELECT * FROM emails WHERE 1=1"
+                query = f"SELECT {projection(conn, self.db_path, 'emails', model)} FROM emails WHERE 1=1"
                 params = []
                 
                 if priority:
@@ -1318,38 +2115,25 @@ class DatabaseManager:
                 query += " ORDER BY received_date DESC"
                 
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                emails = []
-                for row in rows:
-                    emails.append({
-                        'id': row[0],
-                        'subject': row[1],
-                        'sender': row[2],
-                        'recipient': row[3],
-                        'body': row[4],
-                        'received_date': row[5],
-                        'priority': row[6],
-                        'is_analyzed': bool(row[7]),
-                        'ollama_priority': row[8],
-                        'has_todos': bool(row[9]),
-                        'is_archived': bool(row[10]),
-                        'created_at': row[11]
-                    })
-                
-                return emails
+                return rows_to_models(model, cursor.fetchall())
                 
         except Exception as e:
             logger.error(f"Error getting emails: {e}")
             return []
     
+    def get_emails_by_priority(self, priority: str = None, analyzed_only: bool = False,
+                               include_body: bool = False) -> List[Dict[str, Any]]:
+        """Get emails filtered by priority and analysis status."""
+        return [row.to_dict() for row in self.get_email_rows(priority, analyzed_only, include_body)]
+    
     def get_todos_by_source(self, source: str = None, status: str = None) -> List[Dict[str, Any]]:
         """Get todos filtered by source and status."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_todos_by_source') as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = None
                 
-                query = "SELECT * FROM universal_todos WHERE 1=1"
+                query = f"SELECT {projection(conn, self.db_path, 'universal_todos', TodoRow)} FROM universal_todos WHERE 1=1"
                 params = []
                 
                 if source:
@@ -1363,32 +2147,7 @@ class DatabaseManager:
                 query += " ORDER BY due_date ASC, priority DESC"
                 
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                todos = []
-                for row in rows:
-                    todos.append({
-                        'id': row['id'],
-                        'title': row['title'],
-                        'description': row['description'],
-                        'due_date': row['due_date'],
-                        'priority': row['priority'],
-                        'category': row['category'],
-                        'source': row['source'],
-                        'source_id': row['source_id'],
-                        'source_title': row['source_title'],
-                        'source_url': row['source_url'],
-                        'source_preview': row['source_preview'],
-                        'creation_reason': row['creation_reason'],
-                        'status': row['status'],
-                        'assigned_to_service': row['assigned_to_service'],
-                        'requires_response': bool(row['requires_response']),
-                        'email_id': row['email_id'],
-                        'created_at': row['created_at'],
-                        'completed_at': row['completed_at']
-                    })
-                
-                return todos
+                return rows_to_dicts(TodoRow, cursor.fetchall())
                 
         except Exception as e:
             logger.error(f"Error getting todos: {e}")
@@ -1397,7 +2156,7 @@ class DatabaseManager:
     def update_email_analysis(self, email_id: str, ollama_priority: str, has_todos: bool) -> bool:
         """Update email analysis results."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='update_email_analysis') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE emails 
@@ -1410,64 +2169,203 @@ class DatabaseManager:
             logger.error(f"Error updating email analysis: {e}")
             return False
 
+    def _fetch_todos(self, model: Type[TodoSummaryRow], include_completed: bool,
+                     include_deleted: bool, as_dicts: bool):
+        """Run the get_todos query and map rows onto `model` (or dicts keyed like it)."""
+        with self.get_connection(op='fetch_todos') as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            
+            # Build query with filters
+            conditions = []
+            if not include_completed:
+                conditions.append("status != 'completed'")
+            if not include_deleted:
+                conditions.append("status != 'deleted'")
+            
+            query = f"SELECT {projection(conn, self.db_path, 'universal_todos', model)} FROM universal_todos"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY due_date ASC, priority DESC, created_at DESC"
+            
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            return rows_to_dicts(model, rows) if as_dicts else rows_to_models(model, rows)
+
     def get_todos(self, include_completed: bool = False, include_deleted: bool = False) -> List[Dict[str, Any]]:
         """Get all todos from the database."""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Build query with filters
-                conditions = []
-                if not include_completed:
-                    conditions.append("status != 'completed'")
-                if not include_deleted:
-                    conditions.append("status != 'deleted'")
-                
-                query = "SELECT * FROM universal_todos"
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-                query += " ORDER BY due_date ASC, priority DESC, created_at DESC"
-                
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                
-                todos = []
-                for row in rows:
-                    row_keys = set(row.keys())
-                    def get_row_value(key: str, default=None):
-                        return row[key] if key in row_keys else default
+            return self._fetch_todos(TodoRow, include_completed, include_deleted, as_dicts=True)
+        except Exception as e:
+            logger.error(f"Error getting todos: {e}")
+            return []
 
-                    todos.append({
-                        'id': get_row_value('id', ''),
-                        'title': get_row_value('title', ''),
-                        'description': get_row_value('description', ''),
-                        'due_date': get_row_value('due_date'),
-                        'priority': get_row_value('priority', 'medium'),
-                        'category': get_row_value('category', 'general'),
-                        'source': get_row_value('source', 'manual'),
-                        'source_id': get_row_value('source_id'),
-                        'source_title': get_row_value('source_title', ''),
-                        'source_url': get_row_value('source_url', ''),
-                        'source_preview': get_row_value('source_preview', ''),
-                        'creation_reason': get_row_value('creation_reason', ''),
-                        'status': get_row_value('status', 'pending'),
-                        'assigned_to_service': get_row_value('assigned_to_service'),
-                        'requires_response': bool(get_row_value('requires_response', 0)),
-                        'email_id': get_row_value('email_id'),
-                        'created_at': get_row_value('created_at'),
-                        'completed_at': get_row_value('completed_at')
-                    })
-                
-                return todos
-                
+    def get_todo_rows(self, include_completed: bool = False, include_deleted: bool = False,
+                      summary: bool = False) -> List[TodoSummaryRow]:
+        """Get todos as typed rows. summary=True skips description/preview text."""
+        try:
+            model = TodoSummaryRow if summary else TodoRow
+            return self._fetch_todos(model, include_completed, include_deleted, as_dicts=False)
         except Exception as e:
             logger.error(f"Error getting todos: {e}")
             return []
 
+    # Keyset order for task lists: due date, then priority, newest first, id as tie-breaker
+    _TODO_ORDER_KEYS = ("COALESCE(due_date, '')", "COALESCE(priority, '')", "COALESCE(created_at, '')", "id")
+    _TODO_ORDER_BY = ("COALESCE(due_date, '') ASC, COALESCE(priority, '') DESC, "
+                      "COALESCE(created_at, '') DESC, id ASC")
+
+    @staticmethod
+    def _encode_todo_cursor(row: TodoSummaryRow) -> str:
+        """Encode the sort key of the last row on a page as an opaque cursor."""
+        key = [row.due_date or '', row.priority or '', row.created_at or '', row.id]
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_todo_cursor(cursor: str) -> List[str]:
+        """Decode a cursor from _encode_todo_cursor. Raises ValueError if malformed."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(key, list) or len(key) != 4 or not all(isinstance(k, str) for k in key):
+            raise ValueError("Invalid cursor")
+        return key
+
+    def _todo_filter_clause(self, include_completed: bool, include_deleted: bool,
+                            priority: str = None, status: str = None,
+                            category: str = None, source: str = None):
+        """Build the WHERE clause and params shared by task list queries."""
+        conditions = []
+        params: List[Any] = []
+        if not include_completed:
+            conditions.append("status != 'completed'")
+        if not include_deleted:
+            conditions.append("status != 'deleted'")
+        if priority:
+            conditions.append("priority = ? COLLATE NOCASE")
+            params.append(priority)
+        if status:
+            conditions.append("status = ? COLLATE NOCASE")
+            params.append(status)
+        if category:
+            conditions.append("category = ? COLLATE NOCASE")
+            params.append(category)
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        return conditions, params
+
+    def query_todos(self, include_completed: bool = False, include_deleted: bool = False,
+                    priority: str = None, status: str = None, category: str = None,
+                    source: str = None, limit: Optional[int] = None, cursor: str = None,
+                    summary: bool = False) -> Dict[str, Any]:
+        """Filter, sort and page todos in SQL.
+
+        Pages are keyset-based: pass the returned next_cursor back as `cursor`
+        to continue after the last row. Returns {'rows', 'next_cursor', 'total'}
+        where total counts every row matching the filters.
+
+        Raises ValueError for a malformed cursor.
+        """
+        after = self._decode_todo_cursor(cursor) if cursor else None
+        model = TodoSummaryRow if summary else TodoRow
+        try:
+            with self.get_connection(op='query_todos') as conn:
+                conditions, params = self._todo_filter_clause(
+                    include_completed, include_deleted, priority, status, category, source
+                )
+                where = " WHERE " + " AND ".join(conditions) if conditions else ""
+                total = conn.execute(f"SELECT COUNT(*) FROM universal_todos{where}", params).fetchone()[0]
+
+                if after:
+                    due, prio, created, todo_id = self._TODO_ORDER_KEYS
+                    conditions.append(
+                        f"({due} > ? OR ({due} = ? AND {prio} < ?)"
+                        f" OR ({due} = ? AND {prio} = ? AND {created} < ?)"
+                        f" OR ({due} = ? AND {prio} = ? AND {created} = ? AND {todo_id} > ?))"
+                    )
+                    params += [after[0],
+                               after[0], after[1],
+                               after[0], after[1], after[2],
+                               after[0], after[1], after[2], after[3]]
+
+                query = f"SELECT {projection(conn, self.db_path, 'universal_todos', model)} FROM universal_todos"
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                query += f" ORDER BY {self._TODO_ORDER_BY}"
+                if limit is not None:
+                    # Fetch one extra row to know whether another page exists
+                    query += " LIMIT ?"
+                    params.append(limit + 1)
+
+                db_cursor = conn.cursor()
+                db_cursor.row_factory = None
+                db_cursor.execute(query, params)
+                rows = rows_to_models(model, db_cursor.fetchall())
+
+            next_cursor = None
+            if limit is not None and len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = self._encode_todo_cursor(rows[-1]) if rows else None
+            return {'rows': rows, 'next_cursor': next_cursor, 'total': total}
+
+        except Exception as e:
+            logger.error(f"Error querying todos: {e}")
+            return {'rows': [], 'next_cursor': None, 'total': 0}
+
+    def get_todo_stats(self, include_completed: bool = False, include_deleted: bool = False) -> Dict[str, Any]:
+        """Aggregate todo counts by status, priority, category and source in SQL."""
+        stats = {
+            'total_tasks': 0,
+            'pending_tasks': 0,
+            'completed_tasks': 0,
+            'high_priority': 0,
+            'medium_priority': 0,
+            'low_priority': 0,
+            'overdue_tasks': 0,
+            'due_today': 0,
+            'due_this_week': 0,
+            'by_category': {},
+            'by_source': {}
+        }
+        try:
+            with self.get_connection(op='get_todo_stats') as conn:
+                conditions, params = self._todo_filter_clause(include_completed, include_deleted)
+                where = " WHERE " + " AND ".join(conditions) if conditions else ""
+                rows = conn.execute(f"""
+                    SELECT LOWER(COALESCE(NULLIF(status, ''), 'pending')),
+                           LOWER(COALESCE(NULLIF(priority, ''), 'medium')),
+                           COALESCE(NULLIF(category, ''), 'general'),
+                           COALESCE(NULLIF(source, ''), 'manual'),
+                           COUNT(*)
+                    FROM universal_todos{where}
+                    GROUP BY 1, 2, 3, 4
+                """, params).fetchall()
+
+            by_category = stats['by_category']
+            by_source = stats['by_source']
+            for task_status, task_priority, task_category, task_source, count in rows:
+                stats['total_tasks'] += count
+                if task_status == 'pending':
+                    stats['pending_tasks'] += count
+                elif task_status == 'completed':
+                    stats['completed_tasks'] += count
+                if task_priority in ('high', 'medium', 'low'):
+                    stats[f'{task_priority}_priority'] += count
+                by_category[task_category] = by_category.get(task_category, 0) + count
+                by_source[task_source] = by_source.get(task_source, 0) + count
+            return stats
+
+        except Exception as e:
+            logger.error(f"Error getting todo stats: {e}")
+            return stats
+
     def update_todo_status(self, todo_id: str, status: str) -> bool:
         """Update a todo's status."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='update_todo_status') as conn:
                 cursor = conn.cursor()
                 
                 # Add completed timestamp if marking as completed
@@ -1494,7 +2392,7 @@ class DatabaseManager:
     def is_task_deleted(self, task_id: str) -> bool:
         """Check if a task has been deleted by the user."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='is_task_deleted') as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id FROM deleted_tasks WHERE id = ?", (task_id,))
                 return cursor.fetchone() is not None
@@ -1506,7 +2404,7 @@ class DatabaseManager:
                            original_title: str = None, original_url: str = None) -> bool:
         """Record a task deletion to prevent re-importing from sources."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='record_task_deletion') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO deleted_tasks 
@@ -1522,7 +2420,7 @@ class DatabaseManager:
     def get_deleted_task_ids(self, source: str = None) -> List[str]:
         """Get list of deleted task IDs to prevent re-import."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_deleted_task_ids') as conn:
                 cursor = conn.cursor()
                 if source:
                     cursor.execute("SELECT id FROM deleted_tasks WHERE source = ?", (source,))
@@ -1536,7 +2434,7 @@ class DatabaseManager:
     def restore_deleted_task(self, task_id: str) -> bool:
         """Remove a task from the deleted list (restore it for re-import)."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='restore_deleted_task') as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM deleted_tasks WHERE id = ?", (task_id,))
                 conn.commit()
@@ -1548,7 +2446,7 @@ class DatabaseManager:
     def delete_todo(self, todo_id: str) -> bool:
         """Mark a todo as deleted (soft delete) to prevent recreation."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='delete_todo') as conn:
                 cursor = conn.cursor()
                 
                 # Get task details before deleting for deletion tracking
@@ -1582,7 +2480,7 @@ class DatabaseManager:
     def permanently_delete_todo(self, todo_id: str) -> bool:
         """Permanently delete a todo from the database (hard delete)."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='permanently_delete_todo') as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM universal_todos WHERE id = ?", (todo_id,))
                 conn.commit()
@@ -1595,7 +2493,7 @@ class DatabaseManager:
     def update_todo_source_id(self, todo_id: str, source_id: str) -> bool:
         """Update a todo's source_id (e.g., TickTick ID)."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='update_todo_source_id') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE universal_todos 
@@ -1619,7 +2517,7 @@ class DatabaseManager:
         This prevents re-scanning the same item and re-creating deleted tasks.
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='mark_source_scanned') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO scanned_sources 
@@ -1641,6 +2539,50 @@ class DatabaseManager:
             logger.error(f"Error marking source as scanned: {e}")
             return False
     
+    def mark_sources_scanned(self, sources: List[Dict[str, Any]]) -> int:
+        """Mark many source items as scanned in one transaction.
+        
+        Each item takes the mark_source_scanned arguments as keys: source_type,
+        source_id and optionally tasks_found, tasks_created, item_hash, dismissed.
+        Returns the number of rows written.
+        """
+        if not sources:
+            return 0
+        try:
+            with self.get_connection(op='mark_sources_scanned') as conn:
+                written = self._mark_scanned_rows(conn, sources)
+                conn.commit()
+                return written
+        except Exception as e:
+            logger.error(f"Error marking sources as scanned: {e}")
+            return 0
+    
+    def _mark_scanned_rows(self, conn, sources: List[Dict[str, Any]]) -> int:
+        """mark_sources_scanned without the commit, for callers batching several writes."""
+        rows = [(
+            item['source_type'],
+            item['source_id'],
+            item.get('item_hash'),
+            item.get('tasks_found', 0),
+            item.get('tasks_created', 0),
+            1 if item.get('dismissed') else 0
+        ) for item in sources]
+        conn.executemany("""
+            INSERT INTO scanned_sources 
+            (source_type, source_id, item_hash, tasks_found, tasks_created, dismissed)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_type, source_id) DO UPDATE SET
+                scanned_at = CURRENT_TIMESTAMP,
+                tasks_found = excluded.tasks_found,
+                tasks_created = excluded.tasks_created,
+                item_hash = COALESCE(excluded.item_hash, scanned_sources.item_hash),
+                dismissed = CASE 
+                    WHEN excluded.dismissed = 1 THEN 1 
+                    ELSE scanned_sources.dismissed 
+                END
+        """, rows)
+        return len(rows)
+    
     def is_source_scanned(self, source_type: str, source_id: str, check_dismissed: bool = True) -> bool:
         """Check if a source has already been scanned.
         
@@ -1650,7 +2592,7 @@ class DatabaseManager:
             check_dismissed: If True, also returns True for dismissed items
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='is_source_scanned') as conn:
                 cursor = conn.cursor()
                 
                 if check_dismissed:
@@ -1675,7 +2617,7 @@ class DatabaseManager:
         This ensures the source won't generate new tasks unless force re-scanned.
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='mark_source_dismissed') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO scanned_sources (source_type, source_id, dismissed, tasks_created)
@@ -1693,7 +2635,7 @@ class DatabaseManager:
     def get_scanned_sources(self, source_type: str = None, include_dismissed: bool = True) -> List[Dict[str, Any]]:
         """Get list of scanned sources."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_scanned_sources') as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM scanned_sources WHERE 1=1"
@@ -1726,7 +2668,7 @@ class DatabaseManager:
             Number of records cleared
         """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='clear_scanned_sources') as conn:
                 cursor = conn.cursor()
                 
                 query = "DELETE FROM scanned_sources WHERE 1=1"
@@ -1755,7 +2697,7 @@ class DatabaseManager:
         try:
             todo_id = todo_data.get('id', str(uuid.uuid4()))
             
-            with self.get_connection() as conn:
+            with self.get_connection(op='add_suggested_todo') as conn:
                 cursor = conn.cursor()
                 
                 # Check if this task was previously rejected - don't re-add dismissed tasks
@@ -1805,7 +2747,7 @@ class DatabaseManager:
     def get_suggested_todos(self, status: str = 'pending') -> List[Dict[str, Any]]:
         """Get suggested todos by status."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_suggested_todos') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, description, context, source, source_id, source_title, 
@@ -1844,7 +2786,7 @@ class DatabaseManager:
     def get_suggested_todos_by_source(self, source: str, source_id: str) -> List[Dict[str, Any]]:
         """Get suggested todos by source and source_id."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_suggested_todos_by_source') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, description, context, source, source_id, source_title, 
@@ -1882,7 +2824,7 @@ class DatabaseManager:
     def approve_suggested_todo(self, suggestion_id: str) -> bool:
         """Approve a suggested todo and move it to the main todos list."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='approve_suggested_todo') as conn:
                 cursor = conn.cursor()
                 
                 # Get the suggestion
@@ -2002,7 +2944,7 @@ class DatabaseManager:
     def reject_suggested_todo(self, suggestion_id: str) -> bool:
         """Reject a suggested todo."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='reject_suggested_todo') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE suggested_todos 
@@ -2021,7 +2963,7 @@ class DatabaseManager:
     def save_news_article(self, article_data: Dict[str, Any]) -> bool:
         """Save a news article to the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_news_article') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO news_articles 
@@ -2046,10 +2988,92 @@ class DatabaseManager:
             logger.error(f"Error saving news article: {e}")
             return False
     
+    def save_news_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """Upsert many news articles in one transaction. Returns the number of rows written.
+        
+        Existing articles keep is_read and is_liked. created_at is refreshed
+        so articles still being collected are not cleaned up as stale.
+        """
+        if not articles:
+            return 0
+        rows = [(
+            article_data.get('id'),
+            article_data.get('title'),
+            article_data.get('url'),
+            article_data.get('snippet'),
+            article_data.get('image_url'),
+            article_data.get('source'),
+            article_data.get('published_date'),
+            json.dumps(article_data.get('topics', [])),
+            article_data.get('relevance_score', 0.0),
+            article_data.get('user_feedback')
+        ) for article_data in articles]
+        try:
+            with self.get_connection(op='save_news_articles') as conn:
+                conn.executemany("""
+                    INSERT INTO news_articles 
+                    (id, title, url, snippet, image_url, source, published_date, topics, relevance_score, user_feedback)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        url = excluded.url,
+                        snippet = excluded.snippet,
+                        image_url = excluded.image_url,
+                        source = excluded.source,
+                        published_date = excluded.published_date,
+                        topics = excluded.topics,
+                        relevance_score = excluded.relevance_score,
+                        user_feedback = excluded.user_feedback,
+                        created_at = CURRENT_TIMESTAMP
+                """, rows)
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving news articles: {e}")
+            return 0
+    
+    def save_vanity_alerts(self, alerts: List[Dict[str, Any]]) -> int:
+        """Upsert many vanity alerts in one transaction. Returns the number of rows written.
+        
+        Existing alerts keep is_liked, is_dismissed and other user feedback.
+        """
+        if not alerts:
+            return 0
+        rows = [(
+            alert.get('id'),
+            alert.get('title'),
+            alert.get('url'),
+            alert.get('source'),
+            alert.get('search_term'),
+            alert.get('timestamp'),
+            alert.get('confidence_score', 0.0),
+            alert.get('snippet') or ''
+        ) for alert in alerts]
+        try:
+            with self.get_connection(op='save_vanity_alerts') as conn:
+                conn.executemany("""
+                    INSERT INTO vanity_alerts 
+                    (id, title, url, source, search_term, timestamp, confidence_score, snippet)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        url = excluded.url,
+                        source = excluded.source,
+                        search_term = excluded.search_term,
+                        timestamp = excluded.timestamp,
+                        confidence_score = excluded.confidence_score,
+                        snippet = excluded.snippet
+                """, rows)
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving vanity alerts: {e}")
+            return 0
+    
     def mark_article_read(self, article_id: str) -> bool:
         """Mark a news article as read."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='mark_article_read') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE news_articles SET is_read = 1 WHERE id = ?
@@ -2063,7 +3087,7 @@ class DatabaseManager:
     def get_unread_articles(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get unread news articles."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_unread_articles') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, url, snippet, image_url, source, published_date, topics, relevance_score, is_liked, is_read
@@ -2095,7 +3119,7 @@ class DatabaseManager:
     def save_music_content(self, music_data: Dict[str, Any]) -> bool:
         """Save music content to the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_music_content') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO music_content 
@@ -2123,7 +3147,7 @@ class DatabaseManager:
     def save_playlist(self, playlist_data: Dict[str, Any]) -> bool:
         """Save a music playlist to the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_playlist') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO music_playlists 
@@ -2148,7 +3172,7 @@ class DatabaseManager:
     def get_playlists(self) -> List[Dict[str, Any]]:
         """Get all saved playlists from the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_playlists') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, name, mood, artists, genres, tracks, created_at, updated_at
@@ -2176,7 +3200,7 @@ class DatabaseManager:
     def get_playlist(self, playlist_id: str) -> Optional[Dict[str, Any]]:
         """Get a single playlist by ID."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_playlist') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, name, mood, artists, genres, tracks, created_at, updated_at
@@ -2202,7 +3226,7 @@ class DatabaseManager:
     def delete_playlist(self, playlist_id: str) -> bool:
         """Delete a playlist from the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='delete_playlist') as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM music_playlists WHERE id = ?", (playlist_id,))
                 conn.commit()
@@ -2217,7 +3241,7 @@ class DatabaseManager:
     def save_liked_song(self, artist: str, title: str, youtube_id: str = None) -> bool:
         """Save a liked song to the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_liked_song') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO liked_songs (artist, title, youtube_id, liked_at)
@@ -2233,7 +3257,7 @@ class DatabaseManager:
     def remove_liked_song(self, artist: str, title: str) -> bool:
         """Remove a song from liked songs."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='remove_liked_song') as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM liked_songs WHERE artist = ? AND title = ?", (artist, title))
                 conn.commit()
@@ -2245,7 +3269,7 @@ class DatabaseManager:
     def get_liked_songs(self) -> List[Dict[str, Any]]:
         """Get all liked songs from the database."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_liked_songs') as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT artist, title, youtube_id, liked_at
@@ -2260,7 +3284,7 @@ class DatabaseManager:
     def is_song_liked(self, artist: str, title: str) -> bool:
         """Check if a song is liked."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='is_song_liked') as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1 FROM liked_songs WHERE artist = ? AND title = ?", (artist, title))
                 return cursor.fetchone() is not None
@@ -2321,7 +3345,7 @@ class DatabaseManager:
     def like_content(self, content_type: str, content_id: str, is_liked: bool = True) -> bool:
         """Mark content as liked/unliked and update personality profile."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='like_content') as conn:
                 cursor = conn.cursor()
                 
                 # Update the content table
@@ -2424,7 +3448,7 @@ class DatabaseManager:
         cleanup_stats = {'news': 0, 'music': 0, 'vanity_alerts': 0, 'preserved': 0}
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='cleanup_unliked_content') as conn:
                 cursor = conn.cursor()
                 cutoff_date = datetime.now() - timedelta(days=1)  # Content from yesterday
                 
@@ -2497,7 +3521,7 @@ class DatabaseManager:
     def get_personality_profile(self) -> Dict[str, Any]:
         """Get user's personality profile based on liked content."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_personality_profile') as conn:
                 cursor = conn.cursor()
                 
                 # Get preference statistics
@@ -2551,7 +3575,7 @@ class DatabaseManager:
     def get_liked_content_summary(self) -> Dict[str, Any]:
         """Get summary of all liked content for AI personality training."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_liked_content_summary') as conn:
                 cursor = conn.cursor()
                 
                 # Get liked news
@@ -2592,13 +3616,14 @@ class DatabaseManager:
     
     def get_database_stats(self) -> Dict[str, int]:
         """Get database statistics."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_database_stats') as conn:
             cursor = conn.cursor()
             
             stats = {}
             
             # Count records in each table
-            tables = ['credentials', 'auth_tokens', 'collected_data', 'settings', 'dashboard_sessions']
+            tables = ['credentials', 'auth_tokens', 'collected_items', 'settings', 'dashboard_sessions',
+                      'news_articles', 'vanity_alerts', 'ai_messages', 'trust_audit_log', 'scanned_sources']
             for table in tables:
                 cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
                 stats[table] = cursor.fetchone()['count']
@@ -2610,6 +3635,10 @@ class DatabaseManager:
             else:
                 stats['database_size_mb'] = 0
             
+            stats['connection_pool'] = self.get_pool_stats()
+            stats['settings_cache'] = self._settings_cache.get_stats()
+            stats['maintenance'] = self.get_maintenance_stats()
+            
             return stats
 
     async def unlike_content(self, content_id: str, content_type: str) -> bool:
@@ -2619,7 +3648,7 @@ class DatabaseManager:
     async def save_music_feedback(self, content_id: str, feedback: str) -> bool:
         """Save user feedback for music content."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_music_feedback') as conn:
                 cursor = conn.cursor()
                 
                 # Update the music content with feedback
@@ -2642,7 +3671,7 @@ class DatabaseManager:
     async def get_liked_content(self, content_type: str = None) -> List[Dict[str, Any]]:
         """Get all liked content, optionally filtered by type."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_liked_content') as conn:
                 cursor = conn.cursor()
                 
                 liked_content = []
@@ -2733,7 +3762,7 @@ class DatabaseManager:
                           category: str = None, confidence_score: float = 0.5, notes: str = None) -> bool:
         """Save user feedback (like/dislike) for AI training."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='save_user_feedback') as conn:
                 cursor = conn.cursor()
                 
                 # Convert metadata to JSON string
@@ -2759,7 +3788,7 @@ class DatabaseManager:
                          limit: int = 100) -> List[Dict[str, Any]]:
         """Get user feedback for AI training analysis."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_user_feedback') as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT * FROM user_feedback WHERE 1=1"
@@ -2806,7 +3835,7 @@ class DatabaseManager:
     def get_user_preferences_summary(self) -> Dict[str, Any]:
         """Get summary of user preferences for AI training."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_user_preferences_summary') as conn:
                 cursor = conn.cursor()
                 
                 # Get feedback counts by type and category
@@ -2850,7 +3879,7 @@ class DatabaseManager:
     def get_rated_item_ids(self, item_type: str = None) -> Set[str]:
         """Get set of item IDs that have been rated (liked or disliked) to filter them out."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_rated_item_ids') as conn:
                 cursor = conn.cursor()
                 
                 query = "SELECT DISTINCT item_id FROM user_feedback WHERE 1=1"
@@ -2870,7 +3899,7 @@ class DatabaseManager:
     def get_liked_items(self, item_type: str = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get items that have been liked for the 'Liked Items' section."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='get_liked_items') as conn:
                 cursor = conn.cursor()
                 
                 query = """
@@ -2914,7 +3943,7 @@ class DatabaseManager:
     # AI Assistant methods
     def save_ai_provider(self, name: str, provider_type: str, config: Dict[str, Any]) -> str:
         """Save AI provider configuration - updates if exists, creates if new."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_ai_provider') as conn:
             cursor = conn.cursor()
             
             # Check if provider with this type and model already exists
@@ -2963,7 +3992,7 @@ class DatabaseManager:
 
     def get_ai_providers(self, active_only: bool = False) -> List[Dict[str, Any]]:
         """Get AI providers."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_ai_providers') as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM ai_providers"
             if active_only:
@@ -2988,7 +4017,7 @@ class DatabaseManager:
 
     def save_ai_conversation(self, conversation_id: str, provider_id: int, title: str = None, context: Dict = None):
         """Save AI conversation."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_ai_conversation') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO ai_conversations (id, provider_id, title, context_data, updated_at)
@@ -2998,7 +4027,7 @@ class DatabaseManager:
 
     def save_ai_message(self, message_id: str, conversation_id: str, role: str, content: str, metadata: Dict = None):
         """Save AI message."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_ai_message') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO ai_messages (id, conversation_id, role, content, metadata)
@@ -3008,7 +4037,7 @@ class DatabaseManager:
 
     def get_ai_conversation_history(self, conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get AI conversation history."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_ai_conversation_history') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM ai_messages 
@@ -3027,7 +4056,7 @@ class DatabaseManager:
     def save_ai_training_data(self, data_type: str, content: str, context: str = None, 
                              source_table: str = None, source_id: str = None, relevance_score: float = 0.5):
         """Save training data for AI models."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_ai_training_data') as conn:
             cursor = conn.cursor()
             training_id = f"training_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
             cursor.execute("""
@@ -3039,7 +4068,7 @@ class DatabaseManager:
 
     def get_ai_training_data(self, data_types: List[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get training data for AI models."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_ai_training_data') as conn:
             cursor = conn.cursor()
             
             if data_types:
@@ -3063,7 +4092,7 @@ class DatabaseManager:
     def update_ai_training_from_feedback(self):
         """Update training data based on user feedback."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='update_ai_training_from_feedback') as conn:
                 cursor = conn.cursor()
                 
                 # Get recent liked items for training
@@ -3101,7 +4130,7 @@ class DatabaseManager:
     # News Sources Management
     def add_news_source(self, name: str, url: str, category: str = 'general', is_custom: bool = True) -> int:
         """Add a new news source."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='add_news_source') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO news_sources (name, url, category, is_custom)
@@ -3112,7 +4141,7 @@ class DatabaseManager:
 
     def get_news_sources(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all news sources."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_news_sources') as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM news_sources"
             if active_only:
@@ -3124,7 +4153,7 @@ class DatabaseManager:
 
     def update_news_source_preference(self, source_id: int, preference: int):
         """Update user preference for a news source (0-5 scale)."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='update_news_source_preference') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE news_sources 
@@ -3135,7 +4164,7 @@ class DatabaseManager:
 
     def toggle_news_source(self, source_id: int, active: bool):
         """Toggle news source active status."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='toggle_news_source') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE news_sources 
@@ -3146,7 +4175,7 @@ class DatabaseManager:
 
     def update_news_source_stats(self, source_id: int, success: bool = True):
         """Update news source fetch statistics."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='update_news_source_stats') as conn:
             cursor = conn.cursor()
             if success:
                 cursor.execute("""
@@ -3166,7 +4195,7 @@ class DatabaseManager:
     # Investment Tracking
     def save_investment_data(self, symbol: str, name: str, inv_type: str, data: Dict[str, Any]):
         """Save investment data."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_investment_data') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO investments 
@@ -3183,7 +4212,7 @@ class DatabaseManager:
 
     def get_tracked_investments(self) -> List[Dict[str, Any]]:
         """Get all tracked investments."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_tracked_investments') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM investments WHERE is_tracked = 1 
@@ -3193,7 +4222,7 @@ class DatabaseManager:
 
     def toggle_investment_tracking(self, investment_id: int, tracked: bool):
         """Toggle investment tracking."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='toggle_investment_tracking') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE investments SET is_tracked = ? WHERE id = ?
@@ -3204,7 +4233,7 @@ class DatabaseManager:
     def save_local_service(self, service_name: str, port: int, ip_address: str = '127.0.0.1', 
                           service_type: str = 'web', endpoint_url: str = None):
         """Save or update local service information."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_local_service') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO local_services 
@@ -3216,7 +4245,7 @@ class DatabaseManager:
 
     def update_service_status(self, service_id: int, status: str, response_time: float = None):
         """Update service status and response time."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='update_service_status') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE local_services 
@@ -3227,7 +4256,7 @@ class DatabaseManager:
 
     def get_monitored_services(self) -> List[Dict[str, Any]]:
         """Get all monitored services."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_monitored_services') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM local_services WHERE is_monitored = 1 
@@ -3240,7 +4269,7 @@ class DatabaseManager:
                            device_type: str = None, manufacturer: str = None, open_ports: List[int] = None,
                            services: List[str] = None, is_online: bool = True, response_time: float = None):
         """Save or update network device information."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='save_network_device') as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO network_devices 
@@ -3257,7 +4286,7 @@ class DatabaseManager:
 
     def get_network_devices(self, online_only: bool = False) -> List[Dict[str, Any]]:
         """Get network devices."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='get_network_devices') as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM network_devices"
             if online_only:
@@ -3280,7 +4309,7 @@ class DatabaseManager:
 
     def start_ai_model_training(self, provider_id: int, training_data_hash: str) -> str:
         """Start AI model training."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='start_ai_model_training') as conn:
             cursor = conn.cursor()
             training_id = f"training_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             cursor.execute("""
@@ -3293,7 +4322,7 @@ class DatabaseManager:
     def update_ai_model_training_status(self, training_id: str, status: str, model_version: str = None, 
                                        performance_metrics: Dict = None, error_log: str = None):
         """Update AI model training status."""
-        with self.get_connection() as conn:
+        with self.get_connection(op='update_ai_model_training_status') as conn:
             cursor = conn.cursor()
             
             update_fields = ["training_status = ?"]
@@ -3326,58 +4355,57 @@ class DatabaseManager:
     def save_dashboard_project(self, project_data: Dict[str, Any]) -> int:
         """Save or update a dashboard project configuration."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='save_dashboard_project') as conn:
+                cursor = conn.cursor()
             
-            # Debug logging
-            logger.info(f"Saving dashboard - start_command: {project_data.get('start_command')}")
-            logger.info(f"Saving dashboard - production_url: {project_data.get('production_url')}")
-            logger.info(f"Saving dashboard - api_url: {project_data.get('api_url')}")
+                # Debug logging
+                logger.info(f"Saving dashboard - start_command: {project_data.get('start_command')}")
+                logger.info(f"Saving dashboard - production_url: {project_data.get('production_url')}")
+                logger.info(f"Saving dashboard - api_url: {project_data.get('api_url')}")
             
-            cursor.execute("""
-                INSERT INTO dashboard_projects 
-                (name, path, type, port, start_command, url, github_pages_url, 
-                 custom_domain, brand, description, health_endpoint, production_url, 
-                 api_url, is_active, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(name) DO UPDATE SET
-                    path = excluded.path,
-                    type = excluded.type,
-                    port = excluded.port,
-                    start_command = excluded.start_command,
-                    url = excluded.url,
-                    github_pages_url = excluded.github_pages_url,
-                    custom_domain = excluded.custom_domain,
-                    brand = excluded.brand,
-                    description = excluded.description,
-                    health_endpoint = excluded.health_endpoint,
-                    production_url = excluded.production_url,
-                    api_url = excluded.api_url,
-                    is_active = excluded.is_active,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (
-                project_data.get('name'),
-                project_data.get('path', ''),
-                project_data.get('type'),
-                project_data.get('port'),
-                project_data.get('start_command'),
-                project_data.get('url'),
-                project_data.get('github_pages_url'),
-                project_data.get('custom_domain'),
-                project_data.get('brand'),
-                project_data.get('description'),
-                project_data.get('health_endpoint'),
-                project_data.get('production_url'),
-                project_data.get('api_url'),
-                project_data.get('is_active', 1) if isinstance(project_data.get('is_active'), int) else (1 if project_data.get('active', True) else 0)
-            ))
+                cursor.execute("""
+                    INSERT INTO dashboard_projects 
+                    (name, path, type, port, start_command, url, github_pages_url, 
+                     custom_domain, brand, description, health_endpoint, production_url, 
+                     api_url, is_active, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(name) DO UPDATE SET
+                        path = excluded.path,
+                        type = excluded.type,
+                        port = excluded.port,
+                        start_command = excluded.start_command,
+                        url = excluded.url,
+                        github_pages_url = excluded.github_pages_url,
+                        custom_domain = excluded.custom_domain,
+                        brand = excluded.brand,
+                        description = excluded.description,
+                        health_endpoint = excluded.health_endpoint,
+                        production_url = excluded.production_url,
+                        api_url = excluded.api_url,
+                        is_active = excluded.is_active,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (
+                    project_data.get('name'),
+                    project_data.get('path', ''),
+                    project_data.get('type'),
+                    project_data.get('port'),
+                    project_data.get('start_command'),
+                    project_data.get('url'),
+                    project_data.get('github_pages_url'),
+                    project_data.get('custom_domain'),
+                    project_data.get('brand'),
+                    project_data.get('description'),
+                    project_data.get('health_endpoint'),
+                    project_data.get('production_url'),
+                    project_data.get('api_url'),
+                    project_data.get('is_active', 1) if isinstance(project_data.get('is_active'), int) else (1 if project_data.get('active', True) else 0)
+                ))
             
-            project_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+                project_id = cursor.lastrowid
+                conn.commit()
             
-            logger.info(f"Saved dashboard project: {project_data.get('name')}")
-            return project_id
+                logger.info(f"Saved dashboard project: {project_data.get('name')}")
+                return project_id
             
         except Exception as e:
             logger.error(f"Error saving dashboard project: {e}")
@@ -3386,20 +4414,18 @@ class DatabaseManager:
     def get_dashboard_projects(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all saved dashboard projects."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            with self.get_connection(op='get_dashboard_projects') as conn:
+                cursor = conn.cursor()
             
-            query = "SELECT * FROM dashboard_projects"
-            if active_only:
-                query += " WHERE is_active = 1"
-            query += " ORDER BY name"
+                query = "SELECT * FROM dashboard_projects"
+                if active_only:
+                    query += " WHERE is_active = 1"
+                query += " ORDER BY name"
             
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            conn.close()
+                cursor.execute(query)
+                rows = cursor.fetchall()
             
-            return [dict(row) for row in rows]
+                return [dict(row) for row in rows]
             
         except Exception as e:
             logger.error(f"Error getting dashboard projects: {e}")
@@ -3408,43 +4434,42 @@ class DatabaseManager:
     def update_dashboard_project(self, name: str, updates: Dict[str, Any]) -> bool:
         """Update specific fields of a dashboard project."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='update_dashboard_project') as conn:
+                cursor = conn.cursor()
             
-            # Build dynamic update query
-            update_fields = []
-            params = []
+                # Build dynamic update query
+                update_fields = []
+                params = []
             
-            allowed_fields = ['path', 'type', 'port', 'start_command', 'url', 
-                            'github_pages_url', 'custom_domain', 'brand', 
-                            'description', 'health_endpoint', 'production_url', 
-                            'api_url', 'is_active']
+                allowed_fields = ['path', 'type', 'port', 'start_command', 'url', 
+                                'github_pages_url', 'custom_domain', 'brand', 
+                                'description', 'health_endpoint', 'production_url', 
+                                'api_url', 'is_active']
             
-            for field in allowed_fields:
-                if field in updates:
-                    update_fields.append(f"{field} = ?")
-                    params.append(updates[field])
+                for field in allowed_fields:
+                    if field in updates:
+                        update_fields.append(f"{field} = ?")
+                        params.append(updates[field])
             
-            if not update_fields:
-                return False
+                if not update_fields:
+                    return False
             
-            update_fields.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(name)
+                update_fields.append("updated_at = CURRENT_TIMESTAMP")
+                params.append(name)
             
-            cursor.execute(f"""
-                UPDATE dashboard_projects 
-                SET {', '.join(update_fields)}
-                WHERE name = ?
-            """, params)
+                cursor.execute(f"""
+                    UPDATE dashboard_projects 
+                    SET {', '.join(update_fields)}
+                    WHERE name = ?
+                """, params)
             
-            affected = cursor.rowcount
-            conn.commit()
-            conn.close()
+                affected = cursor.rowcount
+                conn.commit()
             
-            if affected > 0:
-                logger.info(f"Updated dashboard project: {name}")
-                return True
-            return False
+                if affected > 0:
+                    logger.info(f"Updated dashboard project: {name}")
+                    return True
+                return False
             
         except Exception as e:
             logger.error(f"Error updating dashboard project {name}: {e}")
@@ -3453,18 +4478,17 @@ class DatabaseManager:
     def delete_dashboard_project(self, name: str) -> bool:
         """Delete a dashboard project."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='delete_dashboard_project') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("DELETE FROM dashboard_projects WHERE name = ?", (name,))
-            affected = cursor.rowcount
-            conn.commit()
-            conn.close()
+                cursor.execute("DELETE FROM dashboard_projects WHERE name = ?", (name,))
+                affected = cursor.rowcount
+                conn.commit()
             
-            if affected > 0:
-                logger.info(f"Deleted dashboard project: {name}")
-                return True
-            return False
+                if affected > 0:
+                    logger.info(f"Deleted dashboard project: {name}")
+                    return True
+                return False
             
         except Exception as e:
             logger.error(f"Error deleting dashboard project {name}: {e}")
@@ -3474,48 +4498,47 @@ class DatabaseManager:
     def get_user_profile(self) -> Dict[str, Any]:
         """Get user profile for AI personalization."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='get_user_profile') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT full_name, preferred_name, occupation, company, role, 
-                       work_focus, interests, communication_style, timezone, 
-                       work_hours, priorities, bio, updated_at,
-                       github_username, soundcloud_url, bandcamp_url,
-                       music_artist_name, music_label_name, book_title,
-                       project_paths, vanity_search_terms
-                FROM user_profile
-                WHERE id = 1
-            """)
+                cursor.execute("""
+                    SELECT full_name, preferred_name, occupation, company, role, 
+                           work_focus, interests, communication_style, timezone, 
+                           work_hours, priorities, bio, updated_at,
+                           github_username, soundcloud_url, bandcamp_url,
+                           music_artist_name, music_label_name, book_title,
+                           project_paths, vanity_search_terms
+                    FROM user_profile
+                    WHERE id = 1
+                """)
             
-            row = cursor.fetchone()
-            conn.close()
+                row = cursor.fetchone()
             
-            if row:
-                return {
-                    'full_name': row[0],
-                    'preferred_name': row[1],
-                    'occupation': row[2],
-                    'company': row[3],
-                    'role': row[4],
-                    'work_focus': row[5],
-                    'interests': row[6],
-                    'communication_style': row[7],
-                    'timezone': row[8],
-                    'work_hours': row[9],
-                    'priorities': row[10],
-                    'bio': row[11],
-                    'updated_at': row[12],
-                    'github_username': row[13] or '',
-                    'soundcloud_url': row[14] or '',
-                    'bandcamp_url': row[15] or '',
-                    'music_artist_name': row[16] or '',
-                    'music_label_name': row[17] or '',
-                    'book_title': row[18] or '',
-                    'project_paths': row[19] or '[]',
-                    'vanity_search_terms': row[20] or '{}'
-                }
-            return {}
+                if row:
+                    return {
+                        'full_name': row[0],
+                        'preferred_name': row[1],
+                        'occupation': row[2],
+                        'company': row[3],
+                        'role': row[4],
+                        'work_focus': row[5],
+                        'interests': row[6],
+                        'communication_style': row[7],
+                        'timezone': row[8],
+                        'work_hours': row[9],
+                        'priorities': row[10],
+                        'bio': row[11],
+                        'updated_at': row[12],
+                        'github_username': row[13] or '',
+                        'soundcloud_url': row[14] or '',
+                        'bandcamp_url': row[15] or '',
+                        'music_artist_name': row[16] or '',
+                        'music_label_name': row[17] or '',
+                        'book_title': row[18] or '',
+                        'project_paths': row[19] or '[]',
+                        'vanity_search_terms': row[20] or '{}'
+                    }
+                return {}
             
         except Exception as e:
             logger.error(f"Error getting user profile: {e}")
@@ -3524,46 +4547,45 @@ class DatabaseManager:
     def save_user_profile(self, profile: Dict[str, Any]) -> bool:
         """Save or update user profile."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='save_user_profile') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT OR REPLACE INTO user_profile (
-                    id, full_name, preferred_name, occupation, company, role,
-                    work_focus, interests, communication_style, timezone,
-                    work_hours, priorities, bio, updated_at,
-                    github_username, soundcloud_url, bandcamp_url,
-                    music_artist_name, music_label_name, book_title,
-                    project_paths, vanity_search_terms
-                ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP,
-                          ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                profile.get('full_name'),
-                profile.get('preferred_name'),
-                profile.get('occupation'),
-                profile.get('company'),
-                profile.get('role'),
-                profile.get('work_focus'),
-                profile.get('interests'),
-                profile.get('communication_style'),
-                profile.get('timezone'),
-                profile.get('work_hours'),
-                profile.get('priorities'),
-                profile.get('bio'),
-                profile.get('github_username'),
-                profile.get('soundcloud_url'),
-                profile.get('bandcamp_url'),
-                profile.get('music_artist_name'),
-                profile.get('music_label_name'),
-                profile.get('book_title'),
-                profile.get('project_paths'),
-                profile.get('vanity_search_terms')
-            ))
+                cursor.execute("""
+                    INSERT OR REPLACE INTO user_profile (
+                        id, full_name, preferred_name, occupation, company, role,
+                        work_focus, interests, communication_style, timezone,
+                        work_hours, priorities, bio, updated_at,
+                        github_username, soundcloud_url, bandcamp_url,
+                        music_artist_name, music_label_name, book_title,
+                        project_paths, vanity_search_terms
+                    ) VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP,
+                              ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    profile.get('full_name'),
+                    profile.get('preferred_name'),
+                    profile.get('occupation'),
+                    profile.get('company'),
+                    profile.get('role'),
+                    profile.get('work_focus'),
+                    profile.get('interests'),
+                    profile.get('communication_style'),
+                    profile.get('timezone'),
+                    profile.get('work_hours'),
+                    profile.get('priorities'),
+                    profile.get('bio'),
+                    profile.get('github_username'),
+                    profile.get('soundcloud_url'),
+                    profile.get('bandcamp_url'),
+                    profile.get('music_artist_name'),
+                    profile.get('music_label_name'),
+                    profile.get('book_title'),
+                    profile.get('project_paths'),
+                    profile.get('vanity_search_terms')
+                ))
             
-            conn.commit()
-            conn.close()
-            logger.info("User profile saved successfully")
-            return True
+                conn.commit()
+                logger.info("User profile saved successfully")
+                return True
             
         except Exception as e:
             logger.error(f"Error saving user profile: {e}")
@@ -3574,19 +4596,18 @@ class DatabaseManager:
                                   comment: str = None) -> bool:
         """Save feedback for an AI message."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='save_ai_message_feedback') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT INTO ai_message_feedback (
-                    message_id, conversation_id, feedback_type, rating, comment
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (message_id, conversation_id, feedback_type, rating, comment))
+                cursor.execute("""
+                    INSERT INTO ai_message_feedback (
+                        message_id, conversation_id, feedback_type, rating, comment
+                    ) VALUES (?, ?, ?, ?, ?)
+                """, (message_id, conversation_id, feedback_type, rating, comment))
             
-            conn.commit()
-            conn.close()
-            logger.info(f"Saved feedback for message {message_id}: {feedback_type}")
-            return True
+                conn.commit()
+                logger.info(f"Saved feedback for message {message_id}: {feedback_type}")
+                return True
             
         except Exception as e:
             logger.error(f"Error saving message feedback: {e}")
@@ -3595,25 +4616,24 @@ class DatabaseManager:
     def get_conversation_feedback_stats(self, conversation_id: str) -> Dict[str, Any]:
         """Get feedback statistics for a conversation."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self.get_connection(op='get_conversation_feedback_stats') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT feedback_type, COUNT(*), AVG(rating)
-                FROM ai_message_feedback
-                WHERE conversation_id = ?
-                GROUP BY feedback_type
-            """, (conversation_id,))
+                cursor.execute("""
+                    SELECT feedback_type, COUNT(*), AVG(rating)
+                    FROM ai_message_feedback
+                    WHERE conversation_id = ?
+                    GROUP BY feedback_type
+                """, (conversation_id,))
             
-            stats = {}
-            for row in cursor.fetchall():
-                stats[row[0]] = {
-                    'count': row[1],
-                    'avg_rating': row[2] if row[2] else 0
-                }
+                stats = {}
+                for row in cursor.fetchall():
+                    stats[row[0]] = {
+                        'count': row[1],
+                        'avg_rating': row[2] if row[2] else 0
+                    }
             
-            conn.close()
-            return stats
+                return stats
             
         except Exception as e:
             logger.error(f"Error getting feedback stats: {e}")
@@ -3623,7 +4643,7 @@ class DatabaseManager:
     def add_safe_sender(self, sender_email: str, reason: str = "User marked as safe") -> bool:
         """Add an email sender to the safe senders whitelist."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='add_safe_sender') as conn:
                 # Extract domain from email
                 import re
                 domain_match = re.search(r'@([a-zA-Z0-9.-]+)', sender_email)
@@ -3649,7 +4669,7 @@ class DatabaseManager:
     def is_safe_sender(self, sender_email: str) -> bool:
         """Check if an email sender is in the safe senders whitelist."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(op='is_safe_sender') as conn:
                 result = conn.execute("""
                     SELECT id FROM safe_email_senders
                     WHERE sender_email = ? COLLATE NOCASE
@@ -3664,17 +4684,17 @@ class DatabaseManager:
     def is_safe_domain(self, domain: str) -> bool:
         """Check if a domain has any safe senders."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.get_connection(op='is_safe_domain') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id FROM safe_email_senders
-                WHERE sender_domain = ? COLLATE NOCASE
-                LIMIT 1
-            """, (domain.lower(),))
+                cursor.execute("""
+                    SELECT id FROM safe_email_senders
+                    WHERE sender_domain = ? COLLATE NOCASE
+                    LIMIT 1
+                """, (domain.lower(),))
             
-            result = cursor.fetchone()
-            return result is not None
+                result = cursor.fetchone()
+                return result is not None
             
         except Exception as e:
             logger.error(f"Error checking safe domain {domain}: {e}")
@@ -3683,28 +4703,28 @@ class DatabaseManager:
     def get_safe_senders(self) -> List[Dict[str, Any]]:
         """Get all safe senders."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.get_connection(op='get_safe_senders') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT sender_email, sender_domain, added_reason, 
-                       marked_safe_count, last_seen, created_at
-                FROM safe_email_senders
-                ORDER BY last_seen DESC
-            """)
+                cursor.execute("""
+                    SELECT sender_email, sender_domain, added_reason, 
+                           marked_safe_count, last_seen, created_at
+                    FROM safe_email_senders
+                    ORDER BY last_seen DESC
+                """)
             
-            safe_senders = []
-            for row in cursor.fetchall():
-                safe_senders.append({
-                    'sender_email': row[0],
-                    'sender_domain': row[1],
-                    'added_reason': row[2],
-                    'marked_safe_count': row[3],
-                    'last_seen': row[4],
-                    'created_at': row[5]
-                })
+                safe_senders = []
+                for row in cursor.fetchall():
+                    safe_senders.append({
+                        'sender_email': row[0],
+                        'sender_domain': row[1],
+                        'added_reason': row[2],
+                        'marked_safe_count': row[3],
+                        'last_seen': row[4],
+                        'created_at': row[5]
+                    })
             
-            return safe_senders
+                return safe_senders
             
         except Exception as e:
             logger.error(f"Error getting safe senders: {e}")
@@ -3713,17 +4733,17 @@ class DatabaseManager:
     def remove_safe_sender(self, sender_email: str) -> bool:
         """Remove an email sender from the safe senders whitelist."""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self.get_connection(op='remove_safe_sender') as conn:
+                cursor = conn.cursor()
             
-            cursor.execute("""
-                DELETE FROM safe_email_senders
-                WHERE sender_email = ? COLLATE NOCASE
-            """, (sender_email.lower(),))
+                cursor.execute("""
+                    DELETE FROM safe_email_senders
+                    WHERE sender_email = ? COLLATE NOCASE
+                """, (sender_email.lower(),))
             
-            conn.commit()
-            logger.info(f"Removed safe sender: {sender_email}")
-            return True
+                conn.commit()
+                logger.info(f"Removed safe sender: {sender_email}")
+                return True
             
         except Exception as e:
             logger.error(f"Error removing safe sender {sender_email}: {e}")
@@ -3791,3 +4811,9 @@ def save_collected_data(service_name: str, data_type: str, data: List[Dict[str,
 def get_collected_data(service_name: str, data_type: str, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
     """Get collected data."""
     return db.get_collected_data(service_name, data_type, start_date, end_date)
+
+
+def iter_collected_data(service_name: str, data_type: str, start_date: datetime = None,
+                        end_date: datetime = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """Stream collected data items."""
+    return db.iter_collected_data(service_name, data_type, start_date, end_date, **kwargs)
@@ -0,0 +1,184 @@
+"""
+Async database facade for the Personal Dashboard.
+
+FastAPI handlers are `async def`, so calling DatabaseManager directly runs
+SQLite work on the event loop and stalls every other in-flight request
+(including SSE chat streams). AsyncDatabaseManager mirrors the
+DatabaseManager API but runs each call on a small dedicated pool of DB
+worker threads, which pairs with the WAL-mode connection pool so reads run
+concurrently with collector writes.
+
+Usage:
+    adb = get_async_db()
+    todos = await adb.get_todos(include_completed=False)
+    result = await adb.run(some_sync_function, arg)
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_WORKERS = 4
+
+
+class _ExecutorStats:
+    """Queue depth and latency counters for the DB executor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+
+    def on_submit(self):
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def on_finish(self, queue_wait: float, run_time: float, ok: bool):
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.queue_wait_total += queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            self.run_time_total += run_time
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = max(self.completed + self.failed, 1)
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'avg_queue_wait_ms': round(self.queue_wait_total / finished * 1000, 2),
+                'max_queue_wait_ms': round(self.queue_wait_max * 1000, 2),
+                'avg_run_time_ms': round(self.run_time_total / finished * 1000, 2),
+            }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_executor_workers = DEFAULT_DB_WORKERS
+_stats = _ExecutorStats()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the shared DB executor on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_executor_workers,
+                    thread_name_prefix='db-worker'
+                )
+    return _executor
+
+
+def configure_db_executor(max_workers: int):
+    """Set the DB worker count (takes effect if the executor is not started yet)."""
+    global _executor_workers
+    _executor_workers = max(1, int(max_workers))
+
+
+def shutdown_db_executor(wait: bool = True):
+    """Stop the shared DB executor (called on app shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def get_db_executor_stats() -> Dict[str, Any]:
+    """Return DB executor queue depth and latency counters."""
+    stats = _stats.snapshot()
+    stats['workers'] = _executor_workers
+    return stats
+
+
+async def run_in_db_executor(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking database callable on the DB executor and await it."""
+    loop = asyncio.get_running_loop()
+    submitted_at = time.perf_counter()
+    _stats.on_submit()
+
+    def call():
+        started_at = time.perf_counter()
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            _stats.on_finish(started_at - submitted_at, time.perf_counter() - started_at, ok)
+
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+class AsyncDatabaseManager:
+    """Awaitable mirror of DatabaseManager.
+
+    Any synchronous DatabaseManager method is available under the same name
+    and signature as a coroutine. Methods that are already `async def` are
+    returned unchanged.
+    """
+
+    def __init__(self, db_manager=None):
+        """Wrap a DatabaseManager (defaults to the global instance)."""
+        if db_manager is None:
+            from database import db as db_manager
+        self._db = db_manager
+
+    @property
+    def sync(self):
+        """The wrapped synchronous DatabaseManager."""
+        return self._db
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run an arbitrary blocking callable (e.g. a multi-query unit of work)."""
+        return await run_in_db_executor(func, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._db, name)
+        if not callable(attr) or inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await run_in_db_executor(attr, *args, **kwargs)
+
+        # Cache the wrapper so repeated lookups are a plain attribute read
+        self.__dict__[name] = method
+        return method
+
+
+_async_db: Optional[AsyncDatabaseManager] = None
+
+
+def get_async_db(db_manager=None) -> AsyncDatabaseManager:
+    """Get the async facade for a DatabaseManager (global instance by default)."""
+    global _async_db
+    if db_manager is not None:
+        return AsyncDatabaseManager(db_manager)
+    if _async_db is None:
+        _async_db = AsyncDatabaseManager()
+    return _async_db
@@ -0,0 +1,131 @@
+"""
+Versioned schema migrations.
+
+Each schema owner (the core DatabaseManager schema, or a module with its own
+tables) is a *component* with an ordered list of migrations. Applied versions
+are recorded per component in the schema_version table, and each pending
+migration runs in its own BEGIN IMMEDIATE transaction so concurrent processes
+apply it exactly once.
+
+Within a process, a (database file, component) pair is checked only once;
+after that ensure_schema() returns without touching the database, which
+makes repeated DatabaseManager construction essentially free.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from db_pool import IN_MEMORY_PATHS, resolve_db_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    """One schema step. `apply` receives a cursor inside the migration transaction."""
+
+    version: int
+    name: str
+    apply: Callable
+
+
+# (db key, component) pairs already brought up to date in this process
+_current: Set[Tuple[str, str]] = set()
+_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+def _lock_for(key: Tuple[str, str]) -> threading.Lock:
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            component TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL,
+            PRIMARY KEY (component, version)
+        )
+    """)
+    conn.commit()
+
+
+def get_schema_version(conn, component: str) -> int:
+    """Highest applied version of a component (0 if none)."""
+    row = conn.execute(
+        "SELECT MAX(version) FROM schema_version WHERE component = ?", (component,)
+    ).fetchone()
+    return row[0] or 0
+
+
+def _apply_pending(conn, component: str, migrations: Sequence[Migration]) -> List[int]:
+    _ensure_version_table(conn)
+    current = get_schema_version(conn, component)
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the lock
+            current = get_schema_version(conn, component)
+            if migration.version <= current:
+                conn.rollback()
+                continue
+            started = time.perf_counter()
+            migration.apply(conn.cursor())
+            duration_ms = (time.perf_counter() - started) * 1000
+            conn.execute(
+                "INSERT INTO schema_version (component, version, name, duration_ms) VALUES (?, ?, ?, ?)",
+                (component, migration.version, migration.name, round(duration_ms, 2))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = migration.version
+        applied.append(migration.version)
+        logger.info(f"Applied {component} migration {migration.version} ({migration.name}) in {duration_ms:.1f}ms")
+    return applied
+
+
+def ensure_schema(conn_factory, db_path: str, component: str,
+                  migrations: Sequence[Migration]) -> List[int]:
+    """Apply pending migrations for a component, once per database file per process.
+
+    `conn_factory` is a context manager factory such as
+    DatabaseManager.get_connection. Returns the versions applied by this call.
+    """
+    if db_path in IN_MEMORY_PATHS:
+        with conn_factory() as conn:
+            return _apply_pending(conn, component, migrations)
+
+    key = (resolve_db_key(db_path), component)
+    if key in _current:
+        return []
+    with _lock_for(key):
+        if key in _current:
+            return []
+        with conn_factory() as conn:
+            applied = _apply_pending(conn, component, migrations)
+        _current.add(key)
+        return applied
+
+
+def reset_schema_state(db_path: str = None):
+    """Forget which databases were checked, so the next ensure_schema re-checks."""
+    key = resolve_db_key(db_path) if db_path is not None else None
+    with _locks_lock:
+        for entry in [e for e in _current if key is None or e[0] == key]:
+            _current.discard(entry)
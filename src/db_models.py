@@ -0,0 +1,207 @@
+"""
+Typed row models for hot database reads.
+
+Each model is a slotted dataclass whose field order is the column order of
+its SELECT, so a fetched tuple maps straight onto the model (or onto a dict
+with one shared key tuple) without per-row key lookups. Summary models leave
+out large text columns (email bodies, todo descriptions) for list views.
+
+The SELECT for a (database, table, model) is built once per process from
+PRAGMA table_info; columns missing from older databases are filled with the
+field default in SQL.
+"""
+
+import threading
+from dataclasses import dataclass, fields, MISSING
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T', bound='RowModel')
+
+
+class RowModel:
+    """Base for row models. Supports read-only dict-style access."""
+
+    __slots__ = ()
+
+    # Columns stored as 0/1 integers that should be exposed as bools
+    BOOL_FIELDS: Tuple[str, ...] = ()
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        names = cls.__dict__.get('_field_names')
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            setattr(cls, '_field_names', names)
+        return names
+
+    @classmethod
+    def field_defaults(cls) -> Tuple[Any, ...]:
+        defaults = cls.__dict__.get('_field_defaults')
+        if defaults is None:
+            defaults = tuple(None if f.default is MISSING else f.default for f in fields(cls))
+            setattr(cls, '_field_defaults', defaults)
+        return defaults
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        return bool(value) if key in self.BOOL_FIELDS else value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.field_names()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.field_names()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict with bool columns converted (JSON-serializable)."""
+        data = dict(zip(self.field_names(), (getattr(self, name) for name in self.field_names())))
+        for name in self.BOOL_FIELDS:
+            data[name] = bool(data[name])
+        return data
+
+
+@dataclass(slots=True)
+class TodoSummaryRow(RowModel):
+    """Todo columns needed by list views (no description/preview text)."""
+
+    BOOL_FIELDS = ('requires_response',)
+
+    id: str = ''
+    title: str = ''
+    due_date: Optional[str] = None
+    priority: str = 'medium'
+    category: str = 'general'
+    source: str = 'manual'
+    source_id: Optional[str] = None
+    source_title: str = ''
+    source_url: str = ''
+    status: str = 'pending'
+    assigned_to_service: Optional[str] = None
+    requires_response: int = 0
+    email_id: Optional[str] = None
+    created_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+    @property
+    def gmail_link(self) -> Optional[str]:
+        return f"https://mail.google.com/mail/u/0/#inbox/{self.email_id}" if self.email_id else None
+
+
+@dataclass(slots=True)
+class TodoRow(TodoSummaryRow):
+    """Full todo row including free-text columns."""
+
+    description: str = ''
+    source_preview: str = ''
+    creation_reason: str = ''
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Serialize for /api/tasks."""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'priority': self.priority,
+            'category': self.category,
+            'status': self.status,
+            'source': self.source,
+            'source_id': self.source_id,
+            'source_title': self.source_title,
+            'source_url': self.source_url,
+            'source_preview': self.source_preview,
+            'creation_reason': self.creation_reason,
+            'due_date': self.due_date,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at,
+            'requires_response': bool(self.requires_response),
+            'email_id': self.email_id,
+            'gmail_link': self.gmail_link
+        }
+
+
+@dataclass(slots=True)
+class EmailSummaryRow(RowModel):
+    """Email columns needed by list views (no body)."""
+
+    BOOL_FIELDS = ('is_analyzed', 'has_todos', 'is_archived')
+
+    id: str = ''
+    subject: str = ''
+    sender: str = ''
+    recipient: Optional[str] = None
+    received_date: Optional[str] = None
+    priority: str = 'medium'
+    is_analyzed: int = 0
+    ollama_priority: Optional[str] = None
+    has_todos: int = 0
+    is_archived: int = 0
+    created_at: Optional[str] = None
+
+
+@dataclass(slots=True)
+class EmailRow(EmailSummaryRow):
+    """Full email row including the body."""
+
+    body: Optional[str] = None
+
+
+# Projection cache: (db key, table, model) -> SELECT column list
+_projection_cache: Dict[Tuple[str, str, type], str] = {}
+_projection_lock = threading.Lock()
+
+
+def _sql_literal(value: Any) -> str:
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def projection(conn, db_key: str, table: str, model: Type[RowModel]) -> str:
+    """Return the cached column list that selects `model` fields in order."""
+    cache_key = (db_key, table, model)
+    columns = _projection_cache.get(cache_key)
+    if columns is None:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        parts = []
+        for name, default in zip(model.field_names(), model.field_defaults()):
+            parts.append(name if name in existing else f"{_sql_literal(default)} AS {name}")
+        columns = ', '.join(parts)
+        with _projection_lock:
+            _projection_cache[cache_key] = columns
+    return columns
+
+
+def clear_projection_cache(db_key: Optional[str] = None):
+    """Forget cached projections (after a schema change)."""
+    with _projection_lock:
+        for key in [k for k in _projection_cache if db_key is None or k[0] == db_key]:
+            del _projection_cache[key]
+
+
+def rows_to_models(model: Type[T], rows: Iterable[tuple]) -> List[T]:
+    """Map positional rows onto model instances."""
+    return [model(*row) for row in rows]
+
+
+def rows_to_dicts(model: Type[RowModel], rows: Iterable[tuple]) -> List[Dict[str, Any]]:
+    """Map positional rows onto plain dicts sharing one key tuple."""
+    keys = model.field_names()
+    bool_fields = model.BOOL_FIELDS
+    result = []
+    for row in rows:
+        data = dict(zip(keys, row))
+        for name in bool_fields:
+            data[name] = bool(data[name])
+        result.append(data)
+    return result
@@ -0,0 +1,389 @@
+"""
+Shared SQLite connection pool for the Personal Dashboard.
+
+Every DatabaseManager for the same database file shares one pool. Connections
+are reused across calls, configured once with WAL journaling and tuned pragmas,
+and checked out reentrantly so nested DatabaseManager calls made by the same
+thread or asyncio task reuse the connection they already hold.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pool defaults
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_ACQUIRE_TIMEOUT = 30.0     # seconds to wait for a free connection
+DEFAULT_BUSY_TIMEOUT_MS = 5000     # SQLite-level wait on a locked database
+DEFAULT_LOCK_RETRIES = 3           # extra attempts after busy_timeout expires
+LOCK_RETRY_BASE_DELAY = 0.05       # seconds, doubled per attempt
+
+# Per-connection pragmas (journal_mode is handled separately, it is per file)
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    'synchronous': 'NORMAL',       # safe with WAL, avoids an fsync per commit
+    'cache_size': -16000,          # 16 MB page cache per connection
+    'mmap_size': 134217728,        # 128 MB memory-mapped reads
+    'temp_store': 'MEMORY',
+    'recursive_triggers': 'ON',    # REPLACE fires delete triggers (search index sync)
+    'auto_vacuum': 'INCREMENTAL',  # only takes effect on new files (retention vacuums)
+}
+
+IN_MEMORY_PATHS = {':memory:', ''}
+
+
+def _is_lock_error(error: Exception) -> bool:
+    """Return True if an OperationalError means the database is locked/busy."""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def _current_owner() -> Tuple[int, Optional[int]]:
+    """Identify the caller as (thread id, asyncio task id)."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), id(task) if task is not None else None
+
+
+class PoolStats:
+    """Thread-safe counters describing pool usage and contention."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.reentrant_checkouts = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.connections_created = 0
+        self.connections_discarded = 0
+        self.rollbacks_on_release = 0
+        self.lock_retries = 0
+        self.lock_failures = 0
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'reentrant_checkouts': self.reentrant_checkouts,
+                'waits': self.waits,
+                'wait_time_total_ms': round(self.wait_time_total * 1000, 2),
+                'wait_time_max_ms': round(self.wait_time_max * 1000, 2),
+                'timeouts': self.timeouts,
+                'connections_created': self.connections_created,
+                'connections_discarded': self.connections_discarded,
+                'rollbacks_on_release': self.rollbacks_on_release,
+                'lock_retries': self.lock_retries,
+                'lock_failures': self.lock_failures,
+            }
+
+
+class PooledCursor(sqlite3.Cursor):
+    """Cursor that retries statements rejected with 'database is locked'."""
+
+    def execute(self, sql, parameters=()):
+        return self.connection._with_lock_retry(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Materialize generators so a retry can replay the same rows
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        return self.connection._with_lock_retry(super().executemany, sql, seq_of_parameters)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection owned by a SQLiteConnectionPool."""
+
+    pool: Optional['SQLiteConnectionPool'] = None
+
+    def cursor(self, factory=PooledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        return self._with_lock_retry(super().commit)
+
+    def _with_lock_retry(self, func, *args):
+        pool = self.pool
+        attempts = pool.lock_retries if pool else 0
+        for attempt in range(attempts + 1):
+            try:
+                return func(*args)
+            except sqlite3.OperationalError as e:
+                if not _is_lock_error(e) or attempt >= attempts:
+                    if pool and _is_lock_error(e):
+                        pool.stats.incr('lock_failures')
+                    raise
+                pool.stats.incr('lock_retries')
+                delay = LOCK_RETRY_BASE_DELAY * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay))
+
+
+class _Checkout:
+    """A connection held by one owner, with a reentrancy depth."""
+
+    __slots__ = ('conn', 'owner', 'depth')
+
+    def __init__(self, conn: PooledConnection, owner: Tuple[int, Optional[int]]):
+        self.conn = conn
+        self.owner = owner
+        self.depth = 1
+
+
+class SQLiteConnectionPool:
+    """Bounded pool of reusable, pre-configured SQLite connections."""
+
+    def __init__(self, db_path: str, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 lock_retries: int = DEFAULT_LOCK_RETRIES,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+                 pragmas: Optional[Dict[str, Any]] = None):
+        self.db_path = db_path
+        self.in_memory = db_path in IN_MEMORY_PATHS
+        # An in-memory database only exists on its own connection, so it
+        # must be served by exactly one shared connection.
+        self.max_connections = 1 if self.in_memory else max(1, max_connections)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock_retries = lock_retries
+        self.acquire_timeout = acquire_timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.stats = PoolStats()
+        self.journal_mode: Optional[str] = None
+
+        self._idle: List[PooledConnection] = []
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._checkout: ContextVar[Optional[_Checkout]] = ContextVar(
+            f'sqlite_pool_checkout_{id(self)}', default=None
+        )
+
+    # Connection lifecycle
+
+    def _create_connection(self) -> PooledConnection:
+        """Open and configure a new connection."""
+        if not self.in_memory:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.pool = self
+        conn.row_factory = sqlite3.Row
+
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if 'auto_vacuum' in self.pragmas:
+            # Must precede the WAL switch, which writes the header of a new file
+            try:
+                conn.execute(f"PRAGMA auto_vacuum = {self.pragmas['auto_vacuum']}")
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Could not apply PRAGMA auto_vacuum: {e}")
+        if not self.in_memory and self.journal_mode is None:
+            try:
+                row = conn.execute("PRAGMA journal_mode = WAL").fetchone()
+                self.journal_mode = (row[0] if row else '').lower()
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Could not enable WAL for {self.db_path}: {e}")
+                self.journal_mode = 'unknown'
+        for name, value in self.pragmas.items():
+            if name == 'auto_vacuum':
+                continue
+            try:
+                conn.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Could not apply PRAGMA {name}={value}: {e}")
+
+        self.stats.incr('connections_created')
+        return conn
+
+    def _acquire(self) -> PooledConnection:
+        """Take an idle connection or open a new one, waiting if at capacity."""
+        waited_from = None
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_connections:
+                    self._in_use += 1
+                    conn = None
+                    break
+
+                if waited_from is None:
+                    waited_from = time.perf_counter()
+                remaining = self.acquire_timeout - (time.perf_counter() - waited_from)
+                if remaining <= 0:
+                    self.stats.incr('timeouts')
+                    raise sqlite3.OperationalError(
+                        f"Timed out waiting for a database connection "
+                        f"({self.max_connections} in use)"
+                    )
+                self._condition.wait(remaining)
+
+        if waited_from is not None:
+            self.stats.record_wait(time.perf_counter() - waited_from)
+
+        if conn is None:
+            try:
+                conn = self._create_connection()
+            except Exception:
+                with self._condition:
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+        return conn
+
+    def _release(self, conn: PooledConnection):
+        """Return a connection to the pool, rolling back unfinished work."""
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+                self.stats.incr('rollbacks_on_release')
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            # Closed or broken connection - drop it
+            healthy = False
+
+        with self._condition:
+            self._in_use -= 1
+            if healthy and not self._closed:
+                self._idle.append(conn)
+            else:
+                self.stats.incr('connections_discarded')
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Check out a connection for the current thread or asyncio task.
+
+        Nested checkouts by the same owner return the connection already
+        held, so helper methods called inside a transaction join it instead
+        of blocking on a second connection.
+        """
+        owner = _current_owner()
+        held = self._checkout.get()
+        if held is not None and held.owner == owner:
+            held.depth += 1
+            self.stats.incr('reentrant_checkouts')
+            try:
+                yield held.conn
+            finally:
+                held.depth -= 1
+            return
+
+        conn = self._acquire()
+        self.stats.incr('checkouts')
+        checkout = _Checkout(conn, owner)
+        token = self._checkout.set(checkout)
+        try:
+            yield conn
+        finally:
+            try:
+                self._checkout.reset(token)
+            except ValueError:
+                # Generator finalized from a different context
+                self._checkout.set(None)
+            self._release(conn)
+
+    def holds_connection(self) -> bool:
+        """True if the current thread or task already has a connection checked out."""
+        held = self._checkout.get()
+        return held is not None and held.owner == _current_owner()
+
+    def close(self):
+        """Close idle connections and refuse further checkouts."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool sizing and contention counters."""
+        with self._condition:
+            sizing = {
+                'db_path': self.db_path,
+                'journal_mode': self.journal_mode or ('memory' if self.in_memory else None),
+                'max_connections': self.max_connections,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+            }
+        sizing.update(self.stats.snapshot())
+        return sizing
+
+
+# Pool registry - one pool per database file per process
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=64)
+def resolve_db_key(db_path: str) -> str:
+    """Canonical registry key for a database file (resolved absolute path)."""
+    return str(Path(db_path).resolve())
+
+
+def get_connection_pool(db_path: str) -> SQLiteConnectionPool:
+    """Get the shared pool for a database file, creating it on first use.
+
+    In-memory databases are private to their caller and are never shared.
+    """
+    if db_path in IN_MEMORY_PATHS:
+        return SQLiteConnectionPool(db_path)
+
+    key = resolve_db_key(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLiteConnectionPool(db_path)
+            _pools[key] = pool
+        return pool
+
+
+def get_all_pool_stats() -> List[Dict[str, Any]]:
+    """Return stats for every shared pool in this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.get_stats() for pool in pools]
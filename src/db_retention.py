@@ -0,0 +1,276 @@
+"""
+Retention and compaction for the dashboard database.
+
+Each RetentionPolicy prunes one table by age and/or row cap, never touching
+rows matched by `keep_where` (e.g. liked articles). Deletes run in bounded
+batches, each in its own short transaction with a pause in between, so
+collectors and API writes are never blocked for long. After pruning, freed
+pages are returned to the filesystem with incremental vacuum and the
+planner statistics of the pruned tables are refreshed with ANALYZE.
+
+Policies can be overridden per table with the `retention_policies` setting,
+e.g. {"news_articles": {"max_age_days": 14}, "trust_audit_log": null}. Only
+the limits are overridable; keep rules are SQL and stay defined here.
+Chat history (ai_messages) and the scan dedup rows (scanned_sources) are
+only pruned when the setting opts in, e.g. {"ai_messages": {}}: losing
+them erases conversations or lets old emails create their tasks again.
+
+Age cutoffs are computed by SQLite in the column's time zone (UTC for
+CURRENT_TIMESTAMP defaults, local time for `local_time` policies) and
+compared through datetime(), so 'T'- and space-separated values agree.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_BATCH_PAUSE = 0.05       # seconds between delete batches
+VACUUM_PAGES_PER_STEP = 1024     # pages released per incremental_vacuum call
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionPolicy:
+    """How long rows of one table are kept."""
+
+    table: str
+    timestamp_column: str
+    max_age_days: Optional[int] = None
+    max_rows: Optional[int] = None
+    keep_where: Optional[str] = None
+    local_time: bool = False  # Column holds local datetime.now() values, not UTC CURRENT_TIMESTAMP
+
+
+DEFAULT_POLICIES: Sequence[RetentionPolicy] = (
+    RetentionPolicy('news_articles', 'created_at', max_age_days=30, max_rows=5000, keep_where='is_liked = 1'),
+    # Dismissed alerts are kept so the collector does not bring them back
+    RetentionPolicy('vanity_alerts', 'timestamp', max_age_days=90, max_rows=5000,
+                    keep_where='is_liked = 1 OR is_dismissed = 1', local_time=True),
+    RetentionPolicy('trust_audit_log', 'created_at', max_age_days=90, max_rows=100000),
+    RetentionPolicy('collected_items', 'collection_date', max_age_days=90, max_rows=200000, local_time=True),
+    RetentionPolicy('collected_data', 'collection_date', max_age_days=90, local_time=True),
+    RetentionPolicy('dashboard_sessions', 'created_at', max_age_days=90, max_rows=1000),
+    RetentionPolicy('data_cleanup_log', 'cleanup_date', max_age_days=365),
+    RetentionPolicy('collector_run_rollups', 'hour', max_age_days=90, local_time=True),
+)
+
+# Settings may change these fields; keep_where is interpolated into DELETE SQL
+OVERRIDABLE_FIELDS = ('max_age_days', 'max_rows')
+
+# Applied only when the retention_policies setting names the table
+OPT_IN_POLICIES: Sequence[RetentionPolicy] = (
+    RetentionPolicy('ai_messages', 'timestamp', max_age_days=180, max_rows=50000),
+    RetentionPolicy('scanned_sources', 'scanned_at', max_age_days=180, keep_where='dismissed = 1'),
+)
+
+
+def merge_policies(policies: Sequence[RetentionPolicy],
+                   overrides: Optional[Dict[str, Any]]) -> List[RetentionPolicy]:
+    """Apply per-table overrides; a None override disables that table's policy.
+
+    Tables of OPT_IN_POLICIES are added only when an override (which may be
+    an empty dict) names them.
+    """
+    if not overrides:
+        return list(policies)
+    merged = []
+    present = {policy.table for policy in policies}
+    opt_in = [policy for policy in OPT_IN_POLICIES if policy.table in overrides and policy.table not in present]
+    for policy in list(policies) + opt_in:
+        if policy.table not in overrides:
+            merged.append(policy)
+            continue
+        override = overrides[policy.table]
+        if override is None:
+            continue
+        ignored = set(override) - set(OVERRIDABLE_FIELDS)
+        if ignored:
+            logger.warning(f"Ignoring retention override fields for {policy.table}: {sorted(ignored)}")
+        fields = {k: v for k, v in override.items() if k in OVERRIDABLE_FIELDS}
+        merged.append(replace(policy, **fields))
+    return merged
+
+
+class RetentionEngine:
+    """Applies retention policies, then compacts and re-analyzes the database."""
+
+    def __init__(self, db, policies: Optional[Sequence[RetentionPolicy]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, batch_pause: float = DEFAULT_BATCH_PAUSE):
+        self.db = db
+        self.policies = list(policies) if policies is not None else None
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+
+    def resolve_policies(self) -> List[RetentionPolicy]:
+        if self.policies is not None:
+            return self.policies
+        return merge_policies(DEFAULT_POLICIES, self.db.get_setting('retention_policies'))
+
+    def run(self, vacuum: bool = True, analyze: bool = True,
+            convert_legacy_vacuum: bool = False) -> Dict[str, Any]:
+        """Prune every table, then vacuum/analyze. Returns a run summary."""
+        started = time.perf_counter()
+        started_at = datetime.now()
+        size_before = self._database_bytes()
+        deleted: Dict[str, int] = {}
+
+        for policy in self.resolve_policies():
+            try:
+                count = self.apply_policy(policy)
+            except Exception as e:
+                logger.error(f"Retention for {policy.table} failed: {e}")
+                continue
+            if count:
+                deleted[policy.table] = count
+
+        if analyze and deleted:
+            self.analyze(list(deleted))
+        pages_freed = self.incremental_vacuum(convert_legacy_vacuum) if vacuum else 0
+        size_after = self._database_bytes()
+
+        summary = {
+            'started_at': started_at.isoformat(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            'rows_deleted': sum(deleted.values()),
+            'deleted_by_table': deleted,
+            'pages_freed': pages_freed,
+            'bytes_reclaimed': max(0, size_before - size_after),
+            'database_bytes': size_after,
+        }
+        self._record_run(summary)
+        logger.info(f"Retention run deleted {summary['rows_deleted']} rows, "
+                    f"reclaimed {summary['bytes_reclaimed']} bytes in {summary['duration_ms']}ms")
+        return summary
+
+    def apply_policy(self, policy: RetentionPolicy) -> int:
+        """Delete rows older than max_age_days, then the oldest rows over max_rows."""
+        if not self._table_exists(policy.table):
+            return 0
+        # NULL flags (e.g. columns added by ALTER TABLE) count as not kept
+        keep = f" AND NOT COALESCE(({policy.keep_where}), 0)" if policy.keep_where else ''
+        ts = policy.timestamp_column
+        deleted = 0
+
+        if policy.max_age_days is not None:
+            zone = ", 'localtime'" if policy.local_time else ''
+            cutoff = f"datetime('now'{zone}, ?)"
+            age = f"-{int(policy.max_age_days)} days"
+            # The text bound lets the timestamp index narrow the scan; datetime()
+            # then compares 'T'- and space-separated values alike
+            deleted += self._delete_in_batches(
+                policy.table,
+                f"SELECT rowid FROM {policy.table} WHERE {ts} < date({cutoff}, '+1 day') "
+                f"AND datetime({ts}) < {cutoff}{keep} LIMIT ?",
+                (age, age)
+            )
+
+        if policy.max_rows is not None:
+            with self.db.get_connection(op='retention.apply_policy') as conn:
+                total = conn.execute(
+                    f"SELECT COUNT(*) FROM {policy.table} WHERE 1 = 1{keep}"
+                ).fetchone()[0]
+            excess = total - policy.max_rows
+            if excess > 0:
+                # Oldest first; rows without a timestamp sort first and go first
+                deleted += self._delete_in_batches(
+                    policy.table,
+                    f"SELECT rowid FROM {policy.table} WHERE 1 = 1{keep} ORDER BY {ts} ASC LIMIT ?",
+                    (), limit_total=excess
+                )
+        return deleted
+
+    def _delete_in_batches(self, table: str, select_sql: str, params: tuple,
+                           limit_total: Optional[int] = None) -> int:
+        """Delete the rowids chosen by `select_sql` (ending in LIMIT ?), one short transaction per batch."""
+        deleted = 0
+        while limit_total is None or deleted < limit_total:
+            batch = self.batch_size if limit_total is None else min(self.batch_size, limit_total - deleted)
+            with self.db.get_connection(op='retention.delete_in_batches') as conn:
+                cursor = conn.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ({select_sql})", (*params, batch)
+                )
+                conn.commit()
+                count = cursor.rowcount
+            deleted += count
+            if count < batch:
+                break
+            if self.batch_pause:
+                time.sleep(self.batch_pause)
+        return deleted
+
+    def incremental_vacuum(self, convert_legacy: bool = False) -> int:
+        """Release free pages to the filesystem in small steps. Returns pages freed.
+
+        Needs auto_vacuum=INCREMENTAL, which new databases get from the pool
+        pragmas. Older files are only converted (a one-time full VACUUM that
+        locks the database while it runs) when `convert_legacy` is set.
+        """
+        with self.db.get_connection(op='retention.incremental_vacuum') as conn:
+            mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if free_before == 0:
+                return 0
+            if mode == 2:
+                remaining = free_before
+                while remaining > 0:
+                    conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})").fetchall()
+                    conn.commit()
+                    now_free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    if now_free >= remaining:
+                        break
+                    remaining = now_free
+            elif convert_legacy:
+                logger.info("Converting database to auto_vacuum=INCREMENTAL (one-time VACUUM)")
+                conn.commit()
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                logger.info(f"{free_before} free pages kept: database is not in incremental auto_vacuum mode "
+                            "(run scripts/nightly_cleanup.py --convert-vacuum once to convert it)")
+                return 0
+            free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            except Exception as e:
+                logger.warning(f"WAL checkpoint after vacuum failed: {e}")
+        return free_before - free_after
+
+    def analyze(self, tables: List[str]):
+        """Refresh planner statistics for the given tables."""
+        with self.db.get_connection(op='retention.analyze') as conn:
+            for table in tables:
+                conn.execute(f"ANALYZE {table}")
+            conn.commit()
+
+    def _table_exists(self, table: str) -> bool:
+        with self.db.get_connection(op='retention.table_exists') as conn:
+            return conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone() is not None
+
+    def _database_bytes(self) -> int:
+        with self.db.get_connection(op='retention.database_bytes') as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def _record_run(self, summary: Dict[str, Any]):
+        try:
+            with self.db.get_connection(op='retention.record_run') as conn:
+                conn.execute("""
+                    INSERT INTO maintenance_runs (
+                        started_at, duration_ms, rows_deleted, bytes_reclaimed, database_bytes, details
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    summary['started_at'], summary['duration_ms'], summary['rows_deleted'],
+                    summary['bytes_reclaimed'], summary['database_bytes'],
+                    json.dumps(summary['deleted_by_table'])
+                ))
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Error recording maintenance run: {e}")
@@ -0,0 +1,155 @@
+"""
+Full-text search over emails, todos, news and notes (SQLite FTS5).
+
+Each searchable table has an FTS5 shadow table keyed by the source rowid and
+kept in sync by triggers, so every write path (batched upserts, REPLACEs,
+scripts using a plain sqlite3 connection) updates the index. Searches join
+the FTS hits back to the source table, rank them with BM25 (column weights
+favour titles) and return highlighted snippets.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_START = '**'
+SNIPPET_END = '**'
+SNIPPET_TOKENS = 12
+FTS_TOKENIZER = 'porter unicode61 remove_diacritics 2'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchSource:
+    """How one table is indexed and presented in search results."""
+
+    kind: str
+    table: str
+    fts_table: str
+    columns: Tuple[str, ...]
+    weights: Tuple[float, ...]
+    title: str
+    timestamp: str
+    url: str
+    where: str = ''
+
+
+SEARCH_SOURCES: Dict[str, SearchSource] = {
+    'emails': SearchSource(
+        kind='emails', table='emails', fts_table='emails_fts',
+        columns=('subject', 'sender', 'body'), weights=(4.0, 2.0, 1.0),
+        title='subject', timestamp='received_date',
+        url="'https://mail.google.com/mail/u/0/#inbox/' || s.id",
+    ),
+    'todos': SearchSource(
+        kind='todos', table='universal_todos', fts_table='todos_fts',
+        columns=('title', 'description', 'source_title'), weights=(5.0, 1.0, 2.0),
+        title='title', timestamp='created_at', url='s.source_url',
+        where="s.status != 'deleted'",
+    ),
+    'news': SearchSource(
+        kind='news', table='news_articles', fts_table='news_fts',
+        columns=('title', 'snippet', 'source'), weights=(5.0, 1.0, 1.0),
+        title='title', timestamp='published_date', url='s.url',
+    ),
+    'notes': SearchSource(
+        kind='notes', table='notes', fts_table='notes_fts',
+        columns=('title', 'content'), weights=(5.0, 1.0),
+        title='title', timestamp='modified_at', url='s.url',
+    ),
+}
+
+
+def create_search_index(cursor):
+    """Create FTS tables and sync triggers; backfill tables indexed for the first time."""
+    existing = {row[0] for row in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%_fts'"
+    ).fetchall()}
+
+    for source in SEARCH_SOURCES.values():
+        cols = ', '.join(source.columns)
+        new_cols = ', '.join(f'new.{c}' for c in source.columns)
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {source.fts_table} "
+            f"USING fts5({cols}, tokenize = '{FTS_TOKENIZER}')"
+        )
+        # OR REPLACE keeps the index consistent even when a REPLACE reuses a rowid
+        # on a connection without recursive_triggers (delete trigger skipped)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source.fts_table}_ai AFTER INSERT ON {source.table} BEGIN
+                INSERT OR REPLACE INTO {source.fts_table}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source.fts_table}_ad AFTER DELETE ON {source.table} BEGIN
+                DELETE FROM {source.fts_table} WHERE rowid = old.rowid;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {source.fts_table}_au AFTER UPDATE OF {cols} ON {source.table} BEGIN
+                DELETE FROM {source.fts_table} WHERE rowid = old.rowid;
+                INSERT INTO {source.fts_table}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+            END
+        """)
+        if source.fts_table not in existing:
+            cursor.execute(
+                f"INSERT INTO {source.fts_table}(rowid, {cols}) SELECT rowid, {cols} FROM {source.table}"
+            )
+            logger.info(f"Built search index {source.fts_table}")
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Returns None when the text has no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def resolve_kinds(kinds: Optional[Iterable[str]]) -> List[SearchSource]:
+    """Map requested kinds to sources. Raises ValueError for unknown kinds."""
+    if not kinds:
+        return list(SEARCH_SOURCES.values())
+    sources = []
+    for kind in kinds:
+        source = SEARCH_SOURCES.get(kind)
+        if source is None:
+            raise ValueError(f"Unknown search kind: {kind}")
+        sources.append(source)
+    return sources
+
+
+def search_source(conn, source: SearchSource, match: str, limit: int) -> List[Dict[str, Any]]:
+    """Run one ranked FTS query against a single source."""
+    weights = ', '.join(str(w) for w in source.weights)
+    where = f" AND {source.where}" if source.where else ''
+    rows = conn.execute(f"""
+        SELECT s.id, s.{source.title},
+               snippet({source.fts_table}, -1, ?, ?, '…', {SNIPPET_TOKENS}),
+               bm25({source.fts_table}, {weights}) AS score,
+               s.{source.timestamp}, {source.url}
+        FROM {source.fts_table}
+        JOIN {source.table} s ON s.rowid = {source.fts_table}.rowid
+        WHERE {source.fts_table} MATCH ?{where}
+        ORDER BY score
+        LIMIT ?
+    """, (SNIPPET_START, SNIPPET_END, match, limit)).fetchall()
+    return [
+        {
+            'kind': source.kind,
+            'id': row[0],
+            'title': row[1],
+            'snippet': row[2],
+            'score': round(-row[3], 4),  # higher is more relevant
+            'timestamp': row[4],
+            'url': row[5],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,146 @@
+"""
+In-process cache for the settings table.
+
+The whole settings table is loaded once per database file and served from
+memory. DatabaseManager.save_setting writes through to the cache and bumps a
+version counter row in cache_versions in the same transaction; readers
+re-check that counter at most every VERSION_CHECK_INTERVAL seconds, so
+writes from other processes (the standalone scripts) are picked up without
+a query per read.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from db_pool import resolve_db_key
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_VERSION_NAME = 'settings'
+VERSION_CHECK_INTERVAL = 1.0   # seconds between cross-process version checks
+
+_MISSING = object()
+
+
+def decode_setting(raw: Any) -> Any:
+    """Decode a stored setting value (JSON, or a legacy plain string)."""
+    try:
+        return json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return raw
+
+
+def read_version(conn, name: str = SETTINGS_VERSION_NAME) -> int:
+    """Read a cache version counter (0 if it was never bumped)."""
+    row = conn.execute("SELECT version FROM cache_versions WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def bump_version(conn, name: str = SETTINGS_VERSION_NAME) -> int:
+    """Increment a cache version counter inside the caller's transaction."""
+    conn.execute("""
+        INSERT INTO cache_versions (name, version) VALUES (?, 1)
+        ON CONFLICT(name) DO UPDATE SET version = version + 1
+    """, (name,))
+    return read_version(conn, name)
+
+
+class SettingsCache:
+    """Decoded settings for one database file, validated by a version row."""
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._values: Optional[Dict[str, Any]] = None
+        self._version = -1
+        self._checked_at = 0.0
+        self.hits = 0
+        self.loads = 0
+
+    def get(self, conn_factory, key: str, default: Any = None) -> Any:
+        """Return a setting, (re)loading the table first if it is stale."""
+        values = self._current(conn_factory)
+        value = values.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        # Hand out copies of containers so callers cannot mutate the cache
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def get_many(self, conn_factory, keys: List[str]) -> Dict[str, Any]:
+        """Return the stored settings among `keys`."""
+        values = self._current(conn_factory)
+        return {key: copy.deepcopy(values[key]) for key in keys if key in values}
+
+    def apply_write(self, key: str, value: Any, new_version: int):
+        """Record a committed save_setting without reloading the table."""
+        with self._lock:
+            if self._values is not None and self._version == new_version - 1:
+                self._values[key] = copy.deepcopy(value)
+                self._version = new_version
+                self._checked_at = time.monotonic()
+            else:
+                # Someone else wrote in between; reload on next read
+                self._values = None
+
+    def invalidate(self):
+        """Drop cached values; the next read reloads the table."""
+        with self._lock:
+            self._values = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'loaded': self._values is not None,
+                'entries': len(self._values) if self._values is not None else 0,
+                'version': self._version,
+                'hits': self.hits,
+                'loads': self.loads,
+            }
+
+    def _current(self, conn_factory) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            if self._values is not None and now - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._values
+
+        with conn_factory() as conn:
+            version = read_version(conn)
+            with self._lock:
+                if self._values is not None and version == self._version:
+                    self._checked_at = now
+                    self.hits += 1
+                    return self._values
+            rows = conn.execute("SELECT setting_key, setting_value FROM settings").fetchall()
+
+        values = {row[0]: decode_setting(row[1]) for row in rows}
+        with self._lock:
+            self._values = values
+            self._version = version
+            self._checked_at = now
+            self.loads += 1
+        return values
+
+
+_caches: Dict[str, SettingsCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_settings_cache(db_path: str) -> SettingsCache:
+    """Get the shared settings cache for a database file.
+
+    In-memory databases are private to their caller and are never shared.
+    """
+    if db_path in (':memory:', ''):
+        return SettingsCache()
+    key = resolve_db_key(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = SettingsCache()
+            _caches[key] = cache
+        return cache
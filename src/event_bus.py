@@ -0,0 +1,111 @@
+"""
+In-process event bus behind the /api/events Server-Sent Events stream.
+
+Publishers (the collection scheduler) call publish() when a widget's data
+actually changes; every open dashboard tab receives a small version-bump
+event and refetches only that widget, instead of polling every endpoint.
+
+Events carry increasing ids and the last `history` events are kept, so a
+client that reconnects with `Last-Event-ID` gets exactly what it missed.
+Ids start from the process start time in milliseconds, so an id from
+before a restart (or one that has fallen out of history) is detected and
+answered with a single `reset` event telling the client to reload.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 500
+DEFAULT_QUEUE_SIZE = 100
+RESET_EVENT = 'reset'
+
+
+@dataclass(frozen=True)
+class BusEvent:
+    id: int
+    event: str
+    data: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.event}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class EventBus:
+    """Fan-out of published events to async subscribers, with replay by id."""
+
+    def __init__(self, history: int = DEFAULT_HISTORY, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._history: Deque[BusEvent] = deque(maxlen=history)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._next_id = int(time.time() * 1000)
+        self.stats = {'published': 0, 'delivered': 0, 'replayed': 0, 'resets': 0, 'dropped_subscribers': 0}
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def publish(self, event: str, data: Dict[str, Any]) -> BusEvent:
+        """Record an event and hand it to every subscriber. Call from the event loop."""
+        bus_event = BusEvent(self._next_id, event, data)
+        self._next_id += 1
+        self._history.append(bus_event)
+        self.stats['published'] += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(bus_event)
+            except asyncio.QueueFull:
+                # A subscriber that cannot keep up gets one reset instead of a backlog
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._reset_event('lagging'))
+                self.stats['dropped_subscribers'] += 1
+        return bus_event
+
+    def _reset_event(self, reason: str) -> BusEvent:
+        self.stats['resets'] += 1
+        return BusEvent(self.last_id, RESET_EVENT, {'reason': reason})
+
+    def _replay(self, last_event_id: int):
+        """Events after `last_event_id`, or a reset if they are no longer all known."""
+        if last_event_id >= self.last_id:
+            return [] if last_event_id == self.last_id else [self._reset_event('unknown id')]
+        oldest = self._history[0].id if self._history else self._next_id
+        if last_event_id < oldest - 1:
+            return [self._reset_event('history expired')]
+        missed = [event for event in self._history if event.id > last_event_id]
+        self.stats['replayed'] += len(missed)
+        return missed
+
+    async def subscribe(self, last_event_id: Optional[int] = None,
+                        heartbeat: Optional[float] = None) -> AsyncIterator[Optional[BusEvent]]:
+        """Yield missed events, then live ones. Yields None every `heartbeat` idle seconds."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            sent = self.last_id
+            if last_event_id is not None:
+                for event in self._replay(last_event_id):
+                    yield event
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat) if heartbeat else await queue.get()
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event.event != RESET_EVENT and event.id <= sent:
+                    continue
+                sent = max(sent, event.id)
+                self.stats['delivered'] += 1
+                yield event
+        finally:
+            self._subscribers.discard(queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'subscribers': len(self._subscribers), 'last_event_id': self.last_id}
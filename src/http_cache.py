@@ -0,0 +1,247 @@
+"""
+Conditional GET and compression for the widget JSON endpoints.
+
+Widgets are polled and refetched on every push event, but their data only
+changes when a collector produces something new. Each response carries a
+weak ETag; a client that already has the current version gets an empty
+304 instead of the whole payload. For cache-backed widgets the ETag is
+derived from the content hash the background manager already computed
+when the collector result was stored (one hash per cache generation), so
+the per-request `freshness` block is not part of the validated
+representation. A matching request for a fresh entry is answered without
+running the endpoint at all; a stale one still runs it, so the
+stale-while-revalidate refresh fires, and then gets its 304. Endpoints
+without a cache generation fall back to hashing the rendered body, minus
+per-request top-level fields such as `timestamp`.
+
+Bodies of at least MIN_COMPRESS_SIZE bytes are compressed with brotli
+when the optional `brotli` package is installed and the client accepts
+it, otherwise with gzip; bodies of OFFLOAD_COMPRESS_SIZE or more are
+hashed and compressed on a worker thread.
+
+Usage:
+    app.add_middleware(ConditionalJSONMiddleware, endpoints={'/api/calendar': 'calendar',
+                                                             '/api/news': None},
+                       version_of=background_manager.cache_version)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller bodies are not worth the CPU
+OFFLOAD_COMPRESS_SIZE = 64 * 1024  # bytes; larger bodies are hashed/compressed off the event loop
+# Top-level fields that change on every request without the content changing
+VOLATILE_FIELDS = frozenset({'timestamp', 'freshness', 'generated_at'})
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5        # good ratio at a fraction of quality 11's cost
+
+_stats = {'responses': 0, 'not_modified': 0, 'compressed': 0,
+          'bytes_uncompressed': 0, 'bytes_sent': 0}
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the given parts (URL plus version, or the body itself)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def body_etag(url: str, body: bytes) -> str:
+    """ETag of a rendered JSON body, ignoring top-level VOLATILE_FIELDS."""
+    if not any(f'"{name}"'.encode('utf-8') in body for name in VOLATILE_FIELDS):
+        return make_etag(url, body)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return make_etag(url, body)
+    if not isinstance(payload, dict):
+        return make_etag(url, body)
+    stable = {key: value for key, value in payload.items() if key not in VOLATILE_FIELDS}
+    return make_etag(url, json.dumps(stable, sort_keys=True, separators=(',', ':')))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported content coding the client accepts ('br', 'gzip' or None)."""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get('*', 0.0)
+    for coding in (('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def encode_body(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress `body` for the client if it is large enough. Returns (body, coding)."""
+    _stats['responses'] += 1
+    _stats['bytes_uncompressed'] += len(body)
+    coding = choose_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_SIZE else None
+    if coding == 'br':
+        encoded = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif coding == 'gzip':
+        encoded = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    else:
+        encoded = body
+    if coding:
+        _stats['compressed'] += 1
+    _stats['bytes_sent'] += len(encoded)
+    return encoded, coding
+
+
+def record_not_modified():
+    _stats['responses'] += 1
+    _stats['not_modified'] += 1
+
+
+def get_http_cache_stats() -> Dict[str, Any]:
+    """Counters for /api/system/status."""
+    saved = _stats['bytes_uncompressed'] - _stats['bytes_sent']
+    return {**_stats, 'bytes_saved_by_compression': saved, 'brotli_available': BROTLI_AVAILABLE}
+
+
+# Headers the middleware rewrites on the responses it handles
+_REPLACED_HEADERS = frozenset({b'content-length', b'content-encoding', b'etag'})
+# Headers a 304 must not carry (RFC 9110 section 15.4.5)
+_BODY_HEADERS = frozenset({b'content-length', b'content-type', b'content-encoding'})
+
+
+class ConditionalJSONMiddleware:
+    """ASGI middleware adding ETags, If-None-Match and compression to JSON endpoints.
+
+    `endpoints` maps each handled path to the cache key whose version
+    validates it, or to None to hash the body. `version_of(key)` returns
+    (version, fresh) for the current cache generation, with version None
+    when nothing is cached. Headers set by the endpoint are kept.
+    """
+
+    def __init__(self, app, endpoints: Dict[str, Optional[str]],
+                 version_of: Callable[[str], Tuple[Optional[str], bool]]):
+        self.app = app
+        self.endpoints = endpoints
+        self.version_of = version_of
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get('path')
+        if scope['type'] != 'http' or scope.get('method') != 'GET' or path not in self.endpoints:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get('headers') or [])
+        if_none_match = request_headers.get(b'if-none-match', b'').decode('latin-1') or None
+        url = f"{path}?{scope.get('query_string', b'').decode('latin-1')}"
+        cache_key = self.endpoints[path]
+        version, fresh = self.version_of(cache_key) if cache_key else (None, False)
+        etag = make_etag(url, version) if version else None
+
+        # Fresh cache generation the client already has: skip the endpoint entirely
+        if etag and fresh and etag_matches(if_none_match, etag):
+            record_not_modified()
+            await self._send_not_modified(send, [], etag)
+            return
+
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+        passthrough = False
+
+        async def buffer(message):
+            nonlocal passthrough
+            if message['type'] == 'http.response.start':
+                content_type = dict(message.get('headers') or []).get(b'content-type', b'')
+                passthrough = message['status'] != 200 or b'application/json' not in content_type
+                if passthrough:
+                    await send(message)
+                else:
+                    start.update(message)
+            elif passthrough:
+                await send(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, buffer)
+        if passthrough or not start:
+            return
+
+        body = b''.join(chunks)
+        if etag is None:
+            etag = await _maybe_offload(len(body), body_etag, url, body)
+        headers = [(name, value) for name, value in start.get('headers', [])
+                   if name.lower() not in _REPLACED_HEADERS]
+        if etag_matches(if_none_match, etag):
+            record_not_modified()
+            await self._send_not_modified(send, headers, etag)
+            return
+
+        accept_encoding = request_headers.get(b'accept-encoding', b'').decode('latin-1') or None
+        body, encoding = await _maybe_offload(len(body), encode_body, body, accept_encoding)
+        headers = _with_cache_headers(headers, etag)
+        if encoding:
+            headers.append((b'content-encoding', encoding.encode('latin-1')))
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _send_not_modified(send, headers: List[Tuple[bytes, bytes]], etag: str):
+        headers = _with_cache_headers([(n, v) for n, v in headers if n.lower() not in _BODY_HEADERS], etag)
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _maybe_offload(size: int, func: Callable[..., Any], *args) -> Any:
+    if size >= OFFLOAD_COMPRESS_SIZE:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+def _with_cache_headers(headers: List[Tuple[bytes, bytes]], etag: str) -> List[Tuple[bytes, bytes]]:
+    """Add the ETag, a revalidating Cache-Control and Vary: Accept-Encoding."""
+    names = {name.lower() for name, _ in headers}
+    headers = headers + [(b'etag', etag.encode('latin-1'))]
+    if b'cache-control' not in names:
+        headers.append((b'cache-control', b'no-cache'))
+    vary = [value for name, value in headers if name.lower() == b'vary']
+    if not any(b'accept-encoding' in value.lower() for value in vary):
+        headers.append((b'vary', b'Accept-Encoding'))
+    return headers
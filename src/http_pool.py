@@ -0,0 +1,281 @@
+"""
+Shared outbound HTTP clients for the Personal Dashboard.
+
+Collectors used to open a new aiohttp session or httpx client per call,
+paying for DNS, TCP and TLS setup every cycle. The app's event loop binds
+one aiohttp session and one httpx client at startup and every collector
+borrows them, so connections are kept alive and reused across runs.
+
+Code running on another loop (scripts, one-off asyncio.run calls) gets a
+temporary client that is closed on exit, exactly like before.
+
+AI providers get a pool of their own per host (provider_session,
+provider_httpx_client): a long chat completion or token stream then never
+waits behind collector traffic for a connection, and the model server's
+connections stay warm between chat turns for PROVIDER_KEEPALIVE_SECONDS.
+
+Every request sent through these clients is counted against the collector
+run in progress (see collector_telemetry) and timed by host for /metrics.
+
+Usage:
+    async with aiohttp_session() as session:
+        async with session.get(url, headers=headers) as response: ...
+
+    async with httpx_client() as client:
+        response = await client.get(url, headers=headers)
+
+    async with provider_session('http://localhost:11434') as session:
+        async with session.post(url, json=payload, timeout=timeout) as response: ...
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+from collector_telemetry import count_upstream_call
+from metrics import OUTBOUND_HTTP_ERRORS, OUTBOUND_HTTP_SECONDS
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 10
+KEEPALIVE_SECONDS = 30
+DEFAULT_TIMEOUT = 30.0
+PROVIDER_MAX_CONNECTIONS = 8
+PROVIDER_KEEPALIVE_SECONDS = 300
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_aiohttp_session = None
+_httpx_client = None
+_provider_sessions: Dict[str, Any] = {}
+_provider_httpx_clients: Dict[str, Any] = {}
+_stats: Dict[str, int] = {'shared_uses': 0, 'temporary_clients': 0, 'clients_created': 0}
+
+
+def _on_shared_loop() -> bool:
+    if _loop is None:
+        return False
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def _ssl_context():
+    try:
+        from utils.ssl_helper import create_ssl_context
+        return create_ssl_context()
+    except Exception:
+        return None
+
+
+async def _on_aiohttp_request(session, context, params):
+    count_upstream_call()
+    context.started = time.perf_counter()
+
+
+async def _on_aiohttp_response(session, context, params):
+    OUTBOUND_HTTP_SECONDS.labels(params.url.host or 'unknown', 'aiohttp').observe(
+        time.perf_counter() - context.started)
+
+
+async def _on_aiohttp_exception(session, context, params):
+    OUTBOUND_HTTP_ERRORS.labels(params.url.host or 'unknown', 'aiohttp').inc()
+
+
+async def _on_httpx_request(request):
+    count_upstream_call()
+    request.extensions['metrics_started'] = time.perf_counter()
+
+
+async def _on_httpx_response(response):
+    started = response.request.extensions.get('metrics_started')
+    if started is not None:
+        OUTBOUND_HTTP_SECONDS.labels(response.request.url.host or 'unknown', 'httpx').observe(
+            time.perf_counter() - started)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme or 'http'}://{parts.netloc or parts.path}".lower()
+
+
+def _new_aiohttp_session(shared: bool, limit: int = MAX_CONNECTIONS,
+                         limit_per_host: int = MAX_CONNECTIONS_PER_HOST,
+                         keepalive: float = KEEPALIVE_SECONDS):
+    kwargs: Dict[str, Any] = {'ttl_dns_cache': 300}
+    ssl_context = _ssl_context()
+    if ssl_context is not None:
+        kwargs['ssl'] = ssl_context
+    if shared:
+        kwargs.update(limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive)
+    connector = aiohttp.TCPConnector(**kwargs)
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_aiohttp_request)
+    trace.on_request_end.append(_on_aiohttp_response)
+    trace.on_request_exception.append(_on_aiohttp_exception)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+                                 trace_configs=[trace])
+
+
+def _new_httpx_client(shared: bool, timeout: Any = DEFAULT_TIMEOUT, limits: Any = None):
+    kwargs: Dict[str, Any] = {'timeout': timeout, 'follow_redirects': True,
+                              'event_hooks': {'request': [_on_httpx_request],
+                                              'response': [_on_httpx_response]}}
+    if limits is not None:
+        kwargs['limits'] = limits
+    elif shared:
+        kwargs['limits'] = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS_PER_HOST * 2,
+            keepalive_expiry=KEEPALIVE_SECONDS,
+        )
+    try:
+        from utils.ssl_helper import get_httpx_client_kwargs
+        kwargs.update(get_httpx_client_kwargs())
+    except Exception:
+        pass
+    return httpx.AsyncClient(**kwargs)
+
+
+async def open_http_clients():
+    """Bind the shared clients to the running loop; they are created on first use."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    logger.info("Shared HTTP client pool bound to the application event loop")
+
+
+async def close_http_clients():
+    """Close the shared clients (on shutdown)."""
+    global _loop, _aiohttp_session, _httpx_client
+    sessions = [_aiohttp_session, *_provider_sessions.values()]
+    clients = [_httpx_client, *_provider_httpx_clients.values()]
+    _loop, _aiohttp_session, _httpx_client = None, None, None
+    _provider_sessions.clear()
+    _provider_httpx_clients.clear()
+    for session in sessions:
+        if session is not None and not session.closed:
+            await session.close()
+    for client in clients:
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+@asynccontextmanager
+async def aiohttp_session() -> AsyncIterator[Any]:
+    """Yield the shared aiohttp session, or a temporary one off the app loop.
+
+    Do not close the yielded session; pass headers and timeouts per request.
+    """
+    global _aiohttp_session
+    if _on_shared_loop():
+        if _aiohttp_session is None or _aiohttp_session.closed:
+            _aiohttp_session = _new_aiohttp_session(shared=True)
+            _stats['clients_created'] += 1
+        _stats['shared_uses'] += 1
+        yield _aiohttp_session
+        return
+
+    _stats['temporary_clients'] += 1
+    async with _new_aiohttp_session(shared=False) as session:
+        yield session
+
+
+@asynccontextmanager
+async def httpx_client() -> AsyncIterator[Any]:
+    """Yield the shared httpx client, or a temporary one off the app loop."""
+    global _httpx_client
+    if _on_shared_loop():
+        if _httpx_client is None or _httpx_client.is_closed:
+            _httpx_client = _new_httpx_client(shared=True)
+            _stats['clients_created'] += 1
+        _stats['shared_uses'] += 1
+        yield _httpx_client
+        return
+
+    _stats['temporary_clients'] += 1
+    async with _new_httpx_client(shared=False) as client:
+        yield client
+
+
+@asynccontextmanager
+async def provider_session(base_url: str, max_connections: int = PROVIDER_MAX_CONNECTIONS) -> AsyncIterator[Any]:
+    """Yield the keep-alive aiohttp session dedicated to an AI provider's host.
+
+    One session (and connection pool) exists per scheme://host:port, created
+    with `max_connections` on first use. Off the app loop a temporary session
+    is used. Do not close the yielded session; pass timeouts per request.
+    """
+    if _on_shared_loop():
+        origin = _origin(base_url)
+        session = _provider_sessions.get(origin)
+        if session is None or session.closed:
+            session = _new_aiohttp_session(shared=True, limit=max_connections, limit_per_host=max_connections,
+                                           keepalive=PROVIDER_KEEPALIVE_SECONDS)
+            _provider_sessions[origin] = session
+            _stats['clients_created'] += 1
+        _stats['shared_uses'] += 1
+        yield session
+        return
+
+    _stats['temporary_clients'] += 1
+    async with _new_aiohttp_session(shared=False) as session:
+        yield session
+
+
+def provider_httpx_client(base_url: str, timeout: float = DEFAULT_TIMEOUT,
+                          max_connections: int = PROVIDER_MAX_CONNECTIONS):
+    """Long-lived httpx client for SDKs that own their transport (OpenAI).
+
+    On the app loop the client is cached per host and closed by
+    close_http_clients(); callers keep the reference for as long as it is
+    not `is_closed`. Its connections belong to that loop, so any other loop
+    (a worker thread's asyncio.run) gets a fresh, unpooled client instead.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                          keepalive_expiry=PROVIDER_KEEPALIVE_SECONDS)
+    if not _on_shared_loop():
+        _stats['temporary_clients'] += 1
+        return _new_httpx_client(shared=False, timeout=timeout, limits=limits)
+
+    origin = _origin(base_url)
+    client = _provider_httpx_clients.get(origin)
+    if client is None or client.is_closed:
+        client = _new_httpx_client(shared=True, timeout=timeout, limits=limits)
+        _provider_httpx_clients[origin] = client
+        _stats['clients_created'] += 1
+    return client
+
+
+def is_pooled_client(client: Any) -> bool:
+    """True if `client` is one of the per-host clients cached by provider_httpx_client()."""
+    return any(pooled is client for pooled in _provider_httpx_clients.values())
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Shared client usage counters, for /api/system/status."""
+    return {
+        **_stats,
+        'bound': _loop is not None,
+        'aiohttp_open': _aiohttp_session is not None and not _aiohttp_session.closed,
+        'httpx_open': _httpx_client is not None and not _httpx_client.is_closed,
+        'provider_pools': sorted(
+            [origin for origin, session in _provider_sessions.items() if not session.closed] +
+            [origin for origin, client in _provider_httpx_clients.items() if not client.is_closed]
+        ),
+    }
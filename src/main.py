@@ -5,7 +5,7 @@ Clean, minimal implementation focusing on core data sources
 """
 
 from fastapi import FastAPI, HTTPException, Request, Query
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import json
@@ -24,7 +24,7 @@ import threading
 import asyncio
 import time
 import secrets
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 # Add the src directory and project root to path for imports
 src_dir = Path(__file__).parent
@@ -34,6 +34,19 @@ sys.path.insert(0, str(project_root))  # Also add project root for config/ impor
 
 # Import database manager
 from database import db
+from db_async import get_async_db, run_in_db_executor, shutdown_db_executor, get_db_executor_stats
+from collection_scheduler import CollectionScheduler, content_hash
+from collector_telemetry import CollectorTelemetry
+from event_bus import EventBus
+from swr_cache import SWRCache, CacheResult as SWRCacheResult
+from http_pool import open_http_clients, close_http_clients, httpx_client, provider_session, get_http_pool_stats
+from http_cache import ConditionalJSONMiddleware, get_http_cache_stats
+from single_flight import single_flight, get_single_flight_stats
+from metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, monitor_event_loop_lag
+from widget_bootstrap import gather_widgets, ndjson_line
+
+# Awaitable facade - runs DatabaseManager calls on the DB worker pool
+adb = get_async_db()
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -247,37 +260,35 @@ async def health_check():
 class BackgroundDataManager:
     """Manages background data collection and caching."""
     
-    def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.cache_timestamps: Dict[str, datetime] = {}
-        self.cache_duration = timedelta(minutes=10)  # Cache for 10 minutes
-        self.background_tasks: Dict[str, threading.Thread] = {}
-        self.running = True
-        
-        # Start background collection threads
-        self.start_background_collection()
+    # name: interval seconds. Every job runs on the app loop (and so uses the
+    # shared HTTP pool); collectors hand their own Google client, feedparser
+    # and SQLite calls to worker threads.
+    COLLECTION_JOBS = {
+        'calendar': 300,     # 5 minutes
+        'email': 180,        # 3 minutes
+        'github': 600,       # 10 minutes
+        'news': 900,         # 15 minutes
+        'music': 1800,       # 30 minutes
+        'vanity': 1800,      # 30 minutes
+        'weather': 900,      # 15 minutes
+        'jokes': 3600,       # 1 hour
+        'maintenance': 21600,  # 6 hours: retention, vacuum, analyze
+    }
+    COLLECTION_TIMEOUT = 120
+    STARTUP_STAGGER = 3  # seconds between each job's first run
     
-    def start_background_collection(self):
-        """Start background data collection threads."""
-        endpoints = [
-            'calendar', 'email', 'github', 'news', 
-            'music', 'vanity', 'weather', 'jokes'
-        ]
+    def __init__(self):
+        # Entries stay fresh for one collector interval, then are served
+        # stale while the collector re-runs in the background
+        self.cache = SWRCache()
+        self._pending_snapshots: set = set()
+        self.widget_versions: Dict[str, str] = {}
+        self.telemetry = CollectorTelemetry(flush=self._save_rollups)
+        self.scheduler = CollectionScheduler(
+            max_concurrency=4, on_result=self._store_result, result_error=self._result_error,
+            telemetry=self.telemetry
+        )
         
-        for endpoint in endpoints:
-            thread = threading.Thread(
-                target=self._background_collector, 
-                args=(endpoint,),
-                daemon=True,
-                name=f"collector-{endpoint}"
-            )
-            thread.start()
-            self.background_tasks[endpoint] = thread
-            
-        logger.info(f"Started {len(endpoints)} background collection threads")
-    
-    def _background_collector(self, endpoint: str):
-        """Background collection worker for a specific endpoint."""
         collection_functions = {
             'calendar': self._collect_calendar,
             'email': self._collect_email,
@@ -286,66 +297,131 @@ class BackgroundDataManager:
             'music': self._collect_music,
             'vanity': self._collect_vanity,
             'weather': self._collect_weather,
-            'jokes': self._collect_jokes
+            'jokes': self._collect_jokes,
+            'maintenance': self._run_maintenance
         }
-        
-        collect_func = collection_functions.get(endpoint)
-        if not collect_func:
-            logger.warning(f"No collection function for endpoint: {endpoint}")
+        for index, (endpoint, interval) in enumerate(self.COLLECTION_JOBS.items()):
+            self.scheduler.add_job(
+                endpoint, collection_functions[endpoint], interval,
+                initial_delay=index * self.STARTUP_STAGGER,
+                timeout=None if endpoint == 'maintenance' else self.COLLECTION_TIMEOUT,
+                # Maintenance keeps its fixed schedule and runs overnight too
+                adaptive=endpoint != 'maintenance',
+                pausable=endpoint != 'maintenance'
+            )
+            self.cache.configure(endpoint, ttl=interval,
+                                 loader=lambda name=endpoint: self._collect_now(name))
+    
+    async def start(self):
+        """Restore the last snapshot, then start background collection on the running loop."""
+        await self.restore_snapshot()
+        await self.scheduler.start()
+    
+    async def restore_snapshot(self) -> int:
+        """Warm the cache from disk so the first page load after a restart is instant.
+        
+        Restored entries keep their original timestamps: stale ones are served
+        while their collectors run as usual, and collectors whose data is still
+        fresh wait until it expires instead of running at startup.
+        """
+        snapshots = await run_in_db_executor(db.load_cache_snapshots, self.cache.max_stale)
+        restored = 0
+        for endpoint, snapshot in snapshots.items():
+            if endpoint not in self.scheduler.jobs:
+                continue
+            self.cache.set(endpoint, snapshot['value'], stored_at=snapshot['stored_at'])
+            self.widget_versions[endpoint] = content_hash(snapshot['value'])
+            self.scheduler.jobs[endpoint].last_hash = self.widget_versions[endpoint]
+            remaining = self.cache.ttl(endpoint) - (time.time() - snapshot['stored_at'])
+            job = self.scheduler.jobs[endpoint]
+            job.initial_delay = max(job.initial_delay, remaining)
+            restored += 1
+        if restored:
+            logger.info(f"Restored {restored} cached widgets from the last snapshot")
+        return restored
+    
+    def _persist(self, endpoint: str):
+        entry = self.cache.peek(endpoint)
+        if entry is None:
             return
-        
-        # Initial delay to stagger startup
-        time.sleep(hash(endpoint) % 30)  # 0-30 second delay based on endpoint name
-        
-        while self.running:
-            try:
-                logger.info(f"Background collecting {endpoint} data...")
-                data = asyncio.run(collect_func())
-                self.cache[endpoint] = data
-                self.cache_timestamps[endpoint] = datetime.now()
-                logger.info(f"Successfully cached {endpoint} data")
-                
-                # Sleep for different intervals based on data type
-                sleep_intervals = {
-                    'calendar': 300,  # 5 minutes
-                    'email': 180,     # 3 minutes
-                    'github': 600,    # 10 minutes
-                    'news': 900,      # 15 minutes
-                    'music': 1800,    # 30 minutes
-                    'vanity': 1800,   # 30 minutes
-                    'weather': 900,   # 15 minutes
-                    'jokes': 3600     # 1 hour
-                }
-                sleep_time = sleep_intervals.get(endpoint, 600)
-                time.sleep(sleep_time)
-                
-            except Exception as e:
-                logger.error(f"Error in background collection for {endpoint}: {e}")
-                # Wait 5 minutes before retrying on error
-                time.sleep(300)
+        task = asyncio.create_task(
+            run_in_db_executor(db.save_cache_snapshot, endpoint, entry.value, entry.stored_at)
+        )
+        self._pending_snapshots.add(task)
+        task.add_done_callback(self._pending_snapshots.discard)
     
-    def get_cached_data(self, endpoint: str) -> Optional[Dict[str, Any]]:
-        """Get cached data for an endpoint if available and fresh."""
-        if endpoint not in self.cache:
+    def _save_rollups(self, rows: List[Dict[str, Any]]):
+        task = asyncio.create_task(run_in_db_executor(db.save_collector_rollups, rows))
+        self._pending_snapshots.add(task)
+        task.add_done_callback(self._pending_snapshots.discard)
+    
+    async def _collect_now(self, endpoint: str):
+        # Joins the scheduled run if one is in flight; _store_result fills the cache
+        await self.scheduler.run_once(endpoint)
+    
+    @staticmethod
+    def _result_error(data: Any) -> Optional[str]:
+        # Collectors report most failures as {"error": ...}; treat those as failed
+        # runs so they back off and never replace the last good copy
+        if isinstance(data, dict) and data.get('error'):
+            return str(data['error'])
+        return None
+    
+    def _store_result(self, endpoint: str, data: Any):
+        self.cache.set(endpoint, data)
+        self._persist(endpoint)
+        logger.info(f"Successfully cached {endpoint} data")
+        
+        # Push a version bump to open dashboards only when the content changed
+        version = self.scheduler.jobs[endpoint].last_hash or content_hash(data)
+        if self.widget_versions.get(endpoint) != version:
+            self.widget_versions[endpoint] = version
+            widget_events.publish('widget', {
+                'widget': endpoint,
+                'version': version[:16],
+                'updated_at': datetime.now().isoformat()
+            })
+    
+    def refresh(self, endpoint: str) -> bool:
+        """Drop the cached copy and collect it again right away."""
+        self.cache.invalidate(endpoint)
+        return self.scheduler.run_now(endpoint)
+    
+    async def get_data(self, endpoint: str, wait_if_missing: bool = True) -> Optional[SWRCacheResult]:
+        """Cached data plus freshness; stale data is returned while it refreshes."""
+        result = await self.cache.get(endpoint, wait_if_missing=wait_if_missing)
+        if result is None or (isinstance(result.value, dict) and result.value.get('error')):
             return None
-            
-        timestamp = self.cache_timestamps.get(endpoint)
-        if not timestamp:
+        return result
+    
+    def cache_version(self, endpoint: str) -> Tuple[Optional[str], bool]:
+        """Content hash of the cached entry (None if missing) and whether it is fresh."""
+        if self.cache.peek(endpoint) is None:
+            return None, False
+        return self.widget_versions.get(endpoint), self.cache.freshness(endpoint)['fresh']
+    
+    def fresh_version(self, endpoint: str) -> Optional[str]:
+        """Content hash of a fresh cached entry, or None if it is missing or stale."""
+        if self.cache.peek(endpoint) is None or not self.cache.freshness(endpoint)['fresh']:
             return None
-            
-        # Check if cache is still fresh
-        if datetime.now() - timestamp > self.cache_duration:
-            logger.info(f"Cache for {endpoint} is stale")
+        return self.widget_versions.get(endpoint)
+    
+    def get_cached_data(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Get cached data for an endpoint if available and fresh."""
+        entry = self.cache.peek(endpoint)
+        if entry is None or not self.cache.freshness(endpoint)['fresh']:
             return None
-            
-        return self.cache[endpoint]
+        return entry.value
+    
+    def get_status(self) -> Dict[str, Any]:
+        return {**self.scheduler.get_status(), 'cache': self.cache.get_stats()}
     
-    def stop(self):
-        """Stop all background collection threads."""
-        self.running = False
-        for thread in self.background_tasks.values():
-            if thread.is_alive():
-                thread.join(timeout=5)
+    async def stop(self):
+        """Cancel all background collection jobs and flush pending snapshot writes."""
+        await self.scheduler.stop()
+        self.telemetry.flush_rollups()
+        if self._pending_snapshots:
+            await asyncio.wait(list(self._pending_snapshots), timeout=5)
     
     # Collection methods (these will be implemented to call the actual collectors)
     async def _collect_calendar(self):
@@ -356,7 +432,8 @@ class BackgroundDataManager:
             collector = CalendarCollector(settings)
             start_date = datetime.now()
             end_date = start_date + timedelta(days=7)
-            events_data = await collector.collect_events(start_date, end_date)
+            events_data = await single_flight.do(('calendar', 'upcoming'), collector.collect_events,
+                                                 start_date, end_date)
             
             if events_data:
                 formatted_events = []
@@ -438,7 +515,7 @@ class BackgroundDataManager:
             }
             
             collector = GmailCollector(account_config)
-            return await collector.collect_data()
+            return await single_flight.do(('gmail', 'primary'), collector.collect_data)
         except Exception as e:
             logger.error(f"Email collection error: {e}")
             return {"error": str(e), "emails": []}
@@ -446,70 +523,18 @@ class BackgroundDataManager:
     async def _collect_github(self):
         try:
             # Use the same logic as the GitHub API endpoint
-            from database import get_credentials
-            github_creds = get_credentials('github')
+            github_creds = await run_in_db_executor(db.get_credentials, 'github')
             if github_creds and github_creds.get('token'):
                 username = github_creds.get('username')
                 if not username:
                     # Fallback to user profile
-                    profile = db.get_user_profile()
+                    profile = await run_in_db_executor(db.get_user_profile)
                     username = profile.get('github_username', 'unknown')
                 token = github_creds.get('token')
                 headers = {'Authorization': f'token {token}', 'Accept': 'application/vnd.github.v3+json'}
                 
-                github_items = []
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    # Get review requests
-                    review_response = await client.get(f'https://api.github.com/search/issues?q=review-requested:{username}+is:open+is:pr', headers=headers)
-                    if review_response.status_code == 200:
-                        for pr in review_response.json().get('items', [])[:3]:
-                            repo_url_parts = pr.get('repository_url', '').split('/')
-                            repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
-                            repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
-                            
-                            github_items.append({
-                                'type': 'Review Requested', 
-                                'title': pr.get('title', ''),
-                                'repo': repo_name, 
-                                'repository': f"{repo_owner}/{repo_name}",
-                                'number': pr.get('number', ''),
-                                'user': pr.get('user', {}).get('login', 'Unknown') if pr.get('user') else 'Unknown',
-                                'state': pr.get('state', 'open'),
-                                'created_at': pr.get('created_at', ''),
-                                'updated_at': pr.get('updated_at', ''),
-                                'body': pr.get('body', ''),
-                                'html_url': pr.get('html_url', ''),
-                                'labels': [label.get('name', '') for label in pr.get('labels', [])],
-                                'assignees': [ass.get('login', '') for ass in pr.get('assignees', [])],
-                                'github_url': pr.get('html_url', ''),
-                                'api_url': pr.get('url', '')
-                            })
-                    
-                    # Get assigned issues (just the first few for caching)
-                    issues_response = await client.get(f'https://api.github.com/search/issues?q=assignee:{username}+is:issue+is:open', headers=headers)
-                    if issues_response.status_code == 200:
-                        for issue in issues_response.json().get('items', [])[:3]:
-                            repo_url_parts = issue.get('repository_url', '').split('/')
-                            repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
-                            repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
-                            
-                            github_items.append({
-                                'type': 'Assigned Issue',
-                                'title': issue.get('title', ''),
-                                'repo': repo_name,
-                                'repository': f"{repo_owner}/{repo_name}",
-                                'number': issue.get('number', ''),
-                                'user': issue.get('user', {}).get('login', 'Unknown') if issue.get('user') else 'Unknown',
-                                'state': issue.get('state', 'open'),
-                                'created_at': issue.get('created_at', ''),
-                                'updated_at': issue.get('updated_at', ''),
-                                'body': issue.get('body', ''),
-                                'html_url': issue.get('html_url', ''),
-                                'labels': [label.get('name', '') for label in issue.get('labels', [])],
-                                'assignees': [ass.get('login', '') for ass in issue.get('assignees', [])],
-                                'github_url': issue.get('html_url', ''),
-                                'api_url': issue.get('url', '')
-                            })
+                async with httpx_client() as client:
+                    github_items = await fetch_github_items(client, username, headers)
                 
                 return {"data": github_items, "total": len(github_items)}
             else:
@@ -530,7 +555,7 @@ class BackgroundDataManager:
     async def _collect_music(self):
         try:
             from collectors.music_collector import MusicCollector
-            collector = MusicCollector()
+            collector = await run_in_db_executor(MusicCollector)  # reads the user profile
             return await collector.collect_data()
         except Exception as e:
             logger.error(f"Music collection error: {e}")
@@ -539,7 +564,7 @@ class BackgroundDataManager:
     async def _collect_vanity(self):
         try:
             from collectors.vanity_alerts_collector import VanityAlertsCollector
-            collector = VanityAlertsCollector()
+            collector = await run_in_db_executor(VanityAlertsCollector)  # reads the user profile
             return await collector.collect_data()
         except Exception as e:
             logger.error(f"Vanity collection error: {e}")
@@ -564,11 +589,110 @@ class BackgroundDataManager:
         except Exception as e:
             logger.error(f"Jokes collection error: {e}")
             return {"error": str(e), "joke": "Failed to load joke"}
+    
+    async def _run_maintenance(self):
+        try:
+            return await run_in_db_executor(db.run_retention)
+        except Exception as e:
+            logger.error(f"Database maintenance error: {e}")
+            return {"error": str(e)}
 
 
 # Initialize background data manager
+widget_events = EventBus()
 background_manager = BackgroundDataManager()
 
+
+# Widget endpoints answered with ETags and compression. The value names the
+# background cache key whose content hash versions the response; endpoints
+# without one are versioned by hashing the rendered body.
+CONDITIONAL_WIDGET_ENDPOINTS = {
+    '/api/calendar': 'calendar',
+    '/api/weather': 'weather',
+    '/api/vanity': 'vanity',
+    '/api/github': None,
+    '/api/news': None,
+    '/api/tasks': None,
+    '/api/vanity-alerts': None,
+}
+
+app.add_middleware(ConditionalJSONMiddleware, endpoints=CONDITIONAL_WIDGET_ENDPOINTS,
+                   version_of=background_manager.cache_version)
+
+# Added last so it is outermost and times the middlewares above as well
+app.add_middleware(MetricsMiddleware)
+
+DB_POOL_IN_USE = REGISTRY.gauge('dashboard_db_pool_connections_in_use', 'Pooled DB connections checked out')
+DB_EXECUTOR_IN_FLIGHT = REGISTRY.gauge('dashboard_db_executor_in_flight', 'Calls queued or running on the DB worker pool')
+SSE_SUBSCRIBERS = REGISTRY.gauge('dashboard_sse_subscribers', 'Open /api/events streams')
+loop_lag_task: Optional[asyncio.Task] = None
+
+
+def _collect_runtime_metrics():
+    DB_POOL_IN_USE.set(db.get_pool_stats().get('in_use', 0))
+    DB_EXECUTOR_IN_FLIGHT.set(get_db_executor_stats().get('in_flight', 0))
+    SSE_SUBSCRIBERS.set(widget_events.get_stats()['subscribers'])
+
+
+REGISTRY.add_collector(_collect_runtime_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint: request, DB, outbound HTTP and AI provider metrics."""
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/events")
+async def stream_widget_events(request: Request, last_event_id: Optional[int] = Query(None)):
+    """Server-Sent Events: a version bump each time a widget's data changes.
+    
+    Reconnecting clients send Last-Event-ID (EventSource does this itself)
+    and receive the events they missed, or one `reset` if those are gone.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    header_id = request.headers.get('last-event-id')
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    
+    async def event_stream():
+        yield "retry: 5000\n\n"
+        async for event in widget_events.subscribe(last_event_id, heartbeat=15):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            yield event.to_sse()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
+
+@app.post("/api/client/activity")
+async def report_client_activity(request: Request):
+    """Dashboard tab visibility and user interaction, the only activity signal.
+    
+    The frontend posts on visibilitychange and, while the tab is visible, on
+    user interaction and a slow heartbeat. Background polling and SSE streams
+    do not count, so a forgotten tab still lets collectors pause.
+    """
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+    visible = bool(body.get('visible', True))
+    background_manager.scheduler.record_activity(visible=visible)
+    return {"success": True, "visible": visible}
+
 # In-memory diagnostics event log
 DIAGNOSTIC_EVENTS: List[Dict[str, Any]] = []
 DIAGNOSTIC_LOCK = threading.Lock()
@@ -1074,11 +1198,10 @@ async def dashboard(code: str = None, state: str = None, error: str = None):
 async def get_calendar():
     """Get calendar events from Google Calendar"""
     try:
-        # Try to get cached data first
-        cached_data = background_manager.get_cached_data('calendar')
-        if cached_data:
-            logger.info("Returning cached calendar data")
-            return cached_data
+        # Serve cached data (stale copies refresh in the background)
+        cached = await background_manager.get_data('calendar')
+        if cached and isinstance(cached.value, dict):
+            return {**cached.value, "freshness": cached.freshness}
         
         # Fallback to real-time collection if no cache available
         logger.info("No cached calendar data, collecting in real-time")
@@ -1088,7 +1211,8 @@ async def get_calendar():
                 calendar_collector = CalendarCollector(settings)
                 start_date = datetime.now()
                 end_date = start_date + timedelta(days=7)
-                events_data = await calendar_collector.collect_events(start_date, end_date)
+                events_data = await single_flight.do(('calendar', 'upcoming'), calendar_collector.collect_events,
+                                                     start_date, end_date)
                 
                 if events_data:
                     formatted_events = []
@@ -1208,8 +1332,12 @@ async def scan_notes():
         
         # Collect notes from all sources (run in thread so it cannot block the event loop)
         try:
+            notes_key = ('notes', obsidian_path, gdrive_folder_id, include_apple_notes,
+                         google_keep_email, tuple(google_keep_labels or ()), limit)
             result = await asyncio.wait_for(
                 asyncio.to_thread(
+                    single_flight.do_sync,
+                    notes_key,
                     collect_all_notes,
                     obsidian_path=obsidian_path,
                     gdrive_folder_id=gdrive_folder_id,
@@ -1245,8 +1373,8 @@ async def scan_notes():
             existing_titles = {s['title'].lower() for s in existing_suggestions}
             
             # Get existing tasks to avoid duplicates
-            existing_tasks = db.get_todos()
-            existing_task_titles = {t.get('title', '').lower() for t in existing_tasks}
+            existing_tasks = db.get_todo_rows(summary=True)
+            existing_task_titles = {(t.title or '').lower() for t in existing_tasks}
             
             for todo_item in result['todos_to_create']:
                 try:
@@ -1482,10 +1610,13 @@ async def get_notes():
         logger.info(f"DEBUG - obsidian_path type: {type(obsidian_path)}, value: {repr(obsidian_path)}")
         logger.info(f"DEBUG - gdrive_folder_id type: {type(gdrive_folder_id)}, value: {repr(gdrive_folder_id)}")
         
-        # Collect notes from all sources (run in thread so it cannot block the event loop)
+        # Collect notes from all sources (run in thread so it cannot block the event loop);
+        # concurrent requests with the same sources share one collection
         try:
             result = await asyncio.wait_for(
                 asyncio.to_thread(
+                    single_flight.do_sync,
+                    ('notes', obsidian_path, gdrive_folder_id, include_apple_notes, limit),
                     collect_all_notes,
                     obsidian_path=obsidian_path,
                     gdrive_folder_id=gdrive_folder_id,
@@ -1503,6 +1634,8 @@ async def get_notes():
                 logger.warning("Retrying notes collection with remote providers disabled")
                 result = await asyncio.wait_for(
                     asyncio.to_thread(
+                        single_flight.do_sync,
+                        ('notes', obsidian_path, None, False, limit),
                         collect_all_notes,
                         obsidian_path=obsidian_path,
                         gdrive_folder_id=None,
@@ -1553,8 +1686,8 @@ async def get_notes():
             existing_titles = {s['title'].lower() for s in existing_suggestions}
             
             # Get existing tasks to avoid duplicates
-            existing_tasks = db.get_todos()
-            existing_task_titles = {t.get('title', '').lower() for t in existing_tasks}
+            existing_tasks = db.get_todo_rows(summary=True)
+            existing_task_titles = {(t.title or '').lower() for t in existing_tasks}
             
             for todo_item in result['todos_to_create']:
                 try:
@@ -2308,7 +2441,8 @@ async def get_email():
                 }
                 
                 gmail_collector = GmailCollector(account_config)
-                data = await gmail_collector.collect_data()
+                # Concurrent tabs and the background collector share one Gmail fetch
+                data = await single_flight.do(('gmail', 'primary'), gmail_collector.collect_data)
                 
                 logger.info(f"Retrieved {data.get('total_count', 0)} emails, {data.get('unread_count', 0)} unread")
                 return data
@@ -2323,6 +2457,112 @@ async def get_email():
         logger.error(f"Error in email API: {e}")
         return {"error": str(e), "emails": [], "total_count": 0, "unread_count": 0}
 
+async def fetch_github_items(client, username: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
+    """GitHub widget items: review requests, assigned issues, recently pushed
+    repositories and your recent pull requests (three of each).
+    
+    Shared by /api/github and the background collector so both serve the same list.
+    """
+    github_items = []
+    # Get review requests
+    review_response = await client.get(f'https://api.github.com/search/issues?q=review-requested:{username}+is:open+is:pr', headers=headers, timeout=10.0)
+    if review_response.status_code == 200:
+        for pr in review_response.json().get('items', [])[:3]:
+            repo_url_parts = pr.get('repository_url', '').split('/')
+            repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
+            repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
+
+            github_items.append({
+                'type': 'Review Requested', 
+                'title': pr.get('title', ''),
+                'repo': repo_name, 
+                'repository': f"{repo_owner}/{repo_name}",
+                'number': pr.get('number', ''),
+                'user': pr.get('user', {}).get('login', 'Unknown') if pr.get('user') else 'Unknown',
+                'state': pr.get('state', 'open'),
+                'created_at': pr.get('created_at', ''),
+                'updated_at': pr.get('updated_at', ''),
+                'body': pr.get('body', ''),
+                'html_url': pr.get('html_url', ''),
+                'labels': [label.get('name', '') for label in pr.get('labels', [])],
+                'assignees': [ass.get('login', '') for ass in pr.get('assignees', [])],
+                'github_url': pr.get('html_url', ''),
+                'api_url': pr.get('url', '')
+            })
+
+    # Get assigned issues  
+    issues_response = await client.get(f'https://api.github.com/search/issues?q=assignee:{username}+is:issue+is:open', headers=headers, timeout=10.0)
+    if issues_response.status_code == 200:
+        for issue in issues_response.json().get('items', [])[:3]:
+            repo_url_parts = issue.get('repository_url', '').split('/')
+            repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
+            repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
+
+            github_items.append({
+                'type': 'Issue Assigned', 
+                'title': issue.get('title', ''),
+                'repo': repo_name,
+                'repository': f"{repo_owner}/{repo_name}", 
+                'number': issue.get('number', ''),
+                'user': issue.get('user', {}).get('login', 'Unknown') if issue.get('user') else 'Unknown',
+                'state': issue.get('state', 'open'),
+                'created_at': issue.get('created_at', ''),
+                'updated_at': issue.get('updated_at', ''),
+                'body': issue.get('body', ''),
+                'html_url': issue.get('html_url', ''),
+                'labels': [label.get('name', '') for label in issue.get('labels', [])],
+                'assignees': [ass.get('login', '') for ass in issue.get('assignees', [])],
+                'github_url': issue.get('html_url', ''),
+                'api_url': issue.get('url', '')
+            })
+
+    # Get recent activity - repositories you've pushed to
+    repos_response = await client.get(f'https://api.github.com/user/repos?sort=pushed&per_page=5', headers=headers, timeout=10.0)
+    if repos_response.status_code == 200:
+        for repo in repos_response.json()[:3]:
+            github_items.append({
+                'type': 'Recent Repository', 
+                'title': repo.get('name', ''),
+                'repo': repo.get('name', ''),
+                'repository': repo.get('full_name', ''), 
+                'description': repo.get('description', 'No description'),
+                'updated_at': repo.get('pushed_at', ''),
+                'language': repo.get('language', 'Unknown'),
+                'stars': repo.get('stargazers_count', 0),
+                'forks': repo.get('forks_count', 0),
+                'private': repo.get('private', False),
+                'html_url': repo.get('html_url', ''),
+                'github_url': repo.get('html_url', ''),
+                'api_url': repo.get('url', '')
+            })
+
+    # Get recent pull requests authored by you
+    prs_response = await client.get(f'https://api.github.com/search/issues?q=author:{username}+is:pr+sort:updated', headers=headers, timeout=10.0)
+    if prs_response.status_code == 200:
+        for pr in prs_response.json().get('items', [])[:3]:
+            repo_url_parts = pr.get('repository_url', '').split('/')
+            repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
+            repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
+
+            github_items.append({
+                'type': 'Pull Request', 
+                'title': pr.get('title', ''),
+                'repo': repo_name,
+                'repository': f"{repo_owner}/{repo_name}", 
+                'number': pr.get('number', ''),
+                'state': pr.get('state', 'open'),
+                'created_at': pr.get('created_at', ''),
+                'updated_at': pr.get('updated_at', ''),
+                'body': pr.get('body', ''),
+                'html_url': pr.get('html_url', ''),
+                'labels': [label.get('name', '') for label in pr.get('labels', [])],
+                'github_url': pr.get('html_url', ''),
+                'api_url': pr.get('url', '')
+            })
+    
+    return github_items
+
+
 @app.get("/api/github")
 async def get_github():
     """Get GitHub activity"""
@@ -2340,103 +2580,8 @@ async def get_github():
                     token = github_creds.get('token')
                     headers = {'Authorization': f'token {token}', 'Accept': 'application/vnd.github.v3+json'}
                     
-                    github_items = []
                     async with httpx.AsyncClient(timeout=10.0) as client:
-                        # Get review requests
-                        review_response = await client.get(f'https://api.github.com/search/issues?q=review-requested:{username}+is:open+is:pr', headers=headers)
-                        if review_response.status_code == 200:
-                            for pr in review_response.json().get('items', [])[:3]:
-                                repo_url_parts = pr.get('repository_url', '').split('/')
-                                repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
-                                repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
-                                
-                                github_items.append({
-                                    'type': 'Review Requested', 
-                                    'title': pr.get('title', ''),
-                                    'repo': repo_name, 
-                                    'repository': f"{repo_owner}/{repo_name}",
-                                    'number': pr.get('number', ''),
-                                    'user': pr.get('user', {}).get('login', 'Unknown') if pr.get('user') else 'Unknown',
-                                    'state': pr.get('state', 'open'),
-                                    'created_at': pr.get('created_at', ''),
-                                    'updated_at': pr.get('updated_at', ''),
-                                    'body': pr.get('body', ''),
-                                    'html_url': pr.get('html_url', ''),
-                                    'labels': [label.get('name', '') for label in pr.get('labels', [])],
-                                    'assignees': [ass.get('login', '') for ass in pr.get('assignees', [])],
-                                    'github_url': pr.get('html_url', ''),
-                                    'api_url': pr.get('url', '')
-                                })
-                        
-                        # Get assigned issues  
-                        issues_response = await client.get(f'https://api.github.com/search/issues?q=assignee:{username}+is:issue+is:open', headers=headers)
-                        if issues_response.status_code == 200:
-                            for issue in issues_response.json().get('items', [])[:3]:
-                                repo_url_parts = issue.get('repository_url', '').split('/')
-                                repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
-                                repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
-                                
-                                github_items.append({
-                                    'type': 'Issue Assigned', 
-                                    'title': issue.get('title', ''),
-                                    'repo': repo_name,
-                                    'repository': f"{repo_owner}/{repo_name}", 
-                                    'number': issue.get('number', ''),
-                                    'user': issue.get('user', {}).get('login', 'Unknown') if issue.get('user') else 'Unknown',
-                                    'state': issue.get('state', 'open'),
-                                    'created_at': issue.get('created_at', ''),
-                                    'updated_at': issue.get('updated_at', ''),
-                                    'body': issue.get('body', ''),
-                                    'html_url': issue.get('html_url', ''),
-                                    'labels': [label.get('name', '') for label in issue.get('labels', [])],
-                                    'assignees': [ass.get('login', '') for ass in issue.get('assignees', [])],
-                                    'github_url': issue.get('html_url', ''),
-                                    'api_url': issue.get('url', '')
-                                })
-                        
-                        # Get recent activity - repositories you've pushed to
-                        repos_response = await client.get(f'https://api.github.com/user/repos?sort=pushed&per_page=5', headers=headers)
-                        if repos_response.status_code == 200:
-                            for repo in repos_response.json()[:3]:
-                                github_items.append({
-                                    'type': 'Recent Repository', 
-                                    'title': repo.get('name', ''),
-                                    'repo': repo.get('name', ''),
-                                    'repository': repo.get('full_name', ''), 
-                                    'description': repo.get('description', 'No description'),
-                                    'updated_at': repo.get('pushed_at', ''),
-                                    'language': repo.get('language', 'Unknown'),
-                                    'stars': repo.get('stargazers_count', 0),
-                                    'forks': repo.get('forks_count', 0),
-                                    'private': repo.get('private', False),
-                                    'html_url': repo.get('html_url', ''),
-                                    'github_url': repo.get('html_url', ''),
-                                    'api_url': repo.get('url', '')
-                                })
-                        
-                        # Get recent pull requests authored by you
-                        prs_response = await client.get(f'https://api.github.com/search/issues?q=author:{username}+is:pr+sort:updated', headers=headers)
-                        if prs_response.status_code == 200:
-                            for pr in prs_response.json().get('items', [])[:3]:
-                                repo_url_parts = pr.get('repository_url', '').split('/')
-                                repo_name = repo_url_parts[-1] if repo_url_parts else 'unknown'
-                                repo_owner = repo_url_parts[-2] if len(repo_url_parts) > 1 else 'unknown'
-                                
-                                github_items.append({
-                                    'type': 'Pull Request', 
-                                    'title': pr.get('title', ''),
-                                    'repo': repo_name,
-                                    'repository': f"{repo_owner}/{repo_name}", 
-                                    'number': pr.get('number', ''),
-                                    'state': pr.get('state', 'open'),
-                                    'created_at': pr.get('created_at', ''),
-                                    'updated_at': pr.get('updated_at', ''),
-                                    'body': pr.get('body', ''),
-                                    'html_url': pr.get('html_url', ''),
-                                    'labels': [label.get('name', '') for label in pr.get('labels', [])],
-                                    'github_url': pr.get('html_url', ''),
-                                    'api_url': pr.get('url', '')
-                                })
+                        github_items = await fetch_github_items(client, username, headers)
                     
                     return {"items": github_items}
             except Exception as e:
@@ -2609,6 +2754,9 @@ async def scan_emails_for_tasks(request: Request):
     """Scan historical emails for tasks using strict AI filtering.
     
     Tracks scanned sources to avoid re-processing emails and respects deleted tasks.
+    Emails pass a heuristic pre-filter, then the AI provider reviews the
+    candidates in batches (use_ai, batch_size, concurrency); progress is
+    pushed to /api/events as `task_scan` events.
     """
     try:
         if not COLLECTORS_AVAILABLE:
@@ -2620,6 +2768,7 @@ async def scan_emails_for_tasks(request: Request):
         end_date_str = body.get('end_date')
         max_emails = body.get('max_emails', 100)
         force_rescan = body.get('force_rescan', False)  # Force rescan previously scanned emails
+        use_ai = body.get('use_ai', True)
         
         # Parse dates
         start_date = datetime.fromisoformat(start_date_str) if start_date_str else datetime.now() - timedelta(days=30)
@@ -2631,11 +2780,27 @@ async def scan_emails_for_tasks(request: Request):
         # Initialize collectors
         settings = Settings()
         gmail_collector = GmailCollector(settings)
-        task_manager = TaskManager(settings)
         
-        # Import email analyzer
-        from processors.email_analyzer import EmailAnalyzer
-        email_analyzer = EmailAnalyzer()
+        from processors.email_task_pipeline import DEFAULT_BATCH_SIZE, DEFAULT_CONCURRENCY, EmailTaskPipeline
+        
+        # AI review is optional: without a healthy provider the heuristics decide alone
+        ai_service = get_ai_service(db, settings)
+        ai_provider = ai_service.get_provider() if use_ai else None
+        if ai_provider and not await ai_provider.check_health():
+            logger.info("AI provider unavailable - scanning emails with heuristics only")
+            ai_provider = None
+        
+        def report_progress(progress: Dict[str, Any]):
+            widget_events.publish('task_scan', progress)
+        
+        pipeline = EmailTaskPipeline(
+            db,
+            ai_provider=ai_provider,
+            response_cache=ai_service.response_cache,
+            batch_size=body.get('batch_size', DEFAULT_BATCH_SIZE),
+            concurrency=body.get('concurrency', DEFAULT_CONCURRENCY),
+            on_progress=report_progress
+        )
         
         # Collect emails in date range
         emails = await gmail_collector.collect_emails(start_date, end_date)
@@ -2643,105 +2808,17 @@ async def scan_emails_for_tasks(request: Request):
         
         logger.info(f"Collected {len(emails)} emails to scan")
         
-        tasks_created = 0
-        tasks_skipped = 0
-        emails_skipped = 0
-        already_scanned = 0
-        
-        # Analyze each email for tasks
-        for email in emails:
-            try:
-                subject = email.get('subject', '')
-                body = email.get('body', '')
-                sender = email.get('sender', '')
-                email_id = email.get('id', '')
-                received_date = email.get('received_date', '')
-                risk_score = email.get('risk_score', 0)  # Get risk score from email data
-                labels = [label.upper() for label in email.get('labels', [])]
-                is_starred = 'STARRED' in labels
-                is_important = bool(email.get('is_important')) or 'IMPORTANT' in labels
-                email_priority = (email.get('priority') or email.get('ollama_priority') or 'medium').lower()
-                
-                # Check if email was already scanned (unless force_rescan is True)
-                if not force_rescan and db.is_source_scanned('email', email_id):
-                    already_scanned += 1
-                    continue
-                
-                # Check if task already exists or was deleted (avoid duplicates and re-creation)
-                existing_tasks = task_manager.get_tasks_by_source('email', email_id, include_deleted=True)
-                if existing_tasks:
-                    logger.info(f"Task already exists/deleted for email: {subject[:50]}")
-                    tasks_skipped += 1
-                    # Mark as scanned to prevent future checks
-                    db.mark_source_scanned('email', email_id, tasks_found=0, tasks_created=0)
-                    continue
-                
-                # Use AI analyzer with strict filtering and risk scoring
-                todos = await email_analyzer.analyze_email_for_todos(subject, body, sender, risk_score)
-                
-                if not todos:
-                    emails_skipped += 1
-                    # Mark as scanned with no tasks found
-                    db.mark_source_scanned('email', email_id, tasks_found=0, tasks_created=0)
-                    continue
-                
-                # Create tasks for each todo found
-                email_tasks_created = 0
-                for todo in todos:
-                    # Check if task already exists (avoid duplicates)
-                    existing_tasks = db.get_todos_by_source('email', None)
-                    existing_tasks = [t for t in existing_tasks if t.get('source_id') == email_id]
-                    if existing_tasks:
-                        logger.info(f"Task already exists for email: {subject[:50]}")
-                        tasks_skipped += 1
-                        continue
-
-                    todo_reason = todo.get('reason', 'Detected as actionable from email content')
-                    base_priority = (todo.get('priority') or 'medium').lower()
-                    should_escalate = is_starred or is_important or email_priority == 'high' or risk_score >= 7
-                    derived_priority = 'high' if should_escalate else base_priority
-                    priority_reason = "Elevated priority from flagged/prioritized email" if should_escalate else "Priority from extracted task signal"
-                    source_preview = (email.get('snippet') or body or '')[:280]
-                    source_url = f"https://mail.google.com/mail/u/0/#inbox/{email_id}" if email_id else None
-                    
-                    # Create task
-                    result = task_manager.create_task(
-                        title=todo.get('task', f"Follow up: {subject[:60]}"),
-                        description=f"From: {sender}\nSubject: {subject}\n\nWhy: {todo_reason}",
-                        priority=derived_priority,
-                        category=todo.get('category', 'email'),
-                        source='email',
-                        source_id=email_id,
-                        email_id=email_id,
-                        source_title=subject,
-                        source_url=source_url,
-                        source_preview=source_preview,
-                        creation_reason=f"{todo_reason}. {priority_reason}",
-                        sync_to_ticktick=COLLECTORS_AVAILABLE
-                    )
-
-                    if result.get('success'):
-                        tasks_created += 1
-                        email_tasks_created += 1
-                        logger.info(f"Created task from email: {subject[:50]}")
-                    else:
-                        tasks_skipped += 1
-                        logger.warning(f"Skipped task creation for email {email_id}: {result.get('error', 'unknown error')}")
-
-                # Mark source as scanned with tasks created count
-                db.mark_source_scanned('email', email_id, tasks_found=len(todos), tasks_created=email_tasks_created)
-                    
-            except Exception as e:
-                logger.error(f"Error processing email {email.get('id', 'unknown')}: {e}")
-                continue
+        result = await pipeline.run(emails, force_rescan=force_rescan)
         
         return {
             "success": True,
             "emails_scanned": len(emails),
-            "already_scanned": already_scanned,
-            "tasks_created": tasks_created,
-            "tasks_skipped": tasks_skipped,
-            "emails_skipped": emails_skipped,
+            "already_scanned": result['already_scanned'],
+            "tasks_created": result['tasks_created'],
+            "tasks_skipped": result['tasks_skipped'],
+            "emails_skipped": result['emails_skipped'],
+            "ai_reviewed": ai_provider is not None,
+            "pipeline": result['pipeline'],
             "date_range": {
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat()
@@ -2749,6 +2826,8 @@ async def scan_emails_for_tasks(request: Request):
             "timestamp": datetime.now().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Email scan error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3451,108 +3530,59 @@ async def apply_email_label(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Task Management API Endpoints
-@app.get("/api/tasks")
-async def get_tasks(include_completed: bool = False, priority: str = None, status: str = None, category: str = None):
-    """Get all tasks from database with optional filtering."""
+@app.get("/api/search")
+async def full_text_search(
+    q: str = Query(..., min_length=1),
+    kinds: str = None,
+    limit: int = Query(20, ge=1, le=200)
+):
+    """Full-text search across emails, tasks, news and notes.
+
+    `kinds` is an optional comma-separated subset of emails,todos,news,notes.
+    """
+    kind_list = [k.strip() for k in kinds.split(',') if k.strip()] if kinds else None
     try:
-        from database import DatabaseManager
+        results = await adb.search(q, kinds=kind_list, limit=limit)
+    except ValueError as e:
+        return {"error": str(e), "success": False}
 
-        active_db = DatabaseManager()
-        current_db_path = active_db.db_path
-        all_tasks = active_db.get_todos(include_completed=include_completed, include_deleted=False)
-
-        # Fallback: if runtime DB has no tasks, check known workspace DB locations
-        if len(all_tasks) == 0:
-            fallback_paths = [
-                project_root / "dashboard.db",
-                project_root / "data" / "dashboard.db",
-                project_root / "src" / "dashboard.db",
-                Path.home() / ".personal-dashboard" / "dashboard.db",
-            ]
+    return {
+        "success": True,
+        "query": q,
+        "results": results,
+        "count": len(results)
+    }
 
-            for fallback_path in fallback_paths:
-                if not fallback_path.exists():
-                    continue
 
-                fallback_path_str = str(fallback_path)
-                if current_db_path and os.path.abspath(fallback_path_str) == os.path.abspath(current_db_path):
-                    continue
+# Task Management API Endpoints
+@app.get("/api/tasks")
+async def get_tasks(
+    include_completed: bool = False,
+    priority: str = None,
+    status: str = None,
+    category: str = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: str = None
+):
+    """Get tasks from database with optional filtering and keyset pagination."""
+    try:
+        try:
+            page = await adb.query_todos(
+                include_completed=include_completed,
+                include_deleted=False,
+                priority=priority,
+                status=status,
+                category=category,
+                limit=limit,
+                cursor=cursor
+            )
+        except ValueError as e:
+            return {"error": str(e), "success": False}
 
-                try:
-                    fallback_db = DatabaseManager(fallback_path_str)
-                    fallback_rows = fallback_db.get_todos(include_completed=include_completed, include_deleted=False)
-                    if fallback_rows:
-                        all_tasks = fallback_rows
-                        logger.info(f"Loaded {len(all_tasks)} tasks from fallback DB: {fallback_path_str}")
-                        break
-                except Exception as fallback_error:
-                    logger.warning(f"Failed reading fallback DB {fallback_path_str}: {fallback_error}")
-
-        tasks = []
-        for task in all_tasks:
-            tasks.append({
-                'id': task.get('id', ''),
-                'title': task.get('title', ''),
-                'description': task.get('description', ''),
-                'priority': task.get('priority', 'medium'),
-                'category': task.get('category', 'general'),
-                'status': task.get('status', 'pending'),
-                'source': task.get('source', 'manual'),
-                'source_id': task.get('source_id', ''),
-                'source_title': task.get('source_title', ''),
-                'source_url': task.get('source_url', ''),
-                'source_preview': task.get('source_preview', ''),
-                'creation_reason': task.get('creation_reason', ''),
-                'due_date': task.get('due_date', ''),
-                'created_at': task.get('created_at', ''),
-                'completed_at': task.get('completed_at', ''),
-                'requires_response': bool(task.get('requires_response', 0)),
-                'email_id': task.get('email_id', ''),
-                'gmail_link': f"https://mail.google.com/mail/u/0/#inbox/{task.get('email_id')}" if task.get('email_id') else None
-            })
-        
-        # Apply filters
-        if priority:
-            tasks = [t for t in tasks if t.get('priority', '').lower() == priority.lower()]
-        
-        if status:
-            tasks = [t for t in tasks if t.get('status', '').lower() == status.lower()]
-            
-        if category:
-            tasks = [t for t in tasks if t.get('category', '').lower() == category.lower()]
+        tasks = [task.to_api_dict() for task in page['rows']]
         
         # Get statistics for all tasks (unfiltered)
-        status_counts = {}
-        priority_counts = {'high': 0, 'medium': 0, 'low': 0}
-        category_counts = {}
-        source_counts = {}
-
-        for task in all_tasks:
-            task_status = (task.get('status') or 'pending').lower()
-            task_priority = (task.get('priority') or 'medium').lower()
-            task_category = task.get('category') or 'general'
-            task_source = task.get('source') or 'manual'
-
-            status_counts[task_status] = status_counts.get(task_status, 0) + 1
-            category_counts[task_category] = category_counts.get(task_category, 0) + 1
-            source_counts[task_source] = source_counts.get(task_source, 0) + 1
-            if task_priority in priority_counts:
-                priority_counts[task_priority] += 1
-
-        stats = {
-            'total_tasks': len(all_tasks),
-            'pending_tasks': status_counts.get('pending', 0),
-            'completed_tasks': status_counts.get('completed', 0),
-            'high_priority': priority_counts['high'],
-            'medium_priority': priority_counts['medium'],
-            'low_priority': priority_counts['low'],
-            'overdue_tasks': 0,
-            'due_today': 0,
-            'due_this_week': 0,
-            'by_category': category_counts,
-            'by_source': source_counts
-        }
+        stats = await adb.get_todo_stats(include_completed=include_completed, include_deleted=False)
         
         return {
             "success": True,
@@ -3564,6 +3594,12 @@ async def get_tasks(include_completed: bool = False, priority: str = None, statu
                 "category": category,
                 "include_completed": include_completed
             },
+            "pagination": {
+                "limit": limit,
+                "next_cursor": page['next_cursor'],
+                "has_more": page['next_cursor'] is not None,
+                "total": page['total']
+            },
             "timestamp": datetime.now().isoformat()
         }
         
@@ -3899,7 +3935,7 @@ async def get_task_details(task_id: str):
 async def get_suggested_todos(status: str = "pending"):
     """Get suggested todos awaiting user approval."""
     try:
-        suggestions = db.get_suggested_todos(status=status)
+        suggestions = await adb.get_suggested_todos(status=status)
         return {
             "success": True,
             "suggestions": suggestions,
@@ -3914,7 +3950,7 @@ async def get_suggested_todos(status: str = "pending"):
 async def approve_suggested_todo(suggestion_id: str):
     """Approve a suggested todo and add it to the main todos list."""
     try:
-        success = db.approve_suggested_todo(suggestion_id)
+        success = await adb.approve_suggested_todo(suggestion_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Suggested todo not found")
@@ -3945,7 +3981,7 @@ async def bulk_process_suggested_todos(request: Request):
         if suggestion_ids:
             target_ids = [str(item).strip() for item in suggestion_ids if str(item).strip()]
         else:
-            pending = db.get_suggested_todos(status="pending")
+            pending = await adb.get_suggested_todos(status="pending")
             target_ids = [str(item.get("id", "")).strip() for item in pending if item.get("id")]
 
         processed = 0
@@ -3954,9 +3990,9 @@ async def bulk_process_suggested_todos(request: Request):
         for suggestion_id in target_ids:
             try:
                 if action == "approve":
-                    success = db.approve_suggested_todo(suggestion_id)
+                    success = await adb.approve_suggested_todo(suggestion_id)
                 else:
-                    success = db.reject_suggested_todo(suggestion_id)
+                    success = await adb.reject_suggested_todo(suggestion_id)
                 if success:
                     processed += 1
                 else:
@@ -3983,7 +4019,7 @@ async def bulk_process_suggested_todos(request: Request):
 async def reject_suggested_todo(suggestion_id: str):
     """Reject a suggested todo."""
     try:
-        success = db.reject_suggested_todo(suggestion_id)
+        success = await adb.reject_suggested_todo(suggestion_id)
         
         if not success:
             raise HTTPException(status_code=404, detail="Suggested todo not found")
@@ -4070,7 +4106,7 @@ Extract clear, actionable tasks. For each task respond with JSON:
 Only include real tasks/action items. Skip if this is just an informational event."""
                 }]
                 
-                result = await ai_provider.chat(messages)
+                result = await ai_service.response_cache.chat(ai_provider, messages)
                 
                 # Parse AI response
                 import json
@@ -4256,7 +4292,7 @@ Extract clear, actionable tasks. For each task respond with JSON:
 Only include real tasks/action items. Skip if this note is purely informational with no actions needed."""
                 }]
                 
-                result_ai = await ai_provider.chat(messages)
+                result_ai = await ai_service.response_cache.chat(ai_provider, messages)
                 
                 # Parse AI response
                 import json
@@ -4314,36 +4350,41 @@ Only include real tasks/action items. Skip if this note is purely informational
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _fetch_news_articles_blocking(include_read: bool) -> list:
+    """Read the latest news articles from the database (runs on the DB executor)."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        
+        # Build query based on whether we want to include read articles
+        if include_read:
+            cursor.execute('''
+                SELECT id, title, url, snippet, image_url, source, published_date, topics, relevance_score, is_read
+                FROM news_articles 
+                ORDER BY is_read ASC, published_date DESC 
+                LIMIT 50
+            ''')
+        else:
+            cursor.execute('''
+                SELECT id, title, url, snippet, image_url, source, published_date, topics, relevance_score, is_read
+                FROM news_articles 
+                WHERE is_read = 0
+                ORDER BY published_date DESC 
+                LIMIT 50
+            ''')
+        return cursor.fetchall()
+
+
 @app.get("/api/news")
 async def get_news(filter: str = "all", include_read: bool = False):
     """Get filtered news headlines from database"""
     try:
         # Get news articles from database
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Build query based on whether we want to include read articles
-            if include_read:
-                cursor.execute('''
-                    SELECT id, title, url, snippet, image_url, source, published_date, topics, relevance_score, is_read
-                    FROM news_articles 
-                    ORDER BY is_read ASC, published_date DESC 
-                    LIMIT 50
-                ''')
-            else:
-                cursor.execute('''
-                    SELECT id, title, url, snippet, image_url, source, published_date, topics, relevance_score, is_read
-                    FROM news_articles 
-                    WHERE is_read = 0
-                    ORDER BY published_date DESC 
-                    LIMIT 50
-                ''')
-            db_articles = cursor.fetchall()
+        db_articles = await run_in_db_executor(_fetch_news_articles_blocking, include_read)
             
         logger.info(f"Found {len(db_articles)} articles in database (include_read={include_read})")
         
         # Get previously rated news items to filter them out
-        rated_item_ids = db.get_rated_item_ids('news')
+        rated_item_ids = await adb.get_rated_item_ids('news')
         
         # Process articles from database
         articles = []
@@ -4648,11 +4689,10 @@ async def get_music():
 async def get_vanity():
     """Get vanity alerts about user's projects and interests"""
     try:
-        # Try to get cached data first
-        cached_data = background_manager.get_cached_data('vanity')
-        if cached_data:
-            logger.info("Returning cached vanity data")
-            return cached_data
+        # Serve cached data (stale copies refresh in the background)
+        cached = await background_manager.get_data('vanity')
+        if cached and isinstance(cached.value, dict):
+            return {**cached.value, "freshness": cached.freshness}
         
         # Fallback to real-time collection if no cache available
         logger.info("No cached vanity data, collecting in real-time")
@@ -4755,6 +4795,51 @@ async def get_vanity_alerts():
         return {"alerts": [], "count": 0, "success": False, "error": str(e)}
 
 
+async def _cached_or_live(endpoint: str, live, adapt=None):
+    """Background-cache copy of a widget if there is one, else the live endpoint."""
+    cached = await background_manager.get_data(endpoint, wait_if_missing=False)
+    if cached and isinstance(cached.value, dict):
+        value = adapt(cached.value) if adapt else cached.value
+        return {**value, "freshness": cached.freshness}
+    return await live()
+
+
+@app.get("/api/dashboard/bootstrap")
+async def dashboard_bootstrap(request: Request):
+    """Every first-paint widget payload in one NDJSON stream, fastest first.
+    
+    The first line lists {"widgets": {name: url}}. Each following line is
+    {"widget", "url", "data"|"error", "elapsed_ms"}, where `url` is the request
+    the payload answers. The last line is {"done": true, ...}.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    sources = {
+        'tasks': ('/api/tasks?include_completed=false',
+                  lambda: get_tasks(include_completed=False, priority=None, status=None,
+                                    category=None, limit=None, cursor=None)),
+        'calendar': ('/api/calendar', get_calendar),
+        'email': ('/api/email', lambda: _cached_or_live('email', get_email)),
+        'github': ('/api/github', lambda: _cached_or_live(
+            'github', get_github, lambda value: {"items": value.get('data', [])})),
+        'news': ('/api/news?include_read=false', lambda: get_news(filter="all", include_read=False)),
+        'weather': ('/api/weather', get_weather),
+        'vanity': ('/api/vanity-alerts', get_vanity_alerts),
+    }
+    
+    async def widget_stream():
+        async for item in gather_widgets(sources):
+            if await request.is_disconnected():
+                break
+            yield ndjson_line(item)
+    
+    return StreamingResponse(
+        widget_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/vanity-alerts/{alert_id}/dismiss")
 async def dismiss_vanity_alert(alert_id: str):
     """Dismiss a vanity alert so it won't be shown again."""
@@ -4835,10 +4920,8 @@ async def get_weather():
         logger.info(f"Weather API called. COLLECTORS_AVAILABLE={COLLECTORS_AVAILABLE}")
         if COLLECTORS_AVAILABLE:
             try:
-                weather_collector = WeatherCollector()
-                logger.info("Instantiated WeatherCollector.")
-                weather_data = await weather_collector.collect_data()
-                logger.info(f"WeatherCollector.collect_data() returned: {weather_data}")
+                cached = await background_manager.get_data('weather')
+                weather_data = cached.value if cached else None
                 if weather_data:
                     # Format the data for display
                     result = {
@@ -4856,7 +4939,8 @@ async def get_weather():
                         "api_status": weather_data.get('api_status', 'unknown'),
                         "setup_note": weather_data.get('setup_note', ''),
                         "timestamp": weather_data.get('timestamp', ''),
-                        "forecast": []
+                        "forecast": [],
+                        "freshness": cached.freshness
                     }
                     
                     # Format forecast data for display
@@ -5362,8 +5446,8 @@ Format: [{"artist": "Name", "title": "Song"}, ...]""")
         
         # Try to use the configured model if available
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{ollama_url}/api/tags") as resp:
+            async with provider_session(ollama_url) as session:
+                async with session.get(f"{ollama_url}/api/tags", timeout=aiohttp.ClientTimeout(total=5)) as resp:
                     if resp.status == 200:
                         tags = await resp.json()
                         available_models = [m['name'] for m in tags.get('models', [])]
@@ -5378,7 +5462,7 @@ Format: [{"artist": "Name", "title": "Song"}, ...]""")
             logger.warning(f"Could not check available models: {e}")
         
         # Call Ollama directly
-        async with aiohttp.ClientSession() as session:
+        async with provider_session(ollama_url) as session:
             async with session.post(
                 f"{ollama_url}/api/generate",
                 json={
@@ -6743,7 +6827,7 @@ async def chat_with_ai(request: Request):
         # Create conversation if needed
         if not conversation_id:
             conversation_id = f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            db.save_ai_conversation(conversation_id, 1, f"Chat {datetime.now().strftime('%H:%M')}")
+            await adb.save_ai_conversation(conversation_id, 1, f"Chat {datetime.now().strftime('%H:%M')}")
         
         # If streaming requested, use SSE endpoint
         if stream:
@@ -6813,7 +6897,7 @@ async def chat_with_ai_stream(
         # Create conversation if needed
         if not conversation_id:
             conversation_id = f"conv_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            db.save_ai_conversation(conversation_id, 1, f"Chat {datetime.now().strftime('%H:%M')}")
+            await adb.save_ai_conversation(conversation_id, 1, f"Chat {datetime.now().strftime('%H:%M')}")
         
         async def event_generator():
             """Generate Server-Sent Events with progress updates."""
@@ -6821,7 +6905,6 @@ async def chat_with_ai_stream(
                 # Send initial status
                 if not quiet_mode:
                     yield f"data: {json.dumps({'type': 'status', 'message': '🤔 Analyzing your request...'})}\n\n"
-                    await asyncio.sleep(0.1)
                 
                 # Check if this is a complex task
                 message_lower = message.lower()
@@ -6832,7 +6915,6 @@ async def chat_with_ai_stream(
                 # Build context with progress updates
                 if not quiet_mode:
                     yield f"data: {json.dumps({'type': 'status', 'message': '📊 Loading your dashboard data...'})}\n\n"
-                    await asyncio.sleep(0.1)
                 
                 ai_service = get_ai_service(db, settings)
                 
@@ -6846,42 +6928,33 @@ async def chat_with_ai_stream(
                         yield f"data: {json.dumps({'type': 'status', 'message': '✓ Loaded recent emails'})}\n\n"
                     if 'note' in message_lower or 'meeting' in message_lower:
                         yield f"data: {json.dumps({'type': 'status', 'message': '📝 Scanning notes (Obsidian + Google Drive)...'})}\n\n"
-                        await asyncio.sleep(0.2)
                     if 'github' in message_lower:
                         yield f"data: {json.dumps({'type': 'status', 'message': '✓ Loaded GitHub issues'})}\n\n"
                     
-                    await asyncio.sleep(0.1)
                     yield f"data: {json.dumps({'type': 'status', 'message': '🧠 Thinking...'})}\n\n"
                 
-                # Get AI response
-                result = await ai_service.chat(
-                    message=message,
-                    conversation_id=conversation_id,
-                    include_context=True,
-                    assistant_id=assistant_id
-                )
-                
-                if not result.get('success'):
-                    yield f"data: {json.dumps({'type': 'error', 'message': result.get('error', 'Unknown error')})}\n\n"
-                    return
-                
-                # Send the response
-                response_text = result['response']
-                
                 # If it's a task creation request, notify about next steps
                 if not quiet_mode and is_task_creation and 'yes' in message_lower:
                     yield f"data: {json.dumps({'type': 'status', 'message': '✓ Creating tasks...'})}\n\n"
-                    await asyncio.sleep(0.1)
-                
-                # Stream the response in chunks for better UX
-                chunk_size = 100
-                for i in range(0, len(response_text), chunk_size):
-                    chunk = response_text[i:i+chunk_size]
-                    yield f"data: {json.dumps({'type': 'response', 'content': chunk})}\n\n"
-                    await asyncio.sleep(0.05)  # Small delay for smooth streaming
                 
-                # Send completion signal
-                yield f"data: {json.dumps({'type': 'done', 'conversation_id': conversation_id, 'provider': result['provider']})}\n\n"
+                # Forward tokens as the provider generates them; the exchange is
+                # saved by the service once the stream completes.
+                async for event in ai_service.chat_stream(
+                    message=message,
+                    conversation_id=conversation_id,
+                    include_context=True,
+                    assistant_id=assistant_id
+                ):
+                    if event['type'] == 'token':
+                        yield f"data: {json.dumps({'type': 'response', 'content': event['content']})}\n\n"
+                    elif event['type'] == 'replace':
+                        # Corrected answer superseding the tokens streamed so far
+                        yield f"data: {json.dumps({'type': 'replace', 'content': event['content']})}\n\n"
+                    elif event['type'] == 'done':
+                        yield f"data: {json.dumps({'type': 'done', 'conversation_id': conversation_id, 'provider': event['provider']})}\n\n"
+                    else:
+                        yield f"data: {json.dumps({'type': 'error', 'message': event.get('error', 'Unknown error')})}\n\n"
+                        return
                 
             except Exception as e:
                 logger.error(f"Error in streaming chat: {e}")
@@ -6958,7 +7031,8 @@ async def get_ai_context():
             "success": True,
             "context": context,
             "context_hash": context_hash,
-            "context_length": len(context)
+            "context_length": len(context),
+            "sections": ai_service.context_sections.get_stats()
         }
         
     except Exception as e:
@@ -7734,7 +7808,7 @@ Keep it concise, actionable, and friendly."""
             messages = [
                 {"role": "user", "content": summary_prompt}
             ]
-            response = await provider.chat(messages)
+            response = await get_ai_service(db, settings).response_cache.chat(provider, messages)
             
             return {
                 "summary": response if isinstance(response, str) else 'Unable to generate summary.',
@@ -7794,8 +7868,9 @@ async def initialize_ai_providers():
             for host_config in ollama_hosts:
                 # First try to get available models
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(f"{host_config['url']}/api/tags") as response:
+                    async with provider_session(host_config['url']) as session:
+                        async with session.get(f"{host_config['url']}/api/tags",
+                                               timeout=aiohttp.ClientTimeout(total=5)) as response:
                             if response.status == 200:
                                 data = await response.json()
                                 models = data.get('models', [])
@@ -8328,29 +8403,52 @@ async def get_system_status():
             "weather": {"available": COLLECTORS_AVAILABLE, "status": "unknown", "last_update": None, "error": None},
             "news": {"available": True, "status": "unknown", "last_update": None, "error": None},
             "jokes": {"available": COLLECTORS_AVAILABLE, "status": "unknown", "last_update": None, "error": None},
-            "music": {"available": True, "status": "unknown", "last_update": None, "error": None}
+            "music": {"available": True, "status": "unknown", "last_update": None, "error": None},
+            "vanity": {"available": True, "status": "unknown", "last_update": None, "error": None},
+            "maintenance": {"available": True, "status": "unknown", "last_update": None, "error": None}
         }
         
-        # Test each collector if available
+        # Status comes from the scheduler's recorded runs, not a live probe
+        telemetry = background_manager.telemetry.summary()
+        rollups = await adb.get_collector_rollups(hours=24)
         for name, info in collectors_status.items():
-            if info["available"]:
-                try:
-                    # Try to get recent data to determine status
-                    test_url = f"/api/{name}"
-                    if name == "email":
-                        test_url = "/api/email"
-                    
-                    # Quick internal test (simulate API call)
-                    info["status"] = "active"
-                    info["last_update"] = datetime.now().isoformat()
-                except Exception as e:
-                    info["status"] = "error"
-                    info["error"] = str(e)
-            else:
+            job = background_manager.scheduler.jobs.get(name)
+            if not info["available"]:
                 info["status"] = "disabled"
                 info["error"] = "Collector not available"
+            elif job is None:
+                info["status"] = "on_demand"  # collected per request, not scheduled
+            elif name not in telemetry:
+                info["status"] = "pending"
+            else:
+                runs = telemetry[name]
+                info["last_update"] = runs["last_success_at"]
+                if not runs["last_run"]["ok"]:
+                    info["status"] = "error"
+                    info["error"] = runs["last_run"]["error"]
+                elif job.paused:
+                    info["status"] = "paused"
+                elif job.last_finished and (datetime.now() - job.last_finished).total_seconds() > job.current_interval * 3:
+                    info["status"] = "stale"
+                else:
+                    info["status"] = "active"
+            if name in telemetry:
+                info["telemetry"] = telemetry[name]
+            if name in rollups:
+                info["last_24h"] = rollups[name]
         
         status_info["collectors"] = collectors_status
+        status_info["system"]["database_pool"] = db.get_pool_stats()
+        status_info["system"]["database_executor"] = get_db_executor_stats()
+        status_info["system"]["database_maintenance"] = await adb.get_maintenance_stats()
+        status_info["system"]["collection_scheduler"] = background_manager.get_status()
+        status_info["system"]["http_pool"] = get_http_pool_stats()
+        status_info["system"]["http_cache"] = get_http_cache_stats()
+        status_info["system"]["single_flight"] = get_single_flight_stats()
+        if AI_ASSISTANT_AVAILABLE:
+            status_info["system"]["ai_context_sections"] = get_ai_service(db, settings).context_sections.get_stats()
+            status_info["system"]["ai_response_cache"] = get_ai_service(db, settings).response_cache.get_stats()
+        status_info["system"]["widget_events"] = widget_events.get_stats()
         
         # Widget status (based on collector status)
         status_info["widgets"] = {
@@ -8393,12 +8491,8 @@ async def refresh_widget(widget_name: str):
         if widget_name not in widget_apis:
             raise HTTPException(status_code=400, detail=f"Unknown widget: {widget_name}")
         
-        # Clear cache for this widget if background manager exists
-        if hasattr(app.state, 'background_manager'):
-            cache_key = widget_name.replace("_widget", "")
-            if cache_key in app.state.background_manager.cache:
-                del app.state.background_manager.cache[cache_key]
-                del app.state.background_manager.cache_timestamps[cache_key]
+        # Clear the cached copy and re-run its collector now
+        background_manager.refresh(widget_name.replace("_widget", ""))
         
         return {
             "success": True,
@@ -8571,9 +8665,8 @@ async def run_diagnostic_repair(request: Request):
                 'servers': 'servers'
             }
             widget_name = widget_map.get(module_name.lower()) if module_name else None
-            if widget_name in background_manager.cache:
-                background_manager.cache.pop(widget_name, None)
-                background_manager.cache_timestamps.pop(widget_name, None)
+            if widget_name:
+                background_manager.refresh(widget_name)
 
             return {
                 "success": True,
@@ -9904,6 +9997,10 @@ async def test_voice(request: Request):
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
+    global loop_lag_task
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag(), name="event-loop-lag")
+    await open_http_clients()
+    await background_manager.start()
     await initialize_ai_providers()
     
     # Create data directory for lead generation files
@@ -9973,10 +10070,14 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up background threads on shutdown."""
+    """Stop background collection and release shared clients on shutdown."""
     logger.info("Shutting down background data collection...")
-    background_manager.stop()
-    logger.info("Background threads stopped")
+    if loop_lag_task is not None:
+        loop_lag_task.cancel()
+    await background_manager.stop()
+    await close_http_clients()
+    logger.info("Background collection stopped")
+    shutdown_db_executor(wait=False)
 
 # ===================================================================
 # SERVER MANAGEMENT ENDPOINTS
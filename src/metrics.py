@@ -0,0 +1,374 @@
+"""
+Prometheus metrics for the Personal Dashboard.
+
+A small in-process registry of counters, gauges and histograms rendered in
+the Prometheus text exposition format (version 0.0.4) at /metrics. It has
+no dependencies and each update is a dict lookup plus a short locked add,
+so it is cheap enough to leave on in production.
+
+What is recorded, and where:
+- HTTP requests per route template, method and status, with latency
+  histograms and an in-flight gauge (MetricsMiddleware in main.py)
+- Event-loop lag, sampled by `monitor_event_loop_lag()`
+- Database time per DatabaseManager method (DatabaseManager.get_connection)
+- Outbound HTTP latency by host (the shared clients in http_pool)
+- AI provider call latency, outcome and token usage (processors.ai_providers)
+
+Label values must come from a small, fixed set (route templates, method
+names, hosts) - never raw URLs or user input.
+
+Usage:
+    REQUESTS = REGISTRY.counter('dashboard_things_total', 'Things done', ('kind',))
+    REQUESTS.labels('widget').inc()
+    LATENCY.labels('GET', '/api/news').observe(0.012)
+    text = REGISTRY.render()
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; web requests and DB calls are mostly in the millisecond range
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Upstream APIs and AI providers take longer
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LOOP_LAG_INTERVAL = 0.5  # seconds between event-loop lag samples
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values) -> object:
+        """The child series for these label values (created on first use)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {_escape(self.documentation)}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return lines
+
+
+class _Value:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count. Name it with a _total suffix."""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield f'{self.name}{_label_text(self.labelnames, key)} {_format_value(child.value)}'
+
+
+class Gauge(Counter):
+    """A value that goes up and down."""
+
+    kind = 'gauge'
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ('upper_bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> '_Timer':
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager that observes the elapsed seconds on exit."""
+
+    __slots__ = ('child', 'started')
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(b for b in buckets if b != math.inf))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f'{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}'
+            labels = _label_text(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_value(total)}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+class Registry:
+    """Named metrics plus callbacks that refresh gauges right before rendering."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, callback: Callable[[], None]):
+        """Run `callback` before each render, e.g. to copy pool stats into gauges."""
+        self._collectors.append(callback)
+
+    def render(self) -> str:
+        for callback in self._collectors:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(callback, '__name__', callback)} failed: {e}")
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'dashboard_http_requests_total', 'HTTP requests handled', ('method', 'route', 'status'))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'dashboard_http_request_duration_seconds', 'Time to send the full HTTP response', ('method', 'route'))
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'dashboard_http_requests_in_flight', 'HTTP requests currently being handled')
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    'dashboard_event_loop_lag_seconds', 'Delay of a scheduled event-loop wakeup past its deadline',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+EVENT_LOOP_LAG_LAST = REGISTRY.gauge(
+    'dashboard_event_loop_lag_last_seconds', 'Most recent event-loop lag sample')
+DB_SECONDS = REGISTRY.histogram(
+    'dashboard_db_connection_hold_seconds',
+    'Time a pooled DB connection is held per operation (checkout wait included, not just query time)',
+    ('operation',))
+OUTBOUND_HTTP_SECONDS = REGISTRY.histogram(
+    'dashboard_outbound_http_duration_seconds', 'Outbound HTTP request latency by host',
+    ('host', 'client'), buckets=SLOW_BUCKETS)
+OUTBOUND_HTTP_ERRORS = REGISTRY.counter(
+    'dashboard_outbound_http_errors_total', 'Outbound HTTP requests that raised before a response',
+    ('host', 'client'))
+AI_REQUEST_SECONDS = REGISTRY.histogram(
+    'dashboard_ai_request_duration_seconds', 'AI provider chat latency',
+    ('provider', 'model', 'outcome'), buckets=SLOW_BUCKETS)
+AI_TOKENS = REGISTRY.counter(
+    'dashboard_ai_tokens_total', 'Tokens reported by AI providers', ('provider', 'model', 'kind'))
+AI_RESPONSE_CACHE = REGISTRY.counter(
+    'dashboard_ai_response_cache_total', 'AI response cache lookups by outcome (hit, near_hit, miss)',
+    ('outcome',))
+
+
+def record_ai_tokens(provider: str, model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+    """Add provider-reported token usage; missing counts are skipped."""
+    if prompt_tokens:
+        AI_TOKENS.labels(provider, model, 'prompt').inc(prompt_tokens)
+    if completion_tokens:
+        AI_TOKENS.labels(provider, model, 'completion').inc(completion_tokens)
+
+
+async def monitor_event_loop_lag(interval: float = LOOP_LAG_INTERVAL):
+    """Sample how late the loop runs a timer; run as a task for the app's lifetime."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+
+ROUTE_CACHE_SIZE = 1024
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route counts, latency and in-flight requests.
+
+    Routes are labelled by their template (e.g. /api/tasks/{task_id}), read
+    from the scope after routing. Requests an inner middleware answered
+    before routing (e.g. a 304 from the conditional-response middleware)
+    are matched against the app's routes instead. Mounted apps such as
+    /static are grouped under "mounted" and 404s under "unmatched". Latency
+    runs until the last body chunk is sent, so streaming responses report
+    their full duration.
+    """
+
+    def __init__(self, app, skip_paths: Sequence[str] = ('/metrics',)):
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+        self._route_cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def _match_route(self, scope) -> Optional[str]:
+        """Template of the endpoint route matching an unrouted request, if any."""
+        key = (scope.get('method', 'GET'), scope.get('path', ''))
+        if key in self._route_cache:
+            return self._route_cache[key]
+        template = None
+        router = getattr(scope.get('app'), 'router', None)
+        for route in getattr(router, 'routes', ()):
+            if not hasattr(route, 'endpoint'):
+                continue  # Mounts keep the "mounted" label
+            try:
+                match, _ = route.matches(scope)
+            except Exception:
+                continue
+            if getattr(match, 'name', None) == 'FULL':
+                template = route.path
+                break
+        if len(self._route_cache) >= ROUTE_CACHE_SIZE:
+            self._route_cache.clear()
+        self._route_cache[key] = template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope.get('path') in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = scope.get('route')
+            template = getattr(route, 'path', None) if route is not None else self._match_route(scope)
+            if template is None:
+                # Mounted apps (static files) carry no route; 404s matched nothing
+                template = 'unmatched' if status['code'] == 404 else 'mounted'
+            method = scope.get('method', 'GET')
+            HTTP_REQUESTS.labels(method, template, status['code']).inc()
+            HTTP_REQUEST_SECONDS.labels(method, template).observe(time.perf_counter() - started)
@@ -19,6 +19,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from processors.task_manager import TaskManager
+from response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,7 @@ router = APIRouter(prefix="/api/ai/summarize", tags=["ai-summarizer"])
 # Initialize
 db = DatabaseManager()
 task_manager = TaskManager()
+response_cache = ResponseCache(db)
 config_path = Path(__file__).parent.parent.parent / "config" / "config.yaml"
 app_settings = Settings.from_yaml(str(config_path)) if config_path.exists() else Settings()
 
@@ -88,28 +90,37 @@ TASKS:
         
         if ai_provider == 'ollama':
             try:
-                import requests
-                ollama_url = f"http://{app_settings.ollama.host}:{app_settings.ollama.port}/api/generate"
-                logger.info(f"Calling Ollama at {ollama_url} with model {app_settings.ollama.model}")
+                import aiohttp
+                from http_pool import provider_session
+                ollama_base = f"http://{app_settings.ollama.host}:{app_settings.ollama.port}"
+                ollama_url = f"{ollama_base}/api/generate"
                 
-                response = requests.post(
-                    ollama_url,
-                    json={
-                        'model': app_settings.ollama.model,
-                        'prompt': prompt,
-                        'stream': False,
-                        'options': {
-                            'temperature': 0.3,
-                            'num_predict': 500
-                        }
-                    },
-                    timeout=30
-                )
+                # The same item is often summarized again with unchanged content
+                ai_response = await response_cache.lookup('ollama', app_settings.ollama.model, prompt)
+                if ai_response is None:
+                    logger.info(f"Calling Ollama at {ollama_url} with model {app_settings.ollama.model}")
+                    async with provider_session(ollama_base) as session:
+                        async with session.post(
+                            ollama_url,
+                            json={
+                                'model': app_settings.ollama.model,
+                                'prompt': prompt,
+                                'stream': False,
+                                'options': {
+                                    'temperature': 0.3,
+                                    'num_predict': 500
+                                }
+                            },
+                            timeout=aiohttp.ClientTimeout(total=30)
+                        ) as response:
+                            if response.status == 200:
+                                result = await response.json(content_type=None)
+                                ai_response = result.get('response', '')
+                                await response_cache.store('ollama', app_settings.ollama.model, prompt, '', ai_response)
+                            else:
+                                logger.error(f"Ollama API error: {response.status}")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get('response', '')
-                    
+                if ai_response is not None:
                     logger.info(f"✅ Ollama responded with {len(ai_response)} chars")
                     logger.info(f"📄 Response preview: {ai_response[:500]}")
                     
@@ -130,8 +141,6 @@ TASKS:
                         # Fallback: use entire response as summary
                         summary = ai_response.strip()
                         logger.warning(f"AI response not in expected format, using raw response")
-                else:
-                    logger.error(f"Ollama API error: {response.status_code}")
                     
             except Exception as e:
                 logger.error(f"Error calling Ollama: {e}")
@@ -149,10 +158,10 @@ TASKS:
                 
         elif ai_provider == 'openai':
             try:
-                from openai import OpenAI
-                client = OpenAI(api_key=app_settings.openai.api_key)
+                from processors.ai_providers import get_openai_client
+                client = get_openai_client(app_settings.openai.api_key)
                 
-                response = client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model=app_settings.openai.model,
                     messages=[
                         {"role": "system", "content": "You are a helpful assistant that summarizes content and extracts actionable tasks."},
@@ -1,21 +1,56 @@
 """
 AI Provider implementations for multiple backends (Ollama, OpenAI, Gemini).
+
+Providers talk to their hosts through the per-host keep-alive pools in
+http_pool, so a chat turn reuses a warm connection instead of opening one.
+Timeouts and pool size come from the provider config (request_timeout,
+connect_timeout, read_timeout, max_connections).
 """
 
 import json
 import logging
 import hashlib
 import asyncio
+import functools
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator, Tuple
 from abc import ABC, abstractmethod
 
 import aiohttp
+import httpx
 import openai
 from openai import AsyncOpenAI
 
+from http_pool import PROVIDER_MAX_CONNECTIONS, is_pooled_client, provider_httpx_client, provider_session
+from metrics import AI_REQUEST_SECONDS, record_ai_tokens
+from single_flight import single_flight
+
 logger = logging.getLogger(__name__)
 
+# Seconds a health_check() result is reused by check_health().
+HEALTH_CHECK_TTL = 30.0
+# Timeout for health and model-list probes.
+PROBE_TIMEOUT = 5.0
+OPENAI_BASE_URL = 'https://api.openai.com/v1'
+
+_openai_clients: Dict[str, Tuple[Any, AsyncOpenAI]] = {}
+
+
+def get_openai_client(api_key: Optional[str], max_connections: int = PROVIDER_MAX_CONNECTIONS) -> AsyncOpenAI:
+    """AsyncOpenAI client for `api_key`, sharing the api.openai.com connection pool.
+
+    Clients are cached per key and rebuilt once the pool has been closed.
+    Off the app loop the pool is not shared, so the client is not cached.
+    """
+    http_client = provider_httpx_client(OPENAI_BASE_URL, max_connections=max_connections)
+    if not is_pooled_client(http_client):
+        return AsyncOpenAI(api_key=api_key, http_client=http_client)
+    cached = _openai_clients.get(api_key or '')
+    if cached is None or cached[0] is not http_client:
+        cached = _openai_clients[api_key or ''] = (http_client, AsyncOpenAI(api_key=api_key, http_client=http_client))
+    return cached[1]
+
 
 class AIProvider(ABC):
     """Base class for AI providers."""
@@ -24,12 +59,44 @@ class AIProvider(ABC):
         self.name = name
         self.config = config
         self.provider_type = self.__class__.__name__.lower().replace('provider', '')
+        self.request_timeout = float(config.get('request_timeout') or 75)
+        self.connect_timeout = float(config.get('connect_timeout') or 15)
+        self.read_timeout = float(config.get('read_timeout') or 60)
+        self.max_connections = int(config.get('max_connections') or PROVIDER_MAX_CONNECTIONS)
+        self._health: Optional[Tuple[float, bool]] = None
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'chat' in cls.__dict__:
+            cls.chat = _timed_chat(cls.__dict__['chat'])
+        if 'chat_stream' in cls.__dict__:
+            cls.chat_stream = _timed_stream(cls.__dict__['chat_stream'])
+    
+    def _request_timeout(self, stream: bool = False) -> aiohttp.ClientTimeout:
+        """Per-request timeout from the config; streams have no total limit
+        and keep going as long as tokens keep arriving."""
+        return aiohttp.ClientTimeout(total=None if stream else self.request_timeout,
+                                     connect=self.connect_timeout, sock_read=self.read_timeout)
+    
+    def _record_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Count provider-reported token usage for /metrics."""
+        record_ai_tokens(self.provider_type, str(getattr(self, 'model_name', '') or 'unknown'),
+                         prompt_tokens, completion_tokens)
     
     @abstractmethod
     async def chat(self, messages: List[Dict[str, str]], stream: bool = False) -> str:
         """Send chat messages to AI provider."""
         pass
     
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Yield the completion in pieces as the provider generates it.
+
+        Failures before any output are yielded as a single "Error: ..." piece,
+        like chat(); failures after output has started are raised. Providers
+        without a streaming API answer in one piece.
+        """
+        yield await self.chat(messages, stream=False)
+    
     @abstractmethod
     async def train(self, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Train or fine-tune the model."""
@@ -40,12 +107,97 @@ class AIProvider(ABC):
         """Check if provider is available."""
         pass
     
+    async def check_health(self, max_age: float = HEALTH_CHECK_TTL) -> bool:
+        """health_check() result, reused for up to `max_age` seconds.
+
+        Concurrent callers share one probe. Use health_check() directly when
+        a fresh answer matters, e.g. when testing a new configuration.
+        """
+        cached = self._health
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        return await single_flight.do(('ai_health', id(self)), self._probe_health)
+    
+    async def _probe_health(self) -> bool:
+        try:
+            healthy = bool(await self.health_check())
+        except Exception:
+            healthy = False
+        self._health = (time.monotonic(), healthy)
+        return healthy
+    
     def generate_training_hash(self, training_data: List[Dict[str, Any]]) -> str:
         """Generate hash for training data to detect changes."""
         content = json.dumps(training_data, sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()
 
 
+def _timed_chat(chat):
+    """Wrap a provider's chat() to record its latency and outcome for /metrics.
+
+    Providers report most failures as an "Error: ..." string rather than
+    raising, so those count as errors too.
+    """
+    @functools.wraps(chat)
+    async def timed(self, *args, **kwargs):
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = await chat(self, *args, **kwargs)
+            if not (isinstance(result, str) and result.startswith('Error')):
+                outcome = 'ok'
+            return result
+        finally:
+            model = str(getattr(self, 'model_name', '') or 'unknown')
+            AI_REQUEST_SECONDS.labels(self.provider_type, model, outcome).observe(time.perf_counter() - started)
+    return timed
+
+
+def _timed_stream(chat_stream):
+    """Wrap a provider's chat_stream() to record its latency and outcome for /metrics."""
+    @functools.wraps(chat_stream)
+    async def timed(self, *args, **kwargs):
+        started = time.perf_counter()
+        outcome = 'error'
+        first = True
+        failed = False
+        try:
+            async for piece in chat_stream(self, *args, **kwargs):
+                if first:
+                    failed = isinstance(piece, str) and piece.startswith('Error')
+                    first = False
+                yield piece
+            if not failed:
+                outcome = 'ok'
+        except GeneratorExit:
+            outcome = 'cancelled'
+            raise
+        finally:
+            model = str(getattr(self, 'model_name', '') or 'unknown')
+            AI_REQUEST_SECONDS.labels(self.provider_type, model, outcome).observe(time.perf_counter() - started)
+    return timed
+
+
+async def _json_lines(content: aiohttp.StreamReader, prefix: str = '') -> AsyncIterator[Dict[str, Any]]:
+    """Decode a streamed response body as one JSON object per line.
+
+    With `prefix` (e.g. 'data:' for server-sent events) only lines carrying
+    it are decoded, with the prefix removed.
+    """
+    async for line in content:
+        line_text = line.decode().strip()
+        if prefix:
+            if not line_text.startswith(prefix):
+                continue
+            line_text = line_text[len(prefix):].strip()
+        if not line_text:
+            continue
+        try:
+            yield json.loads(line_text)
+        except json.JSONDecodeError:
+            continue
+
+
 class OllamaProvider(AIProvider):
     """Ollama local AI provider."""
     
@@ -54,17 +206,59 @@ class OllamaProvider(AIProvider):
         self.base_url = self._normalize_base_url(config.get('base_url', 'http://localhost:11434'))
         self.model_name = (config.get('model_name') or 'qwen2.5:7b').strip()
         self.system_prompt = self._build_system_prompt()
+        # Alternatives tried, once, when the configured host does not answer.
+        self.fallback_urls = [url for url in map(self._normalize_base_url, config.get('fallback_urls') or [])
+                              if url != self.base_url]
+        self._resolve_after = 0.0
 
     def _normalize_base_url(self, base_url: str) -> str:
         """Normalize base URL once to avoid malformed endpoint paths."""
         return str(base_url or 'http://localhost:11434').strip().rstrip('/')
 
-    def _endpoint_url(self, endpoint: str) -> str:
+    def _endpoint_url(self, endpoint: str, base_url: Optional[str] = None) -> str:
         """Build endpoint URL supporting base URLs with or without trailing /api."""
+        base_url = base_url or self.base_url
         endpoint = endpoint.lstrip('/')
-        if self.base_url.endswith('/api') and endpoint.startswith('api/'):
+        if base_url.endswith('/api') and endpoint.startswith('api/'):
             endpoint = endpoint[4:]
-        return f"{self.base_url}/{endpoint}"
+        return f"{base_url}/{endpoint}"
+
+    async def _tags_reachable(self, base_url: str) -> bool:
+        """Whether the /api/tags endpoint answers at `base_url`."""
+        try:
+            async with provider_session(base_url, self.max_connections) as session:
+                async with session.get(self._endpoint_url('api/tags', base_url),
+                                       timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT)) as response:
+                    return response.status == 200
+        except Exception:
+            return False
+
+    async def _resolve_base_url(self):
+        """Settle on the first reachable of the configured and fallback URLs.
+
+        Candidates are probed concurrently on first use rather than while the
+        provider is built; if none answers, the configured URL is kept and
+        the probe is repeated at most every HEALTH_CHECK_TTL seconds.
+        """
+        if not self.fallback_urls or time.monotonic() < self._resolve_after:
+            return
+        await single_flight.do(('ollama_resolve', id(self)), self._probe_candidates)
+
+    async def _probe_candidates(self):
+        candidates = [self.base_url, *self.fallback_urls]
+        reachable = await asyncio.gather(*(self._tags_reachable(url) for url in candidates))
+        for url, ok in zip(candidates, reachable):
+            if ok:
+                if url != self.base_url:
+                    logger.warning("Configured Ollama host %s unreachable; falling back to %s", self.base_url, url)
+                    self.base_url = url
+                self.fallback_urls = []
+                return
+        logger.warning(
+            "No reachable Ollama host found from candidates %s; using configured URL and allowing provider-level retry",
+            candidates
+        )
+        self._resolve_after = time.monotonic() + HEALTH_CHECK_TTL
     
     def _build_system_prompt(self) -> str:
         """Build system prompt based on user preferences and context."""
@@ -94,9 +288,10 @@ class OllamaProvider(AIProvider):
             if not messages or messages[0].get('role') != 'system':
                 messages.insert(0, {'role': 'system', 'content': self.system_prompt})
             
+            await self._resolve_base_url()
             # Keep AI chat responsive: allow model load, but avoid multi-minute UI stalls.
-            timeout = aiohttp.ClientTimeout(total=75, connect=15, sock_read=60)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            timeout = self._request_timeout()
+            async with provider_session(self.base_url, self.max_connections) as session:
                 # Try /api/chat first (newer Ollama versions)
                 payload = {
                     'model': self.model_name,
@@ -104,7 +299,7 @@ class OllamaProvider(AIProvider):
                     'stream': stream
                 }
                 
-                async with session.post(self._endpoint_url('api/chat'), json=payload) as response:
+                async with session.post(self._endpoint_url('api/chat'), json=payload, timeout=timeout) as response:
                     # Some Ollama setups reject /api/chat (400/404). Fall back to /api/generate.
                     if response.status in (400, 404):
                         error_text = (await response.text()).strip()
@@ -132,7 +327,8 @@ class OllamaProvider(AIProvider):
                                         'messages': messages,
                                         'stream': stream
                                     }
-                                    async with session.post(self._endpoint_url('api/chat'), json=retry_payload) as retry_response:
+                                    async with session.post(self._endpoint_url('api/chat'), json=retry_payload,
+                                                            timeout=timeout) as retry_response:
                                         if retry_response.status == 200:
                                             self.model_name = fallback_model
                                             if stream:
@@ -158,7 +354,8 @@ class OllamaProvider(AIProvider):
                             response.status,
                             (error_text[:240] if error_text else '')
                         )
-                        return await self._chat_with_generate(session, messages, stream, model_name=fallback_model)
+                        return await self._chat_with_generate(session, messages, stream, model_name=fallback_model,
+                                                              timeout=timeout)
                     elif response.status == 200:
                         if stream:
                             # Handle streaming response
@@ -171,6 +368,8 @@ class OllamaProvider(AIProvider):
                                             data = json.loads(line_text)
                                             if 'message' in data and 'content' in data['message']:
                                                 content += data['message']['content']
+                                            if data.get('done'):
+                                                self._record_usage(data.get('prompt_eval_count'), data.get('eval_count'))
                                     except json.JSONDecodeError:
                                         continue
                             return content
@@ -178,6 +377,7 @@ class OllamaProvider(AIProvider):
                             # Handle non-streaming response - get full JSON response
                             response_text = await response.text()
                             data = json.loads(response_text)
+                            self._record_usage(data.get('prompt_eval_count'), data.get('eval_count'))
                             if 'message' in data and 'content' in data['message']:
                                 return data['message']['content']
                             else:
@@ -191,7 +391,7 @@ class OllamaProvider(AIProvider):
             logger.error(f"Timeout communicating with Ollama at {self.base_url}; attempting fallback model retry")
             try:
                 retry_timeout = aiohttp.ClientTimeout(total=50, connect=10, sock_read=40)
-                async with aiohttp.ClientSession(timeout=retry_timeout) as retry_session:
+                async with provider_session(self.base_url, self.max_connections) as retry_session:
                     fallback_model = await self._select_fallback_model(retry_session)
                     if fallback_model and fallback_model != self.model_name:
                         logger.warning(
@@ -204,7 +404,8 @@ class OllamaProvider(AIProvider):
                             'messages': messages,
                             'stream': stream
                         }
-                        async with retry_session.post(self._endpoint_url('api/chat'), json=retry_payload) as retry_response:
+                        async with retry_session.post(self._endpoint_url('api/chat'), json=retry_payload,
+                                                      timeout=retry_timeout) as retry_response:
                             if retry_response.status == 200:
                                 self.model_name = fallback_model
                                 if stream:
@@ -236,7 +437,49 @@ class OllamaProvider(AIProvider):
             logger.error(f"Error communicating with Ollama: {type(e).__name__}: {e}")
             return f"Error: Could not connect to Ollama server"
     
-    async def _chat_with_generate(self, session: aiohttp.ClientSession, messages: List[Dict[str, str]], stream: bool = False, model_name: Optional[str] = None) -> str:
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Stream /api/chat tokens as Ollama generates them.
+
+        Non-200 answers are reported as an "Error: ..." piece without trying
+        the fallback model or /api/generate; callers fall back to chat(),
+        which handles those.
+        """
+        if not messages or messages[0].get('role') != 'system':
+            messages.insert(0, {'role': 'system', 'content': self.system_prompt})
+
+        produced = False
+        try:
+            await self._resolve_base_url()
+            async with provider_session(self.base_url, self.max_connections) as session:
+                payload = {'model': self.model_name, 'messages': messages, 'stream': True}
+                async with session.post(self._endpoint_url('api/chat'), json=payload,
+                                        timeout=self._request_timeout(stream=True)) as response:
+                    if response.status != 200:
+                        error_msg = f"Ollama API error: {response.status}"
+                        logger.warning("Streaming %s", error_msg)
+                        yield f"Error: {error_msg}"
+                        return
+                    async for data in _json_lines(response.content):
+                        if data.get('error'):
+                            raise RuntimeError(data['error'])
+                        content = (data.get('message') or {}).get('content')
+                        if content:
+                            produced = True
+                            yield content
+                        if data.get('done'):
+                            self._record_usage(data.get('prompt_eval_count'), data.get('eval_count'))
+        except asyncio.TimeoutError:
+            if produced:
+                raise
+            logger.error(f"Timeout streaming from Ollama at {self.base_url}")
+            yield "Error: Ollama request timed out. The model may be loading or the context is very large."
+        except Exception as e:
+            if produced:
+                raise
+            logger.error(f"Error streaming from Ollama: {type(e).__name__}: {e}")
+            yield f"Error: Could not stream from Ollama server at {self.base_url}"
+    
+    async def _chat_with_generate(self, session: aiohttp.ClientSession, messages: List[Dict[str, str]], stream: bool = False, model_name: Optional[str] = None, timeout: Optional[aiohttp.ClientTimeout] = None) -> str:
         """Fallback method using /api/generate for older Ollama versions."""
         try:
             # Convert chat messages to a single prompt for /api/generate
@@ -266,7 +509,7 @@ class OllamaProvider(AIProvider):
             generate_urls = [self._endpoint_url('api/generate'), self._endpoint_url('generate')]
             last_error_text = ''
             for generate_url in generate_urls:
-                async with session.post(generate_url, json=payload) as response:
+                async with session.post(generate_url, json=payload, timeout=timeout or self._request_timeout()) as response:
                     if response.status == 200:
                         if stream:
                             content = ""
@@ -278,12 +521,15 @@ class OllamaProvider(AIProvider):
                                             data = json.loads(line_text)
                                             if 'response' in data:
                                                 content += data['response']
+                                            if data.get('done'):
+                                                self._record_usage(data.get('prompt_eval_count'), data.get('eval_count'))
                                     except json.JSONDecodeError:
                                         continue
                             return content
                         else:
                             response_text = await response.text()
                             data = json.loads(response_text)
+                            self._record_usage(data.get('prompt_eval_count'), data.get('eval_count'))
                             if 'response' in data:
                                 return data['response']
                             else:
@@ -306,7 +552,8 @@ class OllamaProvider(AIProvider):
     async def _select_fallback_model(self, session: aiohttp.ClientSession) -> Optional[str]:
         """Pick a fallback model from /api/tags when current model is invalid/unavailable."""
         try:
-            async with session.get(self._endpoint_url('api/tags')) as response:
+            async with session.get(self._endpoint_url('api/tags'),
+                                   timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT)) as response:
                 if response.status != 200:
                     return None
                 data = await response.json()
@@ -330,13 +577,17 @@ class OllamaProvider(AIProvider):
             # For Ollama, we create a custom model with fine-tuning data
             modelfile_content = self._create_modelfile(training_data)
             
-            async with aiohttp.ClientSession() as session:
+            await self._resolve_base_url()
+            async with provider_session(self.base_url, self.max_connections) as session:
                 payload = {
                     'name': f"{self.model_name}_finetuned_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
                     'modelfile': modelfile_content
                 }
                 
-                async with session.post(self._endpoint_url('api/create'), json=payload) as response:
+                # Building a model can take minutes; only the connect phase is bounded.
+                create_timeout = aiohttp.ClientTimeout(total=None, connect=self.connect_timeout)
+                async with session.post(self._endpoint_url('api/create'), json=payload,
+                                        timeout=create_timeout) as response:
                     if response.status == 200:
                         return {
                             'status': 'success',
@@ -372,12 +623,8 @@ PARAMETER top_p 0.9"""
     
     async def health_check(self) -> bool:
         """Check Ollama server health."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self._endpoint_url('api/tags')) as response:
-                    return response.status == 200
-        except:
-            return False
+        await self._resolve_base_url()
+        return await self._tags_reachable(self.base_url)
 
 
 class OpenAIProvider(AIProvider):
@@ -387,9 +634,17 @@ class OpenAIProvider(AIProvider):
         super().__init__(name, config)
         self.api_key = config.get('api_key')
         self.model_name = config.get('model_name', 'gpt-3.5-turbo')
-        self.client = AsyncOpenAI(api_key=self.api_key)
         self.system_prompt = self._build_system_prompt()
     
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Shared client for this API key (see get_openai_client)."""
+        return get_openai_client(self.api_key, self.max_connections)
+    
+    def _openai_timeout(self, stream: bool = False) -> httpx.Timeout:
+        return httpx.Timeout(None if stream else self.request_timeout,
+                             connect=self.connect_timeout, read=self.read_timeout)
+    
     def _build_system_prompt(self) -> str:
         """Build system prompt based on user preferences."""
         return """You are a personal AI assistant with access to comprehensive dashboard data including 
@@ -410,7 +665,8 @@ class OpenAIProvider(AIProvider):
                 messages=messages,
                 temperature=0.7,
                 max_tokens=1000,
-                stream=stream
+                stream=stream,
+                timeout=self._openai_timeout(stream)
             )
             
             if stream:
@@ -420,12 +676,41 @@ class OpenAIProvider(AIProvider):
                         content += chunk.choices[0].delta.content
                 return content
             else:
+                usage = getattr(response, 'usage', None)
+                if usage is not None:
+                    self._record_usage(usage.prompt_tokens, usage.completion_tokens)
                 return response.choices[0].message.content
                 
         except Exception as e:
             logger.error(f"Error with OpenAI API: {e}")
             return f"Error: OpenAI API error - {str(e)}"
     
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Stream completion deltas from OpenAI."""
+        if not messages or messages[0].get('role') != 'system':
+            messages.insert(0, {'role': 'system', 'content': self.system_prompt})
+
+        produced = False
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True,
+                timeout=self._openai_timeout(stream=True)
+            )
+            async for chunk in response:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    produced = True
+                    yield content
+        except Exception as e:
+            if produced:
+                raise
+            logger.error(f"Error with OpenAI API: {e}")
+            yield f"Error: OpenAI API error - {str(e)}"
+    
     async def train(self, training_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Fine-tune OpenAI model."""
         try:
@@ -478,7 +763,7 @@ class OpenAIProvider(AIProvider):
     async def health_check(self) -> bool:
         """Check OpenAI API health."""
         try:
-            await self.client.models.list()
+            await self.client.models.list(timeout=PROBE_TIMEOUT)
             return True
         except:
             return False
@@ -506,7 +791,7 @@ class GeminiProvider(AIProvider):
             # Convert messages to Gemini format
             contents = self._convert_messages_to_gemini_format(messages)
             
-            async with aiohttp.ClientSession() as session:
+            async with provider_session(self.base_url, self.max_connections) as session:
                 url = f"{self.base_url}/models/{self.model_name}:generateContent"
                 headers = {'Content-Type': 'application/json'}
                 payload = {
@@ -517,9 +802,12 @@ class GeminiProvider(AIProvider):
                     }
                 }
                 
-                async with session.post(url, json=payload, headers=headers, params={'key': self.api_key}) as response:
+                async with session.post(url, json=payload, headers=headers, params={'key': self.api_key},
+                                        timeout=self._request_timeout()) as response:
                     if response.status == 200:
                         data = await response.json()
+                        usage = data.get('usageMetadata') or {}
+                        self._record_usage(usage.get('promptTokenCount'), usage.get('candidatesTokenCount'))
                         return data.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '')
                     else:
                         error_msg = f"Gemini API error: {response.status}"
@@ -530,6 +818,43 @@ class GeminiProvider(AIProvider):
             logger.error(f"Error with Gemini API: {e}")
             return f"Error: Gemini API error - {str(e)}"
     
+    async def chat_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Stream text parts from Gemini's streamGenerateContent (SSE)."""
+        contents = self._convert_messages_to_gemini_format(messages)
+        produced = False
+        usage = {}
+        try:
+            async with provider_session(self.base_url, self.max_connections) as session:
+                url = f"{self.base_url}/models/{self.model_name}:streamGenerateContent"
+                payload = {
+                    'contents': contents,
+                    'generationConfig': {
+                        'temperature': 0.7,
+                        'maxOutputTokens': 1000,
+                    }
+                }
+                params = {'key': self.api_key, 'alt': 'sse'}
+                async with session.post(url, json=payload, params=params,
+                                        timeout=self._request_timeout(stream=True)) as response:
+                    if response.status != 200:
+                        error_msg = f"Gemini API error: {response.status}"
+                        logger.error(error_msg)
+                        yield f"Error: {error_msg}"
+                        return
+                    async for data in _json_lines(response.content, prefix='data:'):
+                        usage = data.get('usageMetadata') or usage
+                        for candidate in data.get('candidates', [])[:1]:
+                            for part in (candidate.get('content') or {}).get('parts', []):
+                                if part.get('text'):
+                                    produced = True
+                                    yield part['text']
+            self._record_usage(usage.get('promptTokenCount'), usage.get('candidatesTokenCount'))
+        except Exception as e:
+            if produced:
+                raise
+            logger.error(f"Error with Gemini API: {e}")
+            yield f"Error: Gemini API error - {str(e)}"
+    
     def _convert_messages_to_gemini_format(self, messages: List[Dict[str, str]]) -> List[Dict]:
         """Convert chat messages to Gemini format."""
         contents = []
@@ -568,9 +893,10 @@ class GeminiProvider(AIProvider):
     async def health_check(self) -> bool:
         """Check Gemini API health."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with provider_session(self.base_url, self.max_connections) as session:
                 url = f"{self.base_url}/models"
-                async with session.get(url, params={'key': self.api_key}) as response:
+                async with session.get(url, params={'key': self.api_key},
+                                       timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT)) as response:
                     return response.status == 200
         except:
             return False
@@ -606,15 +932,11 @@ class AIProviderManager:
             for name, provider in self.providers.items()
         ]
     
-    async def health_check_all(self) -> Dict[str, bool]:
-        """Check health of all providers."""
-        results = {}
-        for name, provider in self.providers.items():
-            try:
-                results[name] = await provider.health_check()
-            except:
-                results[name] = False
-        return results
+    async def health_check_all(self, max_age: float = HEALTH_CHECK_TTL) -> Dict[str, bool]:
+        """Check health of all providers concurrently, reusing recent results."""
+        providers = list(self.providers.items())
+        results = await asyncio.gather(*(provider.check_health(max_age) for _, provider in providers))
+        return {name: healthy for (name, _), healthy in zip(providers, results)}
 
 
 # Global provider manager instance
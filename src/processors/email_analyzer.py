@@ -3,18 +3,98 @@ Email analysis processor for extracting insights from email content.
 """
 
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set
 import re
 
 logger = logging.getLogger(__name__)
 
+# Deleted tasks from one sender before their emails stop producing tasks
+DELETED_SENDER_LIMIT = 3
+# Words a subject must share with a deleted task's title to count as the same task
+SIMILAR_TITLE_WORDS = 3
+
+
+class TaskHistory:
+    """Deleted email tasks and disliked senders, indexed once for many emails.
+    
+    Deleted titles are kept in an inverted word index so the similar-subject
+    check touches only titles that share a word with the subject, and
+    per-sender deleted counts are memoized.
+    """
+    
+    def __init__(self, deleted_tasks: Iterable[Dict[str, Any]], disliked_senders: Iterable[str] = ()):
+        deleted_tasks = list(deleted_tasks)
+        self._descriptions = [(task.get('description') or '').lower() for task in deleted_tasks]
+        self._titles: List[str] = []
+        self._title_index: Dict[str, Set[int]] = defaultdict(set)
+        for task in deleted_tasks:
+            title = (task.get('title') or '').lower()
+            for word in set(title.split()):
+                self._title_index[word].add(len(self._titles))
+            self._titles.append(title)
+        self.disliked_senders = [domain.lower() for domain in disliked_senders if domain]
+        self._sender_counts: Dict[str, int] = {}
+    
+    @classmethod
+    def from_db(cls, db, email_todos: Optional[List[Dict[str, Any]]] = None) -> 'TaskHistory':
+        """Load from the database; pass email_todos (all statuses) if already fetched."""
+        if email_todos is None:
+            deleted = db.get_todos_by_source('email', status='deleted')
+        else:
+            deleted = [todo for todo in email_todos if todo.get('status') == 'deleted']
+        personality = db.get_personality_profile() or {}
+        return cls(deleted, personality.get('disliked_senders') or [])
+    
+    def deleted_from_sender(self, sender: str) -> int:
+        """Number of deleted tasks whose description mentions this sender
+        (0 for an empty sender, which would match every description)."""
+        key = (sender or '').strip().lower()
+        if not key:
+            return 0
+        if key not in self._sender_counts:
+            self._sender_counts[key] = sum(1 for description in self._descriptions if key in description)
+        return self._sender_counts[key]
+    
+    def similar_deleted_title(self, subject: str) -> Optional[str]:
+        """Title of a deleted task sharing SIMILAR_TITLE_WORDS+ words with the subject."""
+        shared = Counter()
+        for word in set((subject or '').lower().split()):
+            shared.update(self._title_index.get(word, ()))
+        for index, count in shared.items():
+            if count >= SIMILAR_TITLE_WORDS:
+                return self._titles[index]
+        return None
+    
+    def skip_reason(self, subject: str, sender: str) -> Optional[str]:
+        """Why the user's history says not to create a task for this email, or None."""
+        sender = sender or ''
+        deleted = self.deleted_from_sender(sender)
+        if deleted >= DELETED_SENDER_LIMIT:
+            return f"user has deleted {deleted} similar tasks from {sender}"
+        
+        similar = self.similar_deleted_title(subject)
+        if similar is not None:
+            return f"user deleted similar task: {similar[:50]}"
+        
+        sender_domain = sender.split('@')[-1].lower() if '@' in sender else sender.lower()
+        if sender_domain and any(domain in sender_domain for domain in self.disliked_senders):
+            return f"sender {sender} is in user's disliked list"
+        return None
+
 
 class EmailAnalyzer:
     """Analyzes email content for insights and priorities."""
     
-    def __init__(self):
-        """Initialize the email analyzer."""
+    def __init__(self, db=None):
+        """Initialize the email analyzer.
+        
+        Args:
+            db: Optional DatabaseManager used to skip senders and subjects the
+                user deleted tasks for when no preloaded TaskHistory is given.
+        """
+        self.db = db
         self.priority_keywords = [
             'urgent', 'asap', 'deadline', 'priority', 'important',
             'meeting', 'call', 'schedule', 'confirm', 'approve',
@@ -182,7 +262,8 @@ class EmailAnalyzer:
         
         return insights
     
-    async def analyze_email_for_todos(self, subject: str, body: str, sender: str, risk_score: int = 0) -> List[Dict[str, Any]]:
+    async def analyze_email_for_todos(self, subject: str, body: str, sender: str, risk_score: int = 0,
+                                      history: Optional[TaskHistory] = None) -> List[Dict[str, Any]]:
         """Analyze email content for todo items and action items - STRICT filtering with risk scoring.
         
         Args:
@@ -190,49 +271,41 @@ class EmailAnalyzer:
             body: Email body content
             sender: Email sender address
             risk_score: Risk score from EmailRiskChecker (1-10, where 10 is highest risk)
+            history: Preloaded deleted-task index; loaded from self.db for this
+                call when omitted. Pass one when analyzing many emails.
         
         Returns:
             List of todo items if email is legitimate and actionable, empty list otherwise
         """
         try:
-            todos = []
-            combined_text = f"{subject} {body}".lower()
-            
             # FIRST CHECK: Risk score filter - skip high-risk emails
             # Only create tasks for low-medium risk emails (score < 5)
             if risk_score >= 5:
                 logger.info(f"Skipping task creation for email from {sender} - risk score too high ({risk_score}/10)")
                 return []
             
-            # SECOND CHECK: Check deleted tasks history - don't recreate similar tasks user deleted
-            if self.db:
-                # Check if user has deleted similar tasks from this sender
-                deleted_tasks = self.db.get_todos_by_source('email', status='deleted')
-                similar_deleted = [t for t in deleted_tasks if sender.lower() in t.get('description', '').lower()]
-                if len(similar_deleted) >= 3:
-                    # User has deleted 3+ tasks from this sender - likely doesn't want tasks from them
-                    logger.info(f"Skipping task creation from {sender} - user has deleted {len(similar_deleted)} similar tasks")
+            # SECOND CHECK: Deleted tasks history and disliked senders - don't
+            # recreate tasks the user already threw away
+            if history is None and self.db:
+                history = TaskHistory.from_db(self.db)
+            if history is not None:
+                reason = history.skip_reason(subject, sender)
+                if reason:
+                    logger.info(f"Skipping task creation - {reason}")
                     return []
-                
-                # Check if there's a deleted task with very similar subject
-                for deleted in deleted_tasks:
-                    deleted_title = deleted.get('title', '').lower()
-                    # Calculate simple similarity (common words)
-                    subject_words = set(subject.lower().split())
-                    deleted_words = set(deleted_title.split())
-                    if len(subject_words & deleted_words) >= 3:  # 3+ common words
-                        logger.info(f"Skipping task - user deleted similar task: {deleted_title[:50]}")
-                        return []
-                
-                # THIRD CHECK: User personality profile - check if sender is preferred
-                personality = self.db.get_personality_profile()
-                if personality and 'disliked_senders' in personality:
-                    # Extract domain from sender email
-                    sender_domain = sender.split('@')[-1].lower() if '@' in sender else sender.lower()
-                    disliked_domains = personality.get('disliked_senders', [])
-                    if any(domain.lower() in sender_domain for domain in disliked_domains):
-                        logger.info(f"Skipping task from {sender} - sender domain in user's disliked list")
-                        return []
+            
+            return self.extract_todos(subject, body, sender)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing email for todos: {e}")
+            return []
+    
+    def extract_todos(self, subject: str, body: str, sender: str) -> List[Dict[str, Any]]:
+        """Keyword heuristics of analyze_email_for_todos: spam, marketing and
+        automated mail are dropped; action requests become todo items."""
+        try:
+            todos = []
+            combined_text = f"{subject} {body}".lower()
             
             # ENHANCED SPAM/NEWSLETTER DETECTION - exclude these immediately
             spam_indicators = [
@@ -9,6 +9,7 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 from database import DatabaseManager
+from db_migrations import Migration
 
 logger = logging.getLogger(__name__)
 
@@ -21,60 +22,63 @@ class EmailRiskLearningSystem:
         self._ensure_tables()
     
     def _ensure_tables(self):
-        """Create learning tables if they don't exist."""
+        """Create learning tables if they don't exist (once per database per process)."""
         try:
-            with self.db.get_connection() as conn:
-                # User feedback on risk assessments
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS email_risk_feedback (
-                        feedback_id TEXT PRIMARY KEY,
-                        email_id TEXT,
-                        sender_email TEXT NOT NULL,
-                        sender_domain TEXT,
-                        original_risk_score INTEGER,
-                        original_risk_level TEXT,
-                        user_assessment TEXT,
-                        actual_risk_level TEXT,
-                        feedback_reason TEXT,
-                        signals_present TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Learned patterns for future scoring
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS learned_risk_patterns (
-                        pattern_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        pattern_type TEXT,
-                        pattern_value TEXT,
-                        associated_risk TEXT,
-                        confidence REAL DEFAULT 0.5,
-                        match_count INTEGER DEFAULT 0,
-                        correct_count INTEGER DEFAULT 0,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Deleted leads (to avoid re-suggesting)
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS deleted_leads (
-                        deleted_lead_id TEXT PRIMARY KEY,
-                        contact_email TEXT NOT NULL,
-                        contact_name TEXT,
-                        company TEXT,
-                        deletion_reason TEXT,
-                        signals_detected TEXT,
-                        lead_type TEXT,
-                        score INTEGER,
-                        deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                conn.commit()
-                logger.info("✅ Learning system tables created")
+            self.db.ensure_schema('email_risk_learning', [
+                Migration(1, 'learning tables', self._create_tables),
+            ])
         except Exception as e:
             logger.error(f"Error creating learning tables: {e}")
     
+    def _create_tables(self, cursor):
+        """Learning tables: user feedback, learned patterns, deleted leads."""
+        # User feedback on risk assessments
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS email_risk_feedback (
+                feedback_id TEXT PRIMARY KEY,
+                email_id TEXT,
+                sender_email TEXT NOT NULL,
+                sender_domain TEXT,
+                original_risk_score INTEGER,
+                original_risk_level TEXT,
+                user_assessment TEXT,
+                actual_risk_level TEXT,
+                feedback_reason TEXT,
+                signals_present TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Learned patterns for future scoring
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS learned_risk_patterns (
+                pattern_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pattern_type TEXT,
+                pattern_value TEXT,
+                associated_risk TEXT,
+                confidence REAL DEFAULT 0.5,
+                match_count INTEGER DEFAULT 0,
+                correct_count INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Deleted leads (to avoid re-suggesting)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS deleted_leads (
+                deleted_lead_id TEXT PRIMARY KEY,
+                contact_email TEXT NOT NULL,
+                contact_name TEXT,
+                company TEXT,
+                deletion_reason TEXT,
+                signals_detected TEXT,
+                lead_type TEXT,
+                score INTEGER,
+                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        logger.info("✅ Learning system tables created")
+    
     async def record_user_feedback(
         self,
         email_id: str,
@@ -0,0 +1,305 @@
+"""
+Batched task extraction for /api/email/scan-for-tasks.
+
+The scan used to walk emails one at a time: a scanned-sources query, a
+load of every email todo and of every deleted todo, the O(n) deleted-title
+comparison and one commit per created task - for each email. The pipeline
+does the same work in stages:
+
+1. Load indexes once: scanned email ids, email todos (existing and
+   deleted) and the personality profile, as a TaskHistory.
+2. Pre-filter every email with the cheap heuristics of EmailAnalyzer
+   (risk score, deletion history, spam/automated mail, action signals).
+3. Optionally let the AI provider review the heuristic candidates,
+   `batch_size` emails per request and at most `concurrency` requests in
+   flight. Requests go through the ResponseCache, so a rescan of the same
+   mail is answered from SQLite. A batch whose answer fails or cannot be
+   parsed keeps its heuristic results.
+4. Write all new tasks and the scanned marks in one transaction.
+
+Progress is reported to an optional callback as dicts with a `stage`
+('filtered', 'reviewing', 'saved') and running counts.
+
+Usage:
+    pipeline = EmailTaskPipeline(db, ai_provider=provider, response_cache=cache,
+                                 on_progress=publish)
+    result = await pipeline.run(emails, force_rescan=False)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from db_async import AsyncDatabaseManager
+from processors.email_analyzer import EmailAnalyzer, TaskHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5
+DEFAULT_CONCURRENCY = 2
+MAX_BATCH_SIZE = 20
+MAX_CONCURRENCY = 8
+BODY_PREVIEW_CHARS = 600
+
+REVIEW_PROMPT = """Keyword rules flagged the emails below as possibly needing action from me.
+For each one decide whether it really asks me to do something.
+
+Reply with ONLY a JSON array, one object per email, in this form:
+[{{"email": 1, "actionable": true, "task": "short imperative task", "priority": "high|medium|low"}}]
+
+{emails}"""
+
+Candidate = Tuple[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class EmailTaskPipeline:
+    """Extracts tasks from many emails with preloaded indexes, batched AI review
+    and a single write."""
+
+    def __init__(self, db, analyzer: Optional[EmailAnalyzer] = None, ai_provider=None,
+                 response_cache=None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.db = db
+        self.adb = AsyncDatabaseManager(db)
+        self.analyzer = analyzer or EmailAnalyzer(db)
+        self.ai_provider = ai_provider
+        self.response_cache = response_cache
+        self.batch_size = max(1, min(int(batch_size), MAX_BATCH_SIZE))
+        self.concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+        self.on_progress = on_progress
+
+    def _report(self, stage: str, **counts):
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress({'stage': stage, **counts})
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+    async def run(self, emails: List[Dict[str, Any]], force_rescan: bool = False) -> Dict[str, Any]:
+        """Scan emails for tasks. Returns the counts reported by the endpoint
+        plus per-stage timings under 'pipeline'."""
+        started = time.perf_counter()
+        result = {'already_scanned': 0, 'tasks_created': 0, 'tasks_skipped': 0, 'emails_skipped': 0}
+        pipeline = {'candidates': 0, 'failed': 0, 'ai_batches': 0, 'ai_failed_batches': 0, 'ai_rejected': 0}
+
+        # 1. Indexes, loaded once per scan
+        scanned = set()
+        if not force_rescan:
+            scanned = {row['source_id'] for row in await self.adb.get_scanned_sources('email')}
+        email_todos = await self.adb.get_todos_by_source('email')
+        existing = {todo['source_id'] for todo in email_todos if todo.get('source_id')}
+        deleted = [todo for todo in email_todos if todo.get('status') == 'deleted']
+        personality = await self.adb.get_personality_profile() or {}
+        history = TaskHistory(deleted, personality.get('disliked_senders') or [])
+        loaded = time.perf_counter()
+
+        # 2. Heuristic pre-filter
+        scanned_sources = []
+        candidates: List[Candidate] = []
+        for email in emails:
+            # One malformed email is logged and left unscanned; the rest go on
+            try:
+                email_id = email.get('id', '')
+                if email_id in scanned:
+                    result['already_scanned'] += 1
+                    continue
+                scanned.add(email_id)  # The same message twice in one scan counts once
+                if email_id in existing:
+                    logger.info(f"Task already exists/deleted for email: {str(email.get('subject') or '')[:50]}")
+                    result['tasks_skipped'] += 1
+                    scanned_sources.append({'source_type': 'email', 'source_id': email_id})
+                    continue
+
+                todos = await self.analyzer.analyze_email_for_todos(
+                    email.get('subject') or '', email.get('body') or '', email.get('sender') or '',
+                    email.get('risk_score') or 0, history=history)
+                if todos:
+                    candidates.append((email, todos))
+                else:
+                    result['emails_skipped'] += 1
+                    scanned_sources.append({'source_type': 'email', 'source_id': email_id})
+            except Exception as e:
+                pipeline['failed'] += 1
+                logger.error(f"Error processing email {self._email_id(email)}: {e}")
+
+        pipeline['candidates'] = len(candidates)
+        filtered = time.perf_counter()
+        self._report('filtered', emails=len(emails), candidates=len(candidates),
+                     already_scanned=result['already_scanned'])
+
+        # 3. Batched AI review of the candidates
+        if self.ai_provider is not None and candidates:
+            await self._review(candidates, pipeline)
+        reviewed = time.perf_counter()
+
+        # 4. One transaction for tasks and scanned marks
+        tasks = []
+        for email, todos in candidates:
+            email_id = email.get('id', '')
+            if not todos:
+                result['emails_skipped'] += 1
+                scanned_sources.append({'source_type': 'email', 'source_id': email_id})
+                continue
+            try:
+                task = self._task_record(email, todos[0])
+            except Exception as e:
+                pipeline['failed'] += 1
+                logger.error(f"Error building task for email {email_id}: {e}")
+                continue
+            # One task per email; further todos would duplicate its source
+            tasks.append(task)
+            result['tasks_skipped'] += len(todos) - 1
+            scanned_sources.append({'source_type': 'email', 'source_id': email_id,
+                                    'tasks_found': len(todos), 'tasks_created': 1})
+
+        written = await self.adb.save_scan_results(tasks, scanned_sources)
+        if written < 0:
+            raise RuntimeError("Could not save email scan results")
+        result['tasks_created'] = written
+        result['tasks_skipped'] += len(tasks) - written
+
+        finished = time.perf_counter()
+        pipeline['timings_ms'] = {
+            'load_indexes': round((loaded - started) * 1000, 1),
+            'prefilter': round((filtered - loaded) * 1000, 1),
+            'ai_review': round((reviewed - filtered) * 1000, 1),
+            'save': round((finished - reviewed) * 1000, 1),
+        }
+        result['pipeline'] = pipeline
+        self._report('saved', tasks_created=written, emails=len(emails))
+        logger.info(f"Email task scan: {len(emails)} emails, {len(candidates)} candidates, "
+                    f"{written} tasks in {pipeline['timings_ms']}")
+        return result
+
+    async def _review(self, candidates: List[Candidate], pipeline: Dict[str, Any]):
+        """Confirm or drop heuristic candidates with the AI provider, in place."""
+        batches = [candidates[i:i + self.batch_size] for i in range(0, len(candidates), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def review_batch(batch: List[Candidate]):
+            nonlocal done
+            try:
+                async with semaphore:
+                    verdicts = await self._ask(batch)
+                if verdicts is None:
+                    pipeline['ai_failed_batches'] += 1
+                else:
+                    pipeline['ai_rejected'] += self._apply_verdicts(batch, verdicts)
+            except Exception as e:
+                # The batch keeps whatever heuristic todos are left
+                pipeline['ai_failed_batches'] += 1
+                logger.error(f"AI review of {len(batch)} emails failed: {e}")
+            pipeline['ai_batches'] += 1
+            done += 1
+            self._report('reviewing', batches_done=done, batches=len(batches),
+                         emails_reviewed=min(done * self.batch_size, len(candidates)),
+                         candidates=len(candidates))
+
+        await asyncio.gather(*(review_batch(batch) for batch in batches))
+
+    async def _ask(self, batch: List[Candidate]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Verdicts by email number for one batch, or None if the answer is unusable."""
+        sections = []
+        for number, (email, _) in enumerate(batch, 1):
+            body = ' '.join((email.get('body') or email.get('snippet') or '').split())
+            sections.append(f"EMAIL {number}\nFrom: {email.get('sender', '')}\n"
+                            f"Subject: {email.get('subject', '')}\nBody: {body[:BODY_PREVIEW_CHARS]}")
+        messages = [{'role': 'user', 'content': REVIEW_PROMPT.format(emails='\n\n'.join(sections))}]
+
+        try:
+            if self.response_cache is not None:
+                response = await self.response_cache.chat(self.ai_provider, messages)
+            else:
+                response = await self.ai_provider.chat(messages)
+        except Exception as e:
+            logger.warning(f"AI review of {len(batch)} emails failed: {e}")
+            return None
+        if not isinstance(response, str) or response.startswith('Error'):
+            logger.warning(f"AI review of {len(batch)} emails failed: {str(response)[:200]}")
+            return None
+
+        match = re.search(r'\[.*\]', response, re.DOTALL)
+        try:
+            items = json.loads(match.group()) if match else None
+        except json.JSONDecodeError:
+            items = None
+        if not isinstance(items, list):
+            logger.warning(f"Unparseable AI review response: {response[:200]}")
+            return None
+
+        verdicts = {}
+        for item in items:
+            if isinstance(item, dict) and str(item.get('email', '')).isdigit():
+                verdicts[int(item['email'])] = item
+        return verdicts
+
+    @staticmethod
+    def _email_id(email: Any) -> str:
+        return email.get('id', 'unknown') if isinstance(email, dict) else 'unknown'
+
+    @staticmethod
+    def _apply_verdicts(batch: List[Candidate], verdicts: Dict[int, Dict[str, Any]]) -> int:
+        """Drop rejected candidates' todos and refine confirmed ones. Emails the
+        answer left out keep their heuristic todos. Returns the number rejected."""
+        rejected = 0
+        for number, (email, todos) in enumerate(batch, 1):
+            verdict = verdicts.get(number)
+            if verdict is None:
+                continue
+            if verdict.get('actionable') is False:
+                todos.clear()
+                rejected += 1
+                continue
+            todo = todos[0]
+            task = str(verdict.get('task') or '').strip()
+            if task:
+                todo['task'] = task[:120]
+            priority = str(verdict.get('priority') or '').lower()
+            if priority in ('high', 'medium', 'low'):
+                todo['priority'] = priority
+            todo['reason'] = f"{todo.get('reason') or 'action signals'}, confirmed by AI"
+        return rejected
+
+    @staticmethod
+    def _task_record(email: Dict[str, Any], todo: Dict[str, Any]) -> Dict[str, Any]:
+        """universal_todos row for a todo found in an email, as TaskManager.create_task builds it."""
+        subject = email.get('subject', '')
+        sender = email.get('sender', '')
+        email_id = email.get('id', '')
+        labels = [label.upper() for label in email.get('labels', [])]
+        is_starred = 'STARRED' in labels
+        is_important = bool(email.get('is_important')) or 'IMPORTANT' in labels
+        email_priority = (email.get('priority') or email.get('ollama_priority') or 'medium').lower()
+
+        todo_reason = todo.get('reason', 'Detected as actionable from email content')
+        base_priority = (todo.get('priority') or 'medium').lower()
+        should_escalate = is_starred or is_important or email_priority == 'high' or email.get('risk_score', 0) >= 7
+        priority_reason = ("Elevated priority from flagged/prioritized email" if should_escalate
+                           else "Priority from extracted task signal")
+        title = todo.get('task', f"Follow up: {subject[:60]}")
+
+        return {
+            'id': hashlib.md5(f"{title}{email_id}{datetime.now().isoformat()}".encode()).hexdigest(),
+            'title': title,
+            'description': f"From: {sender}\nSubject: {subject}\n\nWhy: {todo_reason}",
+            'due_date': None,
+            'priority': 'high' if should_escalate else base_priority,
+            'category': todo.get('category', 'email'),
+            'source': 'email',
+            'source_id': email_id,
+            'source_title': subject,
+            'source_url': f"https://mail.google.com/mail/u/0/#inbox/{email_id}" if email_id else None,
+            'source_preview': (email.get('snippet') or email.get('body') or '')[:280],
+            'creation_reason': f"{todo_reason}. {priority_reason}",
+            'status': 'pending',
+            'requires_response': 1,
+            'email_id': email_id
+        }
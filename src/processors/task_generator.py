@@ -356,43 +356,41 @@ class TaskGenerator:
     
     def create_tasks_if_not_exist(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create tasks in database if they don't already exist."""
-        created_count = 0
         updated_count = 0
         skipped_count = 0
         
-        existing_tasks = self.db.get_todos()
+        existing_tasks = self.db.get_todo_rows(summary=True)
         
+        # Duplicate keys: same title from same source, or same source_id
+        seen_titles = {
+            ((existing.title or '').lower().strip(), existing.source)
+            for existing in existing_tasks
+        }
+        seen_source_ids = {existing.source_id for existing in existing_tasks if existing.source_id}
+        
+        new_tasks = []
         for task in tasks:
             try:
-                # Check for duplicates based on title and source
-                is_duplicate = False
+                title_key = (task['title'].lower().strip(), task['source'])
+                source_id = task.get('source_id')
                 
-                for existing in existing_tasks:
-                    # Similar title from same source
-                    if (existing.get('title', '').lower().strip() == task['title'].lower().strip() and
-                        existing.get('source') == task['source']):
-                        is_duplicate = True
-                        break
-                    
-                    # Same source_id (exact match)
-                    if (task.get('source_id') and existing.get('source_id') and
-                        task['source_id'] == existing.get('source_id')):
-                        is_duplicate = True
-                        break
-                
-                if is_duplicate:
+                if title_key in seen_titles or (source_id and source_id in seen_source_ids):
                     skipped_count += 1
                     continue
                 
-                # Create the task
-                self.db.add_todo(task)
-                created_count += 1
-                logger.info(f"Created task from {task['source']}: {task['title'][:50]}...")
+                # Several tasks may share a source_id (one note), so only titles are tracked
+                seen_titles.add(title_key)
+                new_tasks.append(task)
                 
             except Exception as e:
                 logger.error(f"Error creating task: {e}")
                 continue
         
+        # Write all new tasks in one transaction
+        created_count = self.db.upsert_todos(new_tasks)
+        for task in new_tasks:
+            logger.info(f"Created task from {task['source']}: {task['title'][:50]}...")
+        
         return {
             'created': created_count,
             'updated': updated_count,
@@ -0,0 +1,169 @@
+"""
+Persistent cache of AI responses for repeated prompts.
+
+The daily brief, "what's on my calendar", per-item summaries and the task
+scans send the same prompts over the same data again and again, and each
+one used to occupy the local model for seconds. Responses are stored in
+SQLite keyed by provider, model, normalized prompt and a hash of the
+context the prompt was answered against, so a repeat returns in
+milliseconds while any change to the data (a new context hash) misses.
+
+Entries expire after a TTL and the least recently used ones are evicted
+beyond a size cap. In "near" mode a prompt that is not an exact repeat can
+still reuse an answer given for a near-identical prompt (same provider,
+model and context; word overlap above a threshold).
+
+Settings (DB settings table):
+    ai_response_cache_mode         'exact' (default), 'near' or 'off'
+    ai_response_cache_ttl          seconds an entry stays valid (900)
+    ai_response_cache_max_entries  size cap before LRU eviction (500)
+    ai_response_cache_similarity   near-mode word overlap threshold (0.9)
+
+Usage:
+    cache = ResponseCache(db)
+    response = await cache.lookup('ollama', model, prompt, context_hash)
+    await cache.store('ollama', model, prompt, context_hash, response)
+
+    response = await cache.chat(provider, messages)
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from db_async import AsyncDatabaseManager
+from metrics import AI_RESPONSE_CACHE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 900
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_SIMILARITY = 0.9
+NEAR_CANDIDATES = 50
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {'hits': 0, 'near_hits': 0, 'misses': 0, 'stores': 0, 'evicted': 0}
+
+
+def _count(field: str, amount: int = 1):
+    with _stats_lock:
+        _stats[field] += amount
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercased, whitespace-collapsed prompt without trailing punctuation."""
+    return ' '.join(str(prompt or '').lower().split()).rstrip('?!. ')
+
+
+def _words(prompt: str) -> set:
+    return set(re.findall(r'\w+', prompt))
+
+
+def similarity(a: str, b: str) -> float:
+    """Word-set overlap (Jaccard) of two normalized prompts."""
+    words_a, words_b = _words(a), _words(b)
+    if not words_a or not words_b:
+        return 1.0 if a == b else 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def cache_key(provider: str, model: str, prompt: str, context_hash: str = '') -> str:
+    payload = json.dumps([provider, model, normalize_prompt(prompt), context_hash or ''])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def messages_context_hash(messages: List[Dict[str, Any]]) -> str:
+    """Hash of everything but the final message, for one-shot prompts."""
+    payload = json.dumps([(m.get('role'), m.get('content')) for m in messages[:-1]])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed AI response cache with TTL, LRU eviction and near-duplicate matching."""
+
+    def __init__(self, db):
+        self.db = db
+        self.adb = AsyncDatabaseManager(db)
+
+    def _setting(self, name: str, default: Any, cast) -> Any:
+        try:
+            value = self.db.get_setting(f'ai_response_cache_{name}', default)
+            return cast(default if value in (None, '') else value)
+        except (TypeError, ValueError):
+            return default
+
+    @property
+    def mode(self) -> str:
+        mode = self._setting('mode', 'exact', lambda value: str(value).strip().lower())
+        return mode if mode in ('exact', 'near', 'off') else 'exact'
+
+    async def lookup(self, provider: str, model: str, prompt: str, context_hash: str = '') -> Optional[str]:
+        """Cached response for this prompt and context, or None."""
+        mode = self.mode
+        if mode == 'off':
+            return None
+        ttl = self._setting('ttl', DEFAULT_TTL, float)
+
+        response = await self.adb.hit_ai_response(cache_key(provider, model, prompt, context_hash), ttl)
+        if response is not None:
+            _count('hits')
+            AI_RESPONSE_CACHE.labels('hit').inc()
+            return response
+
+        if mode == 'near':
+            threshold = self._setting('similarity', DEFAULT_SIMILARITY, float)
+            normalized = normalize_prompt(prompt)
+            candidates = await self.adb.get_recent_ai_responses(provider, model, context_hash or '', ttl,
+                                                                limit=NEAR_CANDIDATES)
+            scored = [(similarity(normalized, row['prompt']), row['cache_key']) for row in candidates]
+            best = max(scored, default=(0.0, None))
+            if best[1] is not None and best[0] >= threshold:
+                response = await self.adb.hit_ai_response(best[1], ttl)
+                if response is not None:
+                    _count('near_hits')
+                    AI_RESPONSE_CACHE.labels('near_hit').inc()
+                    return response
+
+        _count('misses')
+        AI_RESPONSE_CACHE.labels('miss').inc()
+        return None
+
+    async def store(self, provider: str, model: str, prompt: str, context_hash: str, response: str):
+        """Cache a successful response; error strings are never stored."""
+        if self.mode == 'off' or not isinstance(response, str) or not response.strip() or response.startswith('Error'):
+            return
+        await self.adb.save_ai_response(cache_key(provider, model, prompt, context_hash), provider, model,
+                                        normalize_prompt(prompt), context_hash or '', response)
+        _count('stores')
+        evicted = await self.adb.prune_ai_responses(self._setting('ttl', DEFAULT_TTL, float),
+                                                    self._setting('max_entries', DEFAULT_MAX_ENTRIES, int))
+        if evicted:
+            _count('evicted', evicted)
+
+    async def chat(self, provider, messages: List[Dict[str, str]]) -> str:
+        """provider.chat(messages), answered from the cache when the same
+        messages were sent to the same model recently."""
+        provider_type = getattr(provider, 'provider_type', 'unknown')
+        model = str(getattr(provider, 'model_name', '') or '')
+        prompt = messages[-1].get('content', '') if messages else ''
+        context_hash = messages_context_hash(messages)
+
+        cached = await self.lookup(provider_type, model, prompt, context_hash)
+        if cached is not None:
+            return cached
+        response = await provider.chat(messages)
+        await self.store(provider_type, model, prompt, context_hash, response)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since startup plus the stored entry count, for /api/system/status."""
+        with _stats_lock:
+            stats = dict(_stats)
+        lookups = stats['hits'] + stats['near_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['near_hits']) / lookups, 3) if lookups else 0.0
+        stats['mode'] = self.mode
+        stats['entries'] = self.db.count_ai_responses()
+        return stats
@@ -0,0 +1,98 @@
+"""
+Signal-validated cache for independently rendered sections of a document.
+
+The AI context is made of sections (profile, tasks, schedule, notes, ...)
+that change at very different rates. Each section is cached together with
+the *signal* it was rendered from - any cheap, comparable value that
+changes when the section's source data does: a cache_versions counter
+bumped by a trigger, a collector's content hash, a file's mtime. A lookup
+compares the current signal with the stored one and only re-renders the
+section when they differ, so assembling the context for a message costs a
+few signal reads plus string concatenation.
+
+Render time is recorded per section and reported by get_stats(), which
+shows which source dominates a slow context build.
+
+Usage:
+    sections = SectionCache()
+    text = await sections.get('tasks', versions['todos'], render_tasks)
+    sections.invalidate('memory')
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Section:
+    signal: Hashable
+    value: Any
+    built_at: float
+
+
+class SectionCache:
+    """Rendered sections keyed by name, each valid while its signal is unchanged."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sections: Dict[str, _Section] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _section_stats(self, name: str) -> Dict[str, Any]:
+        return self._stats.setdefault(name, {'hits': 0, 'builds': 0, 'total_ms': 0.0,
+                                             'last_build_ms': None, 'max_build_ms': 0.0})
+
+    async def get(self, name: str, signal: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value of section `name` if rendered from `signal`, else `await build()`.
+
+        Exceptions from `build` propagate and leave the previous entry in place.
+        """
+        with self._lock:
+            section = self._sections.get(name)
+            if section is not None and section.signal == signal:
+                self._section_stats(name)['hits'] += 1
+                return section.value
+
+        started = time.perf_counter()
+        value = await build()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._sections[name] = _Section(signal, value, time.time())
+            stats = self._section_stats(name)
+            stats['builds'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['last_build_ms'] = round(elapsed_ms, 2)
+            stats['max_build_ms'] = max(stats['max_build_ms'], round(elapsed_ms, 2))
+        return value
+
+    def invalidate(self, *names: str):
+        """Drop the named sections (all of them if none are given)."""
+        with self._lock:
+            if names:
+                for name in names:
+                    self._sections.pop(name, None)
+            else:
+                self._sections.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits, builds and render times per section."""
+        with self._lock:
+            result = {}
+            for name, stats in self._stats.items():
+                section = self._sections.get(name)
+                result[name] = {
+                    'hits': stats['hits'],
+                    'builds': stats['builds'],
+                    'last_build_ms': stats['last_build_ms'],
+                    'avg_build_ms': round(stats['total_ms'] / stats['builds'], 2) if stats['builds'] else None,
+                    'max_build_ms': stats['max_build_ms'],
+                    'cached': section is not None,
+                    'age_seconds': round(time.time() - section.built_at, 1) if section else None,
+                }
+            return result
@@ -3,18 +3,24 @@ Centralized AI Service - Single source of truth for all AI interactions.
 Manages user profile, context building, and AI provider connections.
 """
 
+import asyncio
 import json
 import gzip
 import hashlib
 import logging
 import re
 import os
-import httpx
+import time
 from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from pathlib import Path
 
+from db_async import AsyncDatabaseManager, run_in_db_executor
+from response_cache import ResponseCache
+from section_cache import SectionCache
+from single_flight import single_flight
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,16 +33,48 @@ class AIService:
     - Learns from user interactions (likes, dislikes, todos)
     """
     
+    # Widgets served by the background collectors, by context section
+    _COLLECTED_SECTIONS = {'schedule': 'calendar', 'emails': 'email', 'github': 'github', 'news': 'news'}
+    # Notes have no change signal; the notes section is rescanned at most this often
+    NOTES_SECTION_TTL = 300
+    # Sections left out of the response cache key: they change every minute
+    # (current time, echoed request) or are rewritten by every exchange (memory)
+    _RESPONSE_CACHE_VOLATILE = ('=== CURRENT CONTEXT ===', '=== LONG-TERM MEMORY ===', '=== SHORT-TERM MEMORY ===')
+    
+    _SECTION_FALLBACKS = {
+        'profile': "=== USER PROFILE ===\nName: User",
+        'memory': "",
+        'tasks': "\n=== ACTIVE TASKS ===\n(Task data not available)",
+        'schedule': "\n=== TODAY'S SCHEDULE ===\n(Calendar data not available)",
+        'emails': "\n=== RECENT EMAILS ===\n(Email data not available)",
+        'github': "\n=== GITHUB ACTIVITY ===\n(GitHub data not available)",
+        'news': "\n=== RECENT NEWS ===\n(News not available)",
+        'weather': "\n=== WEATHER ===\n(Weather data not available)",
+        'notes': "\n=== RECENT NOTES & MEETINGS ===\n(Notes data not available)",
+        'preferences': "",
+    }
+    
+    _CAPABILITIES_SECTION = "\n".join([
+        "\n=== YOUR CAPABILITIES ===",
+        "You can help with:",
+        "  - View and analyze tasks, calendar, emails, GitHub issues, news, weather",
+        "  - Suggest creating new tasks (you'll ask for user approval)",
+        "  - Suggest deleting/completing tasks (you'll ask for user approval)",
+        "  - Prioritize and organize information",
+        "  - Learn from user preferences to improve suggestions",
+    ])
+    
     def __init__(self, db, settings=None):
         """Initialize AI service with database connection."""
         self.db = db
+        self.adb = AsyncDatabaseManager(db)
         self.settings = settings
         self.repo_root = Path(__file__).resolve().parents[2]
         self.long_term_memory_path = self.repo_root / 'LONG_TERM_MEMORY.md'
         self.short_term_memory_path = self.repo_root / 'SHORT_TERM_MEMORY.md'
         self._provider = None
-        self._context_cache = None
-        self._context_cache_time = None
+        self.context_sections = SectionCache()
+        self.response_cache = ResponseCache(db)
         self._user_profile_cache = None
         self._profile_cache_time = None
         self.cache_duration = timedelta(minutes=5)
@@ -66,7 +104,8 @@ class AIService:
                 if provider_type == 'ollama':
                     configured_host = str(self.db.get_setting('ollama_host', 'localhost') or '').strip()
                     configured_model = str(self.db.get_setting('ollama_model', 'deepseek-r1:latest') or '').strip()
-                    provider_base_url = str(getattr(provider, 'base_url', '') or '').strip()
+                    # Compare the URL it was configured with, not a fallback it settled on.
+                    provider_base_url = str(provider.config.get('base_url') or getattr(provider, 'base_url', '') or '').strip()
                     host_mismatch = configured_host and configured_host not in provider_base_url
                     model_mismatch = configured_model and provider_model and configured_model != provider_model
 
@@ -99,41 +138,21 @@ class AIService:
                 if not str(ollama_model or '').strip():
                     ollama_model = 'qwen2.5:7b'
 
-                base_urls = [
-                    f'http://{ollama_host}:{ollama_port}',
-                    f'http://localhost:{ollama_port}',
-                    f'http://127.0.0.1:{ollama_port}',
-                ]
-
-                resolved_base_url = None
-                for candidate in base_urls:
-                    if self._ollama_url_reachable(candidate):
-                        resolved_base_url = candidate
-                        break
-
-                if not resolved_base_url:
-                    resolved_base_url = base_urls[0]
-                    logger.warning(
-                        "No reachable Ollama host found from candidates %s; using configured URL and allowing provider-level retry",
-                        base_urls
-                    )
-                elif resolved_base_url != base_urls[0]:
-                    logger.warning(
-                        "Configured Ollama host %s unreachable; falling back to %s",
-                        base_urls[0],
-                        resolved_base_url
-                    )
+                base_url = f'http://{ollama_host}:{ollama_port}'
 
+                # The provider probes the fallbacks asynchronously on first use.
                 config = {
-                    'base_url': resolved_base_url,
-                    'model_name': ollama_model
+                    'base_url': base_url,
+                    'fallback_urls': [f'http://localhost:{ollama_port}', f'http://127.0.0.1:{ollama_port}'],
+                    'model_name': ollama_model,
+                    **self._transport_config()
                 }
 
                 self._provider = create_provider('ollama', 'configured-ollama', config)
                 ai_manager.providers.clear()
                 ai_manager.default_provider = None
                 ai_manager.register_provider(self._provider, is_default=True)
-                logger.info(f"Initialized Ollama provider: {resolved_base_url} with {ollama_model}")
+                logger.info(f"Initialized Ollama provider: {base_url} with {ollama_model}")
                 
             elif ai_provider_type == 'openai':
                 api_key = self.db.get_credentials('openai', {}).get('api_key')
@@ -141,7 +160,8 @@ class AIService:
                 
                 config = {
                     'api_key': api_key,
-                    'model_name': model
+                    'model_name': model,
+                    **self._transport_config()
                 }
                 
                 self._provider = create_provider('openai', 'configured-openai', config)
@@ -152,13 +172,14 @@ class AIService:
             logger.error(f"Failed to initialize AI provider: {e}")
             self._provider = None
 
-    def _ollama_url_reachable(self, base_url: str) -> bool:
-        """Check whether Ollama tags endpoint is reachable for a base URL."""
-        try:
-            response = httpx.get(f"{base_url}/api/tags", timeout=2.5)
-            return response.status_code == 200
-        except Exception:
-            return False
+    def _transport_config(self) -> Dict[str, Any]:
+        """Provider timeouts and pool size from settings, where set."""
+        config = {}
+        for key in ('request_timeout', 'connect_timeout', 'read_timeout', 'max_connections'):
+            value = self.db.get_setting(f'ai_{key}', None)
+            if value not in (None, ''):
+                config[key] = value
+        return config
     
     def build_user_profile(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
@@ -492,8 +513,7 @@ class AIService:
                 OrderedDict((name, sections.get(name, ['- None yet'])) for name in section_order)
             )
             path.write_text(rendered, encoding='utf-8')
-            self._context_cache = None
-            self._context_cache_time = None
+            self.context_sections.invalidate('memory')
         except Exception as e:
             logger.warning(f"Unable to update memory file {path.name}: {e}")
 
@@ -713,8 +733,7 @@ class AIService:
             normalized_content = f"# Short-Term Memory\n\n{normalized_content}"
 
         target_path.write_text(normalized_content.rstrip() + '\n', encoding='utf-8')
-        self._context_cache = None
-        self._context_cache_time = None
+        self.context_sections.invalidate('memory')
         return True
 
     def reset_memory(self, memory_type: str) -> bool:
@@ -753,253 +772,312 @@ class AIService:
         else:
             raise ValueError('Invalid memory type')
 
-        self._context_cache = None
-        self._context_cache_time = None
+        self.context_sections.invalidate('memory')
         return True
     
     async def build_context(self, user_message: str = "", force_refresh: bool = False) -> str:
         """
         Build comprehensive context for AI requests.
         Includes user profile, recent data, and relevant information.
+        
+        Each section is rendered once and reused until its source data
+        changes (see _section_signal); only the current-time block is
+        rendered per message.
         """
-        # Return cached context if recent and no specific message
-        if not force_refresh and not user_message and self._context_cache and self._context_cache_time:
-            if datetime.now() - self._context_cache_time < self.cache_duration:
-                return self._context_cache
+        context, _ = await self._assemble_context(user_message, force_refresh)
+        return context
+    
+    async def _assemble_context(self, user_message: str = "", force_refresh: bool = False) -> Tuple[str, Dict[str, List[str]]]:
+        """Context text plus its lines grouped by section header (for compaction)."""
+        if force_refresh:
+            self.context_sections.invalidate()
         
         try:
-            self._hydrate_memory_from_profile()
-            context_parts = []
-            
-            # 1. User Profile
-            profile = self.build_user_profile()
-            context_parts.append("=== USER PROFILE ===")
-            context_parts.append(f"Name: {profile.get('user_info', {}).get('name', 'User')}")
-            
-            user_info = profile.get('user_info', {})
-            if user_info.get('company'):
-                context_parts.append(f"Company: {user_info['company']}")
-            if user_info.get('role'):
-                context_parts.append(f"Role: {user_info['role']}")
-
-            raw_user_profile = self._safe_profile_items(self.db.get_user_profile())
-            profile_prompt_fields = []
-            excluded_fields = {'id', 'created_at', 'updated_at'}
-            for key, value in raw_user_profile.items():
-                if key in excluded_fields or value in (None, '', [], {}):
-                    continue
-                if isinstance(value, (list, dict)):
-                    value = json.dumps(value)
-                display_key = key.replace('_', ' ').title()
-                profile_prompt_fields.append(f"{display_key}: {self._truncate_for_memory(str(value), 200)}")
-
-            if profile_prompt_fields:
-                context_parts.append("\n=== DATABASE PROFILE PROMPTS ===")
-                context_parts.extend(profile_prompt_fields[:15])
-
-            context_parts.append("\n=== LONG-TERM MEMORY ===")
-            context_parts.append(self._get_memory_excerpt(self.long_term_memory_path, limit=3200))
-
-            context_parts.append("\n=== SHORT-TERM MEMORY ===")
-            context_parts.append(self._get_memory_excerpt(self.short_term_memory_path, limit=2600))
-            
-            # 2. Current Time Context
-            now = datetime.now()
-            context_parts.append(f"\n=== CURRENT CONTEXT ===")
-            context_parts.append(f"Current Time: {now.strftime('%A, %B %d, %Y at %I:%M %p')}")
-            if user_message:
-                context_parts.append(f"Current User Request: {self._truncate_for_memory(user_message, 240)}")
-            
-            # 3. Active Tasks (top priority)
-            context_parts.append(f"\n=== ACTIVE TASKS ===")
-            todos = self.db.get_todos(include_completed=False, include_deleted=False)
-            if todos:
-                high_priority = [t for t in todos if t.get('priority') == 'high']
-                medium_priority = [t for t in todos if t.get('priority') == 'medium']
-                
-                if high_priority:
-                    context_parts.append("High Priority:")
-                    for todo in high_priority[:5]:
-                        due = todo.get('due_date', 'no date')
-                        context_parts.append(f"  - [{todo['id']}] {todo['title']} (due: {due})")
-                
-                if medium_priority:
-                    context_parts.append("Medium Priority:")
-                    for todo in medium_priority[:5]:
-                        due = todo.get('due_date', 'no date')
-                        context_parts.append(f"  - [{todo['id']}] {todo['title']} (due: {due})")
-                
-                context_parts.append(f"Total active tasks: {len(todos)}")
-            else:
-                context_parts.append("No active tasks")
-            
-            # 4. Today's Calendar Events
-            context_parts.append(f"\n=== TODAY'S SCHEDULE ===")
-            try:
-                # Import the background manager to get cached data directly
-                from main import background_manager
-                cached_calendar = background_manager.get_cached_data('calendar')
-                if cached_calendar and cached_calendar.get('events'):
-                    events = cached_calendar['events']
-                    context_parts.append(f"You have {len(events)} upcoming events:")
-                    for event in events[:10]:
-                        time_str = event.get('time', 'All day')
-                        title = event.get('title') or event.get('summary', 'Untitled')
-                        context_parts.append(f"  - {time_str}: {title}")
-                        if event.get('location'):
-                            context_parts.append(f"    Location: {event['location']}")
-                        if event.get('description'):
-                            desc = str(event['description'])[:100]
-                            context_parts.append(f"    Details: {desc}...")
-                else:
-                    context_parts.append("No upcoming events (data may be loading)")
-            except Exception as e:
-                logger.warning(f"Failed to fetch calendar for context: {e}")
-                context_parts.append("(Calendar data not available)")
-            
-            # 5. Recent Emails (compact summary)
-            context_parts.append(f"\n=== RECENT EMAILS ===")
-            try:
-                from main import background_manager
-                cached_email = background_manager.get_cached_data('email')
-                if cached_email and cached_email.get('emails'):
-                    emails = cached_email['emails']
-                    context_parts.append(f"{len(emails)} emails in inbox. Recent:")
-                    for email in emails[:8]:  # Reduced from 15
-                        sender = email.get('sender') or email.get('from', 'Unknown')
-                        # Extract just the name part if it's an email format
-                        if '<' in sender:
-                            sender = sender.split('<')[0].strip().strip('"')
-                        subject = email.get('subject', 'No subject')[:60]  # Truncate long subjects
-                        context_parts.append(f"  - {sender}: {subject}")
-                else:
-                    context_parts.append("No recent emails")
-            except Exception as e:
-                logger.warning(f"Failed to fetch emails for context: {e}")
-                context_parts.append(f"(Email data not available)")
-            
-            # 6. GitHub Activity
-            context_parts.append(f"\n=== GITHUB ACTIVITY ===")
-            try:
-                from main import background_manager
-                cached_github = background_manager.get_cached_data('github')
-                if cached_github and cached_github.get('issues'):
-                    issues = cached_github['issues']
-                    open_issues = [i for i in issues if i.get('state') == 'open']
-                    if open_issues:
-                        context_parts.append(f"Open Issues ({len(open_issues)}):")
-                        for issue in open_issues[:5]:
-                            repo = issue.get('repo', 'unknown')
-                            title = issue.get('title', 'Untitled')
-                            context_parts.append(f"  - {repo}: {title}")
-                    else:
-                        context_parts.append("No open GitHub issues")
-                else:
-                    context_parts.append("No GitHub data (may be loading)")
-            except Exception as e:
-                logger.warning(f"Failed to fetch GitHub for context: {e}")
-                context_parts.append("(GitHub data not available)")
-            
-            # 7. Recent News (compact)
-            context_parts.append(f"\n=== RECENT NEWS ===")
-            try:
-                from main import background_manager
-                cached_news = background_manager.get_cached_data('news')
-                if cached_news and cached_news.get('articles'):
-                    articles = cached_news['articles']
-                    context_parts.append(f"{len(articles)} articles. Top 3:")
-                    for article in articles[:3]:
-                        title = article.get('title', 'Untitled')[:60]
-                        context_parts.append(f"  - {title}")
-                else:
-                    context_parts.append("No news available")
-            except Exception as e:
-                logger.warning(f"Failed to fetch news for context: {e}")
-                context_parts.append("(News not available)")
-            
-            # 8. Weather
-            context_parts.append(f"\n=== WEATHER ===")
-            try:
-                weather_data = self.db.get_setting('last_weather', {})
-                if isinstance(weather_data, dict) and weather_data.get('current'):
-                    current = weather_data['current']
-                    context_parts.append(f"Current: {current.get('temp', 'N/A')}°F, {current.get('condition', 'N/A')}")
-                else:
-                    context_parts.append("Weather data not available")
-            except:
-                context_parts.append("(Weather data not available)")
-            
-            # 9. Recent Notes (from Obsidian and Google Drive)
-            context_parts.append(f"\n=== RECENT NOTES & MEETINGS ===")
-            try:
-                from collectors.notes_collector import collect_all_notes
-                from database import get_credentials
-                
-                notes_config = get_credentials('notes') or {}
-                obsidian_path = self.db.get_setting('obsidian_vault_path') or notes_config.get('obsidian_vault_path')
-                gdrive_folder_id = self.db.get_setting('google_drive_notes_folder_id') or notes_config.get('google_drive_folder_id')
-                
-                result = collect_all_notes(
-                    obsidian_path=obsidian_path,
-                    gdrive_folder_id=gdrive_folder_id,
-                    limit=10
-                )
-                
-                notes = result.get('notes', [])
-                if notes:
-                    context_parts.append(f"Recent notes ({len(notes)} available):")
-                    for i, note in enumerate(notes[:5], 1):
-                        source_icon = "📝" if note['source'] == 'obsidian' else "☁️"
-                        todo_count = len(note.get('todos', []))
-                        todo_str = f" ({todo_count} TODOs)" if todo_count > 0 else ""
-                        context_parts.append(f"  {i}. {source_icon} {note['title']}{todo_str}")
-                        context_parts.append(f"     Modified: {note.get('modified_at', 'Unknown')[:10]}")
-                        if note.get('preview'):
-                            context_parts.append(f"     Preview: {note['preview'][:100]}...")
-                    
-                    context_parts.append(f"\nNote: User can ask to 'summarize meeting with X' or 'extract tasks from note Y'")
-                else:
-                    context_parts.append("No recent notes available")
-            except Exception as e:
-                logger.error(f"Error loading notes for context: {e}")
-                context_parts.append("(Notes data not available)")
-            
-            # 10. User Preferences (what they like)
-            preferences = profile.get('preferences', {})
-            if preferences:
-                context_parts.append(f"\n=== USER PREFERENCES (Learned from Likes) ===")
-                for pref_type, pref_data in preferences.items():
-                    if pref_data.get('count', 0) > 0:
-                        context_parts.append(f"{pref_type.title()}: {pref_data['count']} items liked")
-                        if pref_data.get('examples'):
-                            context_parts.append(f"  Recent: {', '.join(pref_data['examples'][:2])}")
-            
-            # 11. Communication Style
-            comm_prefs = profile.get('communication_preferences', {})
-            context_parts.append(f"\n=== COMMUNICATION PREFERENCES ===")
-            context_parts.append(f"Style: {comm_prefs.get('style', 'Professional and friendly')}")
-            
-            # 8. AI Capabilities
-            context_parts.append(f"\n=== YOUR CAPABILITIES ===")
-            context_parts.append("You can help with:")
-            context_parts.append("  - View and analyze tasks, calendar, emails, GitHub issues, news, weather")
-            context_parts.append("  - Suggest creating new tasks (you'll ask for user approval)")
-            context_parts.append("  - Suggest deleting/completing tasks (you'll ask for user approval)")
-            context_parts.append("  - Prioritize and organize information")
-            context_parts.append("  - Learn from user preferences to improve suggestions")
-            
-            context = "\n".join(context_parts)
-            
-            # Cache the context
-            if not user_message:  # Only cache general context, not message-specific
-                self._context_cache = context
-                self._context_cache_time = datetime.now()
-            
-            return context
+            versions = await self.adb.get_data_versions()
+            # Profile first: rebuilding it re-seeds long-term memory from the profile
+            rendered = [await self._context_section(name, versions) for name in ('profile', 'memory')]
+            rendered.append(self._render_current_section(user_message))
+            rendered.extend(await asyncio.gather(*(
+                self._context_section(name, versions)
+                for name in ('tasks', 'schedule', 'emails', 'github', 'news', 'weather', 'notes', 'preferences')
+            )))
+            rendered.append((self._CAPABILITIES_SECTION, {}))  # dropped by Ollama compaction
+            
+            parsed: Dict[str, List[str]] = {}
+            for _, section_lines in rendered:
+                parsed.update(section_lines)
+            return "\n".join(text for text, _ in rendered if text), parsed
             
         except Exception as e:
             logger.error(f"Error building context: {e}")
-            return f"Current Time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}"
+            return f"Current Time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}", {}
+    
+    async def _context_section(self, name: str, versions: Dict[str, int]) -> Tuple[str, Dict[str, List[str]]]:
+        """A section's text and parsed lines, re-rendered only when its signal changed."""
+        try:
+            return await self.context_sections.get(
+                name, self._section_signal(name, versions),
+                lambda: self._build_section(name)
+            )
+        except Exception as e:
+            # Not cached: the next message tries again
+            logger.warning(f"Failed to build {name} context section: {e}")
+            text = self._SECTION_FALLBACKS[name]
+            return text, self._parse_context_headers(text)
+    
+    async def _build_section(self, name: str) -> Tuple[str, Dict[str, List[str]]]:
+        text = await getattr(self, f'_render_{name}_section')()
+        return text, self._parse_context_headers(text)
+    
+    def _section_signal(self, name: str, versions: Dict[str, int]) -> Any:
+        """Cheap value that changes whenever the section's source data does."""
+        if name in ('profile', 'preferences'):
+            return versions.get('user_profile'), versions.get('user_feedback')
+        if name == 'memory':
+            return tuple(self._file_signature(path) for path in (self.long_term_memory_path, self.short_term_memory_path))
+        if name == 'tasks':
+            return versions.get('todos')
+        if name == 'weather':
+            return versions.get('settings')
+        if name == 'notes':
+            return versions.get('settings'), int(time.time() // self.NOTES_SECTION_TTL)
+        if name in self._COLLECTED_SECTIONS:
+            try:
+                from main import background_manager
+                return background_manager.fresh_version(self._COLLECTED_SECTIONS[name])
+            except Exception:
+                return None
+        return None
+    
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def _render_current_section(self, user_message: str) -> Tuple[str, Dict[str, List[str]]]:
+        now = datetime.now()
+        lines = ["\n=== CURRENT CONTEXT ===", f"Current Time: {now.strftime('%A, %B %d, %Y at %I:%M %p')}"]
+        if user_message:
+            lines.append(f"Current User Request: {self._truncate_for_memory(user_message, 240)}")
+        text = "\n".join(lines)
+        return text, self._parse_context_headers(text)
+    
+    async def _render_profile_section(self) -> str:
+        await run_in_db_executor(self._hydrate_memory_from_profile)
+        profile = await run_in_db_executor(self.build_user_profile, True)
+        context_parts = ["=== USER PROFILE ==="]
+        context_parts.append(f"Name: {profile.get('user_info', {}).get('name', 'User')}")
+        
+        user_info = profile.get('user_info', {})
+        if user_info.get('company'):
+            context_parts.append(f"Company: {user_info['company']}")
+        if user_info.get('role'):
+            context_parts.append(f"Role: {user_info['role']}")
+
+        raw_user_profile = self._safe_profile_items(await self.adb.get_user_profile())
+        profile_prompt_fields = []
+        excluded_fields = {'id', 'created_at', 'updated_at'}
+        for key, value in raw_user_profile.items():
+            if key in excluded_fields or value in (None, '', [], {}):
+                continue
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value)
+            display_key = key.replace('_', ' ').title()
+            profile_prompt_fields.append(f"{display_key}: {self._truncate_for_memory(str(value), 200)}")
+
+        if profile_prompt_fields:
+            context_parts.append("\n=== DATABASE PROFILE PROMPTS ===")
+            context_parts.extend(profile_prompt_fields[:15])
+        return "\n".join(context_parts)
+    
+    async def _render_memory_section(self) -> str:
+        return "\n".join([
+            "\n=== LONG-TERM MEMORY ===",
+            self._get_memory_excerpt(self.long_term_memory_path, limit=3200),
+            "\n=== SHORT-TERM MEMORY ===",
+            self._get_memory_excerpt(self.short_term_memory_path, limit=2600),
+        ])
+    
+    async def _render_tasks_section(self) -> str:
+        context_parts = ["\n=== ACTIVE TASKS ==="]
+        todos = await self.adb.get_todo_rows(include_completed=False, include_deleted=False, summary=True)
+        if todos:
+            high_priority = [t for t in todos if t.get('priority') == 'high']
+            medium_priority = [t for t in todos if t.get('priority') == 'medium']
+            
+            if high_priority:
+                context_parts.append("High Priority:")
+                for todo in high_priority[:5]:
+                    due = todo.get('due_date', 'no date')
+                    context_parts.append(f"  - [{todo['id']}] {todo['title']} (due: {due})")
+            
+            if medium_priority:
+                context_parts.append("Medium Priority:")
+                for todo in medium_priority[:5]:
+                    due = todo.get('due_date', 'no date')
+                    context_parts.append(f"  - [{todo['id']}] {todo['title']} (due: {due})")
+            
+            context_parts.append(f"Total active tasks: {len(todos)}")
+        else:
+            context_parts.append("No active tasks")
+        return "\n".join(context_parts)
+    
+    def _collected_data(self, section: str) -> Optional[Dict[str, Any]]:
+        # Import the background manager to get cached data directly
+        from main import background_manager
+        return background_manager.get_cached_data(self._COLLECTED_SECTIONS[section])
+    
+    async def _render_schedule_section(self) -> str:
+        context_parts = ["\n=== TODAY'S SCHEDULE ==="]
+        cached_calendar = self._collected_data('schedule')
+        if cached_calendar and cached_calendar.get('events'):
+            events = cached_calendar['events']
+            context_parts.append(f"You have {len(events)} upcoming events:")
+            for event in events[:10]:
+                time_str = event.get('time', 'All day')
+                title = event.get('title') or event.get('summary', 'Untitled')
+                context_parts.append(f"  - {time_str}: {title}")
+                if event.get('location'):
+                    context_parts.append(f"    Location: {event['location']}")
+                if event.get('description'):
+                    desc = str(event['description'])[:100]
+                    context_parts.append(f"    Details: {desc}...")
+        else:
+            context_parts.append("No upcoming events (data may be loading)")
+        return "\n".join(context_parts)
+    
+    async def _render_emails_section(self) -> str:
+        context_parts = ["\n=== RECENT EMAILS ==="]
+        cached_email = self._collected_data('emails')
+        if cached_email and cached_email.get('emails'):
+            emails = cached_email['emails']
+            context_parts.append(f"{len(emails)} emails in inbox. Recent:")
+            for email in emails[:8]:  # Reduced from 15
+                sender = email.get('sender') or email.get('from', 'Unknown')
+                # Extract just the name part if it's an email format
+                if '<' in sender:
+                    sender = sender.split('<')[0].strip().strip('"')
+                subject = email.get('subject', 'No subject')[:60]  # Truncate long subjects
+                context_parts.append(f"  - {sender}: {subject}")
+        else:
+            context_parts.append("No recent emails")
+        return "\n".join(context_parts)
+    
+    async def _render_github_section(self) -> str:
+        context_parts = ["\n=== GITHUB ACTIVITY ==="]
+        cached_github = self._collected_data('github')
+        if cached_github and cached_github.get('issues'):
+            issues = cached_github['issues']
+            open_issues = [i for i in issues if i.get('state') == 'open']
+            if open_issues:
+                context_parts.append(f"Open Issues ({len(open_issues)}):")
+                for issue in open_issues[:5]:
+                    repo = issue.get('repo', 'unknown')
+                    title = issue.get('title', 'Untitled')
+                    context_parts.append(f"  - {repo}: {title}")
+            else:
+                context_parts.append("No open GitHub issues")
+        else:
+            context_parts.append("No GitHub data (may be loading)")
+        return "\n".join(context_parts)
+    
+    async def _render_news_section(self) -> str:
+        context_parts = ["\n=== RECENT NEWS ==="]
+        cached_news = self._collected_data('news')
+        if cached_news and cached_news.get('articles'):
+            articles = cached_news['articles']
+            context_parts.append(f"{len(articles)} articles. Top 3:")
+            for article in articles[:3]:
+                title = article.get('title', 'Untitled')[:60]
+                context_parts.append(f"  - {title}")
+        else:
+            context_parts.append("No news available")
+        return "\n".join(context_parts)
+    
+    async def _render_weather_section(self) -> str:
+        context_parts = ["\n=== WEATHER ==="]
+        weather_data = self.db.get_setting('last_weather', {})  # served from the settings cache
+        if isinstance(weather_data, dict) and weather_data.get('current'):
+            current = weather_data['current']
+            context_parts.append(f"Current: {current.get('temp', 'N/A')}°F, {current.get('condition', 'N/A')}")
+        else:
+            context_parts.append("Weather data not available")
+        return "\n".join(context_parts)
+    
+    async def _render_notes_section(self) -> str:
+        """Recent notes from Obsidian and Google Drive."""
+        from collectors.notes_collector import collect_all_notes
+        from database import get_credentials
+        
+        context_parts = ["\n=== RECENT NOTES & MEETINGS ==="]
+        notes_config = get_credentials('notes') or {}
+        obsidian_path = self.db.get_setting('obsidian_vault_path') or notes_config.get('obsidian_vault_path')
+        gdrive_folder_id = self.db.get_setting('google_drive_notes_folder_id') or notes_config.get('google_drive_folder_id')
+        
+        # Shares an in-progress collection with /api/notes and other chats
+        result = await asyncio.to_thread(
+            single_flight.do_sync,
+            ('notes', obsidian_path, gdrive_folder_id, False, 10),
+            collect_all_notes,
+            obsidian_path=obsidian_path,
+            gdrive_folder_id=gdrive_folder_id,
+            limit=10
+        )
+        
+        notes = result.get('notes', [])
+        if notes:
+            context_parts.append(f"Recent notes ({len(notes)} available):")
+            for i, note in enumerate(notes[:5], 1):
+                source_icon = "📝" if note['source'] == 'obsidian' else "☁️"
+                todo_count = len(note.get('todos', []))
+                todo_str = f" ({todo_count} TODOs)" if todo_count > 0 else ""
+                context_parts.append(f"  {i}. {source_icon} {note['title']}{todo_str}")
+                context_parts.append(f"     Modified: {note.get('modified_at', 'Unknown')[:10]}")
+                if note.get('preview'):
+                    context_parts.append(f"     Preview: {note['preview'][:100]}...")
+            
+            context_parts.append(f"\nNote: User can ask to 'summarize meeting with X' or 'extract tasks from note Y'")
+        else:
+            context_parts.append("No recent notes available")
+        return "\n".join(context_parts)
+    
+    async def _render_preferences_section(self) -> str:
+        """Preferences learned from likes, and communication style."""
+        # Rendered after the profile section, so this is its freshly built profile
+        profile = await run_in_db_executor(self.build_user_profile)
+        context_parts = []
+        preferences = profile.get('preferences', {})
+        if preferences:
+            context_parts.append(f"\n=== USER PREFERENCES (Learned from Likes) ===")
+            for pref_type, pref_data in preferences.items():
+                if pref_data.get('count', 0) > 0:
+                    context_parts.append(f"{pref_type.title()}: {pref_data['count']} items liked")
+                    if pref_data.get('examples'):
+                        context_parts.append(f"  Recent: {', '.join(pref_data['examples'][:2])}")
+        
+        comm_prefs = profile.get('communication_preferences', {})
+        context_parts.append(f"\n=== COMMUNICATION PREFERENCES ===")
+        context_parts.append(f"Style: {comm_prefs.get('style', 'Professional and friendly')}")
+        return "\n".join(context_parts)
+    
+    @staticmethod
+    def _parse_context_headers(context: str) -> Dict[str, List[str]]:
+        """Non-blank lines of each '=== HEADER ===' block, stripped."""
+        parsed: Dict[str, List[str]] = {}
+        current_header = None
+        for raw_line in (context or '').splitlines():
+            line = raw_line.rstrip()
+            if line.startswith('=== ') and line.endswith(' ==='):
+                current_header = line
+                parsed.setdefault(current_header, [])
+                continue
+            if current_header:
+                if line.strip():
+                    parsed[current_header].append(line.strip())
+        return parsed
     
     def compress_context(self, context: str) -> bytes:
         """Compress context for efficient transmission."""
@@ -1023,8 +1101,13 @@ class AIService:
         """Generate hash of context for change detection."""
         return hashlib.sha256(context.encode('utf-8')).hexdigest()
 
-    def _compact_context_for_ollama(self, context: str, user_message: str = "", max_chars: int = 4500) -> str:
-        """Trim full context into a compact, high-signal payload for local Ollama models."""
+    def _compact_context_for_ollama(self, context: str, user_message: str = "", max_chars: int = 4500,
+                                    parsed: Optional[Dict[str, List[str]]] = None) -> str:
+        """Trim full context into a compact, high-signal payload for local Ollama models.
+
+        `parsed` is the context's lines by header when the caller already has
+        them (from _assemble_context); otherwise the text is parsed here.
+        """
         if not context:
             return ""
 
@@ -1063,17 +1146,8 @@ class AIService:
             '=== RECENT NEWS ===',
         ]
 
-        parsed: Dict[str, List[str]] = {}
-        current_header = None
-        for raw_line in (context or '').splitlines():
-            line = raw_line.rstrip()
-            if line.startswith('=== ') and line.endswith(' ==='):
-                current_header = line
-                parsed.setdefault(current_header, [])
-                continue
-            if current_header:
-                if line.strip():
-                    parsed[current_header].append(line.strip())
+        if parsed is None:
+            parsed = self._parse_context_headers(context)
 
         compact_parts: List[str] = []
         for header in section_order:
@@ -1354,52 +1428,210 @@ class AIService:
             Dict with response, context info, and metadata
         """
         try:
-            provider = self.get_provider()
-            if not provider:
+            prepared = await self._prepare_chat(message, conversation_id, include_context, assistant_id)
+            if not prepared:
                 return {
                     'error': 'No AI provider configured',
                     'success': False
                 }
-            provider_name_used = provider.name
-
-            is_ollama = getattr(provider, 'provider_type', '') == 'ollama'
+            cached = await self._cached_chat_result(prepared, message, conversation_id, include_context)
+            if cached:
+                return cached
+            return await self._complete_chat(prepared, message, conversation_id, include_context)
             
-            # Build context
-            context = await self.build_context(message) if include_context else ""
-            assistant_profile = self._get_active_assistant_profile(assistant_id)
-
-            prompt_context = context
-            if context and is_ollama:
-                configured_limit = self.db.get_setting('ollama_context_chars', 4500)
-                try:
-                    max_context_chars = int(configured_limit)
-                except Exception:
-                    max_context_chars = 4500
-                max_context_chars = max(1800, min(max_context_chars, 9000))
-
-                prompt_context = self._compact_context_for_ollama(
-                    context,
-                    user_message=message,
-                    max_chars=max_context_chars
-                )
-                logger.info(
-                    "Compacted Ollama context from %s to %s chars",
-                    len(context),
-                    len(prompt_context)
-                )
+        except Exception as e:
+            logger.error(f"Error in AI chat: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def chat_stream(self, message: str, conversation_id: str = None, include_context: bool = True, assistant_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming chat interface - yields tokens as the provider generates them.
+        
+        Yields {'type': 'token', 'content': ...} events followed by one
+        {'type': 'done', ...} event carrying the full response and the same
+        metadata as chat(), or a {'type': 'error', 'error': ...} event.
+        Memory and conversation history are saved once the stream completes.
+        
+        Cached answers, daily-brief requests (whose answer chat() may rewrite)
+        and provider failures before the first token are answered through
+        chat()'s path and arrive as a single token.
+        
+        A streamed answer that turns out to be a privacy refusal is neither
+        cached nor saved: chat()'s path (corrective retry, sanitizing,
+        fallbacks) answers again and its text arrives in one
+        {'type': 'replace', 'content': ...} event, which supersedes the
+        tokens already sent, before 'done'.
+        """
+        try:
+            prepared = await self._prepare_chat(message, conversation_id, include_context, assistant_id)
+            if not prepared:
+                yield {'type': 'error', 'error': 'No AI provider configured'}
+                return
             
-            # Build messages for chat
-            messages = []
+            result = await self._cached_chat_result(prepared, message, conversation_id, include_context)
+            if result is None and self._is_daily_brief_request(message):
+                result = await self._complete_chat(prepared, message, conversation_id, include_context)
+            if result is not None:
+                for event in self._chat_result_events(result):
+                    yield event
+                return
             
-            # System message with context
-            if prompt_context:
-                # Put strong directive BEFORE the context data - KEEP IT SHORT
-                assistant_name = assistant_profile.get('name', 'AI Assistant')
-                personality = assistant_profile.get('personality', 'Clear, concise, and proactive')
-                tagline = assistant_profile.get('tagline', '')
-                key_phrases = assistant_profile.get('key_phrases', []) or []
+            provider = prepared['provider']
+            pieces = []
+            logger.info(f"Calling provider.chat_stream with {len(prepared['messages'])} messages")
+            try:
+                async for piece in provider.chat_stream(list(prepared['messages'])):
+                    if not pieces and isinstance(piece, str) and piece.startswith('Error'):
+                        logger.warning("Streaming chat failed before first token (%s); using non-streaming path", piece)
+                        break
+                    pieces.append(piece)
+                    yield {'type': 'token', 'content': piece}
+            except Exception as stream_error:
+                if not pieces:
+                    raise
+                logger.error(f"AI stream interrupted after {len(pieces)} pieces: {stream_error}")
+                yield {'type': 'error', 'error': f"Response interrupted: {stream_error}"}
+                return
+            
+            if not pieces:
+                result = await self._complete_chat(prepared, message, conversation_id, include_context)
+                for event in self._chat_result_events(result):
+                    yield event
+                return
+            
+            response = ''.join(pieces)
+            if self._looks_like_privacy_refusal(response):
+                logger.warning("Streamed response was a privacy refusal; answering again through the non-streaming path")
+                result = await self._complete_chat(prepared, message, conversation_id, include_context)
+                if not result.get('success'):
+                    yield {'type': 'error', 'error': result.get('error', 'Unknown error')}
+                    return
+                yield {'type': 'replace', 'content': result['response']}
+                yield {'type': 'done', **{key: value for key, value in result.items() if key != 'success'}}
+                return
+            
+            await self._cache_response(prepared, message, response)
+            await self._save_exchange(message, response, conversation_id)
+            yield {
+                'type': 'done',
+                'response': response,
+                'provider': provider.name,
+                'conversation_id': conversation_id,
+                'context_included': include_context,
+                'context_hash': self.get_context_hash(prepared['context']) if prepared['context'] else None
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in AI chat stream: {e}")
+            yield {'type': 'error', 'error': str(e)}
+    
+    @staticmethod
+    def _chat_result_events(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Stream events for a complete chat() result."""
+        if not result.get('success'):
+            return [{'type': 'error', 'error': result.get('error', 'Unknown error')}]
+        done = {key: value for key, value in result.items() if key != 'success'}
+        return [{'type': 'token', 'content': result['response']}, {'type': 'done', **done}]
+    
+    def _response_cache_context(self, parsed_context: Dict[str, List[str]], assistant_profile: Dict[str, Any],
+                                history: List[Dict[str, str]]) -> str:
+        """Hash of what a chat answer depends on besides the question.
 
-                system_message = f"""You are {assistant_name}, a personal AI assistant with access to the user's data shown below.
+        Covers the data sections, today's date, the assistant persona and the
+        conversation history, but not _RESPONSE_CACHE_VOLATILE sections, so
+        asking the same question again over unchanged data is a cache hit.
+        """
+        sections = {header: lines for header, lines in parsed_context.items()
+                    if header not in self._RESPONSE_CACHE_VOLATILE}
+        persona = [assistant_profile.get(key) for key in ('name', 'personality', 'tagline', 'key_phrases')]
+        payload = json.dumps([sections, datetime.now().date().isoformat(), persona, history],
+                             sort_keys=True, default=str)
+        return self.get_context_hash(payload)
+    
+    async def _cached_chat_result(self, prepared: Dict[str, Any], message: str, conversation_id: Optional[str],
+                                  include_context: bool) -> Optional[Dict[str, Any]]:
+        """A chat() result from the response cache, saved to history like a fresh one; None on a miss."""
+        provider = prepared['provider']
+        response = await self.response_cache.lookup(
+            getattr(provider, 'provider_type', 'unknown'), str(getattr(provider, 'model_name', '') or ''),
+            message, prepared['cache_context']
+        )
+        if response is None:
+            return None
+        logger.info("Answered AI chat from the response cache")
+        await self._save_exchange(message, response, conversation_id)
+        return {
+            'success': True,
+            'response': response,
+            'provider': provider.name,
+            'conversation_id': conversation_id,
+            'context_included': include_context,
+            'context_hash': self.get_context_hash(prepared['context']) if prepared['context'] else None,
+            'cached': True
+        }
+    
+    async def _cache_response(self, prepared: Dict[str, Any], message: str, response: str):
+        provider = prepared['provider']
+        try:
+            await self.response_cache.store(
+                getattr(provider, 'provider_type', 'unknown'), str(getattr(provider, 'model_name', '') or ''),
+                message, prepared['cache_context'], response
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache AI response: {e}")
+    
+    async def _prepare_chat(self, message: str, conversation_id: Optional[str], include_context: bool, assistant_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Resolve the provider and build the message list for one chat turn.
+        
+        Returns None when no provider is configured.
+        """
+        provider = self.get_provider()
+        if not provider:
+            return None
+
+        is_ollama = getattr(provider, 'provider_type', '') == 'ollama'
+        
+        # Build context
+        context, parsed_context = await self._assemble_context(message) if include_context else ("", {})
+        assistant_profile = self._get_active_assistant_profile(assistant_id)
+
+        prompt_context = context
+        if context and is_ollama:
+            configured_limit = self.db.get_setting('ollama_context_chars', 4500)
+            try:
+                max_context_chars = int(configured_limit)
+            except Exception:
+                max_context_chars = 4500
+            max_context_chars = max(1800, min(max_context_chars, 9000))
+
+            prompt_context = self._compact_context_for_ollama(
+                context,
+                user_message=message,
+                max_chars=max_context_chars,
+                parsed=parsed_context
+            )
+            logger.info(
+                "Compacted Ollama context from %s to %s chars",
+                len(context),
+                len(prompt_context)
+            )
+        
+        # Build messages for chat
+        messages = []
+        
+        # System message with context
+        if prompt_context:
+            # Put strong directive BEFORE the context data - KEEP IT SHORT
+            assistant_name = assistant_profile.get('name', 'AI Assistant')
+            personality = assistant_profile.get('personality', 'Clear, concise, and proactive')
+            tagline = assistant_profile.get('tagline', '')
+            key_phrases = assistant_profile.get('key_phrases', []) or []
+
+            system_message = f"""You are {assistant_name}, a personal AI assistant with access to the user's data shown below.
 IMPORTANT: When asked about calendar, emails, tasks - USE THE DATA IN THIS MESSAGE. Never say "I don't have access."
 PRIVACY NOTE: The user has explicitly authorized this app assistant to review and summarize their in-app personal data.
 Do not refuse due to privacy policy concerns for this in-app context.
@@ -1408,9 +1640,9 @@ TAGLINE: {tagline if tagline else 'None'}
 KEY PHRASES: {', '.join(key_phrases[:6]) if key_phrases else 'None'}
 
 """
-                system_message += prompt_context
-                # Keep additional instructions minimal
-                system_message += """
+            system_message += prompt_context
+            # Keep additional instructions minimal
+            system_message += """
 
 RULES:
 - Answer questions using the data above
@@ -1423,48 +1655,68 @@ RULES:
     3) Follow-ups (concrete next actions)
 - Use tagline at most once and only when it fits naturally
 - Be concise and helpful"""
-                messages.append({'role': 'system', 'content': system_message})
-            
-            # Add conversation history if available
-            if conversation_id:
-                history_limit = 2 if is_ollama else 5
-                history = self.db.get_ai_conversation_history(conversation_id, limit=history_limit)
-                for msg in history:
-                    if msg['role'] != 'system':  # Avoid duplicate system messages
-                        messages.append({
-                            'role': msg['role'],
-                            'content': msg['content']
-                        })
-            
-            # Add current message
-            messages.append({'role': 'user', 'content': message})
-            
-            # Log what we're sending (minimal logging)
-            logger.info(f"Calling provider.chat with {len(messages)} messages")
-            
-            # Get AI response
-            response = await provider.chat(messages, stream=False)
-
-            # If Ollama rejects payload (400), retry with minimal prompt context.
-            if isinstance(response, str) and response.startswith('Error: Ollama API error: 400'):
-                logger.warning("Ollama returned 400; retrying with minimal context")
-                minimal_messages = [
-                    {
-                        'role': 'system',
-                        'content': 'You are a helpful assistant. Answer clearly and concisely using available dashboard information from the user message.'
-                    },
-                    {'role': 'user', 'content': message}
-                ]
-                response = await provider.chat(minimal_messages, stream=False)
+            messages.append({'role': 'system', 'content': system_message})
+        
+        # Add conversation history if available
+        history_messages = []
+        if conversation_id:
+            history_limit = 2 if is_ollama else 5
+            history = await self.adb.get_ai_conversation_history(conversation_id, limit=history_limit)
+            for msg in history:
+                if msg['role'] != 'system':  # Avoid duplicate system messages
+                    history_messages.append({
+                        'role': msg['role'],
+                        'content': msg['content']
+                    })
+        messages.extend(history_messages)
+        
+        # Add current message
+        messages.append({'role': 'user', 'content': message})
+        
+        return {
+            'provider': provider,
+            'is_ollama': is_ollama,
+            'context': context,
+            'prompt_context': prompt_context,
+            'messages': messages,
+            'cache_context': self._response_cache_context(parsed_context, assistant_profile, history_messages)
+        }
+    
+    async def _complete_chat(self, prepared: Dict[str, Any], message: str, conversation_id: Optional[str], include_context: bool) -> Dict[str, Any]:
+        """Get a complete response for a prepared chat turn, with retries and fallbacks, and save it."""
+        provider = prepared['provider']
+        provider_name_used = provider.name
+        is_ollama = prepared['is_ollama']
+        context = prepared['context']
+        prompt_context = prepared['prompt_context']
+        messages = prepared['messages']
+        
+        # Log what we're sending (minimal logging)
+        logger.info(f"Calling provider.chat with {len(messages)} messages")
+        
+        # Get AI response
+        response = await provider.chat(messages, stream=False)
 
-            # Some models may still emit generic privacy refusals despite app context.
-            # Retry once with a strict corrective system directive.
-            if self._looks_like_privacy_refusal(response):
-                logger.warning("AI response contained privacy-refusal language; retrying with corrective prompt")
-                retry_messages = []
+        # If Ollama rejects payload (400), retry with minimal prompt context.
+        if isinstance(response, str) and response.startswith('Error: Ollama API error: 400'):
+            logger.warning("Ollama returned 400; retrying with minimal context")
+            minimal_messages = [
+                {
+                    'role': 'system',
+                    'content': 'You are a helpful assistant. Answer clearly and concisely using available dashboard information from the user message.'
+                },
+                {'role': 'user', 'content': message}
+            ]
+            response = await provider.chat(minimal_messages, stream=False)
 
-                if prompt_context:
-                    corrective_system_message = """You are the user's in-app personal assistant.
+        # Some models may still emit generic privacy refusals despite app context.
+        # Retry once with a strict corrective system directive.
+        if self._looks_like_privacy_refusal(response):
+            logger.warning("AI response contained privacy-refusal language; retrying with corrective prompt")
+            retry_messages = []
+
+            if prompt_context:
+                corrective_system_message = """You are the user's in-app personal assistant.
 The user has explicitly granted permission for you to access and summarize their app data context (calendar, email, notes, tasks, GitHub, news).
 Do NOT claim you cannot access data due to privacy policy.
 If some sections are missing in the provided context, state exactly which sections are unavailable and continue with the rest.
@@ -1474,140 +1726,138 @@ When asked to summarize/prioritize, return: Today Snapshot, Top Priorities, Foll
 Use the context below to provide concrete prioritization and summaries.
 
 """
-                    corrective_system_message += prompt_context
-                    retry_messages.append({'role': 'system', 'content': corrective_system_message})
-
-                retry_messages.append({'role': 'user', 'content': message})
-                response = await provider.chat(retry_messages, stream=False)
+                corrective_system_message += prompt_context
+                retry_messages.append({'role': 'system', 'content': corrective_system_message})
+
+            retry_messages.append({'role': 'user', 'content': message})
+            response = await provider.chat(retry_messages, stream=False)
+
+        # Final safeguard: remove refusal sentence if model still includes it.
+        if self._looks_like_privacy_refusal(response):
+            logger.warning("AI response still contains privacy-refusal language after retry; sanitizing response")
+            response = self._strip_privacy_refusal_sentences(response)
+
+        # Enforce concise daily-brief format when requested.
+        if self._is_daily_brief_request(message):
+            needs_reformat = (
+                not self._matches_daily_brief_format(response)
+                or self._looks_generic_priority_response(response)
+                or not self._response_references_context(response, prompt_context)
+            )
 
-            # Final safeguard: remove refusal sentence if model still includes it.
-            if self._looks_like_privacy_refusal(response):
-                logger.warning("AI response still contains privacy-refusal language after retry; sanitizing response")
-                response = self._strip_privacy_refusal_sentences(response)
-
-            # Enforce concise daily-brief format when requested.
-            if self._is_daily_brief_request(message):
-                needs_reformat = (
-                    not self._matches_daily_brief_format(response)
-                    or self._looks_generic_priority_response(response)
-                    or not self._response_references_context(response, prompt_context)
-                )
+            if needs_reformat:
+                logger.info("Daily-priority request detected; enforcing structured context-specific response")
+            brief_messages = []
+            if prompt_context:
+                brief_messages.append({
+                    'role': 'system',
+                    'content': (
+                        "Use ONLY the provided context to produce a concise daily brief in this exact structure:\n"
+                        "Today Snapshot\n"
+                        "- bullet\n"
+                        "- bullet\n"
+                        "Top Priorities\n"
+                        "1) priority — why now\n"
+                        "2) priority — why now\n"
+                        "3) priority — why now\n"
+                        "Follow-ups\n"
+                        "- action | owner | when\n"
+                        "If calendar/email/notes data is unavailable, say that explicitly and continue with available sections.\n\n"
+                        f"{prompt_context}"
+                    )
+                })
+            brief_messages.append({'role': 'user', 'content': message})
+            reformatted = await provider.chat(brief_messages, stream=False)
+            if reformatted:
+                response = reformatted
+
+            still_not_specific = (
+                not self._matches_daily_brief_format(response)
+                or self._looks_generic_priority_response(response)
+                or not self._response_references_context(response, prompt_context)
+            )
 
-                if needs_reformat:
-                    logger.info("Daily-priority request detected; enforcing structured context-specific response")
-                brief_messages = []
-                if prompt_context:
-                    brief_messages.append({
-                        'role': 'system',
-                        'content': (
-                            "Use ONLY the provided context to produce a concise daily brief in this exact structure:\n"
-                            "Today Snapshot\n"
-                            "- bullet\n"
-                            "- bullet\n"
-                            "Top Priorities\n"
-                            "1) priority — why now\n"
-                            "2) priority — why now\n"
-                            "3) priority — why now\n"
-                            "Follow-ups\n"
-                            "- action | owner | when\n"
-                            "If calendar/email/notes data is unavailable, say that explicitly and continue with available sections.\n\n"
-                            f"{prompt_context}"
-                        )
-                    })
-                brief_messages.append({'role': 'user', 'content': message})
-                reformatted = await provider.chat(brief_messages, stream=False)
-                if reformatted:
-                    response = reformatted
-
-                still_not_specific = (
-                    not self._matches_daily_brief_format(response)
-                    or self._looks_generic_priority_response(response)
-                    or not self._response_references_context(response, prompt_context)
-                )
+            if still_not_specific:
+                logger.warning("Model response still generic/unstructured; using deterministic fallback brief")
+                response = self._build_fallback_daily_brief(prompt_context)
 
-                if still_not_specific:
-                    logger.warning("Model response still generic/unstructured; using deterministic fallback brief")
-                    response = self._build_fallback_daily_brief(prompt_context)
-
-            # Final availability fallback: if Ollama failed, try OpenAI automatically.
-            if is_ollama and isinstance(response, str) and response.startswith('Error:'):
-                try:
-                    openai_creds = self.db.get_credentials('openai') or {}
-                    key_candidates = [
-                        openai_creds.get('api_key'),
-                        self.db.get_setting('openai_api_key', ''),
-                        os.getenv('OPENAI_API_KEY', ''),
-                    ]
-                    openai_api_key = ''
-                    for candidate in key_candidates:
-                        if not isinstance(candidate, str):
-                            continue
-                        candidate = candidate.strip()
-                        if candidate.startswith('sk-'):
-                            openai_api_key = candidate
-                            break
-                    openai_model = self.db.get_setting('openai_model', 'gpt-4o-mini')
-
-                    if openai_api_key:
-                        from processors.ai_providers import create_provider
-
-                        fallback_provider = create_provider(
-                            'openai',
-                            'auto-openai-fallback',
-                            {
-                                'api_key': openai_api_key,
-                                'model_name': openai_model,
-                            }
-                        )
+        # Final availability fallback: if Ollama failed, try OpenAI automatically.
+        if is_ollama and isinstance(response, str) and response.startswith('Error:'):
+            try:
+                openai_creds = self.db.get_credentials('openai') or {}
+                key_candidates = [
+                    openai_creds.get('api_key'),
+                    self.db.get_setting('openai_api_key', ''),
+                    os.getenv('OPENAI_API_KEY', ''),
+                ]
+                openai_api_key = ''
+                for candidate in key_candidates:
+                    if not isinstance(candidate, str):
+                        continue
+                    candidate = candidate.strip()
+                    if candidate.startswith('sk-'):
+                        openai_api_key = candidate
+                        break
+                openai_model = self.db.get_setting('openai_model', 'gpt-4o-mini')
+
+                if openai_api_key:
+                    from processors.ai_providers import create_provider
+
+                    fallback_provider = create_provider(
+                        'openai',
+                        'auto-openai-fallback',
+                        {
+                            'api_key': openai_api_key,
+                            'model_name': openai_model,
+                        }
+                    )
 
-                        logger.warning(
-                            "Ollama returned error (%s); retrying with OpenAI fallback model %s",
-                            response,
-                            openai_model
-                        )
-                        fallback_response = await fallback_provider.chat(messages, stream=False)
-                        if fallback_response and not str(fallback_response).startswith('Error:'):
-                            response = fallback_response
-                            provider_name_used = fallback_provider.name
-                        else:
-                            logger.warning("OpenAI fallback returned error response: %s", fallback_response)
+                    logger.warning(
+                        "Ollama returned error (%s); retrying with OpenAI fallback model %s",
+                        response,
+                        openai_model
+                    )
+                    fallback_response = await fallback_provider.chat(messages, stream=False)
+                    if fallback_response and not str(fallback_response).startswith('Error:'):
+                        response = fallback_response
+                        provider_name_used = fallback_provider.name
                     else:
-                        logger.warning("Skipping OpenAI fallback: no valid API key available")
-                except Exception as fallback_error:
-                    logger.warning(f"OpenAI fallback attempt failed: {fallback_error}")
-
-            # If all provider attempts failed, return a stable degraded message instead of raw provider error.
-            if isinstance(response, str) and response.startswith('Error:'):
-                response = (
-                    "AI assistant is temporarily unavailable because the local model is timing out or unreachable. "
-                    "Dashboard data collection is still running; retry AI chat shortly."
-                )
+                        logger.warning("OpenAI fallback returned error response: %s", fallback_response)
+                else:
+                    logger.warning("Skipping OpenAI fallback: no valid API key available")
+            except Exception as fallback_error:
+                logger.warning(f"OpenAI fallback attempt failed: {fallback_error}")
+
+        # If all provider attempts failed, return a stable degraded message instead of raw provider error.
+        if isinstance(response, str) and response.startswith('Error:'):
+            response = (
+                "AI assistant is temporarily unavailable because the local model is timing out or unreachable. "
+                "Dashboard data collection is still running; retry AI chat shortly."
+            )
+        else:
+            await self._cache_response(prepared, message, response)
 
-            self._update_conversation_memory(message, response)
-            
-            # Save to conversation history
-            if conversation_id:
-                user_msg_id = f"msg_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_user"
-                ai_msg_id = f"msg_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_ai"
-                
-                self.db.save_ai_message(user_msg_id, conversation_id, 'user', message)
-                self.db.save_ai_message(ai_msg_id, conversation_id, 'assistant', response)
-            
-            return {
-                'success': True,
-                'response': response,
-                'provider': provider_name_used,
-                'conversation_id': conversation_id,
-                'context_included': include_context,
-                'context_hash': self.get_context_hash(context) if context else None
-            }
+        await self._save_exchange(message, response, conversation_id)
+        
+        return {
+            'success': True,
+            'response': response,
+            'provider': provider_name_used,
+            'conversation_id': conversation_id,
+            'context_included': include_context,
+            'context_hash': self.get_context_hash(context) if context else None
+        }
+    
+    async def _save_exchange(self, message: str, response: str, conversation_id: Optional[str]):
+        """Update conversation memory and save the exchange to conversation history."""
+        self._update_conversation_memory(message, response)
+        
+        if conversation_id:
+            user_msg_id = f"msg_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_user"
+            ai_msg_id = f"msg_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_ai"
             
-        except Exception as e:
-            logger.error(f"Error in AI chat: {e}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+            await self.adb.save_ai_message(user_msg_id, conversation_id, 'user', message)
+            await self.adb.save_ai_message(ai_msg_id, conversation_id, 'assistant', response)
     
     def learn_from_feedback(self, item_type: str, item_id: str, feedback: str, item_data: Dict[str, Any] = None):
         """
@@ -1626,8 +1876,7 @@ Use the context below to provide concrete prioritization and summaries.
             # Invalidate caches to pick up new preferences
             self._user_profile_cache = None
             self._profile_cache_time = None
-            self._context_cache = None
-            self._context_cache_time = None
+            self.context_sections.invalidate('profile', 'preferences')
             
             logger.info(f"Learned from {feedback} on {item_type}: {item_id}")
             
@@ -1646,7 +1895,7 @@ Use the context below to provide concrete prioritization and summaries.
             now = datetime.now()
             
             # Check for overdue tasks
-            todos = self.db.get_todos(include_completed=False, include_deleted=False)
+            todos = self.db.get_todo_rows(include_completed=False, include_deleted=False, summary=True)
             overdue = [t for t in todos if t.get('due_date') and 
                       datetime.fromisoformat(t['due_date'].replace('Z', '+00:00')) < now]
             
@@ -1858,6 +2107,24 @@ Use the context below to provide concrete prioritization and summaries.
                 'created_count': 0
             }
     
+    def search(self, query: str, kinds: List[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Full-text search across emails, tasks, news and notes.
+        
+        Args:
+            query: Search keywords
+            kinds: Optional subset of 'emails', 'todos', 'news', 'notes'
+            limit: Maximum number of results
+        
+        Returns:
+            Ranked results with kind, id, title, snippet, timestamp and url
+        """
+        try:
+            return self.db.search(query, kinds=kinds, limit=limit)
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            return []
+    
     def search_tasks(self, query: str, status: str = None, priority: str = None) -> List[Dict[str, Any]]:
         """
         Search tasks by keywords, status, and priority.
@@ -1871,29 +2138,16 @@ Use the context below to provide concrete prioritization and summaries.
             List of matching tasks
         """
         try:
-            # Get all tasks
-            all_tasks = self.db.get_todos(include_completed=(status == 'completed'))
+            include_completed = (status == 'completed')
             
-            # Filter by status if specified
-            if status:
-                all_tasks = [t for t in all_tasks if t.get('status') == status]
-            
-            # Filter by priority if specified
-            if priority:
-                all_tasks = [t for t in all_tasks if t.get('priority') == priority]
-            
-            # Search by query keywords
+            # Keyword searches go through the full-text index, best match first
             if query:
-                query_lower = query.lower()
-                matching_tasks = []
-                for task in all_tasks:
-                    title = task.get('title', '').lower()
-                    description = task.get('description', '').lower()
-                    if query_lower in title or query_lower in description:
-                        matching_tasks.append(task)
-                return matching_tasks
+                return self.db.search_todos(query, include_completed=include_completed,
+                                            status=status, priority=priority)
             
-            return all_tasks
+            page = self.db.query_todos(include_completed=include_completed,
+                                       status=status, priority=priority)
+            return [row.to_dict() for row in page['rows']]
             
         except Exception as e:
             logger.error(f"Error searching tasks: {e}")
@@ -1910,22 +2164,32 @@ Use the context below to provide concrete prioritization and summaries.
             Note data if found, None otherwise
         """
         try:
+            # Notes are indexed as they are collected
+            note = self.db.find_note(title_query)
+            if note:
+                return note
+            
             from collectors.notes_collector import collect_all_notes
             from database import get_credentials
             
-            # Get notes configuration
+            # Not indexed yet: collect recent notes (which indexes them) and retry
             notes_config = get_credentials('notes') or {}
             obsidian_path = self.db.get_setting('obsidian_vault_path') or notes_config.get('obsidian_vault_path')
             gdrive_folder_id = self.db.get_setting('google_drive_notes_folder_id') or notes_config.get('google_drive_folder_id')
             
-            # Collect recent notes
-            result = collect_all_notes(
+            result = single_flight.do_sync(
+                ('notes', obsidian_path, gdrive_folder_id, False, 50),
+                collect_all_notes,
                 obsidian_path=obsidian_path,
                 gdrive_folder_id=gdrive_folder_id,
                 limit=50  # Get more notes for searching
             )
             
-            # Search by title
+            note = self.db.find_note(title_query)
+            if note:
+                return note
+            
+            # Fall back to substring match on titles the index could not tokenize
             query_lower = title_query.lower()
             for note in result.get('notes', []):
                 if query_lower in note.get('title', '').lower():
@@ -0,0 +1,154 @@
+"""
+Single-flight request coalescing for expensive upstream fetches.
+
+Several tabs, the background collector and the AI service can all ask for
+the same Gmail, Calendar or notes data at the same moment. Without
+coalescing each of them runs its own collection, multiplying upstream API
+calls and CPU for identical results. A SingleFlight group lets concurrent
+callers for the same key share one in-progress call: the first caller
+runs it, everyone who arrives before it finishes awaits the same result
+(or exception). Nothing is cached afterwards - the next caller after
+completion starts a fresh fetch.
+
+Keys are strings or tuples. The first element of a tuple (or the whole
+string) names the key's family, which is what the dedup counters in
+/api/system/status are grouped by; the remaining elements distinguish
+calls with different arguments.
+
+Coroutine callers use `do`; blocking code running in threads (e.g. notes
+reads handed to asyncio.to_thread) uses `do_sync`. A `do` caller on a
+different event loop than the call in flight joins it through the owning
+loop instead of starting a second fetch.
+
+Usage:
+    data = await single_flight.do('gmail', collector.collect_data)
+    notes = single_flight.do_sync(('notes', path, limit), collect_all_notes, path, limit=limit)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """A blocking call in progress; waiters block on `done`."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+def _family(key: Hashable) -> str:
+    return str(key[0] if isinstance(key, tuple) and key else key)
+
+
+async def _join(task: asyncio.Future) -> Any:
+    return await asyncio.shield(task)
+
+
+class SingleFlight:
+    """Share one in-flight call per key among concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: Hashable, field: str):
+        family = self._stats.setdefault(_family(key), {'calls': 0, 'executions': 0,
+                                                       'deduplicated': 0, 'errors': 0})
+        family[field] += 1
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await `fn(*args, **kwargs)`, or the call already running for `key`.
+
+        The shared call runs as its own task, so a caller that is cancelled
+        (e.g. by asyncio.wait_for) does not cancel it for the others.
+        """
+        with self._lock:
+            self._count(key, 'calls')
+            task = self._tasks.get(key)
+            if task is not None and task.get_loop().is_closed():
+                task = None  # its loop is gone, so it can never finish
+            if task is None:
+                self._count(key, 'executions')
+                task = asyncio.ensure_future(fn(*args, **kwargs))
+                self._tasks[key] = task
+                task.add_done_callback(lambda done: self._finish_task(key, done))
+            else:
+                self._count(key, 'deduplicated')
+        owner = task.get_loop()
+        if owner is not asyncio.get_running_loop():
+            # A task can only be awaited on its own loop; wait for it there
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_join(task), owner))
+        return await asyncio.shield(task)
+
+    def _finish_task(self, key: Hashable, task: asyncio.Future):
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+            if task.cancelled() or task.exception() is not None:
+                self._count(key, 'errors')
+
+    def do_sync(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Blocking variant of `do` for code running in worker threads."""
+        with self._lock:
+            self._count(key, 'calls')
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                self._count(key, 'executions')
+                call = self._calls[key] = _Call()
+            else:
+                self._count(key, 'deduplicated')
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._count(key, 'errors')
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Single-flight {_family(key)}: shared one call with {call.waiters} waiter(s)")
+            call.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-family call/dedup counters plus totals, for /api/system/status."""
+        with self._lock:
+            families = {name: dict(counts) for name, counts in self._stats.items()}
+            in_flight = len(self._tasks) + len(self._calls)
+        calls = sum(counts['calls'] for counts in families.values())
+        deduplicated = sum(counts['deduplicated'] for counts in families.values())
+        return {
+            'calls': calls,
+            'deduplicated': deduplicated,
+            'dedup_ratio': round(deduplicated / calls, 3) if calls else 0.0,
+            'in_flight': in_flight,
+            'keys': families,
+        }
+
+
+# Process-wide group shared by collectors, endpoints and the AI service
+single_flight = SingleFlight()
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    return single_flight.get_stats()
@@ -256,6 +256,9 @@ try {
         this.editMode = false;
         this.autoRefreshInterval = 5; // minutes
         this.autoRefreshTimer = null;
+        this.widgetEvents = null; // EventSource for /api/events widget pushes
+        this.widgetEventsConnected = false;
+        this.bootstrap = null; // In-flight /api/dashboard/bootstrap stream (first paint only)
         this.backgroundImages = []; // Available background images
         this.currentBackgroundIndex = 0;
         this.backgroundRotation = 'random'; // 'random', 'sequential', 'fixed'
@@ -303,6 +306,7 @@ try {
             this.initAudioControlPanel();
             this.loadDashboardConfig();
             this.loadAutoRefreshSettings();
+            this.subscribeToWidgetEvents();
             this.loadBackgroundSettings();
             this.loadTaskSyncSettings();
             this.loadVoiceSettings();
@@ -392,6 +396,17 @@ try {
     }
 
     async fetchJsonWithTimeout(url, options = {}, timeoutMs = 12000) {
+        if (!options.method && this.bootstrap) {
+            // First paint: answer from the bootstrap stream when it carries this URL
+            const payload = await this.takeBootstrapPayload(url, timeoutMs);
+            if (payload !== null) {
+                return new Response(JSON.stringify(payload), {
+                    status: 200,
+                    headers: { 'Content-Type': 'application/json' }
+                });
+            }
+        }
+
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
 
@@ -403,6 +418,81 @@ try {
         }
     }
 
+    startBootstrap() {
+        // One NDJSON stream from /api/dashboard/bootstrap carries every first-paint
+        // widget; loaders pick their line up via fetchJsonWithTimeout as it arrives
+        if (this.bootstrap || !window.ReadableStream || !window.TextDecoder) {
+            return;
+        }
+        let announce;
+        const bootstrap = {
+            widgets: {}, // url -> { promise, resolve }
+            ready: new Promise(resolve => { announce = resolve; })
+        };
+        this.bootstrap = bootstrap;
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const item = JSON.parse(line);
+            if (item.widgets) {
+                for (const url of Object.values(item.widgets)) {
+                    let resolve;
+                    const promise = new Promise(r => { resolve = r; });
+                    bootstrap.widgets[url] = { promise, resolve };
+                }
+                announce();
+            } else if (item.url && bootstrap.widgets[item.url]) {
+                // Error lines resolve to null so the loader falls back to its own endpoint
+                bootstrap.widgets[item.url].resolve('data' in item ? item.data : null);
+            }
+        };
+
+        (async () => {
+            try {
+                const response = await fetch('/api/dashboard/bootstrap');
+                if (!response.ok || !response.body) return;
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffered = '';
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    buffered += decoder.decode(value, { stream: true });
+                    const lines = buffered.split('\n');
+                    buffered = lines.pop();
+                    lines.forEach(handleLine);
+                }
+                handleLine(buffered);
+            } catch (error) {
+                console.warn('Dashboard bootstrap stream failed:', error);
+            } finally {
+                announce();
+                Object.values(bootstrap.widgets).forEach(widget => widget.resolve(null));
+                // Only first paint is served from the stream; later loads hit the endpoints
+                if (this.bootstrap === bootstrap) this.bootstrap = null;
+            }
+        })();
+    }
+
+    async takeBootstrapPayload(url, timeoutMs) {
+        const bootstrap = this.bootstrap;
+        let timeoutId;
+        const timeout = new Promise(resolve => { timeoutId = setTimeout(() => resolve(null), timeoutMs); });
+        try {
+            return await Promise.race([
+                bootstrap.ready.then(() => {
+                    const widget = bootstrap.widgets[url];
+                    if (!widget) return null;
+                    delete bootstrap.widgets[url];
+                    return widget.promise;
+                }),
+                timeout
+            ]);
+        } finally {
+            clearTimeout(timeoutId);
+        }
+    }
+
     getLoadErrorMessage(defaultMessage, error) {
         if (error && error.name === 'AbortError') {
             return `${defaultMessage} (request timed out)`;
@@ -1227,6 +1317,22 @@ try {
         }
     }
     
+    showEmailScanProgress(progress) {
+        // Progress pushed by /api/email/scan-for-tasks while a scan runs
+        const progressDiv = document.getElementById('scan-progress');
+        const statusDiv = document.getElementById('scan-status');
+        if (!progressDiv || !statusDiv || progressDiv.classList.contains('hidden')) {
+            return;
+        }
+        if (progress.stage === 'filtered') {
+            statusDiv.textContent = `Filtered ${progress.emails} emails: ${progress.candidates} look actionable...`;
+        } else if (progress.stage === 'reviewing') {
+            statusDiv.textContent = `AI reviewing ${progress.emails_reviewed}/${progress.candidates} candidate emails...`;
+        } else if (progress.stage === 'saved') {
+            statusDiv.textContent = `Saved ${progress.tasks_created} new tasks`;
+        }
+    }
+    
     renderEmails() {
         const grid = document.getElementById('emails-grid');
         if (!grid) {
@@ -4129,7 +4235,6 @@ Then ask me: "What would you like to do with this email?"`,
             };
             
             eventSource.onmessage = (event) => {
-                console.log('📨 Received event:', event.data);
                 try {
                     const data = JSON.parse(event.data);
                     
@@ -4148,9 +4253,9 @@ Then ask me: "What would you like to do with this email?"`,
                         }
                         this.renderAIChat();
                         
-                    } else if (data.type === 'response') {
-                        // Accumulate response chunks
-                        accumulatedResponse += data.content;
+                    } else if (data.type === 'response' || data.type === 'replace') {
+                        // Accumulate response chunks; 'replace' carries a corrected full answer
+                        accumulatedResponse = data.type === 'replace' ? data.content : accumulatedResponse + data.content;
                         
                         // Remove status message if present
                         if (!hasSeenResponse) {
@@ -6625,8 +6730,15 @@ Then ask me: "What would you like to do with this email?"`,
         // Start new timer
         const intervalMs = this.autoRefreshInterval * 60 * 1000;
         this.autoRefreshTimer = setInterval(async () => {
-            console.log('Auto-refreshing dashboard data...');
-            await this.loadAllData();
+            if (this.widgetEventsConnected) {
+                // Collector-fed widgets arrive over /api/events; only poll the rest
+                console.log('Auto-refreshing non-pushed dashboard data...');
+                await Promise.all([this.loadTodos(), this.loadDashboards(), this.loadPlaylists()]);
+                this.updateAllCounts();
+            } else {
+                console.log('Auto-refreshing dashboard data...');
+                await this.loadAllData();
+            }
             await this.generateOverviewPrompt();
             this.updateRefreshStatus();
         }, intervalMs);
@@ -6634,6 +6746,58 @@ Then ask me: "What would you like to do with this email?"`,
         console.log(`Auto-refresh enabled: every ${this.autoRefreshInterval} minutes`);
     }
     
+    subscribeToWidgetEvents() {
+        // Server pushes a version bump when a collector produces new data;
+        // EventSource reconnects on its own and resumes from Last-Event-ID
+        if (!window.EventSource || this.widgetEvents) {
+            return;
+        }
+        const source = new EventSource('/api/events');
+        source.onopen = () => {
+            this.widgetEventsConnected = true;
+        };
+        source.onerror = () => {
+            this.widgetEventsConnected = false;
+        };
+        source.addEventListener('widget', (event) => {
+            try {
+                const { widget } = JSON.parse(event.data);
+                this.reloadPushedWidget(widget);
+            } catch (error) {
+                console.warn('Bad widget event:', error);
+            }
+        });
+        source.addEventListener('task_scan', (event) => {
+            try {
+                this.showEmailScanProgress(JSON.parse(event.data));
+            } catch (error) {
+                console.warn('Bad task scan event:', error);
+            }
+        });
+        source.addEventListener('reset', () => {
+            // Missed events are gone (server restart or long disconnect): reload everything
+            this.loadAllData();
+        });
+        this.widgetEvents = source;
+    }
+    
+    reloadPushedWidget(widget) {
+        const background = { background: true };
+        const loaders = {
+            calendar: () => this.loadCalendar(0, background),
+            email: () => this.loadEmails(false, 0, background),
+            github: () => this.loadGithub(0, background),
+            news: () => this.loadNews(0, background),
+            weather: () => this.loadWeather(0, background),
+            vanity: () => this.loadVanityAlerts(),
+            music: () => this.loadMusicNews()
+        };
+        const load = loaders[widget];
+        if (load) {
+            Promise.resolve(load()).then(() => this.updateAllCounts()).catch(e => console.warn(`Error reloading ${widget}:`, e));
+        }
+    }
+    
     updateRefreshStatus() {
         const statusEl = document.getElementById('refresh-status-text');
         if (!statusEl) return;
@@ -8327,7 +8491,10 @@ Then ask me: "What would you like to do with this email?"`,
     async init() {
         try {
             console.log('Initializing dashboard data loader...');
-            
+
+            // Open the bootstrap stream first so widget payloads are on their way
+            this.startBootstrap();
+
             // Load initial user profile
             await this.loadUserProfile();
             
@@ -8870,6 +9037,40 @@ document.addEventListener('DOMContentLoaded', async () => {
     await updateGoogleAuthButton();
     await loadSuggestedTodos();
 });
+
+// Tell the server whether the tab is visible and in use; collectors run more
+// often while it is, and pause when no visible tab has reported for a while.
+// Background polling does not count as activity, only these reports do.
+const ACTIVITY_REPORT_MIN_MS = 60 * 1000;       // interaction reports at most once a minute
+const ACTIVITY_HEARTBEAT_MS = 10 * 60 * 1000;  // visible but untouched tab
+let lastActivityReport = 0;
+
+function reportDashboardVisibility() {
+    lastActivityReport = Date.now();
+    fetch('/api/client/activity', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ visible: document.visibilityState === 'visible' }),
+        keepalive: true
+    }).catch(() => {});
+}
+
+function reportDashboardInteraction() {
+    if (document.visibilityState === 'visible' && Date.now() - lastActivityReport >= ACTIVITY_REPORT_MIN_MS) {
+        reportDashboardVisibility();
+    }
+}
+
+document.addEventListener('visibilitychange', reportDashboardVisibility);
+document.addEventListener('DOMContentLoaded', reportDashboardVisibility);
+['pointerdown', 'keydown', 'wheel'].forEach(type => {
+    document.addEventListener(type, reportDashboardInteraction, { passive: true });
+});
+setInterval(() => {
+    if (document.visibilityState === 'visible') {
+        reportDashboardVisibility();
+    }
+}, ACTIVITY_HEARTBEAT_MS);
 } catch (error) {
     console.error('❌ CRITICAL: Failed to initialize DashboardDataLoader:', error);
     console.error('Stack:', error.stack);
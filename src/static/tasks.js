@@ -35,8 +35,13 @@ async function initializeTaskManagement() {
     }, 30000);
 }
 
+// Tasks are fetched in keyset-paginated pages so large backlogs render quickly
+const TASK_PAGE_SIZE = 200;
+let taskLoadGeneration = 0;
+
 // Load tasks from API
 async function loadTasks() {
+    const generation = ++taskLoadGeneration;
     try {
         showTaskLoadingState();
         
@@ -46,9 +51,10 @@ async function loadTasks() {
         if (taskData.filters.priority && taskData.filters.priority !== 'all') params.set('priority', taskData.filters.priority);
         if (taskData.filters.status && taskData.filters.status !== 'all') params.set('status', taskData.filters.status);
         if (taskData.filters.category && taskData.filters.category !== 'all') params.set('category', taskData.filters.category);
+        params.set('limit', TASK_PAGE_SIZE);
         
-        const response = await fetch(`/api/tasks?${params.toString()}`);
-        const data = await response.json();
+        let response = await fetch(`/api/tasks?${params.toString()}`);
+        let data = await response.json();
         
         if (data.success) {
             taskData.tasks = data.tasks || [];
@@ -57,6 +63,16 @@ async function loadTasks() {
             renderTasks();
             renderTaskStatistics();
             
+            // Fetch remaining pages, unless a newer load has started
+            while (data.pagination && data.pagination.has_more && generation === taskLoadGeneration) {
+                params.set('cursor', data.pagination.next_cursor);
+                response = await fetch(`/api/tasks?${params.toString()}`);
+                data = await response.json();
+                if (!data.success || generation !== taskLoadGeneration) break;
+                taskData.tasks = taskData.tasks.concat(data.tasks || []);
+                renderTasks();
+            }
+            
             console.log('Tasks loaded:', taskData.tasks.length);
         } else {
             showTaskError(`Failed to load tasks: ${data.error}`);
@@ -0,0 +1,159 @@
+"""
+Stale-while-revalidate cache for collector results.
+
+Every key has its own TTL, normally the interval of the collector that
+fills it. While an entry is within its TTL it is served as fresh. Past
+the TTL (but within `max_stale`) it is still served immediately and a
+background refresh is started, so a widget never waits on a collector
+just because the data aged out between runs. Only a missing or
+hopelessly old entry makes the caller wait.
+
+Refreshes are coalesced: however many requests hit a stale key at once,
+there is at most one loader call in flight per key, and waiting callers
+share its result.
+
+Usage:
+    cache = SWRCache()
+    cache.configure('weather', ttl=900, loader=load_weather)
+    result = await cache.get('weather')
+    if result:
+        return {**result.value, 'freshness': result.freshness}
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 600          # seconds
+DEFAULT_MAX_STALE = 86400  # serve stale data for up to a day
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float  # time.time()
+
+
+@dataclass
+class CacheResult:
+    """A cached value plus freshness metadata for the UI."""
+
+    value: Any
+    freshness: Dict[str, Any]
+
+
+class SWRCache:
+    """Per-key TTL cache that serves stale values while refreshing them."""
+
+    def __init__(self, default_ttl: float = DEFAULT_TTL, max_stale: float = DEFAULT_MAX_STALE):
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self._entries: Dict[str, CacheEntry] = {}
+        self._ttls: Dict[str, float] = {}
+        self._loaders: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0,
+                      'refreshes': 0, 'coalesced': 0, 'refresh_errors': 0}
+
+    def configure(self, key: str, ttl: Optional[float] = None,
+                  loader: Optional[Callable[[], Awaitable[Any]]] = None):
+        """Set a key's TTL and the coroutine function that reloads it."""
+        if ttl is not None:
+            self._ttls[key] = ttl
+        if loader is not None:
+            self._loaders[key] = loader
+
+    def ttl(self, key: str) -> float:
+        return self._ttls.get(key, self.default_ttl)
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Store a value; `stored_at` keeps the original time (e.g. restored data)."""
+        self._entries[key] = CacheEntry(value, time.time() if stored_at is None else stored_at)
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def keys(self):
+        return list(self._entries)
+
+    def freshness(self, key: str) -> Dict[str, Any]:
+        """Age and state of a key, as returned to the UI."""
+        entry = self._entries.get(key)
+        ttl = self.ttl(key)
+        refreshing = key in self._refreshing and not self._refreshing[key].done()
+        if entry is None:
+            return {'cached': False, 'fresh': False, 'refreshing': refreshing, 'ttl_seconds': ttl}
+        age = max(0.0, time.time() - entry.stored_at)
+        return {
+            'cached': True,
+            'fresh': age <= ttl,
+            'refreshing': refreshing,
+            'age_seconds': round(age, 1),
+            'ttl_seconds': ttl,
+            'updated_at': datetime.fromtimestamp(entry.stored_at).isoformat(),
+        }
+
+    async def get(self, key: str, wait_if_missing: bool = True) -> Optional[CacheResult]:
+        """Return the cached value, refreshing it in the background when stale."""
+        entry = self._entries.get(key)
+        age = time.time() - entry.stored_at if entry else None
+
+        if entry is not None and age <= self.ttl(key):
+            self.stats['fresh_hits'] += 1
+            return CacheResult(entry.value, self.freshness(key))
+
+        if entry is not None and age <= self.max_stale:
+            self.stats['stale_hits'] += 1
+            self.refresh(key)
+            return CacheResult(entry.value, self.freshness(key))
+
+        self.stats['misses'] += 1
+        task = self.refresh(key)
+        if task is None or not wait_if_missing:
+            return None
+        await asyncio.shield(task)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry.stored_at > self.max_stale:
+            return None
+        return CacheResult(entry.value, self.freshness(key))
+
+    def refresh(self, key: str) -> Optional[asyncio.Task]:
+        """Start a reload of `key`, or join the one already in flight."""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            self.stats['coalesced'] += 1
+            return task
+        loader = self._loaders.get(key)
+        if loader is None:
+            return None
+        self.stats['refreshes'] += 1
+        task = asyncio.create_task(self._reload(key, loader), name=f"swr-refresh-{key}")
+        self._refreshing[key] = task
+        return task
+
+    async def _reload(self, key: str, loader: Callable[[], Awaitable[Any]]):
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats['refresh_errors'] += 1
+            logger.error(f"Background refresh of {key} failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'keys': {key: self.freshness(key) for key in self._entries},
+        }
@@ -13,6 +13,7 @@ from pydantic import BaseModel, Field
 from ..models import VerificationContext
 from ..report_generator import ReportGenerator
 from ..plugin_registry import get_registry
+from db_async import run_in_db_executor
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,76 @@ class PluginInfo(BaseModel):
     enabled: bool
 
 
+def _load_email_for_thread(db, thread_id: str) -> Optional[Dict[str, Any]]:
+    """Load an email by thread ID as a report input dict (blocking)."""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(emails)")
+        email_columns = {row[1] for row in cursor.fetchall()}
+
+        thread_col = 'thread_id' if 'thread_id' in email_columns else 'id'
+
+        select_fields = {
+            'thread_id': 'thread_id' if 'thread_id' in email_columns else 'id',
+            'message_id': 'message_id' if 'message_id' in email_columns else 'id',
+            'sender': 'sender' if 'sender' in email_columns else "''",
+            'sender_name': 'sender_name' if 'sender_name' in email_columns else "''",
+            'subject': 'subject' if 'subject' in email_columns else "''",
+            'body_text': (
+                'body_text' if 'body_text' in email_columns
+                else ('body' if 'body' in email_columns else "''")
+            ),
+            'body_html': 'body_html' if 'body_html' in email_columns else "''",
+            'snippet': (
+                'snippet' if 'snippet' in email_columns
+                else ("substr(body, 1, 240)" if 'body' in email_columns else "''")
+            ),
+            'headers': 'headers' if 'headers' in email_columns else "''",
+            'received_date': (
+                'received_date' if 'received_date' in email_columns
+                else ('created_at' if 'created_at' in email_columns else "''")
+            ),
+        }
+
+        select_sql = ', '.join([f"{expr} AS {alias}" for alias, expr in select_fields.items()])
+        query = f"""
+            SELECT {select_sql}
+            FROM emails
+            WHERE {thread_col} = ?
+            LIMIT 1
+        """
+        cursor.execute(query, (thread_id,))
+        
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+    raw_headers = row['headers'] if 'headers' in row.keys() else ''
+    parsed_headers = {}
+    if raw_headers:
+        try:
+            parsed_headers = json.loads(raw_headers)
+        except Exception:
+            try:
+                parsed_headers = eval(raw_headers)
+            except Exception:
+                parsed_headers = {}
+
+    return {
+        'thread_id': row['thread_id'] or thread_id,
+        'message_id': row['message_id'] or thread_id,
+        'sender': row['sender'] or '',
+        'sender_name': row['sender_name'] or '',
+        'subject': row['subject'] or '',
+        'body_text': row['body_text'] or '',
+        'body_html': row['body_html'] or '',
+        'snippet': row['snippet'] or '',
+        'headers': parsed_headers,
+        'received_date': row['received_date'] or ''
+    }
+
+
 @router.get("/reports/{thread_id}", response_model=TrustReportResponse)
 async def get_report(thread_id: str, db=Depends(get_db)):
     """
@@ -86,86 +157,22 @@ async def get_report(thread_id: str, db=Depends(get_db)):
     
     # Try to get existing report
     try:
-        report = generator.get_report(thread_id)
+        report = await run_in_db_executor(generator.get_report, thread_id)
     except Exception as e:
         logger.warning(f"Trust report lookup failed for thread {thread_id}: {e}")
         report = None
     
     if not report:
         # Try to get email from database and generate report
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("PRAGMA table_info(emails)")
-            email_columns = {row[1] for row in cursor.fetchall()}
-
-            thread_col = 'thread_id' if 'thread_id' in email_columns else 'id'
-
-            select_fields = {
-                'thread_id': 'thread_id' if 'thread_id' in email_columns else 'id',
-                'message_id': 'message_id' if 'message_id' in email_columns else 'id',
-                'sender': 'sender' if 'sender' in email_columns else "''",
-                'sender_name': 'sender_name' if 'sender_name' in email_columns else "''",
-                'subject': 'subject' if 'subject' in email_columns else "''",
-                'body_text': (
-                    'body_text' if 'body_text' in email_columns
-                    else ('body' if 'body' in email_columns else "''")
-                ),
-                'body_html': 'body_html' if 'body_html' in email_columns else "''",
-                'snippet': (
-                    'snippet' if 'snippet' in email_columns
-                    else ("substr(body, 1, 240)" if 'body' in email_columns else "''")
-                ),
-                'headers': 'headers' if 'headers' in email_columns else "''",
-                'received_date': (
-                    'received_date' if 'received_date' in email_columns
-                    else ('created_at' if 'created_at' in email_columns else "''")
-                ),
-            }
-
-            select_sql = ', '.join([f"{expr} AS {alias}" for alias, expr in select_fields.items()])
-            query = f"""
-                SELECT {select_sql}
-                FROM emails
-                WHERE {thread_col} = ?
-                LIMIT 1
-            """
-            cursor.execute(query, (thread_id,))
-            
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Email not found")
-            
-            # Generate report
-            raw_headers = row['headers'] if 'headers' in row.keys() else ''
-            parsed_headers = {}
-            if raw_headers:
-                try:
-                    parsed_headers = json.loads(raw_headers)
-                except Exception:
-                    try:
-                        parsed_headers = eval(raw_headers)
-                    except Exception:
-                        parsed_headers = {}
-
-            email_dict = {
-                'thread_id': row['thread_id'] or thread_id,
-                'message_id': row['message_id'] or thread_id,
-                'sender': row['sender'] or '',
-                'sender_name': row['sender_name'] or '',
-                'subject': row['subject'] or '',
-                'body_text': row['body_text'] or '',
-                'body_html': row['body_html'] or '',
-                'snippet': row['snippet'] or '',
-                'headers': parsed_headers,
-                'received_date': row['received_date'] or ''
-            }
-            
-            try:
-                report = await generator.generate_report_from_email(email_dict)
-            except Exception as e:
-                logger.warning(f"Trust report generation failed for thread {thread_id}: {e}")
-                raise HTTPException(status_code=404, detail="Trust report unavailable for this email")
+        email_dict = await run_in_db_executor(_load_email_for_thread, db, thread_id)
+        if not email_dict:
+            raise HTTPException(status_code=404, detail="Email not found")
+        
+        try:
+            report = await generator.generate_report_from_email(email_dict)
+        except Exception as e:
+            logger.warning(f"Trust report generation failed for thread {thread_id}: {e}")
+            raise HTTPException(status_code=404, detail="Trust report unavailable for this email")
     
     return TrustReportResponse(
         report_id=report.report_id,
@@ -225,7 +232,7 @@ async def list_reports(
     List trust reports with optional filtering.
     """
     generator = ReportGenerator(db)
-    reports = generator.list_reports(limit=limit, risk_level=risk_level)
+    reports = await run_in_db_executor(generator.list_reports, limit=limit, risk_level=risk_level)
     return reports
 
 
@@ -235,7 +242,7 @@ async def get_stats(db=Depends(get_db)):
     Get trust layer statistics.
     """
     generator = ReportGenerator(db)
-    stats = generator.get_stats()
+    stats = await run_in_db_executor(generator.get_stats)
     return TrustStatsResponse(**stats)
 
 
@@ -10,6 +10,7 @@ import json
 from .models import VerificationContext, TrustReport, TrustClaim, Finding
 from .plugin_registry import get_registry
 from .scoring_engine import ScoringEngine
+from db_async import run_in_db_executor
 
 logger = logging.getLogger(__name__)
 
@@ -68,8 +69,8 @@ class ReportGenerator:
             signals={claim.claim_type: claim.to_dict() for claim in all_claims}
         )
         
-        # Save to database
-        self._save_report(report, all_claims, context)
+        # Save to database (off the event loop)
+        await run_in_db_executor(self._save_report, report, all_claims, context)
         
         logger.info(f"Report generated: score={report.score}, risk={report.risk_level.value}")
         return report
@@ -0,0 +1,72 @@
+"""
+Concurrent widget loading for the /api/dashboard/bootstrap endpoint.
+
+The dashboard's first paint used to fire one request per widget. The
+bootstrap endpoint instead starts every widget source at once and streams
+each payload back as a line of NDJSON the moment it is ready, so the
+fastest widgets render first and the page needs a single round trip.
+A slow or failing source only produces an error line for its own widget;
+the client loads that widget the usual way.
+
+Usage:
+    sources = {'calendar': ('/api/calendar', get_calendar)}
+    async for item in gather_widgets(sources, timeout=15):
+        yield ndjson_line(item)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WIDGET_TIMEOUT = 15  # seconds per widget
+
+WidgetSources = Dict[str, Tuple[str, Callable[[], Awaitable[Any]]]]
+
+
+def ndjson_line(item: Dict[str, Any]) -> str:
+    return json.dumps(item, default=str, separators=(',', ':')) + "\n"
+
+
+async def gather_widgets(sources: WidgetSources,
+                         timeout: float = DEFAULT_WIDGET_TIMEOUT) -> AsyncIterator[Dict[str, Any]]:
+    """Run every source concurrently and yield results in completion order.
+
+    The first item is {"widgets": {name: url}} so the client knows which
+    requests the stream will answer. Then each widget yields
+    {"widget", "url", "data", "elapsed_ms"} or, on failure,
+    {"widget", "url", "error", "elapsed_ms"}. A final {"done": true} item
+    summarises the run. Sources still running when the consumer stops are
+    cancelled.
+    """
+    started = time.monotonic()
+
+    async def load(name: str, url: str, loader: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        item = {'widget': name, 'url': url}
+        try:
+            item['data'] = await asyncio.wait_for(loader(), timeout)
+        except asyncio.TimeoutError:
+            item['error'] = f"timed out after {timeout}s"
+        except Exception as e:
+            logger.error(f"Bootstrap load of {name} failed: {e}")
+            item['error'] = str(e)
+        item['elapsed_ms'] = round((time.monotonic() - started) * 1000)
+        return item
+
+    tasks = [asyncio.create_task(load(name, url, loader), name=f"bootstrap-{name}")
+             for name, (url, loader) in sources.items()]
+    failed = 0
+    try:
+        yield {'widgets': {name: url for name, (url, _) in sources.items()}}
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            failed += 'error' in item
+            yield item
+        yield {'done': True, 'count': len(tasks), 'failed': failed,
+               'elapsed_ms': round((time.monotonic() - started) * 1000)}
+    finally:
+        for task in tasks:
+            task.cancel()
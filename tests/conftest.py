@@ -0,0 +1,21 @@
+"""Shared pytest fixtures."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import database
+
+
+@pytest.fixture(autouse=True)
+def isolated_default_database(tmp_path, monkeypatch):
+    """Point the global database and DatabaseManager() without a path at
+    tmp_path, so no test creates or migrates the project's dashboard.db."""
+    path = str(tmp_path / 'default.db')
+    monkeypatch.setattr(database, 'DATABASE_PATH', path)
+    monkeypatch.setattr(database.DatabaseManager.__init__, '__defaults__', (path,))
+    monkeypatch.setattr(database, '_db', None)
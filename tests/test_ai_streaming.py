@@ -0,0 +1,109 @@
+"""Tests for token-level AI chat streaming through AIService.chat_stream."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from services.ai_service import AIService
+
+
+class FakeProvider:
+    """Provider that streams fixed pieces and records non-streaming calls."""
+
+    provider_type = 'fake'
+
+    def __init__(self, pieces, fail_after=None, reply='full answer'):
+        self.name = 'fake'
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.reply = reply
+        self.chat_calls = 0
+
+    async def chat_stream(self, messages):
+        for i, piece in enumerate(self.pieces):
+            if i == self.fail_after:
+                raise ConnectionResetError('connection lost')
+            yield piece
+
+    async def chat(self, messages, stream=False):
+        self.chat_calls += 1
+        return self.reply
+
+
+@pytest.fixture
+def service(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+    service = AIService(db)
+    service.long_term_memory_path = tmp_path / 'LONG_TERM_MEMORY.md'
+    service.short_term_memory_path = tmp_path / 'SHORT_TERM_MEMORY.md'
+    service._ensure_memory_files()
+    db.save_ai_conversation('conv_test', 1, 'Test')
+    return service
+
+
+def _collect(service, message='What is on my calendar?'):
+    """Events from chat_stream, plus the saved history seen at each token."""
+    async def scenario():
+        events, history_at_token = [], []
+        async for event in service.chat_stream(message, conversation_id='conv_test', include_context=False):
+            events.append(event)
+            if event['type'] == 'token':
+                history_at_token.append(len(service.db.get_ai_conversation_history('conv_test')))
+        return events, history_at_token
+
+    return asyncio.run(scenario())
+
+
+class TestAIStreaming:
+    """Test token forwarding, persistence after completion and fallbacks."""
+
+    def test_tokens_are_forwarded_as_generated(self, service):
+        """Each provider piece becomes a token event; history is saved after the last."""
+        service._provider = FakeProvider(['You have ', 'two ', 'meetings.'])
+        events, history_at_token = _collect(service)
+
+        assert [e['content'] for e in events if e['type'] == 'token'] == ['You have ', 'two ', 'meetings.']
+        assert events[-1]['type'] == 'done'
+        assert events[-1]['response'] == 'You have two meetings.'
+        assert events[-1]['provider'] == 'fake'
+        assert history_at_token == [0, 0, 0]
+        history = service.db.get_ai_conversation_history('conv_test')
+        assert sorted(m['role'] for m in history) == ['assistant', 'user']
+        assert service._provider.chat_calls == 0
+
+    def test_error_before_first_token_uses_non_streaming_path(self, service):
+        """An "Error: ..." first piece falls back to chat() and arrives as one token."""
+        service._provider = FakeProvider(['Error: Ollama API error: 404'], reply='Two meetings today.')
+        events, _ = _collect(service)
+
+        assert [e['type'] for e in events] == ['token', 'done']
+        assert events[0]['content'] == 'Two meetings today.'
+        assert service._provider.chat_calls == 1
+        assert len(service.db.get_ai_conversation_history('conv_test')) == 2
+
+    def test_interrupted_stream_reports_error_and_saves_nothing(self, service):
+        """A failure after tokens were sent ends the stream with an error event."""
+        service._provider = FakeProvider(['You have ', 'two ', 'meetings.'], fail_after=2)
+        events, _ = _collect(service)
+
+        assert [e['type'] for e in events] == ['token', 'token', 'error']
+        assert 'connection lost' in events[-1]['error']
+        assert service.db.get_ai_conversation_history('conv_test') == []
+
+    def test_streamed_refusal_is_replaced_and_not_cached(self, service):
+        """A refusal is answered again through chat(); only the corrected text is kept."""
+        service._provider = FakeProvider(["I don't have access ", 'to your calendar.'], reply='Two meetings today.')
+        events, _ = _collect(service)
+
+        assert [e['type'] for e in events] == ['token', 'token', 'replace', 'done']
+        assert events[2]['content'] == events[-1]['response'] == 'Two meetings today.'
+        history = service.db.get_ai_conversation_history('conv_test')
+        assert "I don't have access" not in ' '.join(m['content'] for m in history)
+        with service.db.get_connection() as conn:
+            cached = [row[0] for row in conn.execute("SELECT response FROM ai_response_cache")]
+        assert cached == ['Two meetings today.']
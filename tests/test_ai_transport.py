@@ -0,0 +1,128 @@
+"""Tests for AI provider transport: cached health checks and async host resolution."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import http_pool
+from database import DatabaseManager
+from processors.ai_providers import AIProvider, AIProviderManager, OllamaProvider, ai_manager
+from services.ai_service import AIService
+
+
+class CountingProvider(AIProvider):
+    """Provider whose health probe is slow and counted."""
+
+    def __init__(self, name, healthy=True):
+        super().__init__(name, {})
+        self.healthy = healthy
+        self.probes = 0
+
+    async def chat(self, messages, stream=False):
+        return ''
+
+    async def train(self, training_data):
+        return {}
+
+    async def health_check(self):
+        self.probes += 1
+        await asyncio.sleep(0.01)
+        return self.healthy
+
+
+class TestAITransport:
+    """Test health caching, provider URL fallback and transport settings."""
+
+    def test_health_checks_are_cached_and_coalesced(self):
+        """Concurrent checks share one probe; later ones reuse it until max_age."""
+        provider = CountingProvider('local')
+
+        async def scenario():
+            first = await asyncio.gather(*(provider.check_health() for _ in range(3)))
+            cached = await provider.check_health()
+            fresh = await provider.check_health(max_age=0)
+            return first, cached, fresh
+
+        first, cached, fresh = asyncio.run(scenario())
+        assert first == [True, True, True] and cached and fresh
+        assert provider.probes == 2
+
+    def test_health_check_all_reuses_results(self):
+        """The manager checks every provider concurrently through the cache."""
+        manager = AIProviderManager()
+        up, down = CountingProvider('up'), CountingProvider('down', healthy=False)
+        manager.register_provider(up)
+        manager.register_provider(down)
+
+        async def scenario():
+            await manager.health_check_all()
+            return await manager.health_check_all()
+
+        assert asyncio.run(scenario()) == {'up': True, 'down': False}
+        assert up.probes == down.probes == 1
+
+    def test_ollama_falls_back_to_first_reachable_url(self):
+        """Candidates are probed once, on first use, and the first live one sticks."""
+        provider = OllamaProvider('ollama', {
+            'base_url': 'http://gpu-box:11434',
+            'fallback_urls': ['http://localhost:11434', 'http://127.0.0.1:11434'],
+        })
+        probed = []
+
+        async def reachable(base_url):
+            probed.append(base_url)
+            return base_url != 'http://gpu-box:11434'
+
+        provider._tags_reachable = reachable
+
+        async def scenario():
+            await provider._resolve_base_url()
+            await provider._resolve_base_url()
+
+        asyncio.run(scenario())
+        assert provider.base_url == 'http://localhost:11434'
+        assert probed == ['http://gpu-box:11434', 'http://localhost:11434', 'http://127.0.0.1:11434']
+
+    def test_provider_is_built_from_settings_without_probing(self, tmp_path, monkeypatch):
+        """Initialization only records candidates and transport settings."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        db.save_setting('ai_provider', 'ollama')
+        db.save_setting('ollama_host', 'gpu-box')
+        db.save_setting('ai_request_timeout', 120)
+        db.save_setting('ai_max_connections', 4)
+        monkeypatch.setattr(ai_manager, 'providers', {})
+        monkeypatch.setattr(ai_manager, 'default_provider', None)
+
+        provider = AIService(db).get_provider()
+        assert provider.base_url == 'http://gpu-box:11434'
+        assert provider.fallback_urls == ['http://localhost:11434', 'http://127.0.0.1:11434']
+        assert provider.request_timeout == 120.0
+        assert provider.max_connections == 4
+        assert provider.connect_timeout == 15.0
+
+    def test_provider_httpx_client_is_pooled_only_on_the_app_loop(self, monkeypatch):
+        """Other loops get a fresh client instead of one bound to the app loop."""
+        monkeypatch.setattr(http_pool, 'httpx', SimpleNamespace(Limits=lambda **kwargs: kwargs), raising=False)
+        monkeypatch.setattr(http_pool, '_new_httpx_client',
+                            lambda shared, **kwargs: SimpleNamespace(is_closed=False, shared=shared))
+        monkeypatch.setattr(http_pool, '_provider_httpx_clients', {})
+
+        async def on_app_loop():
+            await http_pool.open_http_clients()
+            return (http_pool.provider_httpx_client('https://api.openai.com/v1'),
+                    http_pool.provider_httpx_client('https://api.openai.com/v1/models'))
+
+        async def on_other_loop():
+            return http_pool.provider_httpx_client('https://api.openai.com/v1')
+
+        try:
+            first, again = asyncio.run(on_app_loop())
+            other = asyncio.run(on_other_loop())
+        finally:
+            monkeypatch.setattr(http_pool, '_loop', None)
+        assert first is again and first.shared and http_pool.is_pooled_client(first)
+        assert other is not first and not other.shared and not http_pool.is_pooled_client(other)
@@ -0,0 +1,107 @@
+"""Tests for batched DatabaseManager write APIs."""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from processors.task_generator import TaskGenerator
+
+
+class TestBulkWrites:
+    """Test executemany upserts and their conflict handling."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_save_news_articles_preserves_user_state(self, db):
+        """Re-saving articles updates content but keeps read/liked flags."""
+        articles = [
+            {'id': f'a{i}', 'title': f'Title {i}', 'url': f'https://x/{i}', 'topics': ['ai']}
+            for i in range(10)
+        ]
+        assert db.save_news_articles(articles) == 10
+        db.mark_article_read('a1')
+        with db.get_connection() as conn:
+            conn.execute("UPDATE news_articles SET is_liked = 1 WHERE id = 'a2'")
+            conn.commit()
+
+        articles[1]['title'] = 'Updated'
+        assert db.save_news_articles(articles) == 10
+
+        with db.get_connection() as conn:
+            rows = {row['id']: row for row in conn.execute("SELECT * FROM news_articles")}
+        assert len(rows) == 10
+        assert rows['a1']['title'] == 'Updated'
+        assert rows['a1']['is_read'] == 1
+        assert rows['a2']['is_liked'] == 1
+
+    def test_save_emails_upserts(self, db):
+        """Emails are inserted and updated in one call."""
+        emails = [{'id': 'e1', 'subject': 'Hi', 'sender': 'a@x.com', 'has_todos': True}]
+        assert db.save_emails(emails) == 1
+        emails[0]['subject'] = 'Hi again'
+        assert db.save_emails(emails) == 1
+
+        rows = db.get_emails_by_priority()
+        assert len(rows) == 1
+        assert rows[0]['subject'] == 'Hi again'
+        assert rows[0]['has_todos'] is True
+
+    def test_upsert_todos_skips_deleted(self, db):
+        """Previously deleted tasks are not re-imported."""
+        db.record_task_deletion('t2', 'email')
+        todos = [{'id': f't{i}', 'title': f'Task {i}', 'source': 'email'} for i in range(3)]
+
+        assert db.upsert_todos(todos) == 2
+        assert {todo['id'] for todo in db.get_todos()} == {'t0', 't1'}
+
+    def test_mark_sources_scanned_keeps_dismissed(self, db):
+        """Batch scans keep the dismissed flag like mark_source_scanned."""
+        db.mark_source_scanned('email', 'm1', dismissed=True)
+        written = db.mark_sources_scanned([
+            {'source_type': 'email', 'source_id': 'm1', 'tasks_found': 2},
+            {'source_type': 'email', 'source_id': 'm2'},
+        ])
+
+        assert written == 2
+        assert db.is_source_scanned('email', 'm2')
+        with db.get_connection() as conn:
+            row = conn.execute(
+                "SELECT tasks_found, dismissed FROM scanned_sources WHERE source_id = 'm1'"
+            ).fetchone()
+        assert tuple(row) == (2, 1)
+
+    def test_save_vanity_alerts_keeps_dismissals(self, db):
+        """Re-collected alerts do not undo a dismissal."""
+        alert = {
+            'id': 'v1', 'title': 'Mention', 'url': 'https://x', 'source': 'web',
+            'search_term': 'me', 'timestamp': '2026-10-16T00:00:00', 'confidence_score': 0.9
+        }
+        assert db.save_vanity_alerts([alert]) == 1
+        with db.get_connection() as conn:
+            conn.execute("UPDATE vanity_alerts SET is_dismissed = 1 WHERE id = 'v1'")
+            conn.commit()
+
+        assert db.save_vanity_alerts([alert]) == 1
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT is_dismissed FROM vanity_alerts").fetchone()[0] == 1
+
+    def test_task_generator_creates_in_one_batch(self, db):
+        """create_tasks_if_not_exist skips duplicates and writes the rest."""
+        db.save_todo({'id': 'old', 'title': 'Existing', 'source': 'calendar'})
+        generator = TaskGenerator(db)
+        result = generator.create_tasks_if_not_exist([
+            {'id': 'n1', 'title': 'Existing', 'source': 'calendar'},
+            {'id': 'n2', 'title': 'New one', 'source': 'calendar'},
+            {'id': 'n3', 'title': 'new one ', 'source': 'calendar'},
+        ])
+
+        assert result['created'] == 1
+        assert result['skipped'] == 2
+        assert {todo['id'] for todo in db.get_todos()} == {'old', 'n2'}
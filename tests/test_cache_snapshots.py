@@ -0,0 +1,71 @@
+"""Tests for persisted collector cache snapshots."""
+
+import asyncio
+import pytest
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from swr_cache import SWRCache
+
+
+class TestCacheSnapshots:
+    """Test snapshot round-trips and warm-starting the SWR cache."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_round_trip_keeps_timestamp(self, db):
+        """Values come back intact with their original stored_at."""
+        stored_at = time.time() - 42
+        value = {'events': [{'title': 'Standup', 'start': datetime(2026, 10, 16, 9, 0)}]}
+        assert db.save_cache_snapshot('calendar', value, stored_at)
+        assert db.save_cache_snapshot('calendar', {'events': []}, stored_at + 1)
+
+        snapshots = db.load_cache_snapshots()
+        assert snapshots == {'calendar': {'value': {'events': []}, 'stored_at': stored_at + 1}}
+
+        db.save_cache_snapshot('weather', {'temp': 12}, stored_at)
+        weather = DatabaseManager(db.db_path).load_cache_snapshots()['weather']
+        assert weather['value'] == {'temp': 12}
+
+    def test_old_and_corrupt_snapshots_are_skipped(self, db):
+        """max_age_seconds filters old rows; unreadable payloads are ignored."""
+        db.save_cache_snapshot('news', ['old'], time.time() - 7200)
+        db.save_cache_snapshot('jokes', {'joke': 'ok'}, time.time())
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO cache_snapshots (cache_key, payload, stored_at) VALUES ('bad', x'00', ?)",
+                         (time.time(),))
+            conn.commit()
+
+        assert set(db.load_cache_snapshots()) == {'news', 'jokes'}
+        assert set(db.load_cache_snapshots(max_age_seconds=3600)) == {'jokes'}
+
+    def test_restored_snapshot_is_served_while_refreshing(self, db):
+        """A restored stale entry is returned at once and refreshed in the background."""
+        db.save_cache_snapshot('news', {'articles': ['cached']}, time.time() - 1800)
+
+        async def scenario():
+            async def loader():
+                return {'articles': ['live']}
+
+            cache = SWRCache()
+            cache.configure('news', ttl=900, loader=loader)
+            for key, snapshot in db.load_cache_snapshots().items():
+                cache.set(key, snapshot['value'], stored_at=snapshot['stored_at'])
+            first = await cache.get('news')
+            await asyncio.sleep(0)
+            return first, await cache.get('news')
+
+        first, second = asyncio.run(scenario())
+        assert first.value == {'articles': ['cached']}
+        assert first.freshness['age_seconds'] >= 1800
+        assert first.freshness['refreshing'] is True
+        assert second.value == {'articles': ['live']}
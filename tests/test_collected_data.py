@@ -0,0 +1,104 @@
+"""Tests for the per-item collected data store."""
+
+import json
+import sqlite3
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+
+
+class TestCollectedData:
+    """Test per-item storage, range queries and streaming."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_one_row_per_item_with_extracted_columns(self, db):
+        """Items get their own row with key and timestamp pulled out."""
+        run = datetime(2026, 10, 16, 9, 0)
+        items = [
+            {'id': 'ev1', 'start_time': '2026-10-20T10:00:00', 'title': 'Standup'},
+            {'title': 'No key or time'},
+        ]
+        assert db.save_collected_data('calendar', 'events', items, run) == 2
+
+        with db.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT item_key, item_timestamp, data_type FROM collected_items ORDER BY item_index"
+            ).fetchall()
+        assert rows[0]['item_key'] == 'ev1'
+        assert rows[0]['item_timestamp'] == '2026-10-20 10:00:00'
+        assert rows[1]['item_timestamp'] == '2026-10-16 09:00:00'
+        assert len(rows[1]['item_key']) == 40
+        assert {row['data_type'] for row in rows} == {'events'}
+
+    def test_same_day_run_replaces_previous(self, db):
+        """A second run on the same day replaces the first; other days stay."""
+        day = datetime(2026, 10, 16, 8, 0)
+        db.save_collected_data('news', 'articles', [{'id': 'old'}], day - timedelta(days=1))
+        db.save_collected_data('news', 'articles', [{'id': 'a'}, {'id': 'b'}], day)
+        db.save_collected_data('news', 'articles', [{'id': 'c'}], day + timedelta(hours=6))
+
+        items = db.get_collected_data('news', 'articles', day - timedelta(days=2), day + timedelta(days=1))
+        assert [item['id'] for item in items] == ['c', 'old']
+        assert db.get_latest_collection_date('news') == day + timedelta(hours=6)
+
+    def test_range_queries_by_item_time_and_key(self, db):
+        """Item-time ranges and key filters return only the requested items."""
+        items = [{'id': f'i{n}', 'timestamp': f'2026-10-{n + 1:02d}T12:00:00Z'} for n in range(10)]
+        db.save_collected_data('github', 'activity', items, datetime(2026, 10, 16))
+
+        window = list(db.iter_collected_data(
+            'github', 'activity', datetime(2026, 10, 3), datetime(2026, 10, 5, 23, 59), by='item'
+        ))
+        assert [item['id'] for item in window] == ['i4', 'i3', 'i2']
+
+        picked = list(db.iter_collected_data('github', 'activity', keys=['i7', 'i1', 'missing']))
+        assert sorted(item['id'] for item in picked) == ['i1', 'i7']
+        assert list(db.iter_collected_data('github', 'activity', keys=[])) == []
+        assert len(list(db.iter_collected_data('github', 'activity', limit=3))) == 3
+
+    def test_iter_streams_in_batches(self, db):
+        """The generator yields lazily and keeps collection order."""
+        items = [{'id': str(n)} for n in range(25)]
+        db.save_collected_data('music', 'tracks', items, datetime(2026, 10, 16))
+
+        stream = db.iter_collected_data('music', 'tracks', batch_size=4)
+        assert next(stream) == {'id': '0'}
+        assert db.get_pool_stats()['in_use'] == 0  # Released between pages
+        assert not db._pool.holds_connection()
+        assert [item['id'] for item in stream] == [str(n) for n in range(1, 25)]
+        assert [item['id'] for item in db.iter_collected_data('music', 'tracks', limit=10, batch_size=4)] == \
+            [str(n) for n in range(10)]
+        assert len(list(db.iter_collected_data('music', 'tracks', by='item', batch_size=3))) == 25
+
+    def test_legacy_blobs_are_migrated(self, tmp_path):
+        """Existing collected_data JSON blobs become item rows on startup."""
+        path = str(tmp_path / 'legacy.db')
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE collected_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, service_name TEXT NOT NULL,
+                data_type TEXT NOT NULL, data_content TEXT NOT NULL,
+                collection_date TIMESTAMP NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO collected_data (service_name, data_type, data_content, collection_date) VALUES (?, ?, ?, ?)",
+            ('weather', 'forecast', json.dumps([{'id': 'd1'}, {'id': 'd2'}]), '2026-10-15 07:00:00')
+        )
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(path)
+        assert [item['id'] for item in db.iter_collected_data('weather', 'forecast')] == ['d1', 'd2']
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM collected_data").fetchone()[0] == 0
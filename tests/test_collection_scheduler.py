@@ -0,0 +1,251 @@
+"""Tests for the asyncio collection scheduler."""
+
+import asyncio
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from collection_scheduler import CollectionScheduler
+
+
+class TestCollectionScheduler:
+    """Test intervals, concurrency limits, failures and cancellation."""
+
+    def test_runs_jobs_and_stores_results(self):
+        """Jobs repeat on their interval and results go to on_result."""
+        results = []
+
+        async def scenario():
+            counter = {'n': 0}
+
+            async def collect():
+                counter['n'] += 1
+                return counter['n']
+
+            scheduler = CollectionScheduler(on_result=lambda name, data: results.append((name, data)))
+            scheduler.add_job('news', collect, interval=0.02, jitter=0)
+            await scheduler.start()
+            await asyncio.sleep(0.09)
+            await scheduler.stop()
+            return scheduler.get_status()
+
+        status = asyncio.run(scenario())
+        assert results[:3] == [('news', 1), ('news', 2), ('news', 3)]
+        assert status['jobs']['news']['runs'] == len(results)
+        assert status['running'] is False
+
+    def test_run_now_wakes_sleeping_job(self):
+        """run_now triggers a run without waiting for the interval."""
+        async def scenario():
+            runs = []
+
+            async def collect():
+                runs.append(1)
+
+            scheduler = CollectionScheduler()
+            scheduler.add_job('weather', collect, interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(0.01)
+            assert scheduler.run_now('weather')
+            assert not scheduler.run_now('missing')
+            await asyncio.sleep(0.01)
+            await scheduler.stop()
+            return len(runs)
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_concurrency_is_limited(self):
+        """No more than max_concurrency collectors run at once."""
+        async def scenario():
+            active = {'now': 0, 'peak': 0}
+
+            async def collect():
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+                await asyncio.sleep(0.02)
+                active['now'] -= 1
+
+            scheduler = CollectionScheduler(max_concurrency=2)
+            for i in range(6):
+                scheduler.add_job(f'job{i}', collect, interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(0.1)
+            await scheduler.stop()
+            return active['peak'], scheduler.get_status()
+
+        peak, status = asyncio.run(scenario())
+        assert peak == 2
+        assert all(job['runs'] == 1 for job in status['jobs'].values())
+
+    def test_failures_and_timeouts_retry_sooner(self):
+        """Errors and timeouts are recorded and use the retry interval."""
+        async def scenario():
+            async def broken():
+                raise RuntimeError('api down')
+
+            async def slow():
+                await asyncio.sleep(1)
+
+            scheduler = CollectionScheduler()
+            scheduler.add_job('broken', broken, interval=3600, retry_interval=0.01, jitter=0)
+            scheduler.add_job('slow', slow, interval=3600, timeout=0.01)
+            await scheduler.start()
+            await asyncio.sleep(0.06)
+            await scheduler.stop()
+            return scheduler.get_status()['jobs']
+
+        jobs = asyncio.run(scenario())
+        assert jobs['broken']['failures'] >= 2
+        assert jobs['broken']['last_error'] == 'api down'
+        assert jobs['slow']['failures'] == 1
+        assert jobs['slow']['last_error'] == 'TimeoutError'
+
+    def test_stop_cancels_and_offload_uses_worker_thread(self):
+        """stop() cancels in-flight jobs; offloaded jobs run off the loop thread."""
+        threads = {}
+
+        async def scenario():
+            cancelled = asyncio.Event()
+
+            async def hang():
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            def blocking():
+                threads['job'] = threading.current_thread().name
+
+            threads['loop'] = threading.current_thread().name
+            scheduler = CollectionScheduler()
+            scheduler.add_job('hang', hang, interval=3600)
+            scheduler.add_job('calendar', blocking, interval=3600, offload=True)
+            await scheduler.start()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+            return cancelled.is_set()
+
+        assert asyncio.run(scenario())
+        assert threads['job'] != threads['loop']
+
+    def test_coroutine_jobs_run_on_the_loop(self):
+        """Coroutine collectors run on the loop thread and cannot be offloaded."""
+        threads = {}
+
+        async def collect():
+            threads['job'] = threading.current_thread().name
+
+        async def scenario():
+            threads['loop'] = threading.current_thread().name
+            scheduler = CollectionScheduler()
+            with pytest.raises(ValueError):
+                scheduler.add_job('email', collect, interval=3600, offload=True)
+            scheduler.add_job('email', collect, interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+        asyncio.run(scenario())
+        assert threads['job'] == threads['loop']
+
+
+class TestAdaptiveScheduling:
+    """Test change-rate, activity, backoff and idle-pause adjustments."""
+
+    def test_unchanged_content_lengthens_interval(self):
+        """Identical results grow the interval; a change resets it."""
+        scheduler = CollectionScheduler()
+        job = scheduler.add_job('news', None, interval=100, jitter=0)
+        scheduler.client_visible = False
+
+        job.record_content({'articles': [1], 'timestamp': 'a'})
+        job.record_content({'articles': [1], 'timestamp': 'b'})
+        job.record_content({'articles': [1], 'timestamp': 'c'})
+        assert job.unchanged_runs == 2
+        assert scheduler.next_delay(job, ok=True) == 225
+
+        for _ in range(10):
+            job.record_content({'articles': [1]})
+        assert job.current_interval == 400
+
+        job.record_content({'articles': [1, 2]})
+        assert scheduler.next_delay(job, ok=True) == 100
+
+    def test_active_client_shortens_interval(self):
+        """A visible, recently active tab halves the interval down to min_interval."""
+        scheduler = CollectionScheduler()
+        job = scheduler.add_job('email', None, interval=180, jitter=0, min_interval=120)
+        fixed = scheduler.add_job('maintenance', None, interval=600, jitter=0, adaptive=False)
+
+        scheduler.record_activity(visible=True)
+        assert scheduler.next_delay(job, ok=True) == 120
+        assert scheduler.next_delay(fixed, ok=True) == 600
+
+        scheduler.record_activity(visible=False)
+        assert scheduler.next_delay(job, ok=True) == 180
+
+    def test_failures_back_off_exponentially(self):
+        """Each consecutive failure doubles the retry delay up to max_backoff."""
+        scheduler = CollectionScheduler()
+        job = scheduler.add_job('github', None, interval=600, retry_interval=60, max_backoff=400)
+
+        delays = []
+        for failures in range(1, 6):
+            job.consecutive_failures = failures
+            delays.append(scheduler.next_delay(job, ok=False))
+        bounds = [60, 120, 240, 400, 400]
+        assert all(bound / 2 <= delay <= bound for delay, bound in zip(delays, bounds))
+
+    def test_error_results_count_as_failures(self):
+        """result_error turns {"error": ...} results into failed runs that are not stored."""
+        stored = []
+
+        async def scenario():
+            async def collect():
+                return {'error': 'Not authenticated'}
+
+            scheduler = CollectionScheduler(on_result=lambda name, data: stored.append(data),
+                                            result_error=lambda data: data.get('error'))
+            job = scheduler.add_job('email', collect, interval=180)
+            return await scheduler.run_job(job), job
+
+        ok, job = asyncio.run(scenario())
+        assert ok is False
+        assert job.last_error == 'Not authenticated'
+        assert stored == []
+
+    def test_idle_pause_and_resume(self):
+        """With no client activity pausable jobs stop; a request resumes them."""
+        async def scenario():
+            runs = {'news': 0, 'maintenance': 0}
+
+            def collector(name):
+                async def collect():
+                    runs[name] += 1
+                return collect
+
+            scheduler = CollectionScheduler(idle_timeout=0.03)
+            scheduler.add_job('news', collector('news'), interval=0.01, jitter=0, adaptive=False)
+            scheduler.add_job('maintenance', collector('maintenance'), interval=0.01, jitter=0,
+                              adaptive=False, pausable=False)
+            await scheduler.start()
+            await asyncio.sleep(0.08)
+            paused = scheduler.get_status()['jobs']['news']['paused']
+            before = dict(runs)
+            await asyncio.sleep(0.03)
+            idle_runs = runs['news'] - before['news']
+            scheduler.record_activity()
+            await asyncio.sleep(0.01)
+            await scheduler.stop()
+            return paused, idle_runs, runs, before
+
+        paused, idle_runs, runs, before = asyncio.run(scenario())
+        assert paused is True
+        assert idle_runs == 0
+        assert runs['news'] > before['news']
+        assert runs['maintenance'] > before['maintenance']
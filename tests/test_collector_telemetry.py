@@ -0,0 +1,103 @@
+"""Tests for collector run telemetry and its hourly rollups."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from collection_scheduler import CollectionScheduler
+from collector_telemetry import (CollectorTelemetry, RunRecord, count_upstream_call,
+                                 measure_payload, percentile, track_upstream_calls)
+from database import DatabaseManager
+
+
+class TestCollectorTelemetry:
+    """Test the ring buffer, percentiles, upstream counting and rollups."""
+
+    def test_percentiles_and_ring_buffer(self):
+        """Percentiles use nearest rank over the last `history` runs only."""
+        assert percentile([], 50) is None
+        assert percentile([1, 2, 3, 4], 50) == 2
+        assert percentile(list(range(1, 101)), 99) == 99
+
+        telemetry = CollectorTelemetry(history=10)
+        for ms in range(1, 21):
+            telemetry.record(RunRecord('news', float(ms), ok=ms != 20, error_class='TimeoutError' if ms == 20 else None))
+        summary = telemetry.summary()['news']
+        assert summary['runs'] == 20 and summary['window'] == 10
+        assert summary['duration_ms']['p50'] == 15.0
+        assert summary['duration_ms']['max'] == 20.0
+        assert summary['failure_rate'] == 0.1
+        assert summary['last_error_class'] == 'TimeoutError'
+        assert summary['last_success_at'] is not None
+        assert len(telemetry.recent('news', limit=3)) == 3
+
+    def test_measure_payload(self):
+        """Items come from the longest top-level list; bytes from the JSON encoding."""
+        assert measure_payload(None) == {'items': 0, 'payload_bytes': 0}
+        assert measure_payload([1, 2, 3])['items'] == 3
+        measured = measure_payload({'events': [1, 2], 'emails': [1, 2, 3, 4], 'count': 4})
+        assert measured['items'] == 4 and measured['payload_bytes'] > 0
+
+    def test_upstream_calls_follow_tasks_and_threads(self):
+        """Calls made in child tasks and worker threads count toward the run."""
+        async def child():
+            count_upstream_call()
+
+        async def scenario():
+            with track_upstream_calls() as calls:
+                count_upstream_call()
+                await asyncio.gather(asyncio.ensure_future(child()),
+                                     asyncio.to_thread(count_upstream_call, 2))
+            count_upstream_call()  # outside any run: ignored
+            return calls.count
+
+        assert asyncio.run(scenario()) == 4
+
+    def test_scheduler_records_each_run(self):
+        """Successful and failing runs are recorded with sizes, errors and upstream calls."""
+        telemetry = CollectorTelemetry()
+
+        def collect_blocking():
+            count_upstream_call(3)
+            return {'events': [1, 2]}
+
+        async def failing():
+            return {'error': 'token expired'}
+
+        async def scenario():
+            scheduler = CollectionScheduler(telemetry=telemetry,
+                                            result_error=lambda data: data.get('error'))
+            scheduler.add_job('calendar', collect_blocking, interval=3600, offload=True)
+            scheduler.add_job('email', failing, interval=3600)
+            await scheduler.start()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+        asyncio.run(scenario())
+        summary = telemetry.summary()
+        assert summary['calendar']['last_run']['upstream_calls'] == 3
+        assert summary['calendar']['items']['last'] == 2
+        assert summary['email']['failures'] == 1
+        assert summary['email']['last_error_class'] == 'CollectorResultError'
+        assert summary['email']['last_run']['error'] == 'token expired'
+
+    def test_rollups_accumulate_in_database(self, tmp_path):
+        """Flushed rollups add onto the stored hourly totals."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        telemetry = CollectorTelemetry(flush=db.save_collector_rollups, flush_interval=3600)
+        telemetry.record(RunRecord('weather', 100.0, ok=True, items=1, upstream_calls=2))
+        telemetry.record(RunRecord('weather', 300.0, ok=False, error_class='HTTPError'))
+        assert telemetry.flush_rollups() >= 1  # one row per collector and hour
+        telemetry.record(RunRecord('weather', 200.0, ok=True, items=1, upstream_calls=2))
+        telemetry.flush_rollups()
+        assert telemetry.flush_rollups() == 0
+
+        rollups = db.get_collector_rollups(hours=24)['weather']
+        assert rollups['runs'] == 3 and rollups['failures'] == 1
+        assert rollups['avg_ms'] == 200.0 and rollups['max_ms'] == 300.0
+        assert rollups['upstream_calls'] == 4
+        assert rollups['last_success_at'] is not None
@@ -0,0 +1,66 @@
+"""Tests for the async database facade."""
+
+import asyncio
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_async import AsyncDatabaseManager, get_db_executor_stats, run_in_db_executor
+
+
+class TestAsyncDatabaseManager:
+    """Test that DB calls are awaitable and run off the event loop thread."""
+
+    @pytest.fixture
+    def adb(self, tmp_path):
+        """Create an async facade over a file-backed test database."""
+        return AsyncDatabaseManager(DatabaseManager(str(tmp_path / 'dashboard.db')))
+
+    def test_mirrors_database_manager(self, adb):
+        """Sync methods are exposed as coroutines with the same results."""
+        async def scenario():
+            assert await adb.save_todo({'id': 'todo-1', 'title': 'Async', 'source': 'manual'})
+            return await adb.get_todos()
+
+        todos = asyncio.run(scenario())
+        assert [todo['id'] for todo in todos] == ['todo-1']
+        assert adb.sync.get_todos()[0]['title'] == 'Async'
+
+    def test_runs_on_db_worker_thread(self, adb):
+        """Work is executed on the DB executor, not the event loop thread."""
+        async def scenario():
+            loop_thread = threading.current_thread().name
+            worker_thread = await run_in_db_executor(lambda: threading.current_thread().name)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(scenario())
+        assert worker_thread != loop_thread
+        assert worker_thread.startswith('db-worker')
+
+    def test_concurrent_calls_and_stats(self, adb):
+        """Concurrent awaits complete and are counted in executor stats."""
+        before = get_db_executor_stats()['completed']
+
+        async def scenario():
+            await asyncio.gather(*[
+                adb.save_setting(f'key_{i}', i) for i in range(20)
+            ])
+            return await asyncio.gather(*[adb.get_setting(f'key_{i}') for i in range(20)])
+
+        assert asyncio.run(scenario()) == list(range(20))
+        stats = get_db_executor_stats()
+        assert stats['completed'] - before == 40
+        assert stats['in_flight'] == 0
+
+    def test_errors_propagate(self, adb):
+        """Exceptions raised in the worker surface to the awaiting caller."""
+        def fail():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            asyncio.run(adb.run(fail))
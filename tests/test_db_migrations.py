@@ -0,0 +1,74 @@
+"""Tests for versioned schema migrations."""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_migrations import Migration, get_schema_version, reset_schema_state
+
+
+class TestMigrations:
+    """Test schema_version bookkeeping and once-per-process DDL."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_core_schema_is_versioned(self, db):
+        """The baseline migration is recorded in schema_version."""
+        with db.get_connection() as conn:
+            assert get_schema_version(conn, 'core') == len(db.schema_migrations())
+            row = conn.execute("SELECT name FROM schema_version WHERE component = 'core' AND version = 1").fetchone()
+        assert row['name'] == 'baseline schema'
+
+    def test_construction_after_first_init_skips_database(self, db):
+        """Later DatabaseManager constructions do not check out a connection."""
+        checkouts = db.get_pool_stats()['checkouts']
+        for _ in range(50):
+            DatabaseManager(db.db_path)
+        assert db.get_pool_stats()['checkouts'] == checkouts
+
+    def test_new_process_only_checks_version(self, db):
+        """A fresh process sees the recorded version and applies nothing."""
+        reset_schema_state(db.db_path)
+        assert db.ensure_schema('core', db.schema_migrations()) == []
+
+    def test_component_migrations_apply_once_in_order(self, db):
+        """Module migrations run once; appended steps run on the next check."""
+        calls = []
+
+        def create(cursor):
+            calls.append(1)
+            cursor.execute("CREATE TABLE widgets (id TEXT PRIMARY KEY)")
+
+        def add_column(cursor):
+            calls.append(2)
+            cursor.execute("ALTER TABLE widgets ADD COLUMN label TEXT")
+
+        assert db.ensure_schema('widgets', [Migration(1, 'create', create)]) == [1]
+        assert db.ensure_schema('widgets', [Migration(1, 'create', create)]) == []
+
+        reset_schema_state(db.db_path)
+        steps = [Migration(2, 'label', add_column), Migration(1, 'create', create)]
+        assert db.ensure_schema('widgets', steps) == [2]
+        assert calls == [1, 2]
+
+    def test_failed_migration_rolls_back(self, db):
+        """A failing step leaves no partial DDL and no version row."""
+        def broken(cursor):
+            cursor.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            db.ensure_schema('broken', [Migration(1, 'broken', broken)])
+
+        with db.get_connection() as conn:
+            assert get_schema_version(conn, 'broken') == 0
+            assert conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'"
+            ).fetchone()[0] == 0
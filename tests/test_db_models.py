@@ -0,0 +1,161 @@
+"""Tests for typed row models and column projection."""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_models import TodoRow, TodoSummaryRow, EmailRow, EmailSummaryRow, projection
+
+
+class TestRowModels:
+    """Test todo/email row mapping and projections."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database with one todo and one email."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        db.save_todo({
+            'id': 'todo-1', 'title': 'Reply to Sam', 'description': 'Long description',
+            'source': 'email', 'priority': 'high', 'email_id': 'msg-1',
+            'requires_response': True
+        })
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO emails (id, subject, sender, body, is_analyzed) VALUES (?, ?, ?, ?, ?)",
+                ('msg-1', 'Hello', 'sam@example.com', 'Body text', 1)
+            )
+            conn.commit()
+        return db
+
+    def test_get_todos_returns_plain_dicts(self, db):
+        """get_todos keeps its dict contract and is JSON-serializable."""
+        todos = db.get_todos()
+        assert isinstance(todos[0], dict)
+        assert todos[0]['title'] == 'Reply to Sam'
+        assert todos[0]['requires_response'] is True
+        assert set(todos[0]) == set(TodoRow.field_names())
+        json.dumps(todos)
+
+    def test_todo_rows_are_models_with_dict_access(self, db):
+        """Typed rows support attribute and dict-style access."""
+        row = db.get_todo_rows()[0]
+        assert isinstance(row, TodoRow)
+        assert row.description == 'Long description'
+        assert row['priority'] == 'high'
+        assert row.get('requires_response') is True
+        assert row.get('missing', 'default') == 'default'
+        assert row.gmail_link.endswith('msg-1')
+
+    def test_summary_projection_skips_text_columns(self, db):
+        """Summary rows never load description text."""
+        row = db.get_todo_rows(summary=True)[0]
+        assert type(row) is TodoSummaryRow
+        assert not hasattr(row, 'description')
+        with db.get_connection() as conn:
+            columns = projection(conn, db.db_path, 'universal_todos', TodoSummaryRow)
+        assert 'description' not in columns
+
+    def test_api_dict_matches_task_shape(self, db):
+        """to_api_dict produces the /api/tasks task shape."""
+        task = db.get_todo_rows()[0].to_api_dict()
+        assert task['gmail_link'] == 'https://mail.google.com/mail/u/0/#inbox/msg-1'
+        assert task['requires_response'] is True
+        assert 'assigned_to_service' not in task
+
+    def test_email_rows_skip_body_by_default(self, db):
+        """Email list reads leave out the body unless asked for."""
+        summary = db.get_email_rows()[0]
+        assert type(summary) is EmailSummaryRow
+        assert summary['is_analyzed'] is True
+
+        full = db.get_email_rows(include_body=True)[0]
+        assert isinstance(full, EmailRow)
+        assert full.body == 'Body text'
+
+        emails = db.get_emails_by_priority()
+        assert 'body' not in emails[0]
+        assert emails[0]['subject'] == 'Hello'
+
+    def test_missing_columns_use_model_defaults(self, tmp_path):
+        """Projections fill columns absent from older tables with defaults."""
+        db = DatabaseManager(str(tmp_path / 'legacy.db'))
+        with db.get_connection() as conn:
+            conn.execute("CREATE TABLE legacy_todos (id TEXT, title TEXT)")
+            columns = projection(conn, db.db_path, 'legacy_todos', TodoSummaryRow)
+            conn.execute("INSERT INTO legacy_todos VALUES ('a', 'Old')")
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            row = TodoSummaryRow(*cursor.execute(f"SELECT {columns} FROM legacy_todos").fetchone())
+        assert row.title == 'Old'
+        assert row.priority == 'medium'
+        assert row.status == 'pending'
+
+
+class TestTodoQuery:
+    """Test SQL filtering, keyset pagination and stats for task lists."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a database with a mix of todos."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        priorities = ['high', 'medium', 'low']
+        for i in range(25):
+            db.save_todo({
+                'id': f'todo-{i:02d}',
+                'title': f'Task {i}',
+                'priority': priorities[i % 3],
+                'category': 'work' if i % 2 else 'home',
+                'source': 'email' if i % 5 == 0 else 'manual',
+                'status': 'completed' if i % 4 == 0 else 'pending',
+                'due_date': f'2026-01-{(i % 7) + 1:02d}' if i % 6 else None
+            })
+        return db
+
+    def test_keyset_pages_match_unpaged_order(self, db):
+        """Following cursors yields every row once, in the unpaged order."""
+        expected = [row.id for row in db.query_todos(include_completed=True)['rows']]
+
+        seen, cursor = [], None
+        while True:
+            page = db.query_todos(include_completed=True, limit=4, cursor=cursor)
+            seen.extend(row.id for row in page['rows'])
+            assert page['total'] == 25
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert len(set(seen)) == 25
+
+    def test_filters_are_case_insensitive(self, db):
+        """Priority/status/category filters match the old Python filtering."""
+        page = db.query_todos(priority='HIGH', category='Work')
+        assert page['rows']
+        for row in page['rows']:
+            assert row.priority == 'high'
+            assert row.category == 'work'
+            assert row.status != 'completed'
+        assert page['total'] == len(page['rows'])
+
+    def test_invalid_cursor_raises(self, db):
+        """Malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            db.query_todos(cursor='not-a-cursor')
+
+    def test_stats_match_python_counts(self, db):
+        """GROUP BY stats agree with counting the rows directly."""
+        todos = db.get_todos(include_completed=True)
+        stats = db.get_todo_stats(include_completed=True)
+
+        assert stats['total_tasks'] == len(todos)
+        assert stats['completed_tasks'] == sum(1 for t in todos if t['status'] == 'completed')
+        assert stats['high_priority'] == sum(1 for t in todos if t['priority'] == 'high')
+        assert stats['by_source'] == {
+            'email': sum(1 for t in todos if t['source'] == 'email'),
+            'manual': sum(1 for t in todos if t['source'] == 'manual'),
+        }
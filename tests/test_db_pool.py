@@ -0,0 +1,87 @@
+"""Tests for the pooled SQLite connection layer."""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_pool import get_connection_pool
+
+
+class TestConnectionPool:
+    """Test connection reuse, pragmas and stats."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_pool_is_shared_per_file(self, db):
+        """Managers for the same file share one pool."""
+        other = DatabaseManager(db.db_path)
+        assert other._pool is db._pool
+        assert get_connection_pool(db.db_path) is db._pool
+
+    def test_wal_and_pragmas(self, db):
+        """Connections use WAL with tuned pragmas."""
+        with db.get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_connections_are_reused(self, db):
+        """Sequential calls reuse a single idle connection."""
+        for i in range(20):
+            db.save_setting(f'key_{i}', i)
+            assert db.get_credentials(f'key_{i}') is None
+
+        stats = db.get_pool_stats()
+        assert stats['connections_created'] == 1
+        assert stats['checkouts'] >= 40
+
+    def test_nested_checkout_reuses_connection(self, db):
+        """Nested calls from the same thread join the held connection."""
+        db.save_todo({'id': 'todo-1', 'title': 'Nested', 'source': 'manual'})
+
+        # delete_todo calls record_task_deletion while holding a connection
+        assert db.delete_todo('todo-1') is True
+        assert 'todo-1' in db.get_deleted_task_ids()
+        assert db.get_pool_stats()['reentrant_checkouts'] >= 1
+
+    def test_uncommitted_work_rolled_back_on_release(self, db):
+        """A checkout that never commits leaves no partial writes behind."""
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO settings (setting_key, setting_value) VALUES (?, ?)",
+                ('uncommitted', '"value"')
+            )
+
+        assert db.get_setting('uncommitted') is None
+        assert db.get_pool_stats()['rollbacks_on_release'] == 1
+
+    def test_concurrent_writers(self, db):
+        """Threads writing concurrently all succeed."""
+        def writer(thread_no):
+            for i in range(50):
+                db.save_todo({'id': f'{thread_no}-{i}', 'title': 'Task', 'source': 'test'})
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(db.get_todos()) == 300
+        stats = db.get_pool_stats()
+        assert stats['in_use'] == 0
+        assert stats['lock_failures'] == 0
+
+    def test_in_memory_database_keeps_schema(self):
+        """In-memory databases keep their tables across calls."""
+        memory_db = DatabaseManager(':memory:')
+        memory_db.save_setting('theme', 'dark')
+        assert memory_db.get_setting('theme') == 'dark'
@@ -0,0 +1,154 @@
+"""Tests for the batched email task extraction pipeline."""
+
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from processors.email_analyzer import EmailAnalyzer, TaskHistory
+from processors.email_task_pipeline import EmailTaskPipeline
+
+
+def actionable_email(number, sender='alice@example.com', subject=None):
+    return {
+        'id': f'msg-{number}',
+        'subject': subject or f'Budget figures {number}',
+        'sender': sender,
+        'body': 'Action required: could you please review the attached numbers by Friday?',
+    }
+
+
+class ReviewProvider:
+    """Provider that rejects even-numbered emails and tracks concurrency."""
+
+    provider_type = 'ollama'
+    model_name = 'qwen2.5:7b'
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batch_sizes = []
+
+    async def chat(self, messages, stream=False):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        prompt = messages[-1]['content']
+        subjects = re.findall(r'Subject: Budget figures (\d+)', prompt)
+        self.batch_sizes.append(len(subjects))
+        if self.reply is not None:
+            return self.reply
+        return json.dumps([
+            {'email': index, 'actionable': int(number) % 2 == 1, 'task': f'Review budget {number}', 'priority': 'low'}
+            for index, number in enumerate(subjects, 1)
+        ])
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+
+class TestEmailTaskPipeline:
+    """Test the preloaded indexes, batched AI review and single-transaction save."""
+
+    def test_history_index_matches_per_email_checks(self):
+        """Sender counts, similar deleted titles and disliked domains skip emails."""
+        history = TaskHistory(
+            [{'title': 'Follow up: quarterly budget review meeting', 'description': 'From: bob@corp.com'}] +
+            [{'title': f'Old task {i}', 'description': 'From: spam@ads.com'} for i in range(3)],
+            disliked_senders=['Pushy.io']
+        )
+        assert history.skip_reason('Hello', 'spam@ads.com') is not None
+        assert history.skip_reason('Quarterly budget review moved', 'carol@corp.com') is not None
+        assert history.skip_reason('Lunch?', 'sales@pushy.io') is not None
+        assert history.skip_reason('Quarterly plans', 'bob@corp.com') is None
+        assert history.deleted_from_sender('bob@corp.com') == 1
+
+    def test_analyzer_uses_its_database(self, db):
+        """Without a preloaded history the analyzer loads one from its db."""
+        db.save_todo({'id': 'gone', 'title': 'Follow up: budget figures for review', 'source': 'email',
+                      'status': 'deleted', 'description': 'From: alice@example.com'})
+        email = actionable_email(1, subject='Budget figures for review')
+
+        async def scenario():
+            return (await EmailAnalyzer(db).analyze_email_for_todos(email['subject'], email['body'], email['sender']),
+                    await EmailAnalyzer().analyze_email_for_todos(email['subject'], email['body'], email['sender']))
+
+        with_history, without = asyncio.run(scenario())
+        assert with_history == [] and len(without) == 1
+
+    def test_batches_reviewed_with_bounded_concurrency(self, db):
+        """Candidates are packed per request; rejected ones are dropped, others refined."""
+        provider = ReviewProvider()
+        progress = []
+        emails = [actionable_email(n) for n in range(1, 8)]
+        emails.append({'id': 'msg-promo', 'subject': 'Flash sale', 'sender': 'news@shop.com',
+                       'body': 'Unsubscribe. Limited time. Buy now.'})
+        pipeline = EmailTaskPipeline(db, ai_provider=provider, batch_size=3, concurrency=2,
+                                     on_progress=progress.append)
+
+        result = asyncio.run(pipeline.run(emails))
+        assert provider.batch_sizes == [3, 3, 1]
+        assert provider.max_in_flight == 2
+        assert result['tasks_created'] == 4
+        assert result['emails_skipped'] == 4
+        assert result['pipeline']['ai_rejected'] == 3
+
+        tasks = {task['source_id']: task for task in db.get_todos_by_source('email')}
+        assert sorted(tasks) == ['msg-1', 'msg-3', 'msg-5', 'msg-7']
+        assert tasks['msg-3']['title'] == 'Review budget 3' and tasks['msg-3']['priority'] == 'low'
+        assert [p['stage'] for p in progress] == ['filtered', 'reviewing', 'reviewing', 'reviewing', 'saved']
+        assert len(db.get_scanned_sources('email')) == 8
+
+    def test_unusable_review_keeps_heuristic_tasks(self, db):
+        """A batch the provider cannot answer falls back to the heuristics."""
+        provider = ReviewProvider(reply='Error: Ollama API error: 500')
+        result = asyncio.run(EmailTaskPipeline(db, ai_provider=provider).run(
+            [actionable_email(n) for n in range(1, 3)]))
+        assert result['tasks_created'] == 2
+        assert result['pipeline']['ai_failed_batches'] == 1
+
+    def test_rescan_uses_indexes_and_single_transaction(self, db, monkeypatch):
+        """Scanned and already-tasked emails are skipped; a failed save writes nothing."""
+        emails = [actionable_email(n) for n in range(1, 4)]
+        first = asyncio.run(EmailTaskPipeline(db).run(emails))
+        again = asyncio.run(EmailTaskPipeline(db).run(emails))
+        forced = asyncio.run(EmailTaskPipeline(db).run(emails, force_rescan=True))
+        assert first['tasks_created'] == 3
+        assert again['already_scanned'] == 3 and again['tasks_created'] == 0
+        assert forced['tasks_skipped'] == 3 and forced['tasks_created'] == 0
+
+        def broken_mark(conn, sources):
+            raise RuntimeError('disk full')
+
+        monkeypatch.setattr(db, '_mark_scanned_rows', broken_mark)
+        with pytest.raises(RuntimeError):
+            asyncio.run(EmailTaskPipeline(db).run([actionable_email(9)]))
+        assert [t for t in db.get_todos_by_source('email') if t['source_id'] == 'msg-9'] == []
+
+    def test_empty_sender_matches_no_deleted_tasks(self):
+        """A missing sender is not counted against every deleted task."""
+        history = TaskHistory([{'title': f'Old task {i}', 'description': 'From: spam@ads.com'} for i in range(3)])
+        assert history.deleted_from_sender('') == 0
+        assert history.deleted_from_sender(None) == 0
+        assert history.skip_reason('Quarterly plans', '') is None
+
+    def test_malformed_email_is_skipped_not_fatal(self, db):
+        """One email that cannot be processed is logged and left unscanned."""
+        emails = [actionable_email(1), 'not an email', actionable_email(2)]
+        result = asyncio.run(EmailTaskPipeline(db).run(emails))
+        assert result['tasks_created'] == 2
+        assert result['pipeline']['failed'] == 1
+        assert sorted(t['source_id'] for t in db.get_todos_by_source('email')) == ['msg-1', 'msg-2']
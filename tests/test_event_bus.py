@@ -0,0 +1,97 @@
+"""Tests for the widget event bus behind /api/events."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from event_bus import EventBus
+
+
+async def _take(stream, count):
+    return [await stream.__anext__() for _ in range(count)]
+
+
+class TestEventBus:
+    """Test fan-out, Last-Event-ID replay, resets and heartbeats."""
+
+    def test_live_events_reach_every_subscriber(self):
+        """Each subscriber gets each event once, formatted as SSE."""
+        async def scenario():
+            bus = EventBus()
+            first, second = bus.subscribe(), bus.subscribe()
+            pending = [asyncio.ensure_future(_take(first, 2)), asyncio.ensure_future(_take(second, 2))]
+            await asyncio.sleep(0)
+            bus.publish('widget', {'widget': 'news', 'version': 'a'})
+            bus.publish('widget', {'widget': 'weather', 'version': 'b'})
+            results = await asyncio.gather(*pending)
+            return bus, results
+
+        bus, (first, second) = asyncio.run(scenario())
+        assert [e.data['widget'] for e in first] == ['news', 'weather']
+        assert first == second
+        assert first[1].id == first[0].id + 1
+        assert first[0].to_sse().startswith(f"id: {first[0].id}\nevent: widget\ndata: ")
+        assert bus.get_stats()['delivered'] == 4
+
+    def test_resume_replays_missed_events(self):
+        """A reconnect with Last-Event-ID gets exactly the events after it."""
+        async def scenario():
+            bus = EventBus()
+            seen = bus.publish('widget', {'widget': 'calendar'})
+            bus.publish('widget', {'widget': 'email'})
+            bus.publish('widget', {'widget': 'github'})
+            return await _take(bus.subscribe(last_event_id=seen.id), 2)
+
+        replayed = asyncio.run(scenario())
+        assert [e.data['widget'] for e in replayed] == ['email', 'github']
+
+    def test_unknown_or_expired_id_gets_reset(self):
+        """Ids from before a restart or beyond the history produce one reset."""
+        async def scenario():
+            bus = EventBus(history=2)
+            old = bus.publish('widget', {'widget': 'a'})
+            for name in 'bcd':
+                bus.publish('widget', {'widget': name})
+            expired = await _take(bus.subscribe(last_event_id=old.id), 1)
+            from_future = await _take(bus.subscribe(last_event_id=bus.last_id + 50), 1)
+            return expired, from_future
+
+        expired, from_future = asyncio.run(scenario())
+        assert expired[0].event == 'reset'
+        assert from_future[0].event == 'reset'
+
+    def test_lagging_subscriber_gets_reset_instead_of_backlog(self):
+        """A full queue is replaced by a single reset event."""
+        async def scenario():
+            bus = EventBus(queue_size=3)
+            stream = bus.subscribe()
+            pending = asyncio.ensure_future(_take(stream, 1))
+            await asyncio.sleep(0)
+            for i in range(10):
+                bus.publish('widget', {'widget': f'w{i}'})
+            delivered = await pending
+            live = asyncio.ensure_future(_take(stream, 1))
+            await asyncio.sleep(0)
+            bus.publish('widget', {'widget': 'after'})
+            return delivered, await live, bus.get_stats()
+
+        delivered, live, stats = asyncio.run(scenario())
+        assert delivered[0].event == 'reset'
+        assert live[0].data['widget'] == 'after'
+        assert stats['dropped_subscribers'] >= 1
+
+    def test_heartbeat_and_unsubscribe(self):
+        """Idle streams yield None on the heartbeat; closing removes the subscriber."""
+        async def scenario():
+            bus = EventBus()
+            stream = bus.subscribe(heartbeat=0.01)
+            tick = await stream.__anext__()
+            subscribed = bus.get_stats()['subscribers']
+            await stream.aclose()
+            return tick, subscribed, bus.get_stats()['subscribers']
+
+        assert asyncio.run(scenario()) == (None, 1, 0)
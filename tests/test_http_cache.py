@@ -0,0 +1,141 @@
+"""Tests for widget ETags and response compression."""
+
+import asyncio
+import gzip
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import http_cache
+from http_cache import ConditionalJSONMiddleware, body_etag, make_etag, etag_matches, choose_encoding, encode_body
+
+
+def widget_app(calls, content_type=b'application/json'):
+    """ASGI endpoint returning a body with a per-request age, like the widgets."""
+    async def app(scope, receive, send):
+        calls.append(scope['path'])
+        body = json.dumps({'events': ['standup'] * 100,
+                           'freshness': {'age_seconds': len(calls)}}).encode()
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', content_type), (b'x-widget', b'calendar'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+    return app
+
+
+def get(app, path, **headers):
+    """Run one GET through an ASGI app; returns (status, headers, body)."""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+             'headers': [(k.replace('_', '-').encode(), v.encode()) for k, v in headers.items()]}
+    asyncio.run(app(scope, receive, send))
+    return (sent[0]['status'], dict(sent[0]['headers']),
+            b''.join(m.get('body', b'') for m in sent[1:]))
+
+
+class TestHttpCache:
+    """Test ETag generation/matching and content negotiation."""
+
+    def test_etag_is_stable_per_version(self):
+        """Same URL and version give the same ETag; any change gives a new one."""
+        etag = make_etag('/api/calendar?', 'abc123')
+        assert etag.startswith('W/"')
+        assert etag == make_etag('/api/calendar?', 'abc123')
+        assert etag != make_etag('/api/calendar?', 'abc124')
+        assert etag != make_etag('/api/news?filter=tech', 'abc123')
+        assert make_etag('/api/news?', b'{"a":1}') != make_etag('/api/news?', b'{"a":2}')
+
+    def test_body_etag_ignores_per_request_fields(self):
+        """A new top-level timestamp alone does not change a body's ETag."""
+        first = b'{"tasks": [{"timestamp": "09:00"}], "timestamp": "2026-01-01T10:00:00"}'
+        second = b'{"timestamp": "2026-01-01T10:00:05", "tasks": [{"timestamp": "09:00"}]}'
+        changed = b'{"tasks": [{"timestamp": "09:30"}], "timestamp": "2026-01-01T10:00:05"}'
+        assert body_etag('/api/tasks?', first) == body_etag('/api/tasks?', second)
+        assert body_etag('/api/tasks?', first) != body_etag('/api/tasks?', changed)
+
+    def test_if_none_match_uses_weak_comparison(self):
+        """Lists, strong forms of a weak tag and '*' all match."""
+        etag = make_etag('/api/weather?', 'v1')
+        opaque = etag[2:]
+        assert etag_matches(etag, etag)
+        assert etag_matches(opaque, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches('*', etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('W/"other"', etag)
+
+    def test_encoding_negotiation(self, monkeypatch):
+        """Brotli is preferred when available; q=0 excludes a coding."""
+        monkeypatch.setattr(http_cache, 'BROTLI_AVAILABLE', False)
+        assert choose_encoding('gzip, deflate, br') == 'gzip'
+        assert choose_encoding('gzip;q=0, br') is None
+        assert choose_encoding('*') == 'gzip'
+        assert choose_encoding(None) is None
+
+        monkeypatch.setattr(http_cache, 'BROTLI_AVAILABLE', True)
+        assert choose_encoding('gzip, deflate, br') == 'br'
+        assert choose_encoding('gzip, br;q=0') == 'gzip'
+
+    def test_only_large_bodies_are_compressed(self, monkeypatch):
+        """Small bodies pass through; large ones are gzipped and round-trip."""
+        monkeypatch.setattr(http_cache, 'BROTLI_AVAILABLE', False)
+        small = b'{"ok": true}'
+        assert encode_body(small, 'gzip') == (small, None)
+
+        large = b'{"articles": [' + b'{"title": "Widget news"},' * 200 + b'{}]}'
+        body, encoding = encode_body(large, 'gzip, br')
+        assert encoding == 'gzip'
+        assert len(body) < len(large)
+        assert gzip.decompress(body) == large
+        assert http_cache.get_http_cache_stats()['bytes_saved_by_compression'] > 0
+
+
+class TestConditionalJSONMiddleware:
+    """Test 304s per cache generation, header passthrough and body hashing."""
+
+    def test_fresh_generation_skips_the_endpoint(self):
+        """A fresh cached version answers If-None-Match without running the endpoint."""
+        calls = []
+        app = ConditionalJSONMiddleware(widget_app(calls), {'/api/calendar': 'calendar'},
+                                        version_of=lambda key: ('v1', True))
+        status, headers, _ = get(app, '/api/calendar')
+        assert status == 200 and headers[b'x-widget'] == b'calendar'
+        status, headers, body = get(app, '/api/calendar', if_none_match=headers[b'etag'].decode())
+        assert (status, body) == (304, b'') and b'content-type' not in headers
+        assert calls == ['/api/calendar']
+
+    def test_stale_generation_runs_endpoint_then_304(self):
+        """Per-request freshness does not change the ETag of a stale entry."""
+        calls = []
+        app = ConditionalJSONMiddleware(widget_app(calls), {'/api/calendar': 'calendar'},
+                                        version_of=lambda key: ('v1', False))
+        etag = get(app, '/api/calendar')[1][b'etag'].decode()
+        status, headers, _ = get(app, '/api/calendar', if_none_match=etag)
+        assert status == 304 and headers[b'x-widget'] == b'calendar'
+        assert len(calls) == 2  # the stale-while-revalidate refresh still fires
+
+    def test_body_hash_compression_and_passthrough(self):
+        """Uncached endpoints hash the body; large bodies are gzipped; non-JSON is untouched."""
+        calls = []
+        app = ConditionalJSONMiddleware(widget_app(calls), {'/api/news': None},
+                                        version_of=lambda key: (None, False))
+        status, headers, body = get(app, '/api/news', accept_encoding='gzip')
+        assert status == 200 and headers[b'content-encoding'] == b'gzip'
+        assert headers[b'content-length'] == str(len(body)).encode()
+        assert json.loads(gzip.decompress(body))['freshness']['age_seconds'] == 1
+
+        html = ConditionalJSONMiddleware(widget_app(calls, b'text/html'), {'/api/news': None},
+                                         version_of=lambda key: (None, False))
+        status, headers, _ = get(html, '/api/news', accept_encoding='gzip')
+        assert status == 200 and b'etag' not in headers and b'content-encoding' not in headers
@@ -0,0 +1,146 @@
+"""Tests for the Prometheus metrics registry and request middleware."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import metrics
+from metrics import Registry, MetricsMiddleware
+from database import DatabaseManager
+
+
+def _sample(text, line_prefix):
+    """Value of the first exposition line starting with `line_prefix`."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestMetrics:
+    """Test exposition format, histograms, middleware labels and DB timing."""
+
+    def test_counter_and_gauge_exposition(self):
+        """HELP/TYPE headers, escaped label values and integer formatting."""
+        registry = Registry()
+        requests = registry.counter('test_requests_total', 'Requests', ('route',))
+        requests.labels('/api/news').inc()
+        requests.labels('/api/news').inc(2)
+        requests.labels('say "hi"\n').inc()
+        gauge = registry.gauge('test_in_flight', 'In flight')
+        gauge.inc()
+        gauge.dec()
+        gauge.set(3)
+
+        text = registry.render()
+        assert '# TYPE test_requests_total counter' in text
+        assert 'test_requests_total{route="/api/news"} 3' in text
+        assert 'test_requests_total{route="say \\"hi\\"\\n"} 1' in text
+        assert 'test_in_flight 3' in text
+        with pytest.raises(ValueError):
+            requests.labels('a', 'b')
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Observations land in le-buckets; +Inf, _sum and _count agree."""
+        registry = Registry()
+        latency = registry.histogram('test_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            latency.labels('/api/tasks').observe(value)
+
+        text = registry.render()
+        assert 'test_seconds_bucket{route="/api/tasks",le="0.1"} 2' in text
+        assert 'test_seconds_bucket{route="/api/tasks",le="1"} 3' in text
+        assert 'test_seconds_bucket{route="/api/tasks",le="+Inf"} 4' in text
+        assert 'test_seconds_count{route="/api/tasks"} 4' in text
+        assert _sample(text, 'test_seconds_sum') == pytest.approx(5.65)
+
+    def test_registering_twice_returns_the_same_metric(self):
+        """Same name and labels reuse the metric; a conflicting shape is rejected."""
+        registry = Registry()
+        first = registry.counter('test_total', 'x', ('a',))
+        assert registry.counter('test_total', 'x', ('a',)) is first
+        with pytest.raises(ValueError):
+            registry.gauge('test_total', 'x', ('a',))
+
+    def test_middleware_labels_by_route_template(self):
+        """Requests are labelled by the matched route template and final status."""
+        async def app(scope, receive, send):
+            if scope['path'].startswith('/api/tasks/'):
+                scope['route'] = SimpleNamespace(path='/api/tasks/{task_id}')
+                await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            else:
+                await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def send(message):
+            pass
+
+        async def scenario():
+            middleware = MetricsMiddleware(app)
+            for path in ('/api/tasks/1', '/api/tasks/2', '/nope', '/metrics'):
+                await middleware({'type': 'http', 'method': 'GET', 'path': path}, None, send)
+
+        before = metrics.HTTP_REQUESTS.labels('GET', '/api/tasks/{task_id}', '200').value
+        asyncio.run(scenario())
+        assert metrics.HTTP_REQUESTS.labels('GET', '/api/tasks/{task_id}', '200').value == before + 2
+        assert metrics.HTTP_REQUESTS.labels('GET', 'unmatched', '404').value >= 1
+        assert ('GET', '/metrics', '200') not in metrics.HTTP_REQUESTS._children
+        assert metrics.HTTP_IN_FLIGHT.labels().value == 0
+
+    def test_unrouted_responses_are_matched_to_routes(self):
+        """A 304 sent before routing is labelled with the route it would have hit."""
+        class FakeRoute:
+            def __init__(self, path):
+                self.path = path
+                self.endpoint = object()
+
+            def matches(self, scope):
+                full = scope['path'] == self.path
+                return SimpleNamespace(name='FULL' if full else 'NONE'), {}
+
+        fake_app = SimpleNamespace(router=SimpleNamespace(
+            routes=[SimpleNamespace(path='/static'), FakeRoute('/api/weather')]))
+
+        async def app(scope, receive, send):
+            code = 304 if scope['path'] == '/api/weather' else 200
+            await send({'type': 'http.response.start', 'status': code, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def send(message):
+            pass
+
+        async def scenario():
+            middleware = MetricsMiddleware(app)
+            for path in ('/api/weather', '/api/weather', '/static/app.js'):
+                await middleware({'type': 'http', 'method': 'GET', 'path': path, 'app': fake_app}, None, send)
+
+        before = metrics.HTTP_REQUESTS.labels('GET', '/api/weather', '304').value
+        mounted = metrics.HTTP_REQUESTS.labels('GET', 'mounted', '200').value
+        asyncio.run(scenario())
+        assert metrics.HTTP_REQUESTS.labels('GET', '/api/weather', '304').value == before + 2
+        assert metrics.HTTP_REQUESTS.labels('GET', 'mounted', '200').value == mounted + 1
+
+    def test_db_hold_time_is_labelled_with_the_operation(self, tmp_path):
+        """Outermost get_connection checkouts are timed under their op name."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        child = metrics.DB_SECONDS.labels('save_cache_snapshot')
+        before = sum(child.counts)
+        db.save_cache_snapshot('news', {'articles': []}, 0.0)
+        assert sum(child.counts) == before + 1
+
+    def test_unlabelled_and_nested_checkouts(self, tmp_path):
+        """Callers without an op count as 'other'; nested checkouts are not timed again."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        other = metrics.DB_SECONDS.labels('other')
+        inner = metrics.DB_SECONDS.labels('save_cache_snapshot')
+        before_other, before_inner = sum(other.counts), sum(inner.counts)
+        with db.get_connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+            db.save_cache_snapshot('news', {'articles': []}, 0.0)
+        assert sum(other.counts) == before_other + 1
+        assert sum(inner.counts) == before_inner
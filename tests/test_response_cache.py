@@ -0,0 +1,110 @@
+"""Tests for the SQLite-backed AI response cache."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import metrics
+from database import DatabaseManager
+from response_cache import ResponseCache, normalize_prompt
+
+
+class EchoProvider:
+    """Provider that counts chat() calls."""
+
+    provider_type = 'ollama'
+    model_name = 'qwen2.5:7b'
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, messages, stream=False):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+
+class TestResponseCache:
+    """Test exact and near-duplicate hits, expiry, eviction and metrics."""
+
+    def test_exact_hits_ignore_case_and_spacing(self, db):
+        """A repeated prompt over the same context hits; a new context misses."""
+        cache = ResponseCache(db)
+        hits_before = metrics.AI_RESPONSE_CACHE.labels('hit').value
+
+        async def scenario():
+            await cache.store('ollama', 'qwen', "What's on my calendar?", 'ctx1', 'Two meetings.')
+            await cache.store('ollama', 'qwen', 'Summarize my inbox', 'ctx1', 'Error: Ollama API error: 500')
+            return (
+                await cache.lookup('ollama', 'qwen', "  what's on my   CALENDAR ", 'ctx1'),
+                await cache.lookup('ollama', 'qwen', "What's on my calendar?", 'ctx2'),
+                await cache.lookup('openai', 'qwen', "What's on my calendar?", 'ctx1'),
+                await cache.lookup('ollama', 'qwen', 'Summarize my inbox', 'ctx1'),
+            )
+
+        assert asyncio.run(scenario()) == ('Two meetings.', None, None, None)
+        assert metrics.AI_RESPONSE_CACHE.labels('hit').value == hits_before + 1
+        assert normalize_prompt('Plan my day?!') == 'plan my day'
+
+    def test_near_duplicate_mode(self, db):
+        """Near mode reuses an answer for a prompt with nearly the same words."""
+        cache = ResponseCache(db)
+
+        async def scenario():
+            await cache.store('ollama', 'qwen', 'what are my top priorities for today', 'ctx', 'Ship the release.')
+            exact_only = await cache.lookup('ollama', 'qwen', 'what are my top priorities for today please', 'ctx')
+            db.save_setting('ai_response_cache_mode', 'near')
+            db.save_setting('ai_response_cache_similarity', 0.8)
+            near = await cache.lookup('ollama', 'qwen', 'what are my top priorities for today please', 'ctx')
+            unrelated = await cache.lookup('ollama', 'qwen', 'what is the weather', 'ctx')
+            db.save_setting('ai_response_cache_mode', 'off')
+            off = await cache.lookup('ollama', 'qwen', 'what are my top priorities for today', 'ctx')
+            return exact_only, near, unrelated, off
+
+        assert asyncio.run(scenario()) == (None, 'Ship the release.', None, None)
+
+    def test_ttl_and_lru_eviction(self, db):
+        """Expired entries miss; beyond the size cap the least recently used go first."""
+        cache = ResponseCache(db)
+        db.save_setting('ai_response_cache_max_entries', 2)
+
+        async def scenario():
+            await cache.store('ollama', 'qwen', 'first', '', 'one')
+            await cache.store('ollama', 'qwen', 'second', '', 'two')
+            await cache.lookup('ollama', 'qwen', 'first', '')
+            with db.get_connection() as conn:
+                conn.execute("UPDATE ai_response_cache SET last_hit_at = last_hit_at - 10 WHERE prompt = 'second'")
+                conn.commit()
+            await cache.store('ollama', 'qwen', 'third', '', 'three')
+            with db.get_connection() as conn:
+                conn.execute("UPDATE ai_response_cache SET created_at = created_at - 3600 WHERE prompt = 'third'")
+                conn.commit()
+            return [await cache.lookup('ollama', 'qwen', prompt, '') for prompt in ('first', 'second', 'third')]
+
+        assert asyncio.run(scenario()) == ['one', None, None]
+        stats = cache.get_stats()
+        assert stats['evicted'] >= 1 and stats['entries'] == 2
+
+    def test_chat_calls_provider_once_per_prompt(self, db):
+        """cache.chat() answers a repeated message list without the provider."""
+        cache = ResponseCache(db)
+        provider = EchoProvider()
+        messages = [{'role': 'system', 'content': 'Data: 3 emails'}, {'role': 'user', 'content': 'Summarize'}]
+
+        async def scenario():
+            first = await cache.chat(provider, list(messages))
+            again = await cache.chat(provider, list(messages))
+            changed = await cache.chat(provider, [{'role': 'system', 'content': 'Data: 4 emails'}, messages[1]])
+            return first, again, changed
+
+        assert asyncio.run(scenario()) == ('answer 1', 'answer 1', 'answer 2')
+        assert provider.calls == 2
@@ -0,0 +1,134 @@
+"""Tests for the retention and compaction engine."""
+
+import pytest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_retention import RetentionEngine, RetentionPolicy, DEFAULT_POLICIES, merge_policies
+
+
+def _ts(days_ago: int) -> str:
+    """UTC 'YYYY-MM-DD HH:MM:SS', as CURRENT_TIMESTAMP stores it, a minute
+    past the day boundary so whole-second cutoffs never tie."""
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago, minutes=1)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class TestRetention:
+    """Test age/row-cap pruning, keep rules, batching and vacuum."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a database with 40 articles of increasing age, every 10th liked."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO news_articles (id, title, url, snippet, is_liked, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(f'a{i}', f'Title {i}', f'https://x/{i}', 'x' * 2000, 1 if i % 10 == 0 else 0, _ts(i))
+                 for i in range(40)]
+            )
+            conn.commit()
+        return db
+
+    def _ids(self, db):
+        with db.get_connection() as conn:
+            return {row[0] for row in conn.execute("SELECT id FROM news_articles")}
+
+    def test_age_policy_keeps_liked_rows(self, db):
+        """Rows past max age go, liked rows stay whatever their age."""
+        policy = RetentionPolicy('news_articles', 'created_at', max_age_days=15, keep_where='is_liked = 1')
+        summary = RetentionEngine(db, [policy], batch_size=4, batch_pause=0).run()
+
+        ids = self._ids(db)
+        assert {f'a{i}' for i in range(15)} <= ids
+        assert {'a20', 'a30'} <= ids
+        assert 'a16' not in ids
+        assert summary['deleted_by_table'] == {'news_articles': 23}
+
+    def test_row_cap_removes_oldest(self, db):
+        """max_rows trims the oldest unprotected rows in bounded batches."""
+        policy = RetentionPolicy('news_articles', 'created_at', max_rows=10, keep_where='is_liked = 1')
+        RetentionEngine(db, [policy], batch_size=3, batch_pause=0).run(vacuum=False)
+
+        ids = self._ids(db)
+        unliked = {i for i in ids if int(i[1:]) % 10}
+        assert unliked == {f'a{i}' for i in range(1, 12) if i != 10}
+        assert {'a0', 'a10', 'a20', 'a30'} <= ids
+
+    def test_vacuum_reclaims_space_and_is_reported(self, db):
+        """Deleted pages are released and show up in get_database_stats."""
+        summary = db.run_retention(policies=[RetentionPolicy('news_articles', 'created_at', max_age_days=0)])
+        assert summary['rows_deleted'] == 40
+        assert summary['pages_freed'] > 0
+        assert summary['bytes_reclaimed'] > 0
+
+        maintenance = db.get_database_stats()['maintenance']
+        assert maintenance['runs'] == 1
+        assert maintenance['total_bytes_reclaimed'] == summary['bytes_reclaimed']
+        assert maintenance['last_run']['deleted_by_table'] == {'news_articles': 40}
+
+    def test_setting_overrides_defaults(self, db):
+        """The retention_policies setting adjusts or disables default policies."""
+        db.save_setting('retention_policies', {'news_articles': {'max_age_days': 5}, 'ai_messages': None})
+        policies = {p.table: p for p in RetentionEngine(db).resolve_policies()}
+        assert policies['news_articles'].max_age_days == 5
+        assert policies['news_articles'].keep_where == 'is_liked = 1'
+        assert 'ai_messages' not in policies
+        assert len(merge_policies(DEFAULT_POLICIES, None)) == len(DEFAULT_POLICIES)
+
+    def test_setting_cannot_change_keep_rules(self, db):
+        """keep_where is SQL, so settings may only change the limits."""
+        db.save_setting('retention_policies', {'news_articles': {'max_rows': 7, 'keep_where': '1 = 0'}})
+        policies = {p.table: p for p in RetentionEngine(db).resolve_policies()}
+        assert policies['news_articles'].max_rows == 7
+        assert policies['news_articles'].keep_where == 'is_liked = 1'
+
+    def test_liked_and_dismissed_vanity_alerts_are_kept(self, db):
+        """Dismissals outlive the age limit so old alerts are not shown again."""
+        old = (datetime.now() - timedelta(days=120)).isoformat()
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO vanity_alerts (id, title, timestamp, is_liked, is_dismissed) VALUES (?, ?, ?, ?, ?)",
+                [('plain', 'Plain', old, 0, None), ('liked', 'Liked', old, 1, 0),
+                 ('dismissed', 'Dismissed', old, 0, 1)]
+            )
+            conn.commit()
+        policy = next(p for p in DEFAULT_POLICIES if p.table == 'vanity_alerts')
+        assert RetentionEngine(db, [policy], batch_pause=0).apply_policy(policy) == 1
+        with db.get_connection() as conn:
+            assert {row[0] for row in conn.execute("SELECT id FROM vanity_alerts")} == {'liked', 'dismissed'}
+
+    def test_chat_history_and_scan_dedup_are_opt_in(self, db):
+        """ai_messages and scanned_sources are only pruned when the setting names them."""
+        defaults = {p.table for p in RetentionEngine(db).resolve_policies()}
+        assert not {'ai_messages', 'scanned_sources'} & defaults
+
+        db.save_setting('retention_policies', {'ai_messages': {'max_age_days': 365}})
+        policies = {p.table: p for p in RetentionEngine(db).resolve_policies()}
+        assert policies['ai_messages'].max_age_days == 365
+        assert policies['ai_messages'].max_rows == 50000
+        assert 'scanned_sources' not in policies
+
+    def test_local_time_cutoff_ignores_separator(self, db):
+        """Local 'T'-separated timestamps are aged by time, not by text order."""
+        now = datetime.now()
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO vanity_alerts (id, title, timestamp) VALUES (?, ?, ?)",
+                [('old', 'Old', (now - timedelta(days=1, hours=1)).isoformat()),
+                 ('new', 'New', (now - timedelta(days=1) + timedelta(hours=1)).isoformat())]
+            )
+            conn.commit()
+        policy = RetentionPolicy('vanity_alerts', 'timestamp', max_age_days=1, local_time=True)
+        assert RetentionEngine(db, [policy], batch_pause=0).apply_policy(policy) == 1
+        with db.get_connection() as conn:
+            assert [row[0] for row in conn.execute("SELECT id FROM vanity_alerts")] == ['new']
+
+    def test_default_run_handles_every_table(self, db):
+        """A default run completes across all tables, including missing ones."""
+        summary = db.run_retention()
+        assert summary['deleted_by_table'] == {'news_articles': 9}
@@ -0,0 +1,79 @@
+"""Tests for the FTS5 search index."""
+
+import sqlite3
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_search import fts_query
+
+
+class TestSearch:
+    """Test trigger sync, ranking, snippets and kind filtering."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a database with one item of each kind."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        db.save_emails([{'id': 'e1', 'subject': 'Quarterly budget review',
+                         'sender': 'cfo@example.com', 'body': 'Please send the budget numbers by Friday.'}])
+        db.save_todo({'id': 't1', 'title': 'Prepare budget slides', 'source': 'manual'})
+        db.save_todo({'id': 't2', 'title': 'Walk the dog', 'description': 'Mention budget only in passing',
+                      'source': 'manual'})
+        db.save_news_articles([{'id': 'n1', 'title': 'Markets rally', 'url': 'https://x/n1',
+                                'snippet': 'Government budget talks lift stocks'}])
+        db.save_notes([{'source': 'obsidian', 'title': 'Budget planning 2027', 'path': '/vault/budget.md',
+                        'preview': 'Ideas for next year', 'todos': []}])
+        return db
+
+    def test_search_across_kinds_with_snippets(self, db):
+        """One query returns ranked hits from every kind with highlighted snippets."""
+        results = db.search('budget')
+        assert {hit['kind'] for hit in results} == {'emails', 'todos', 'news', 'notes'}
+        scores = [hit['score'] for hit in results]
+        assert scores == sorted(scores, reverse=True)
+        assert all('**' in hit['snippet'] for hit in results)
+
+        email = next(hit for hit in results if hit['kind'] == 'emails')
+        assert email['url'].endswith('#inbox/e1')
+
+    def test_title_matches_rank_higher(self, db):
+        """BM25 column weights put title hits ahead of description hits."""
+        ids = [hit['id'] for hit in db.search('budget', kinds=['todos'])]
+        assert ids == ['t1', 't2']
+
+    def test_index_follows_updates_and_deletes(self, db):
+        """Triggers keep the index in sync, including REPLACE on a plain connection."""
+        db.save_todo({'id': 't1', 'title': 'Prepare forecast slides', 'source': 'manual'})
+        assert [hit['id'] for hit in db.search('budget', kinds=['todos'])] == ['t2']
+        assert db.search('forecast', kinds=['todos'])[0]['id'] == 't1'
+
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("INSERT OR REPLACE INTO news_articles (id, title, url) VALUES ('n1', 'Weather update', 'u')")
+        conn.commit()
+        conn.close()
+        assert db.search('budget', kinds=['news']) == []
+        assert db.search('weather', kinds=['news'])[0]['id'] == 'n1'
+
+        db.delete_todo('t2')
+        assert db.search('passing') == []
+
+    def test_search_todos_filters_and_returns_rows(self, db):
+        """search_todos returns full todo dicts and honours filters."""
+        todos = db.search_todos('budg')
+        assert [todo['id'] for todo in todos] == ['t1', 't2']
+        assert 'description' in todos[0]
+        assert db.search_todos('budget', priority='high') == []
+
+    def test_find_note_and_query_parsing(self, db):
+        """Notes resolve by title; punctuation-only queries match nothing."""
+        assert db.find_note('budget planning')['path'] == '/vault/budget.md'
+        assert fts_query('"; DROP') == '"DROP"*'
+        assert fts_query('!!!') is None
+        assert db.search('!!!') == []
+        with pytest.raises(ValueError):
+            db.search('budget', kinds=['calendar'])
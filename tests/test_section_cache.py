@@ -0,0 +1,89 @@
+"""Tests for the signal-validated section cache and the data version counters."""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from section_cache import SectionCache
+
+
+class TestSectionCache:
+    """Test signal validation, invalidation, stats and trigger-bumped versions."""
+
+    def test_section_rebuilds_only_when_signal_changes(self):
+        """Same signal is a hit; a new signal re-renders that section only."""
+        sections = SectionCache()
+        renders = []
+
+        def renderer(name):
+            async def render():
+                renders.append(name)
+                return f"{name} v{len(renders)}"
+            return render
+
+        async def scenario():
+            first = await sections.get('tasks', 1, renderer('tasks'))
+            await sections.get('notes', ('vault', 0), renderer('notes'))
+            again = await sections.get('tasks', 1, renderer('tasks'))
+            changed = await sections.get('tasks', 2, renderer('tasks'))
+            await sections.get('notes', ('vault', 0), renderer('notes'))
+            return first, again, changed
+
+        first, again, changed = asyncio.run(scenario())
+        assert first == again == 'tasks v1'
+        assert changed == 'tasks v3'
+        assert renders == ['tasks', 'notes', 'tasks']
+
+        stats = sections.get_stats()
+        assert stats['tasks']['builds'] == 2 and stats['tasks']['hits'] == 1
+        assert stats['notes']['builds'] == 1 and stats['notes']['hits'] == 1
+        assert stats['tasks']['last_build_ms'] is not None and stats['tasks']['cached']
+
+    def test_invalidate_and_failed_builds(self):
+        """Invalidated sections re-render; a failing render leaves the old entry."""
+        sections = SectionCache()
+        calls = []
+
+        async def render():
+            calls.append(1)
+            return 'memory'
+
+        async def broken():
+            raise OSError('unreadable')
+
+        async def scenario():
+            await sections.get('memory', 'sig', render)
+            sections.invalidate('memory')
+            await sections.get('memory', 'sig', render)
+            with pytest.raises(OSError):
+                await sections.get('memory', 'new-sig', broken)
+            return await sections.get('memory', 'sig', render)
+
+        assert asyncio.run(scenario()) == 'memory'
+        assert len(calls) == 2
+        sections.invalidate()
+        assert sections.get_stats()['memory']['cached'] is False
+
+    def test_writes_bump_data_versions(self, tmp_path):
+        """Triggers bump the todos/profile/feedback counters on every write."""
+        db = DatabaseManager(str(tmp_path / 'dashboard.db'))
+        before = db.get_data_versions()
+        assert before == {'todos': 0, 'user_profile': 0, 'user_feedback': 0, 'settings': 0}
+
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO universal_todos (id, title, source) VALUES ('t1', 'Ship it', 'manual')")
+            conn.execute("UPDATE universal_todos SET status = 'completed' WHERE id = 't1'")
+            conn.execute("DELETE FROM universal_todos WHERE id = 't1'")
+            conn.commit()
+        db.save_setting('last_weather', {'current': {'temp': 60}})
+
+        after = db.get_data_versions()
+        assert after['todos'] == 3
+        assert after['settings'] > before['settings']
+        assert after['user_profile'] == 0
+        assert db.get_data_versions(['todos']) == {'todos': 3}
@@ -0,0 +1,74 @@
+"""Tests for the DatabaseManager settings cache."""
+
+import json
+import sqlite3
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from database import DatabaseManager
+from db_settings_cache import bump_version
+
+
+class TestSettingsCache:
+    """Test cached reads, write-through and cross-process invalidation."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a file-backed test database."""
+        return DatabaseManager(str(tmp_path / 'dashboard.db'))
+
+    def test_reads_load_table_once(self, db):
+        """Repeated reads are served from memory after one load."""
+        db.save_setting('notes_limit', 10)
+        db.save_setting('news_config', {'topics': ['ai']})
+
+        for _ in range(20):
+            assert db.get_setting('notes_limit') == 10
+            assert db.get_setting('missing', 'fallback') == 'fallback'
+
+        assert db._settings_cache.get_stats()['loads'] == 1
+
+    def test_save_writes_through(self, db):
+        """save_setting updates the cache without a reload."""
+        assert db.get_setting('ollama_host') is None
+        db.save_setting('ollama_host', 'gpu-box')
+
+        assert db.get_setting('ollama_host') == 'gpu-box'
+        assert db.get_settings(['ollama_host', 'nope']) == {'ollama_host': 'gpu-box'}
+        assert db._settings_cache.get_stats()['loads'] == 1
+
+    def test_cached_containers_are_copies(self, db):
+        """Mutating a returned dict does not change the cached value."""
+        db.save_setting('vanity_config', {'names': ['me']})
+        db.get_setting('vanity_config')['names'].append('other')
+        assert db.get_setting('vanity_config') == {'names': ['me']}
+
+    def test_other_process_writes_are_picked_up(self, db):
+        """A write from another connection bumps the version and invalidates."""
+        db.save_setting('notes_limit', 10)
+        assert db.get_setting('notes_limit') == 10
+
+        # Simulate a script in another process with its own plain connection
+        conn = sqlite3.connect(db.db_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO settings (setting_key, setting_value) VALUES (?, ?)",
+            ('notes_limit', json.dumps(25))
+        )
+        bump_version(conn)
+        conn.commit()
+        conn.close()
+
+        db._settings_cache.check_interval = 0
+        assert db.get_setting('notes_limit') == 25
+
+    def test_legacy_plain_string_values(self, db):
+        """Values that are not JSON come back as raw strings."""
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO settings (setting_key, setting_value) VALUES ('raw', 'plain text')")
+            conn.commit()
+        db.invalidate_settings_cache()
+        assert db.get_setting('raw') == 'plain text'
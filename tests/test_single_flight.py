@@ -0,0 +1,151 @@
+"""Tests for single-flight coalescing of upstream fetches."""
+
+import asyncio
+import threading
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test async and blocking coalescing, error sharing and counters."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Callers for the same key await one call; other keys run separately."""
+        flight = SingleFlight()
+        runs = []
+
+        async def fetch(name):
+            runs.append(name)
+            await asyncio.sleep(0.01)
+            return {'source': name}
+
+        async def scenario():
+            return await asyncio.gather(
+                flight.do(('gmail', 'primary'), fetch, 'gmail'),
+                flight.do(('gmail', 'primary'), fetch, 'gmail'),
+                flight.do(('gmail', 'primary'), fetch, 'gmail'),
+                flight.do('calendar', fetch, 'calendar'),
+            )
+
+        results = asyncio.run(scenario())
+        assert runs == ['gmail', 'calendar']
+        assert results[0] is results[1] is results[2]
+
+        stats = flight.get_stats()
+        assert stats['calls'] == 4 and stats['deduplicated'] == 2
+        assert stats['keys']['gmail'] == {'calls': 3, 'executions': 1, 'deduplicated': 2, 'errors': 0}
+        assert stats['in_flight'] == 0
+
+    def test_later_callers_start_a_fresh_call(self):
+        """Results are not cached once the shared call has finished."""
+        flight = SingleFlight()
+        runs = []
+
+        async def fetch():
+            runs.append(1)
+            return len(runs)
+
+        async def scenario():
+            return [await flight.do('notes', fetch), await flight.do('notes', fetch)]
+
+        assert asyncio.run(scenario()) == [1, 2]
+
+    def test_errors_reach_every_waiter(self):
+        """A failing call raises in all callers and is counted once."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('quota exceeded')
+
+        async def scenario():
+            return await asyncio.gather(flight.do('gmail', fetch), flight.do('gmail', fetch),
+                                        return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.get_stats()['keys']['gmail']['errors'] == 1
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        """A caller timing out leaves the call running for the others."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def scenario():
+            impatient = asyncio.wait_for(flight.do('notes', fetch), 0.01)
+            patient = flight.do('notes', fetch)
+            return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+        timed_out, result = asyncio.run(scenario())
+        assert isinstance(timed_out, asyncio.TimeoutError)
+        assert result == 'done'
+
+    def test_blocking_callers_share_one_call(self):
+        """Threads calling do_sync for the same key share one execution."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        runs = []
+
+        def collect(limit):
+            runs.append(limit)
+            started.set()
+            release.wait(1)
+            return {'notes': [], 'limit': limit}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do_sync(('notes', 10), collect, 10)))
+        leader.start()
+        started.wait(1)
+        followers = [threading.Thread(target=lambda: results.append(flight.do_sync(('notes', 10), collect, 10)))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        deadline = time.monotonic() + 1
+        while flight.get_stats()['deduplicated'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(1)
+
+        assert runs == [10]
+        assert len(results) == 4 and all(r is results[0] for r in results)
+        assert flight.get_stats()['keys']['notes']['deduplicated'] == 3
+
+    def test_caller_on_another_loop_joins_the_call(self):
+        """A caller on a second event loop shares the fetch owned by the first."""
+        flight = SingleFlight()
+        started = threading.Event()
+        runs = []
+
+        async def fetch():
+            runs.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return {'events': []}
+
+        results = []
+        follower = threading.Thread(
+            target=lambda: (started.wait(1), results.append(asyncio.run(flight.do('calendar', fetch)))))
+        follower.start()
+
+        async def scenario():
+            return await flight.do('calendar', fetch)
+
+        results.append(asyncio.run(scenario()))
+        follower.join(1)
+
+        assert runs == [1]
+        assert len(results) == 2 and results[0] is results[1]
+        assert flight.get_stats()['keys']['calendar'] == {'calls': 2, 'executions': 1,
+                                                          'deduplicated': 1, 'errors': 0}
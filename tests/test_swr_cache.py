@@ -0,0 +1,130 @@
+"""Tests for the stale-while-revalidate collector cache."""
+
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from collection_scheduler import CollectionScheduler
+from swr_cache import SWRCache
+
+
+class TestSWRCache:
+    """Test fresh/stale serving, coalesced refreshes and freshness metadata."""
+
+    def test_fresh_value_served_without_refresh(self):
+        """Within the TTL the value is returned and the loader is not called."""
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {'temp': 2}
+
+        async def scenario():
+            cache = SWRCache()
+            cache.configure('weather', ttl=60, loader=loader)
+            cache.set('weather', {'temp': 1})
+            return await cache.get('weather')
+
+        result = asyncio.run(scenario())
+        assert result.value == {'temp': 1}
+        assert result.freshness['fresh'] is True
+        assert result.freshness['refreshing'] is False
+        assert calls == []
+
+    def test_stale_value_served_immediately_then_refreshed(self):
+        """Past the TTL the old value comes back at once and reloads in the background."""
+        async def scenario():
+            release = asyncio.Event()
+
+            async def loader():
+                await release.wait()
+                return {'temp': 2}
+
+            cache = SWRCache()
+            cache.configure('weather', ttl=60, loader=loader)
+            cache.set('weather', {'temp': 1}, stored_at=time.time() - 120)
+
+            stale = await cache.get('weather')
+            release.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            fresh = await cache.get('weather')
+            return stale, fresh
+
+        stale, fresh = asyncio.run(scenario())
+        assert stale.value == {'temp': 1}
+        assert stale.freshness['fresh'] is False
+        assert stale.freshness['refreshing'] is True
+        assert stale.freshness['age_seconds'] >= 120
+        assert fresh.value == {'temp': 2}
+        assert fresh.freshness['fresh'] is True
+
+    def test_concurrent_misses_share_one_load(self):
+        """Many callers on a missing key wait for a single loader call."""
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ['event']
+
+        async def scenario():
+            cache = SWRCache()
+            cache.configure('calendar', ttl=300, loader=loader)
+            results = await asyncio.gather(*[cache.get('calendar') for _ in range(10)])
+            return results, cache.stats
+
+        results, stats = asyncio.run(scenario())
+        assert calls == [1]
+        assert all(result.value == ['event'] for result in results)
+        assert stats['coalesced'] == 9
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """A loader error is counted and the stale copy stays available."""
+        async def loader():
+            raise RuntimeError('api down')
+
+        async def scenario():
+            cache = SWRCache(max_stale=3600)
+            cache.configure('news', ttl=60, loader=loader)
+            cache.set('news', ['old'], stored_at=time.time() - 120)
+            await cache.get('news')
+            await asyncio.sleep(0)
+            result = await cache.get('news')
+            cache.set('news', ['ancient'], stored_at=time.time() - 7200)
+            return result, await cache.get('news'), cache.stats
+
+        result, too_old, stats = asyncio.run(scenario())
+        assert result.value == ['old']
+        assert too_old is None
+        assert stats['refresh_errors'] == 2
+
+    def test_scheduler_run_once_coalesces_with_periodic_run(self):
+        """An on-demand load joins the collector run already in flight."""
+        calls = []
+
+        async def scenario():
+            async def collect():
+                calls.append(1)
+                await asyncio.sleep(0.02)
+                return {'items': len(calls)}
+
+            cache = SWRCache()
+            scheduler = CollectionScheduler(on_result=cache.set)
+            scheduler.add_job('news', collect, interval=3600)
+            cache.configure('news', ttl=900, loader=lambda: scheduler.run_once('news'))
+            await scheduler.start()
+            await asyncio.sleep(0.005)
+            result = await cache.get('news')
+            await scheduler.stop()
+            return result, scheduler.get_status()['jobs']['news']
+
+        result, job = asyncio.run(scenario())
+        assert calls == [1]
+        assert result.value == {'items': 1}
+        assert job['coalesced'] == 1
@@ -0,0 +1,86 @@
+"""Tests for the concurrent widget loader behind /api/dashboard/bootstrap."""
+
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from widget_bootstrap import gather_widgets, ndjson_line
+
+
+def _source(value, delay=0.0, error=None):
+    async def load():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return value
+    return load
+
+
+async def _collect(sources, **kwargs):
+    return [item async for item in gather_widgets(sources, **kwargs)]
+
+
+class TestWidgetBootstrap:
+    """Test completion ordering, per-widget failures and cancellation."""
+
+    def test_widgets_stream_in_completion_order(self):
+        """Header first, then fastest widget first, then a summary."""
+        sources = {
+            'news': ('/api/news', _source({'articles': []}, delay=0.05)),
+            'weather': ('/api/weather', _source({'temperature': 20})),
+        }
+        items = asyncio.run(_collect(sources))
+
+        assert items[0] == {'widgets': {'news': '/api/news', 'weather': '/api/weather'}}
+        assert [item['widget'] for item in items[1:3]] == ['weather', 'news']
+        assert items[1]['data'] == {'temperature': 20}
+        assert items[1]['url'] == '/api/weather'
+        assert items[-1]['done'] is True
+        assert items[-1]['count'] == 2 and items[-1]['failed'] == 0
+
+    def test_failures_and_timeouts_only_affect_their_widget(self):
+        """A raising or slow source yields an error line; others still arrive."""
+        sources = {
+            'github': ('/api/github', _source(None, error=RuntimeError('rate limited'))),
+            'calendar': ('/api/calendar', _source({'events': []}, delay=1)),
+            'tasks': ('/api/tasks', _source({'tasks': []})),
+        }
+        items = asyncio.run(_collect(sources, timeout=0.05))
+        by_widget = {item['widget']: item for item in items if 'widget' in item}
+
+        assert by_widget['github']['error'] == 'rate limited'
+        assert 'timed out' in by_widget['calendar']['error']
+        assert by_widget['tasks']['data'] == {'tasks': []}
+        assert items[-1]['failed'] == 2
+
+    def test_closing_the_stream_cancels_pending_sources(self):
+        """Sources still running when the consumer stops are cancelled."""
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def scenario():
+            stream = gather_widgets({'fast': ('/a', _source(1)), 'slow': ('/b', slow)})
+            await stream.__anext__()  # header
+            assert (await stream.__anext__())['widget'] == 'fast'
+            await stream.aclose()
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        assert cancelled == [True]
+
+    def test_ndjson_line_is_one_compact_json_line(self):
+        """Each item serialises to one newline-terminated JSON object."""
+        line = ndjson_line({'widget': 'news', 'data': {'title': 'a\nb'}})
+        assert line.endswith('\n') and line.count('\n') == 1
+        assert json.loads(line) == {'widget': 'news', 'data': {'title': 'a\nb'}}